@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import subprocess
+import sys
+
+import pytest
+from pytest_codspeed.plugin import BenchmarkFixture
+
+# Short-lived headless processes pay for the add-on startup every time,
+# so measure it in a fresh interpreter.
+STARTUP_SCRIPT = """
+import sys
+
+import bpy
+
+bpy.ops.preferences.addon_enable(module="io_scene_vrm")
+
+lazy_module_names = [
+    "io_scene_vrm.exporter.vrm0_exporter",
+    "io_scene_vrm.exporter.vrm1_exporter",
+    "io_scene_vrm.importer.vrm0_importer",
+    "io_scene_vrm.importer.vrm1_importer",
+    "io_scene_vrm.importer.vrm_animation_importer",
+]
+loaded_module_names = [name for name in lazy_module_names if name in sys.modules]
+if loaded_module_names:
+    raise AssertionError(f"Loaded on startup: {loaded_module_names}")
+"""
+
+
+def test_startup(benchmark: BenchmarkFixture) -> None:
+    @benchmark
+    def _() -> None:
+        subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], check=True)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,5 +1,7 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 
+from collections.abc import Generator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Final
 
@@ -15,6 +17,7 @@ _logger = get_logger(__name__)
 class State:
     during_animation_playback: bool = False
     during_frame_change: bool = False
+    during_shape_key_update_suspension: bool = False
 
 
 _state: Final = State()
@@ -30,7 +33,28 @@ def _is_animation_playing(context: Context) -> bool:
 
 
 def defer_shape_key_update(context: Context) -> bool:
-    return _is_animation_playing(context) or _state.during_frame_change
+    return (
+        _is_animation_playing(context)
+        or _state.during_frame_change
+        or _state.during_shape_key_update_suspension
+    )
+
+
+@contextmanager
+def suspend_shape_key_update() -> Generator[None]:
+    """Queue expression preview updates instead of applying them one by one.
+
+    The queued armatures are applied by the callers with
+    ``apply_pending_preview_update_to_armatures()`` after leaving the block.
+    """
+    saved_during_shape_key_update_suspension = _state.during_shape_key_update_suspension
+    _state.during_shape_key_update_suspension = True
+    try:
+        yield
+    finally:
+        _state.during_shape_key_update_suspension = (
+            saved_during_shape_key_update_suspension
+        )
 
 
 @persistent
@@ -56,3 +80,4 @@ def frame_change_post(_unused: object) -> None:
 def clear_global_variables() -> None:
     _state.during_animation_playback = False
     _state.during_frame_change = False
+    _state.during_shape_key_update_suspension = False
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from array import array
+from sys import float_info
+from typing import Final
+
+from bpy.types import FCurve
+
+# The values of eBezTriple_Interpolation returned by foreach_get("interpolation")
+# https://projects.blender.org/blender/blender/src/tag/v4.2.0/source/blender/makesdna/DNA_curve_types.h#L463-L467
+INTERPOLATION_CONSTANT: Final = 0
+INTERPOLATION_LINEAR: Final = 1
+INTERPOLATION_BEZIER: Final = 2
+
+# https://projects.blender.org/blender/blender/src/tag/v4.2.0/source/blender/blenkernel/intern/fcurve.cc#L2131
+EXACT_FRAME_THRESHOLD: Final = 0.0001
+FLT_EPSILON: Final = 1.1920928955078125e-07
+
+
+def evaluate_fcurve(fcurve: FCurve, frame_start: int, frame_end: int) -> list[float]:
+    """Evaluate an F-curve at each frame from frame_start to frame_end inclusive.
+
+    The keyframe points are read once, and frames on keyframes, constant and
+    linear segments, flat Bezier segments and constant extrapolation are
+    evaluated the same way as FCurve.evaluate() does. The other frames, such
+    as those in curved Bezier or easing segments, fall back to FCurve.evaluate()
+    because it is faster than solving the cubic in Python.
+    """
+    frames = range(frame_start, frame_end + 1)
+    keyframe_points = fcurve.keyframe_points
+    keyframe_count = len(keyframe_points)
+    if not keyframe_count or any(not modifier.mute for modifier in fcurve.modifiers):
+        return [fcurve.evaluate(frame) for frame in frames]
+
+    coordinates = array("f", bytes(keyframe_count * 2 * 4))
+    keyframe_points.foreach_get("co", coordinates)
+    handle_lefts = array("f", bytes(keyframe_count * 2 * 4))
+    keyframe_points.foreach_get("handle_left", handle_lefts)
+    handle_rights = array("f", bytes(keyframe_count * 2 * 4))
+    keyframe_points.foreach_get("handle_right", handle_rights)
+    interpolations = array("i", bytes(keyframe_count * 4))
+    keyframe_points.foreach_get("interpolation", interpolations)
+
+    xs = coordinates[0::2]
+    ys = coordinates[1::2]
+    handle_left_ys = handle_lefts[1::2]
+    handle_right_ys = handle_rights[1::2]
+    constant_extrapolation = fcurve.extrapolation == "CONSTANT"
+    first_x = xs[0]
+    last_x = xs[-1]
+
+    values: list[float] = []
+    index = 0
+    for frame in frames:
+        if frame <= first_x:
+            if constant_extrapolation or interpolations[0] == INTERPOLATION_CONSTANT:
+                values.append(ys[0])
+            else:
+                values.append(fcurve.evaluate(frame))
+            continue
+        if frame >= last_x:
+            if constant_extrapolation or interpolations[-1] == INTERPOLATION_CONSTANT:
+                values.append(ys[-1])
+            else:
+                values.append(fcurve.evaluate(frame))
+            continue
+
+        # Frames are increasing, so the segment never moves backwards
+        while index + 1 < keyframe_count and xs[index + 1] <= frame:
+            index += 1
+        if abs(frame - xs[index]) < EXACT_FRAME_THRESHOLD:
+            values.append(ys[index])
+            continue
+        if (
+            index + 1 < keyframe_count
+            and abs(xs[index + 1] - frame) < EXACT_FRAME_THRESHOLD
+        ):
+            values.append(ys[index + 1])
+            continue
+
+        begin = ys[index]
+        duration = xs[index + 1] - xs[index]
+        interpolation = interpolations[index]
+        if interpolation == INTERPOLATION_CONSTANT or duration < float_info.epsilon:
+            values.append(begin)
+        elif interpolation == INTERPOLATION_LINEAR:
+            values.append(
+                begin + (ys[index + 1] - begin) * (frame - xs[index]) / duration
+            )
+        elif (
+            interpolation == INTERPOLATION_BEZIER
+            and abs(begin - ys[index + 1]) < FLT_EPSILON
+            and abs(handle_right_ys[index] - handle_left_ys[index + 1]) < FLT_EPSILON
+            and abs(handle_left_ys[index + 1] - ys[index + 1]) < FLT_EPSILON
+        ):
+            values.append(begin)
+        else:
+            values.append(fcurve.evaluate(frame))
+    return values
@@ -69,3 +69,24 @@ def create_unique_indexed_file_path(path: Path, binary: Optional[bytes] = None)
         + f"(max retries: {max_retry_count} exceeded): {path}"
     )
     raise RuntimeError(message)
+
+
+def find_indexed_file_path_with_same_content(
+    path: Path, binary: bytes
+) -> Optional[Path]:
+    """Find a file created by create_unique_indexed_file_path() with the content."""
+    suffix = path.suffix
+    stem = path.stem
+    max_retry_count = 100_000
+
+    for count in range(max_retry_count):
+        count_str = f".{count}" if count else ""
+        path = path.with_name(stem + count_str + suffix)
+        try:
+            if not path.is_file():
+                return None
+            if path.stat().st_size == len(binary) and path.read_bytes() == binary:
+                return path
+        except OSError:
+            return None
+    return None
@@ -3,9 +3,12 @@ import base64
 import json
 import math
 import struct
-from dataclasses import dataclass
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Final, Optional, Union
+from typing import BinaryIO, Final, Optional, Union
 from urllib.parse import unquote, urlsplit
 
 from mathutils import Matrix, Quaternion, Vector
@@ -113,9 +116,32 @@ def parse_glb(data: bytes) -> tuple[dict[str, Json], bytes]:
     return json_obj, bin_chunk_data_bytes
 
 
-def pack_glb(
-    json_dict: dict[str, Json], bin_chunk_bytes: Union[bytes, bytearray]
-) -> bytes:
+@dataclass
+class ChunkedBuffer:
+    """Buffer bytes kept as separate chunks.
+
+    write_glb() writes the chunks one by one, so the buffer is never
+    concatenated into a single copy.
+    """
+
+    chunks: list[bytes] = field(default_factory=list[bytes])
+    byte_length: int = 0
+
+    def extend(self, data: Union[bytes, bytearray]) -> None:
+        if not data:
+            return
+        self.chunks.append(bytes(data))
+        self.byte_length += len(data)
+
+    def __len__(self) -> int:
+        return self.byte_length
+
+
+def write_glb(
+    output: BinaryIO,
+    json_dict: dict[str, Json],
+    bin_chunk_bytes: Union[bytes, bytearray, ChunkedBuffer],
+) -> None:
     # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#binary-gltf-layout
     json_chunk_bytes = json.dumps(
         json_dict,
@@ -125,18 +151,18 @@ def pack_glb(
         # Unity Editor.
         ensure_ascii=False,
     ).encode()
+    json_chunk_bytes += b"\x20" * (-len(json_chunk_bytes) % 4)
 
-    while len(json_chunk_bytes) % 4:
-        json_chunk_bytes += b"\x20"
-
-    while len(bin_chunk_bytes) % 4:
-        bin_chunk_bytes += b"\x00"
-
-    glb = bytearray()
+    if isinstance(bin_chunk_bytes, ChunkedBuffer):
+        bin_chunk_chunks: Sequence[Union[bytes, bytearray]] = bin_chunk_bytes.chunks
+    else:
+        bin_chunk_chunks = [bin_chunk_bytes]
+    bin_chunk_padding = b"\x00" * (-len(bin_chunk_bytes) % 4)
+    bin_chunk_length = len(bin_chunk_bytes) + len(bin_chunk_padding)
 
-    glb.extend(b"glTF")  # magic
-    glb.extend(struct.pack("<I", 2))  # version
-    glb.extend(  # length
+    output.write(b"glTF")  # magic
+    output.write(struct.pack("<I", 2))  # version
+    output.write(  # length
         struct.pack(
             "<I",
             # header
@@ -146,19 +172,26 @@ def pack_glb(
             + len(json_chunk_bytes)
             # binary chunk
             + 8
-            + len(bin_chunk_bytes),
+            + bin_chunk_length,
         )
     )
 
-    glb.extend(struct.pack("<I", len(json_chunk_bytes)))
-    glb.extend(b"JSON")
-    glb.extend(json_chunk_bytes)
+    output.write(struct.pack("<I", len(json_chunk_bytes)))
+    output.write(b"JSON")
+    output.write(json_chunk_bytes)
+
+    output.write(struct.pack("<I", bin_chunk_length))
+    output.write(b"BIN\x00")
+    output.writelines(bin_chunk_chunks)
+    output.write(bin_chunk_padding)
 
-    glb.extend(struct.pack("<I", len(bin_chunk_bytes)))
-    glb.extend(b"BIN\x00")
-    glb.extend(bin_chunk_bytes)
 
-    return bytes(glb)
+def pack_glb(
+    json_dict: dict[str, Json], bin_chunk_bytes: Union[bytes, bytearray]
+) -> bytes:
+    output = BytesIO()
+    write_glb(output, json_dict, bin_chunk_bytes)
+    return output.getvalue()
 
 
 @dataclass(frozen=True)
@@ -182,6 +215,26 @@ class Component:
                 return component
         return None
 
+    @staticmethod
+    def from_array(
+        values: Union["array[int]", "array[float]"],
+    ) -> Optional["Component"]:
+        for component in (
+            BYTE_COMPONENT,
+            UNSIGNED_BYTE_COMPONENT,
+            SHORT_COMPONENT,
+            UNSIGNED_SHORT_COMPONENT,
+            INT_COMPONENT,
+            UNSIGNED_INT_COMPONENT,
+            FLOAT_COMPONENT,
+        ):
+            if (
+                component.unpack_symbol == values.typecode
+                and component.byte_length == values.itemsize
+            ):
+                return component
+        return None
+
 
 BYTE_COMPONENT: Final = Component(GL_BYTE, "b", 1)
 UNSIGNED_BYTE_COMPONENT: Final = Component(GL_UNSIGNED_BYTE, "B", 1)
@@ -206,6 +259,84 @@ def _accessor_type_component_count(accessor_type: str) -> Optional[int]:
     return None
 
 
+def array_to_little_endian_bytes(values: Union["array[int]", "array[float]"]) -> bytes:
+    if sys.byteorder == "little":
+        return values.tobytes()
+    swapped_values = array(values.typecode, values)
+    swapped_values.byteswap()
+    return swapped_values.tobytes()
+
+
+@dataclass(frozen=True)
+class BufferBuilder:
+    """Append buffer views and accessors to the buffer 0 of a glb."""
+
+    buffer0: Union[bytearray, ChunkedBuffer]
+    buffer_view_dicts: list[dict[str, Json]]
+    accessor_dicts: list[dict[str, Json]]
+
+    def append_buffer_view(
+        self, data: Union[bytes, bytearray, "array[int]", "array[float]"]
+    ) -> int:
+        if isinstance(data, array):
+            data = array_to_little_endian_bytes(data)
+
+        # Align to 4 bytes, the largest component size
+        self.buffer0.extend(bytes(-len(self.buffer0) % 4))
+        byte_offset = len(self.buffer0)
+        self.buffer0.extend(data)
+
+        buffer_view_index = len(self.buffer_view_dicts)
+        self.buffer_view_dicts.append(
+            {
+                "buffer": 0,
+                "byteOffset": byte_offset,
+                "byteLength": len(data),
+            }
+        )
+        return buffer_view_index
+
+    def append_accessor(
+        self,
+        values: Union["array[int]", "array[float]"],
+        accessor_type: str,
+        *,
+        min_max: bool = False,
+    ) -> int:
+        component = Component.from_array(values)
+        if component is None:
+            message = f"Unsupported array typecode: {values.typecode}"
+            raise ValueError(message)
+        component_count = _accessor_type_component_count(accessor_type)
+        if component_count is None:
+            message = f"Unsupported accessor type: {accessor_type}"
+            raise ValueError(message)
+        count, remainder = divmod(len(values), component_count)
+        if remainder:
+            message = (
+                f"The length {len(values)} is not a multiple of"
+                + f" the component count {component_count}"
+            )
+            raise ValueError(message)
+
+        accessor_dict: dict[str, Json] = {
+            "bufferView": self.append_buffer_view(values),
+            "componentType": component.component_type,
+            "count": count,
+            "type": accessor_type,
+        }
+        if min_max and count:
+            component_values = [
+                values[index::component_count] for index in range(component_count)
+            ]
+            accessor_dict["min"] = [min(v) for v in component_values]
+            accessor_dict["max"] = [max(v) for v in component_values]
+
+        accessor_index = len(self.accessor_dicts)
+        self.accessor_dicts.append(accessor_dict)
+        return accessor_index
+
+
 def read_buffer_view_as_bytes(
     buffer_view_dict: Json,
     buffer_dicts: list[Json],
@@ -1077,15 +1208,134 @@ def read_accessor_as_animation_sampler_rotation_output(
     buffer_view_dicts: list[Json],
     buffer_dicts: list[Json],
     buffer0_bytes: bytes,
+    *,
+    normalize: bool = True,
 ) -> Optional[list[Quaternion]]:
     vec4_accessor = _read_vec4_accessor(
         accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
     )
     if vec4_accessor is None:
         return None
+    if not normalize:
+        # Tangents of CUBICSPLINE samplers are not unit quaternions
+        return [Quaternion((w, x, -z, y)) for x, y, z, w in vec4_accessor]
     return [Quaternion((w, x, -z, y)).normalized() for x, y, z, w in vec4_accessor]
 
 
+AccessorCacheKey = tuple[str, int, int, bytes]
+
+
+def _create_accessor_cache_key(
+    accessor_dict: dict[str, Json],
+    buffer_view_dicts: list[Json],
+    buffer_dicts: list[Json],
+    buffer0_bytes: bytes,
+) -> Optional[AccessorCacheKey]:
+    accessor_type = accessor_dict.get("type")
+    if not isinstance(accessor_type, str):
+        return None
+    component_type = accessor_dict.get("componentType")
+    if not isinstance(component_type, int):
+        return None
+    count = accessor_dict.get("count")
+    if not isinstance(count, int):
+        return None
+    raw_bytes = _read_accessor_as_bytes(
+        accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+    )
+    if raw_bytes is None:
+        return None
+    return (accessor_type, component_type, count, raw_bytes)
+
+
+@dataclass(frozen=True)
+class AnimationSamplerAccessorCache:
+    """Decoded animation sampler accessors shared across VRMA files.
+
+    The entries are keyed by the accessor layout and its raw bytes, so the same
+    keyframe data is decoded once even if it appears in different accessors or
+    files. The returned lists are shared and must not be modified.
+    """
+
+    key_to_input: dict[AccessorCacheKey, Optional[list[float]]] = field(
+        default_factory=dict[AccessorCacheKey, Optional[list[float]]]
+    )
+    key_to_translation_output: dict[AccessorCacheKey, Optional[list[Vector]]] = field(
+        default_factory=dict[AccessorCacheKey, Optional[list[Vector]]]
+    )
+    key_to_rotation_output: dict[
+        tuple[AccessorCacheKey, bool], Optional[list[Quaternion]]
+    ] = field(
+        default_factory=dict[tuple[AccessorCacheKey, bool], Optional[list[Quaternion]]]
+    )
+
+    def read_input(
+        self,
+        accessor_dict: dict[str, Json],
+        buffer_view_dicts: list[Json],
+        buffer_dicts: list[Json],
+        buffer0_bytes: bytes,
+    ) -> Optional[list[float]]:
+        key = _create_accessor_cache_key(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        if key is None:
+            return None
+        if key in self.key_to_input:
+            return self.key_to_input[key]
+        values = read_accessor_as_animation_sampler_input(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        self.key_to_input[key] = values
+        return values
+
+    def read_translation_output(
+        self,
+        accessor_dict: dict[str, Json],
+        buffer_view_dicts: list[Json],
+        buffer_dicts: list[Json],
+        buffer0_bytes: bytes,
+    ) -> Optional[list[Vector]]:
+        key = _create_accessor_cache_key(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        if key is None:
+            return None
+        if key in self.key_to_translation_output:
+            return self.key_to_translation_output[key]
+        values = read_accessor_as_animation_sampler_translation_output(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        self.key_to_translation_output[key] = values
+        return values
+
+    def read_rotation_output(
+        self,
+        accessor_dict: dict[str, Json],
+        buffer_view_dicts: list[Json],
+        buffer_dicts: list[Json],
+        buffer0_bytes: bytes,
+        *,
+        normalize: bool = True,
+    ) -> Optional[list[Quaternion]]:
+        key = _create_accessor_cache_key(
+            accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+        )
+        if key is None:
+            return None
+        if (key, normalize) in self.key_to_rotation_output:
+            return self.key_to_rotation_output[(key, normalize)]
+        values = read_accessor_as_animation_sampler_rotation_output(
+            accessor_dict,
+            buffer_view_dicts,
+            buffer_dicts,
+            buffer0_bytes,
+            normalize=normalize,
+        )
+        self.key_to_rotation_output[(key, normalize)] = values
+        return values
+
+
 def parse_gltf_node_matrix(node_dict: dict[str, Json]) -> Matrix:
     matrix = node_dict.get("matrix")
     if isinstance(matrix, list):
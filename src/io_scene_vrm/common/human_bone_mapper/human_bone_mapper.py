@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import re
-from collections.abc import Mapping
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
 from functools import cache
 from typing import Final, Optional
 
@@ -51,53 +53,105 @@ def _canonicalize_bone_name(bone_name: str) -> str:
     return ".".join(bone_name_components)
 
 
-def _match_bone_name(bone_name1: str, bone_name2: str) -> bool:
-    return _canonicalize_bone_name(bone_name1) == _canonicalize_bone_name(bone_name2)
+@dataclass(frozen=True)
+class CanonicalMappingTable:
+    """A mapping table with bone names canonicalized in advance."""
+
+    name: str
+    mapping: Mapping[str, HumanBoneSpecification]
+    canonical_bone_names: Mapping[str, str]
+
+    @staticmethod
+    def create(
+        name: str, mapping: Mapping[str, HumanBoneSpecification]
+    ) -> "CanonicalMappingTable":
+        return CanonicalMappingTable(
+            name=name,
+            mapping=mapping,
+            canonical_bone_names={
+                bone_name: _canonicalize_bone_name(bone_name) for bone_name in mapping
+            },
+        )
+
+
+@cache
+def get_static_canonical_mapping_tables() -> tuple[CanonicalMappingTable, ...]:
+    """Return the mapping tables that don't depend on the armature."""
+    return tuple(
+        CanonicalMappingTable.create(name, mapping)
+        for name, mapping in (
+            mixamo_mapping.CONFIG,
+            mpfb_mapping.CONFIG_DEFAULT,
+            mpfb_mapping.CONFIG_GAME_ENGINE,
+            unreal_mapping.CONFIG,
+            ready_player_me_mapping.CONFIG,
+            reallusion_mapping.CONFIG,
+            cats_blender_plugin_fix_model_mapping.CONFIG,
+            microsoft_rocketbox_mapping.CONFIG_BIP01,
+            microsoft_rocketbox_mapping.CONFIG_BIP02,
+            rigify_meta_rig_mapping.CONFIG,
+            vroid_mapping.CONFIG,
+            vroid_mapping.CONFIG_SYMMETRICAL,
+            vrm_addon_mapping.CONFIG_VRM1,
+            vrm_addon_mapping.CONFIG_VRM0,
+        )
+    )
+
+
+def _create_canonical_bone_name_to_bone(armature: Armature) -> dict[str, Bone]:
+    """Return the first bone of each canonical bone name."""
+    canonical_bone_name_to_bone: dict[str, Bone] = {}
+    for bone in armature.bones:
+        canonical_bone_name_to_bone.setdefault(_canonicalize_bone_name(bone.name), bone)
+    return canonical_bone_name_to_bone
 
 
 def _match_count(
-    armature: Armature, mapping: Mapping[str, HumanBoneSpecification]
+    canonical_bone_name_to_bone: Mapping[str, Bone],
+    table: CanonicalMappingTable,
+    *,
+    only_requirement: bool,
 ) -> int:
     count = 0
 
-    mapping = {
-        bpy_name: specification
-        for bpy_name, specification in mapping.items()
-        if any(_match_bone_name(bpy_name, bone.name) for bone in armature.bones)
-    }
-
-    # Validate bone ordering
-    for bpy_name, specification in mapping.items():
-        bone = next(
-            (bone for bone in armature.bones if _match_bone_name(bpy_name, bone.name)),
-            None,
-        )
+    # The first specification for each canonical bone name in the table
+    canonical_bone_name_to_specification: dict[str, HumanBoneSpecification] = {}
+    bone_and_specifications: list[tuple[Bone, HumanBoneSpecification]] = []
+    for bpy_name, specification in table.mapping.items():
+        if only_requirement and not specification.requirement:
+            continue
+        canonical_bone_name = table.canonical_bone_names[bpy_name]
+        bone = canonical_bone_name_to_bone.get(canonical_bone_name)
         if not bone:
             continue
+        canonical_bone_name_to_specification.setdefault(
+            canonical_bone_name, specification
+        )
+        bone_and_specifications.append((bone, specification))
+    human_bone_names = {
+        specification.name for _bone, specification in bone_and_specifications
+    }
 
+    # Validate bone ordering
+    for bone, specification in bone_and_specifications:
         parent_specification: Optional[HumanBoneSpecification] = None
         search_parent_specification = specification.parent
         while search_parent_specification:
-            if search_parent_specification in mapping.values():
+            if search_parent_specification.name in human_bone_names:
                 parent_specification = search_parent_specification
                 break
             search_parent_specification = search_parent_specification.parent
 
         found = False
-        bone: Optional[Bone] = bone.parent
-        while bone:
-            search_specification = next(
-                (
-                    search_specification
-                    for bpy_name, search_specification in mapping.items()
-                    if _match_bone_name(bpy_name, bone.name)
-                ),
-                None,
+        search_bone: Optional[Bone] = bone.parent
+        while search_bone:
+            search_specification = canonical_bone_name_to_specification.get(
+                _canonicalize_bone_name(search_bone.name)
             )
             if search_specification:
                 found = search_specification == parent_specification
                 break
-            bone = bone.parent
+            search_bone = search_bone.parent
 
         if found or not parent_specification:
             count += 1
@@ -107,34 +161,24 @@ def _match_count(
 
 
 def _match_counts(
-    armature: object, mapping: Mapping[str, HumanBoneSpecification]
+    canonical_bone_name_to_bone: Mapping[str, Bone], table: CanonicalMappingTable
 ) -> tuple[int, int]:
-    if not isinstance(armature, Armature):
-        message = f"{type(armature)} is not an Armature"
-        raise TypeError(message)
-    required_mapping = {
-        bpy_name: required_specification
-        for bpy_name, required_specification in mapping.items()
-        if required_specification.requirement
-    }
-    return (_match_count(armature, required_mapping), _match_count(armature, mapping))
+    return (
+        _match_count(canonical_bone_name_to_bone, table, only_requirement=True),
+        _match_count(canonical_bone_name_to_bone, table, only_requirement=False),
+    )
 
 
 def _sorted_required_first(
-    armature: Armature,
+    canonical_bone_name_to_bone: Mapping[str, Bone],
     mapping: Mapping[str, HumanBoneSpecification],
 ) -> dict[str, HumanBoneSpecification]:
     bpy_bone_name_mapping: dict[str, HumanBoneSpecification] = {
-        bpy_bone_name: specification
+        bone.name: specification
         for original_bone_name, specification in mapping.items()
         if (
-            bpy_bone_name := next(
-                (
-                    bone.name
-                    for bone in armature.bones
-                    if _match_bone_name(original_bone_name, bone.name)
-                ),
-                None,
+            bone := canonical_bone_name_to_bone.get(
+                _canonicalize_bone_name(original_bone_name)
             )
         )
     }
@@ -156,32 +200,49 @@ def _sorted_required_first(
     return sorted_mapping
 
 
-def create_human_bone_mapping(
+@dataclass(frozen=True)
+class HumanBoneMappingResult:
+    armature_object_name: str
+    mapping_name: str
+    mapping: dict[str, HumanBoneSpecification]
+    required_count: int
+    wanted_required_count: int
+    elapsed_seconds: float
+
+    @property
+    def confidence(self) -> float:
+        """The ratio of the required human bones found in the mapping."""
+        if not self.wanted_required_count:
+            return 0.0
+        return min(self.required_count / self.wanted_required_count, 1.0)
+
+
+def create_human_bone_mapping_result(
     armature: Object,
-) -> dict[str, HumanBoneSpecification]:
+    static_canonical_mapping_tables: Optional[Sequence[CanonicalMappingTable]] = None,
+) -> HumanBoneMappingResult:
+    start_time = time.perf_counter()
     armature_data = armature.data
     if not isinstance(armature_data, Armature):
         raise TypeError
+    if static_canonical_mapping_tables is None:
+        static_canonical_mapping_tables = get_static_canonical_mapping_tables()
+
+    canonical_bone_name_to_bone = _create_canonical_bone_name_to_bone(armature_data)
     ((required_count, _all_count), name, mapping) = max(
-        (_match_counts(armature_data, mapping), name, mapping)
-        for name, mapping in (
-            mmd_mapping.create_config(armature),
-            biped_mapping.create_config(armature),
-            mixamo_mapping.CONFIG,
-            mpfb_mapping.CONFIG_DEFAULT,
-            mpfb_mapping.CONFIG_GAME_ENGINE,
-            unreal_mapping.CONFIG,
-            ready_player_me_mapping.CONFIG,
-            reallusion_mapping.CONFIG,
-            cats_blender_plugin_fix_model_mapping.CONFIG,
-            microsoft_rocketbox_mapping.CONFIG_BIP01,
-            microsoft_rocketbox_mapping.CONFIG_BIP02,
-            rigify_meta_rig_mapping.CONFIG,
-            vroid_mapping.CONFIG,
-            vroid_mapping.CONFIG_SYMMETRICAL,
-            vrm_addon_mapping.CONFIG_VRM1,
-            vrm_addon_mapping.CONFIG_VRM0,
-        )
+        (
+            (
+                _match_counts(canonical_bone_name_to_bone, table),
+                table.name,
+                table.mapping,
+            )
+            for table in (
+                CanonicalMappingTable.create(*mmd_mapping.create_config(armature)),
+                CanonicalMappingTable.create(*biped_mapping.create_config(armature)),
+                *static_canonical_mapping_tables,
+            )
+        ),
+        key=lambda counts_and_name_and_mapping: counts_and_name_and_mapping[:2],
     )
     result = {}
     wanted_required_count = sum(
@@ -198,6 +259,37 @@ def create_human_bone_mapping(
             required_count = structure_base_mapping_required_count
     if required_count:
         _logger.debug('Treat as "%s" bone mappings', name)
-        result = _sorted_required_first(armature_data, mapping)
+        result = _sorted_required_first(canonical_bone_name_to_bone, mapping)
+    return HumanBoneMappingResult(
+        armature_object_name=armature.name,
+        mapping_name=name,
+        mapping=result,
+        required_count=required_count,
+        wanted_required_count=wanted_required_count,
+        elapsed_seconds=time.perf_counter() - start_time,
+    )
+
+
+def create_human_bone_mapping(
+    armature: Object,
+) -> dict[str, HumanBoneSpecification]:
+    result = create_human_bone_mapping_result(armature)
+    _canonicalize_bone_name.cache_clear()
+    return result.mapping
+
+
+def create_human_bone_mapping_results(
+    armatures: Sequence[Object],
+) -> list[HumanBoneMappingResult]:
+    """Create human bone mappings for many armatures at once.
+
+    The static mapping tables are canonicalized once and the canonicalized bone
+    names are shared between the armatures.
+    """
+    static_canonical_mapping_tables = get_static_canonical_mapping_tables()
+    results = [
+        create_human_bone_mapping_result(armature, static_canonical_mapping_tables)
+        for armature in armatures
+    ]
     _canonicalize_bone_name.cache_clear()
-    return result
+    return results
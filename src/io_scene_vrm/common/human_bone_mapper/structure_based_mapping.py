@@ -99,6 +99,50 @@ class Counter:
     cache_hit: int = 0
 
 
+# Subtrees that have the same shape share the same ID, so the ID can be used as a
+# hash of the subtree that is cheap to compare.
+_shape_key_to_shape_id: Final[
+    dict[tuple[float, float, float, tuple[int, ...]], int]
+] = {}
+
+
+def _intern_shape(
+    x: float, y: float, z: float, children_shape_ids: tuple[int, ...]
+) -> int:
+    shape_key = (x, y, z, children_shape_ids)
+    shape_id = _shape_key_to_shape_id.get(shape_key)
+    if shape_id is None:
+        shape_id = len(_shape_key_to_shape_id)
+        _shape_key_to_shape_id[shape_key] = shape_id
+    return shape_id
+
+
+def _create_mirrored_human_bone_specifications() -> Mapping[
+    HumanBoneSpecification, HumanBoneSpecification
+]:
+    result: dict[HumanBoneSpecification, HumanBoneSpecification] = {}
+    for human_bone_specification in HumanBoneSpecifications.all_human_bones:
+        name = human_bone_specification.name.value
+        if name.startswith("left"):
+            mirrored_name = "right" + name.removeprefix("left")
+        elif name.startswith("right"):
+            mirrored_name = "left" + name.removeprefix("right")
+        else:
+            continue
+        mirrored_human_bone_specification = HumanBoneSpecifications.from_name_str(
+            mirrored_name
+        )
+        if mirrored_human_bone_specification is None:
+            continue
+        result[human_bone_specification] = mirrored_human_bone_specification
+    return result
+
+
+# Human bones that have a counterpart on the other side. All of their descendants
+# are also on the same side.
+MIRRORED_HUMAN_BONE_SPECIFICATIONS: Final = _create_mirrored_human_bone_specifications()
+
+
 @dataclass(frozen=True)
 class NormalizedBone:
     name: str
@@ -193,6 +237,23 @@ class NormalizedBone:
             "recursiveLen": self.recursive_len,
         }
 
+    @cached_property
+    def shape_id(self) -> int:
+        """Identify the shape of the subtree regardless of the bone names."""
+        return _intern_shape(
+            self.x, self.y, self.z, tuple(child.shape_id for child in self.children)
+        )
+
+    @cached_property
+    def mirrored_shape_id(self) -> int:
+        """Identify the shape of the subtree mirrored along the X axis."""
+        return _intern_shape(
+            -self.x,
+            self.y,
+            self.z,
+            tuple(child.mirrored_shape_id for child in self.children),
+        )
+
     def dump(self) -> str:
         output = f'("{self.name}", ({self.x:.3f}, {self.y:.3f}, {self.z:.3f})): {{\n'
         for child in self.children:
@@ -434,26 +495,58 @@ class AssignedSearchBranch:
 SEARCH_STOP_BRANCH: Final[SearchBranch] = UnassignedSearchBranch()
 
 
+SearchCacheKey = tuple[tuple[str, ...], tuple[str, ...], Optional[tuple[str, str]], int]
+ShapeCacheKey = tuple[tuple[int, ...], tuple[str, ...], int, int, int, bool]
+
+
+@dataclass(frozen=True)
+class ShapeCacheEntry:
+    """A search result and the arguments it was computed for.
+
+    The cache key only contains the shapes of the bones, so a result can be reused
+    for other bones of the same shape or the mirrored shape after relabeling.
+    """
+
+    result: SearchBranch
+    bones: tuple[NormalizedBone, ...]
+    mirrored: bool
+
+
+DEFAULT_MAX_RECURSION_DEPTH: Final = 50
+
+
 @dataclass(frozen=True)
 class SearchContext:
     max_search_count: int
     require_requirement: int
     only_requirement: bool
     counter: Counter = field(default_factory=Counter)
-    cache: dict[
-        tuple[tuple[str, ...], tuple[str, ...], Optional[tuple[str, str]], int],
-        SearchBranch,
-    ] = field(
-        default_factory=dict[
-            tuple[tuple[str, ...], tuple[str, ...], Optional[tuple[str, str]], int],
-            SearchBranch,
-        ]
+    cache: dict[SearchCacheKey, SearchBranch] = field(
+        default_factory=dict[SearchCacheKey, SearchBranch]
+    )
+    shape_cache: dict[ShapeCacheKey, ShapeCacheEntry] = field(
+        default_factory=dict[ShapeCacheKey, ShapeCacheEntry]
+    )
+    session_shape_cache: Mapping[ShapeCacheKey, ShapeCacheEntry] = field(
+        default_factory=dict[ShapeCacheKey, ShapeCacheEntry]
     )
-    max_recursion_depth: int = 50
+    max_recursion_depth: int = DEFAULT_MAX_RECURSION_DEPTH
 
 
 DEFAULT_MAX_SEARCH_COUNT: Final[int] = 1000000
 
+# Search results of limbs and fingers are kept for the session, so that repeated
+# searches on the same or a similar rig are fast.
+MAX_SESSION_SHAPE_CACHE_LEN: Final = 500000
+MAX_SESSION_MAPPING_CACHE_LEN: Final = 64
+_session_shape_cache: Final[dict[ShapeCacheKey, ShapeCacheEntry]] = {}
+_session_mapping_cache: Final[
+    dict[
+        tuple[tuple[NormalizedBone, ...], HumanBoneSpecification, int, int],
+        Mapping[str, HumanBoneSpecification],
+    ]
+] = {}
+
 
 def create_structure_based_mapping(
     armature: Object,
@@ -487,7 +580,21 @@ def create_structure_based_mapping(
         if bone.parent is None
     ]
     armature_data.pose_position = pose_position
+
+    # The search always starts from the same depth, so the result only depends on
+    # the recursion limit in addition to the bones and the search count limit.
+    mapping_cache_key = (
+        tuple(root_bones),
+        human_bone_specification,
+        max_search_count,
+        DEFAULT_MAX_RECURSION_DEPTH,
+    )
+    cached_mapping = _session_mapping_cache.get(mapping_cache_key)
+    if cached_mapping is not None:
+        return cached_mapping
+
     counter = Counter()
+    shape_cache: dict[ShapeCacheKey, ShapeCacheEntry] = {}
     max_result: SearchBranch = SEARCH_STOP_BRANCH
 
     for require_requirement, only_requirement in ((1, True), (0, False)):
@@ -496,6 +603,8 @@ def create_structure_based_mapping(
             only_requirement=only_requirement,
             max_search_count=max_search_count,
             counter=counter,
+            shape_cache=shape_cache,
+            session_shape_cache=_session_shape_cache,
         )
         for skip_count in range(1000):
             if counter.count > search_context.max_search_count:
@@ -555,7 +664,16 @@ def create_structure_based_mapping(
         counter.cache_hit,
     )
     mapping = max_result.recursive_mappings
-    return {spec.name: bone for bone, spec in mapping.items()}
+    result = {spec.name: bone for bone, spec in mapping.items()}
+
+    if len(_session_shape_cache) + len(shape_cache) > MAX_SESSION_SHAPE_CACHE_LEN:
+        _session_shape_cache.clear()
+    _session_shape_cache.update(shape_cache)
+    while len(_session_mapping_cache) >= MAX_SESSION_MAPPING_CACHE_LEN:
+        del _session_mapping_cache[next(iter(_session_mapping_cache))]
+    _session_mapping_cache[mapping_cache_key] = result
+
+    return result
 
 
 def _search_structure_based_mapping_step(
@@ -585,9 +703,13 @@ def _search_structure_based_mapping_step(
     if counter.count > search_context.max_search_count:
         return SEARCH_STOP_BRANCH
 
+    human_bone_names = tuple(
+        human_bone_specification.name.value
+        for human_bone_specification in human_bone_specifications
+    )
     cache_key = (
         (bone.name,),
-        tuple(spec.name.value for spec in human_bone_specifications),
+        human_bone_names,
         None
         if parent is None
         else (
@@ -601,6 +723,22 @@ def _search_structure_based_mapping_step(
         counter.cache_hit += 1
         return search_branchs
 
+    shape_cache_query = _create_shape_cache_query(
+        (bone,), human_bone_names, depth, skip_count, search_context
+    )
+    if (
+        shape_cache_query is not None
+        and (
+            search_branchs := _find_shape_cached_search_branch(
+                shape_cache_query, parent, search_context
+            )
+        )
+        is not None
+    ):
+        counter.cache_hit += 1
+        cache[cache_key] = search_branchs
+        return search_branchs
+
     result = SEARCH_STOP_BRANCH
 
     if len(human_bone_specifications) == 1:
@@ -649,6 +787,8 @@ def _search_structure_based_mapping_step(
         )
 
     cache[cache_key] = result
+    if shape_cache_query is not None:
+        _store_shape_cached_search_branch(shape_cache_query, result, search_context)
     return result
 
 
@@ -674,10 +814,14 @@ def _search_structure_based_mapping_product(
     if counter.count > search_context.max_search_count:
         return SEARCH_STOP_BRANCH
 
+    human_bone_names = tuple(
+        human_bone_specification.name.value
+        for human_bone_specification in human_bone_specifications
+    )
     cache = search_context.cache
     cache_key = (
         tuple(sorted(bone.name for bone in bones)),
-        tuple(spec.name.value for spec in human_bone_specifications),
+        human_bone_names,
         None
         if parent is None
         else (
@@ -690,6 +834,22 @@ def _search_structure_based_mapping_product(
         counter.cache_hit += 1
         return search_branchs
 
+    shape_cache_query = _create_shape_cache_query(
+        bones, human_bone_names, depth, skip_count, search_context
+    )
+    if (
+        shape_cache_query is not None
+        and (
+            search_branchs := _find_shape_cached_search_branch(
+                shape_cache_query, parent, search_context
+            )
+        )
+        is not None
+    ):
+        counter.cache_hit += 1
+        cache[cache_key] = search_branchs
+        return search_branchs
+
     result = SEARCH_STOP_BRANCH
 
     for skipping_human_bone_specification in human_bone_specifications:
@@ -838,9 +998,206 @@ def _search_structure_based_mapping_product(
         break
 
     cache[cache_key] = result
+    if shape_cache_query is not None:
+        _store_shape_cached_search_branch(shape_cache_query, result, search_context)
     return result
 
 
+@dataclass(frozen=True)
+class ShapeCacheQuery:
+    key: ShapeCacheKey
+    bones: tuple[NormalizedBone, ...]
+    mirrored: bool
+
+
+_human_bone_names_to_canonical_human_bone_names: Final[
+    dict[tuple[str, ...], Optional[tuple[tuple[str, ...], bool]]]
+] = {}
+
+
+def _canonicalize_human_bone_names(
+    human_bone_names: tuple[str, ...],
+) -> Optional[tuple[tuple[str, ...], bool]]:
+    """Return the human bone names on the left side and whether they are mirrored.
+
+    Return None if the human bones are not all on the same side.
+    """
+    if human_bone_names in _human_bone_names_to_canonical_human_bone_names:
+        return _human_bone_names_to_canonical_human_bone_names[human_bone_names]
+
+    canonical: Optional[tuple[tuple[str, ...], bool]] = None
+    if all(name.startswith("left") for name in human_bone_names):
+        canonical = (human_bone_names, False)
+    elif all(name.startswith("right") for name in human_bone_names):
+        canonical = (
+            tuple("left" + name.removeprefix("right") for name in human_bone_names),
+            True,
+        )
+    _human_bone_names_to_canonical_human_bone_names[human_bone_names] = canonical
+    return canonical
+
+
+def _create_shape_cache_query(
+    bones: tuple[NormalizedBone, ...],
+    human_bone_names: tuple[str, ...],
+    depth: int,
+    skip_count: int,
+    search_context: SearchContext,
+) -> Optional[ShapeCacheQuery]:
+    """Create a cache key from the shapes of the bones.
+
+    Only human bones on one side are looked up by shape. They don't refer to the
+    parent in the score, so the result can be reused for another limb or finger of
+    the same shape. If the human bones are on the right side, the key is created
+    from the mirrored bones and the left side human bones so that symmetric limbs
+    share the result. The depth is part of the key because it changes the score and
+    the recursion limit.
+    """
+    canonical = _canonicalize_human_bone_names(human_bone_names)
+    if canonical is None:
+        return None
+    canonical_human_bone_names, mirrored = canonical
+
+    if len(bones) == 1:
+        query_bones = bones
+        shape_ids = (bones[0].mirrored_shape_id if mirrored else bones[0].shape_id,)
+    elif mirrored:
+        query_bones = tuple(sorted(bones, key=lambda bone: bone.mirrored_shape_id))
+        shape_ids = tuple(bone.mirrored_shape_id for bone in query_bones)
+    else:
+        query_bones = tuple(sorted(bones, key=lambda bone: bone.shape_id))
+        shape_ids = tuple(bone.shape_id for bone in query_bones)
+
+    return ShapeCacheQuery(
+        key=(
+            shape_ids,
+            canonical_human_bone_names,
+            depth,
+            skip_count,
+            search_context.require_requirement,
+            search_context.only_requirement,
+        ),
+        bones=query_bones,
+        mirrored=mirrored,
+    )
+
+
+def _store_shape_cached_search_branch(
+    query: ShapeCacheQuery,
+    result: SearchBranch,
+    search_context: SearchContext,
+) -> None:
+    # A result truncated by the search count limit is not reusable elsewhere
+    if search_context.counter.count > search_context.max_search_count:
+        return
+    search_context.shape_cache[query.key] = ShapeCacheEntry(
+        result=result, bones=query.bones, mirrored=query.mirrored
+    )
+
+
+def _find_shape_cached_search_branch(
+    query: ShapeCacheQuery,
+    parent: Optional[tuple[NormalizedBone, HumanBoneSpecification]],
+    search_context: SearchContext,
+) -> Optional[SearchBranch]:
+    entry = search_context.shape_cache.get(query.key)
+    if entry is None:
+        entry = search_context.session_shape_cache.get(query.key)
+        if entry is None:
+            return None
+
+    bone_id_to_relabeled_bone: dict[int, NormalizedBone] = {}
+    entry_and_relabeled_bones = list(zip(entry.bones, query.bones))
+    while entry_and_relabeled_bones:
+        entry_bone, relabeled_bone = entry_and_relabeled_bones.pop()
+        bone_id_to_relabeled_bone[id(entry_bone)] = relabeled_bone
+        entry_and_relabeled_bones.extend(
+            zip(entry_bone.children, relabeled_bone.children)
+        )
+
+    return _relabel_search_branch(
+        entry.result,
+        bone_id_to_relabeled_bone,
+        parent,
+        mirrored=entry.mirrored != query.mirrored,
+    )
+
+
+def _relabel_search_branch(
+    search_branch: SearchBranch,
+    bone_id_to_relabeled_bone: Mapping[int, NormalizedBone],
+    relabeled_parent: Optional[tuple[NormalizedBone, HumanBoneSpecification]],
+    *,
+    mirrored: bool,
+) -> SearchBranch:
+    """Replace bones, human bones and the parent of a cached search result.
+
+    Parents outside of the cached subtree are the parent of the search, which may
+    be a different but equal object when the result came from the exact cache.
+    They are replaced with relabeled_parent.
+    """
+    if isinstance(search_branch, UnassignedSearchBranch):
+        if not search_branch.children:
+            return search_branch
+        return UnassignedSearchBranch(
+            children=tuple(
+                _relabel_search_branch(
+                    child,
+                    bone_id_to_relabeled_bone,
+                    relabeled_parent,
+                    mirrored=mirrored,
+                )
+                for child in search_branch.children
+            )
+        )
+
+    def relabel_bone(bone: NormalizedBone) -> NormalizedBone:
+        return bone_id_to_relabeled_bone[id(bone)]
+
+    def relabel_human_bone_specification(
+        human_bone_specification: HumanBoneSpecification,
+    ) -> HumanBoneSpecification:
+        if not mirrored:
+            return human_bone_specification
+        return MIRRORED_HUMAN_BONE_SPECIFICATIONS[human_bone_specification]
+
+    search_branch_parent = search_branch.parent
+    if search_branch_parent is None:
+        search_branch_relabeled_parent = None
+    elif id(search_branch_parent[0]) not in bone_id_to_relabeled_bone:
+        search_branch_relabeled_parent = relabeled_parent
+    else:
+        parent_bone, parent_human_bone_specification = search_branch_parent
+        search_branch_relabeled_parent = (
+            relabel_bone(parent_bone),
+            relabel_human_bone_specification(parent_human_bone_specification),
+        )
+
+    return AssignedSearchBranch(
+        depth=search_branch.depth,
+        bone=relabel_bone(search_branch.bone),
+        human_bone_specification=relabel_human_bone_specification(
+            search_branch.human_bone_specification
+        ),
+        parent=search_branch_relabeled_parent,
+        children=tuple(
+            _relabel_search_branch(
+                child,
+                bone_id_to_relabeled_bone,
+                relabeled_parent,
+                mirrored=mirrored,
+            )
+            for child in search_branch.children
+        ),
+    )
+
+
+def clear_global_variables() -> None:
+    _session_mapping_cache.clear()
+    _session_shape_cache.clear()
+    _shape_key_to_shape_id.clear()
+
+
 def _backtrack_skip_counts_and_bone_combinations(
     *,
     bones: tuple[tuple[NormalizedBone, int], ...],
@@ -55,6 +55,10 @@ def vrma(
     *,
     filter_glob: str = "*.vrma",
     armature_object_name: str = "",
+    keyframe_reduction: str = "NONE",
+    rotation_tolerance: float = 0.0017453292519943296,
+    translation_tolerance: float = 0.0001,
+    expression_tolerance: float = 0.001,
     filepath: str = "",
     check_existing: bool = True,
 ) -> set[str]:
@@ -62,6 +66,10 @@ def vrma(
         execution_context,
         filter_glob=filter_glob,
         armature_object_name=armature_object_name,
+        keyframe_reduction=keyframe_reduction,
+        rotation_tolerance=rotation_tolerance,
+        translation_tolerance=translation_tolerance,
+        expression_tolerance=expression_tolerance,
         filepath=filepath,
         check_existing=check_existing,
     )
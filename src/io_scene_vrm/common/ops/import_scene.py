@@ -1,6 +1,8 @@
 # This code is auto generated.
 # To regenerate, run the `uv run tools/property_typing.py` command.
 
+from collections.abc import Mapping, Sequence
+from typing import Optional, Union
 
 import bpy
 
@@ -55,3 +57,27 @@ def vrma(
         armature_object_name=armature_object_name,
         filepath=filepath,
     )
+
+
+# This code is auto generated.
+# To regenerate, run the `uv run tools/property_typing.py` command.
+def vrma_batch(
+    execution_context: str = "EXEC_DEFAULT",
+    /,
+    *,
+    filter_glob: str = "*.vrma",
+    armature_object_name: str = "",
+    push_to_nla: bool = False,
+    files: Optional[Sequence[Mapping[str, Union[str, int, float, bool]]]] = None,
+    directory: str = "",
+    filepath: str = "",
+) -> set[str]:
+    return bpy.ops.import_scene.vrma_batch(  # type: ignore[attr-defined, no-any-return]
+        execution_context,
+        filter_glob=filter_glob,
+        armature_object_name=armature_object_name,
+        push_to_nla=push_to_nla,
+        files=files if files is not None else [],
+        directory=directory,
+        filepath=filepath,
+    )
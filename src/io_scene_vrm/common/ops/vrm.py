@@ -1485,6 +1485,24 @@ def assign_vrm1_humanoid_human_bones_automatically(
     )
 
 
+# This code is auto generated.
+# To regenerate, run the `uv run tools/property_typing.py` command.
+def batch_assign_vrm1_humanoid_human_bones_automatically(
+    execution_context: str = "EXEC_DEFAULT",
+    /,
+    *,
+    armature_object_names: Optional[
+        Sequence[Mapping[str, Union[str, int, float, bool]]]
+    ] = None,
+) -> set[str]:
+    return bpy.ops.vrm.batch_assign_vrm1_humanoid_human_bones_automatically(  # type: ignore[attr-defined, no-any-return]
+        execution_context,
+        armature_object_names=armature_object_names
+        if armature_object_names is not None
+        else [],
+    )
+
+
 # This code is auto generated.
 # To regenerate, run the `uv run tools/property_typing.py` command.
 def update_vrm1_expression_ui_list_elements(
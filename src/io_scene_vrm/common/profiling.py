@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+"""Opt-in profiling spans written as a Chrome trace.
+
+Set the BLENDER_VRM_PROFILE_PATH environment variable to a file path to record
+the spans of each import or export. The file can be opened in chrome://tracing
+or https://ui.perfetto.dev. When the variable is not set, span() returns a
+shared no-op context manager.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from os import environ
+from pathlib import Path
+from typing import Final, Optional
+
+from .convert import Json
+from .logger import get_logger
+
+_logger = get_logger(__name__)
+
+_DISABLED_SPAN: Final = nullcontext()
+
+
+@dataclass
+class State:
+    trace_path: Optional[Path] = None
+    depth: int = 0
+    trace_event_dicts: list[dict[str, Json]] = field(
+        default_factory=list[dict[str, Json]]
+    )
+
+
+_state: Final = State()
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Record the time spent in the with block as a span named name.
+
+    The outermost span writes the trace file when it ends.
+    """
+    if _state.trace_path is None and not environ.get("BLENDER_VRM_PROFILE_PATH"):
+        return _DISABLED_SPAN
+    return _record_span(name)
+
+
+@contextmanager
+def _record_span(name: str) -> Generator[None]:
+    if not _state.depth:
+        trace_path = environ.get("BLENDER_VRM_PROFILE_PATH")
+        if not trace_path:
+            yield
+            return
+        _state.trace_path = Path(trace_path)
+    _state.depth += 1
+    start_ns = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end_ns = time.perf_counter_ns()
+        _state.trace_event_dicts.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+        _state.depth -= 1
+        if not _state.depth:
+            _write_trace()
+
+
+def _write_trace() -> None:
+    trace_path = _state.trace_path
+    trace_event_dicts = list(_state.trace_event_dicts)
+    _state.trace_path = None
+    _state.trace_event_dicts.clear()
+    if trace_path is None:
+        return
+    try:
+        trace_path.write_text(
+            json.dumps({"traceEvents": trace_event_dicts}), encoding="UTF-8"
+        )
+    except OSError:
+        _logger.exception("Failed to write %s", trace_path)
@@ -1,7 +1,13 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import json
 import math
+import threading
+import time
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass, field
+from os import environ
+from pathlib import Path
 from typing import Final, Optional
 from uuid import uuid4
 
@@ -9,17 +15,78 @@ import bpy
 from bpy.types import Context
 
 from .logger import get_logger
+from .profiling import span
 
 _logger = get_logger(__name__)
 
 
+class ProgressCancelledError(Exception):
+    pass
+
+
+class CancellationToken:
+    """Cooperatively cancel a long-running operation.
+
+    cancel() may be called from any thread, for example from a watchdog timer in
+    a pipeline script. The operation checks the token between items and raises
+    ProgressCancelledError.
+    """
+
+    def __init__(self) -> None:
+        self._event: Final = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            message = "The operation was cancelled"
+            raise ProgressCancelledError(message)
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    name: str
+    elapsed_seconds: float
+    processed_item_count: int
+
+
+@dataclass
+class ProgressReport:
+    """State shared by a progress and the progresses nested in it."""
+
+    cancellation_token: CancellationToken
+    phase_timings: list[PhaseTiming] = field(default_factory=list[PhaseTiming])
+
+    def write(self, path: Path) -> None:
+        report_dict = {
+            "cancelled": self.cancellation_token.is_cancelled(),
+            "phases": [
+                {
+                    "name": phase_timing.name,
+                    "elapsed_seconds": phase_timing.elapsed_seconds,
+                    "processed_item_count": phase_timing.processed_item_count,
+                }
+                for phase_timing in self.phase_timings
+            ],
+        }
+        path.write_text(json.dumps(report_dict, indent=2), encoding="UTF-8")
+
+
 class PartialProgress:
     def __init__(
-        self, progress: "Progress", partial_start_ratio: float, partial_end_ratio: float
+        self,
+        progress: "Progress",
+        partial_start_ratio: float,
+        partial_end_ratio: float,
     ) -> None:
         self.progress: Final = progress
         self.partial_start_ratio: Final = partial_start_ratio
         self.partial_end_ratio: Final = partial_end_ratio
+        self.processed_item_count = 0
 
     def update(self, ratio: float) -> None:
         ratio = min(max(0.0, ratio), 1.0)
@@ -28,13 +95,21 @@ class PartialProgress:
             + ratio * (self.partial_end_ratio - self.partial_start_ratio)
         )
 
+    def update_items(self, processed_item_count: int, item_count: int) -> None:
+        self.processed_item_count = processed_item_count
+        self.update(float(processed_item_count) / item_count if item_count else 1)
+
 
 class Progress:
     active_progress_uuid: Optional[str] = None
+    active_report: Optional[ProgressReport] = None
 
-    def __init__(self, context: Context, *, show_progress: bool) -> None:
+    def __init__(
+        self, context: Context, *, show_progress: bool, report: ProgressReport
+    ) -> None:
         self.context: Final = context
         self.show_progress: Final = show_progress
+        self.report: Final = report
         self.uuid: Final = uuid4().hex
         self.last_ratio = 0.0
 
@@ -42,7 +117,32 @@ class Progress:
         partial_end_ratio = min(max(0.0, partial_end_ratio), 1.0)
         return PartialProgress(self, self.last_ratio, partial_end_ratio)
 
+    @contextmanager
+    def phase(self, name: str, partial_end_ratio: float) -> Generator[PartialProgress]:
+        """Measure a phase that advances the progress up to partial_end_ratio."""
+        partial_progress = self.partial_progress(partial_end_ratio)
+        start_time = time.perf_counter()
+        try:
+            with span(name):
+                yield partial_progress
+        finally:
+            phase_timing = PhaseTiming(
+                name=name,
+                elapsed_seconds=time.perf_counter() - start_time,
+                processed_item_count=partial_progress.processed_item_count,
+            )
+            self.report.phase_timings.append(phase_timing)
+            _logger.debug(
+                "Phase %s took %.3f seconds for %d items",
+                phase_timing.name,
+                phase_timing.elapsed_seconds,
+                phase_timing.processed_item_count,
+            )
+        partial_progress.update(1)
+
     def update(self, ratio: float) -> None:
+        self.report.cancellation_token.raise_if_cancelled()
+
         ratio = min(max(0.0, ratio), 1.0)
         self.last_ratio = ratio
         if self.active_progress_uuid != self.uuid:
@@ -72,16 +172,50 @@ class Progress:
 
 @contextmanager
 def create_progress(
-    context: Context, *, show_progress: bool = True
+    context: Context,
+    *,
+    show_progress: bool = True,
+    cancellation_token: Optional[CancellationToken] = None,
 ) -> Generator[Progress]:
+    """Create a progress.
+
+    A nested progress shares the phase timings and the cancellation token of the
+    outermost one. When the outermost progress ends, the phase timings are
+    written as JSON to the path in the BLENDER_VRM_PROGRESS_REPORT_PATH
+    environment variable, if it is set.
+    """
     saved_progress_uuid = Progress.active_progress_uuid
+    saved_report = Progress.active_report
+    report = saved_report
+    if report is None:
+        report = ProgressReport(
+            cancellation_token=cancellation_token or CancellationToken()
+        )
     try:
         if show_progress and Progress.active_progress_uuid is None:
             context.window_manager.progress_begin(0, 9999)
-        progress = Progress(context, show_progress=show_progress)
+        progress = Progress(context, show_progress=show_progress, report=report)
         Progress.active_progress_uuid = progress.uuid
+        Progress.active_report = report
         yield progress
     finally:
         Progress.active_progress_uuid = saved_progress_uuid
+        Progress.active_report = saved_report
         if show_progress and Progress.active_progress_uuid is None:
             context.window_manager.progress_end()
+        if saved_report is None and report.phase_timings:
+            report_path = environ.get("BLENDER_VRM_PROGRESS_REPORT_PATH")
+            if report_path:
+                try:
+                    report.write(Path(report_path))
+                except OSError:
+                    _logger.exception("Failed to write %s", report_path)
+
+
+def cancel_active_progress() -> bool:
+    """Cancel the running operation. This may be called from any thread."""
+    report = Progress.active_report
+    if report is None:
+        return False
+    report.cancellation_token.cancel()
+    return True
@@ -1,5 +1,5 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
-from typing import Final, Union
+from typing import Final, Optional, Union
 
 from bpy.types import (
     Object,
@@ -68,22 +68,58 @@ def set_rotation_without_mode_change(
     )
 
 
+def get_rotation_data_path(
+    object_or_pose_bone: Union[Object, PoseBone],
+) -> Optional[str]:
+    if object_or_pose_bone.rotation_mode == ROTATION_MODE_QUATERNION:
+        return "rotation_quaternion"
+    if object_or_pose_bone.rotation_mode == ROTATION_MODE_AXIS_ANGLE:
+        return "rotation_axis_angle"
+    if object_or_pose_bone.rotation_mode in ROTATION_MODE_EULER:
+        return "rotation_euler"
+
+    _logger.error(
+        "Unexpected rotation mode for %s %s: %s",
+        type(object_or_pose_bone),
+        object_or_pose_bone.name,
+        object_or_pose_bone.rotation_mode,
+    )
+    return None
+
+
+def convert_quaternion_to_rotation_values(
+    object_or_pose_bone: Union[Object, PoseBone], quaternion: Quaternion
+) -> Optional[Union[tuple[float, float, float, float], tuple[float, float, float]]]:
+    """Return the values set_rotation_without_mode_change() would assign.
+
+    The order of the values matches the property named by
+    get_rotation_data_path().
+    """
+    if object_or_pose_bone.rotation_mode == ROTATION_MODE_QUATERNION:
+        return (quaternion.w, quaternion.x, quaternion.y, quaternion.z)
+
+    if object_or_pose_bone.rotation_mode == ROTATION_MODE_AXIS_ANGLE:
+        axis, angle = quaternion.to_axis_angle()
+        return (angle, axis.x, axis.y, axis.z)
+
+    if object_or_pose_bone.rotation_mode in ROTATION_MODE_EULER:
+        euler = quaternion.to_euler(object_or_pose_bone.rotation_mode)
+        return (euler.x, euler.y, euler.z)
+
+    _logger.error(
+        "Unexpected rotation mode for %s %s: %s",
+        type(object_or_pose_bone),
+        object_or_pose_bone.name,
+        object_or_pose_bone.rotation_mode,
+    )
+    return None
+
+
 def insert_rotation_keyframe(
     object_or_pose_bone: Union[Object, PoseBone], *, frame: int
 ) -> None:
-    if object_or_pose_bone.rotation_mode == ROTATION_MODE_QUATERNION:
-        data_path = "rotation_quaternion"
-    elif object_or_pose_bone.rotation_mode == ROTATION_MODE_AXIS_ANGLE:
-        data_path = "rotation_axis_angle"
-    elif object_or_pose_bone.rotation_mode in ROTATION_MODE_EULER:
-        data_path = "rotation_euler"
-    else:
-        _logger.error(
-            "Unexpected rotation mode for %s %s: %s",
-            type(object_or_pose_bone),
-            object_or_pose_bone.name,
-            object_or_pose_bone.rotation_mode,
-        )
+    data_path = get_rotation_data_path(object_or_pose_bone)
+    if data_path is None:
         return
 
     object_or_pose_bone.keyframe_insert(data_path, frame=frame)
@@ -4,7 +4,8 @@ from dataclasses import dataclass, field
 from typing import Final, Optional
 
 import bpy
-from bpy.types import Armature, Context
+from bpy.app.handlers import persistent
+from bpy.types import Armature, Context, Depsgraph, Object, Scene
 
 from ..common import ops
 from ..common.logger import get_logger
@@ -23,6 +24,12 @@ from .vrm1 import migration as vrm1_migration
 _logger = get_logger(__name__)
 
 
+@dataclass
+class MigratedArmatureStamp:
+    armature_data_pointer: int
+    addon_version: tuple[int, int, int]
+
+
 @dataclass
 class State:
     blend_file_compatibility_warning_shown: bool = False
@@ -31,19 +38,46 @@ class State:
         default_factory=set[tuple[str, bool]]
     )
 
+    # Armature objects that were migrated and have not changed since then.
+    # Entries are discarded by depsgraph_update_post() and moved to
+    # changed_armature_object_names, which is the work-list of the next
+    # migrate_all_objects(changed_only=True).
+    migrated_armature_stamps: Final[dict[str, MigratedArmatureStamp]] = field(
+        default_factory=dict[str, MigratedArmatureStamp]
+    )
+    changed_armature_object_names: Final[set[str]] = field(default_factory=set[str])
+    migrated_object_count: int = -1
+
     def clear(self) -> None:
         self.blend_file_compatibility_warning_shown = False
         self.blend_file_addon_compatibility_warning_shown = False
         self.deferred_migration_parameters.clear()
+        self.clear_migrated_armature_stamps()
+
+    def clear_migrated_armature_stamps(self) -> None:
+        self.migrated_armature_stamps.clear()
+        self.changed_armature_object_names.clear()
+        self.migrated_object_count = -1
 
 
 _state: Final = State()
 
 
 def is_unnecessary(armature_data: Armature, *, heavy_migration: bool) -> bool:
+    return _is_unnecessary(
+        armature_data, get_addon_version(), heavy_migration=heavy_migration
+    )
+
+
+def _is_unnecessary(
+    armature_data: Armature,
+    addon_version: tuple[int, int, int],
+    *,
+    heavy_migration: bool,
+) -> bool:
     ext = get_armature_extension(armature_data)
     return (
-        tuple(ext.addon_version) >= get_addon_version()
+        tuple(ext.addon_version) >= addon_version
         and vrm0_migration.is_unnecessary(ext.vrm0, heavy_migration=heavy_migration)
         and vrm1_migration.is_unnecessary(ext.vrm1, heavy_migration=heavy_migration)
         and spring_bone1_migration.is_unnecessary(
@@ -102,7 +136,21 @@ def migrate(
 ) -> bool:
     if context is None:
         context = bpy.context
+    return _migrate(
+        context,
+        armature_object_name,
+        get_addon_version(),
+        heavy_migration=heavy_migration,
+    )
 
+
+def _migrate(
+    context: Context,
+    armature_object_name: str,
+    updated_addon_version: tuple[int, int, int],
+    *,
+    heavy_migration: bool,
+) -> bool:
     armature = context.blend_data.objects.get(armature_object_name)
     if not armature:
         return False
@@ -110,7 +158,9 @@ def migrate(
     if not isinstance(armature_data, Armature):
         return False
 
-    if is_unnecessary(armature_data, heavy_migration=heavy_migration):
+    if _is_unnecessary(
+        armature_data, updated_addon_version, heavy_migration=heavy_migration
+    ):
         return True
 
     ext = get_armature_extension(armature_data)
@@ -133,7 +183,6 @@ def migrate(
     ):
         ext.spec_version = ext.SPEC_VERSION_VRM0
 
-    updated_addon_version = get_addon_version()
     _logger.info(
         "Upgrade armature %s %s to %s",
         armature_object_name,
@@ -149,19 +198,60 @@ def migrate_all_objects(
     *,
     heavy_migration: bool,
     show_progress: bool = False,
+    changed_only: bool = False,
 ) -> None:
-    for obj in context.blend_data.objects:
-        if obj.type == "ARMATURE":
-            migrate(context, obj.name, heavy_migration=heavy_migration)
+    """Migrate all armatures, materials and preferences.
+
+    With changed_only=True, only the armatures that were added or updated since
+    the previous call are migrated, unless a full migration is still required.
+    """
+    updated_addon_version = get_addon_version()
+
+    object_count = len(context.blend_data.objects)
+    if (
+        not changed_only
+        or heavy_migration
+        or object_count != _state.migrated_object_count
+        or any(
+            stamp.addon_version != updated_addon_version
+            for stamp in _state.migrated_armature_stamps.values()
+        )
+    ):
+        _state.clear_migrated_armature_stamps()
+        armature_object_names = [
+            obj.name for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        ]
+        full_migration = True
+    else:
+        armature_object_names = sorted(_state.changed_armature_object_names)
+        full_migration = False
+    _state.changed_armature_object_names.clear()
+
+    for armature_object_name in armature_object_names:
+        if not _migrate(
+            context,
+            armature_object_name,
+            updated_addon_version,
+            heavy_migration=heavy_migration,
+        ):
+            continue
+        armature = context.blend_data.objects.get(armature_object_name)
+        if not armature or not isinstance(armature.data, Armature):
+            continue
+        _state.migrated_armature_stamps[armature_object_name] = MigratedArmatureStamp(
+            armature_data_pointer=armature.data.as_pointer(),
+            addon_version=updated_addon_version,
+        )
+    _state.migrated_object_count = len(context.blend_data.objects)
 
     VrmAddonSceneExtensionPropertyGroup.update_vrm0_material_property_names(context)
     mtoon1_migration.migrate(context, show_progress=show_progress)
-    _validate_blend_file_compatibility(context)
-    _validate_blend_file_addon_compatibility(context)
+    if full_migration or armature_object_names:
+        _validate_blend_file_compatibility(context)
+        _validate_blend_file_addon_compatibility(context, updated_addon_version)
 
     preferences = get_preferences(context)
 
-    updated_addon_version = get_addon_version()
     if tuple(preferences.addon_version) != updated_addon_version:
         _logger.debug(
             "Upgrade preferences %s to %s",
@@ -230,14 +320,15 @@ def _show_blend_file_compatibility_warning(file_version: str, app_version: str)
     )
 
 
-def _validate_blend_file_addon_compatibility(context: Context) -> None:
+def _validate_blend_file_addon_compatibility(
+    context: Context, installed_addon_version: tuple[int, int, int]
+) -> None:
     """Warn when attempting to edit a file created with a newer VRM add-on.
 
     This warning is for files using an older VRM add-on.
     """
     if not context.blend_data.filepath:
         return
-    installed_addon_version = get_addon_version()
 
     # TODO: It might be better to store the version in Scene or similar
     file_addon_version: tuple[int, ...] = (0, 0, 0)
@@ -290,6 +381,34 @@ def _have_vrm_model(context: Context) -> bool:
     )
 
 
+@persistent
+def depsgraph_update_post(_scene: Scene, depsgraph: Depsgraph) -> None:
+    if not depsgraph.id_type_updated("OBJECT") and not depsgraph.id_type_updated(
+        "ARMATURE"
+    ):
+        return
+
+    # Armature data may be renamed, so it is identified by its pointer
+    changed_armature_data_pointers: set[int] = set()
+    for update in depsgraph.updates:
+        updated_id = update.id.original
+        if isinstance(updated_id, Object):
+            if updated_id.type != "ARMATURE":
+                continue
+            _state.migrated_armature_stamps.pop(updated_id.name, None)
+            _state.changed_armature_object_names.add(updated_id.name)
+        elif isinstance(updated_id, Armature):
+            changed_armature_data_pointers.add(updated_id.as_pointer())
+    if not changed_armature_data_pointers:
+        return
+
+    for armature_object_name, stamp in list(_state.migrated_armature_stamps.items()):
+        if stamp.armature_data_pointer not in changed_armature_data_pointers:
+            continue
+        del _state.migrated_armature_stamps[armature_object_name]
+        _state.changed_armature_object_names.add(armature_object_name)
+
+
 def clear_global_variables() -> None:
     _state.clear()
 
@@ -35,6 +35,12 @@ TextureInfoBackup = Mtoon1TextureInfoPropertyGroup.TextureInfoBackup
 
 _logger = get_logger(__name__)
 
+# Materials whose fingerprint matches were migrated by the same versions of the
+# add-on, its node groups, Blender and the blend file, and can be skipped
+# without inspecting their node trees. It is saved in the material, so it
+# survives across sessions.
+MIGRATION_FINGERPRINT_KEY: Final = "migration_fingerprint"
+
 
 @dataclass
 class State:
@@ -51,15 +57,58 @@ def _show_material_blender_4_2_warning_delay(material_name_lines: str) -> None:
     )
 
 
+def create_migration_fingerprint(
+    context: Context, material: Material, addon_version: tuple[int, int, int]
+) -> Optional[str]:
+    node_tree = material.node_tree
+    if not node_tree:
+        return None
+    mtoon1 = get_material_extension(material).mtoon1
+    # The node and link counts are cheap to read and change whenever the node
+    # tree is rebuilt or edited structurally.
+    return ":".join(
+        (
+            ".".join(map(str, addon_version)),
+            ".".join(map(str, shader.LAST_MODIFIED_VERSION)),
+            ".".join(map(str, bpy.app.version[:2])),
+            ".".join(map(str, tuple(context.blend_data.version))),
+            ".".join(map(str, tuple(mtoon1.addon_version))),
+            str(len(node_tree.nodes)),
+            str(len(node_tree.links)),
+        )
+    )
+
+
+def is_migrated(
+    context: Context, material: Material, addon_version: tuple[int, int, int]
+) -> bool:
+    fingerprint = create_migration_fingerprint(context, material, addon_version)
+    if fingerprint is None:
+        return False
+    mtoon1 = get_material_extension(material).mtoon1
+    return mtoon1.get(MIGRATION_FINGERPRINT_KEY) == fingerprint
+
+
 def migrate(context: Context, *, show_progress: bool = False) -> None:
     blender_4_2_migrated_material_names: list[str] = []
 
-    with create_progress(context, show_progress=show_progress) as progress:
-        for material_index, material in enumerate(context.blend_data.materials):
-            if not material:
-                continue
-            _migrate_material(context, material, blender_4_2_migrated_material_names)
-            progress.update(float(material_index) / len(context.blend_data.materials))
+    addon_version = version.get_addon_version()
+    materials = [
+        material
+        for material in context.blend_data.materials
+        if material and not is_migrated(context, material, addon_version)
+    ]
+
+    # Only the first run after loading a file has materials to migrate, so the
+    # progress is shown only when there is work to do.
+    with create_progress(
+        context, show_progress=show_progress and bool(materials)
+    ) as progress:
+        for material_index, material in enumerate(materials):
+            _migrate_material(
+                context, material, addon_version, blender_4_2_migrated_material_names
+            )
+            progress.update(float(material_index) / len(materials))
         progress.update(1)
 
     if (
@@ -89,6 +138,7 @@ def migrate(context: Context, *, show_progress: bool = False) -> None:
 def _migrate_material(
     context: Context,
     material: Material,
+    updated_addon_version: tuple[int, int, int],
     blender_4_2_migrated_material_names: list[str],
 ) -> None:
     if (
@@ -399,10 +449,13 @@ def _migrate_material(
         )
 
     mtoon1.setup_drivers()
-    updated_addon_version = version.get_addon_version()
     if tuple(mtoon1.addon_version) != updated_addon_version:
         mtoon1.addon_version = updated_addon_version
 
+    fingerprint = create_migration_fingerprint(context, material, updated_addon_version)
+    if fingerprint is not None:
+        mtoon1[MIGRATION_FINGERPRINT_KEY] = fingerprint
+
 
 def _backup_texture_info(texture_info: object) -> Optional[TextureInfoBackup]:
     if not isinstance(texture_info, PropertyGroup):
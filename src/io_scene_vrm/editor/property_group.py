@@ -17,7 +17,7 @@ from typing import (
 import bpy
 from bpy.app.translations import pgettext
 from bpy.props import FloatProperty, PointerProperty, StringProperty
-from bpy.types import Armature, Bone, Context, Material, Object, PropertyGroup, UILayout
+from bpy.types import Armature, Context, Material, Object, PropertyGroup, UILayout
 from mathutils import Vector
 
 from ..common import shader
@@ -426,6 +426,130 @@ class BonePropertyGroup(PropertyGroup):
         bone_uuid: str  # type: ignore[no-redef]
 
 
+BoneTreeSignature = tuple[tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class BoneTreeIndex:
+    """Armature bone hierarchy flattened in depth-first preorder.
+
+    The index of a bone is its entry number in the Euler tour of the bone tree and
+    its descendants occupy the contiguous range up to its exit number. Therefore,
+    ancestor and descendant checks can be performed in constant time.
+    """
+
+    signature: BoneTreeSignature
+    bone_names: tuple[str, ...]
+    bone_name_to_index: Mapping[str, int]
+    parent_indices: tuple[int, ...]
+    depths: tuple[int, ...]
+    exit_indices: tuple[int, ...]
+    children_indices: tuple[tuple[int, ...], ...]
+    root_indices: tuple[int, ...]
+
+    pointer_to_bone_tree_index: ClassVar[dict[int, "BoneTreeIndex"]] = {}
+
+    @staticmethod
+    def create_signature(armature_data: Armature) -> BoneTreeSignature:
+        return tuple(
+            (bone.name, parent.name if (parent := bone.parent) else "")
+            for bone in armature_data.bones.values()
+        )
+
+    @classmethod
+    def get(cls, armature_data: Armature) -> "BoneTreeIndex":
+        signature = cls.create_signature(armature_data)
+        pointer_key = armature_data.as_pointer()
+        bone_tree_index = cls.pointer_to_bone_tree_index.get(pointer_key)
+        if bone_tree_index is not None and bone_tree_index.signature == signature:
+            return bone_tree_index
+        bone_tree_index = cls.create(signature)
+        cls.pointer_to_bone_tree_index[pointer_key] = bone_tree_index
+        return bone_tree_index
+
+    @staticmethod
+    def create(signature: BoneTreeSignature) -> "BoneTreeIndex":
+        root_bone_names: list[str] = []
+        bone_name_to_child_bone_names: dict[str, list[str]] = {}
+        for bone_name, parent_bone_name in signature:
+            if parent_bone_name:
+                bone_name_to_child_bone_names.setdefault(parent_bone_name, []).append(
+                    bone_name
+                )
+            else:
+                root_bone_names.append(bone_name)
+
+        bone_names: list[str] = []
+        parent_indices: list[int] = []
+        depths: list[int] = []
+        traversing_bones = [
+            (bone_name, -1, 0) for bone_name in reversed(root_bone_names)
+        ]
+        while traversing_bones:
+            bone_name, parent_index, depth = traversing_bones.pop()
+            index = len(bone_names)
+            bone_names.append(bone_name)
+            parent_indices.append(parent_index)
+            depths.append(depth)
+            traversing_bones.extend(
+                (child_bone_name, index, depth + 1)
+                for child_bone_name in reversed(
+                    bone_name_to_child_bone_names.get(bone_name, [])
+                )
+            )
+
+        # In preorder, a parent always precedes its children. Walking backwards
+        # settles each exit number before it is propagated to the parent.
+        exit_indices = list(range(len(bone_names)))
+        reversed_children_indices: list[list[int]] = [[] for _ in bone_names]
+        for index in reversed(range(len(bone_names))):
+            parent_index = parent_indices[index]
+            if parent_index < 0:
+                continue
+            exit_indices[parent_index] = max(
+                exit_indices[parent_index], exit_indices[index]
+            )
+            reversed_children_indices[parent_index].append(index)
+
+        return BoneTreeIndex(
+            signature=signature,
+            bone_names=tuple(bone_names),
+            bone_name_to_index={
+                bone_name: index for index, bone_name in enumerate(bone_names)
+            },
+            parent_indices=tuple(parent_indices),
+            depths=tuple(depths),
+            exit_indices=tuple(exit_indices),
+            children_indices=tuple(
+                tuple(reversed(indices)) for indices in reversed_children_indices
+            ),
+            root_indices=tuple(
+                index
+                for index, parent_index in enumerate(parent_indices)
+                if parent_index < 0
+            ),
+        )
+
+    def is_ancestor_of(self, ancestor_index: int, descendant_index: int) -> bool:
+        return ancestor_index < descendant_index <= self.exit_indices[ancestor_index]
+
+    def subtree_indices(self, index: int) -> range:
+        return range(index, self.exit_indices[index] + 1)
+
+    def ancestor_indices(self, index: int) -> Iterator[int]:
+        parent_index = self.parent_indices[index]
+        while parent_index >= 0:
+            yield parent_index
+            parent_index = self.parent_indices[parent_index]
+
+    def find_root_index(self, index: int) -> int:
+        parent_index = self.parent_indices[index]
+        while parent_index >= 0:
+            index = parent_index
+            parent_index = self.parent_indices[index]
+        return index
+
+
 class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
     pointer_to_bone_name_candidates: ClassVar[dict[int, set[str]]] = {}
 
@@ -475,8 +599,12 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
         bpy_bone_name_to_human_bone_specification: Mapping[str, HumanBoneSpecification],
         error_bpy_bone_names: Sequence[str],
         diagnostics_layout: Optional[UILayout] = None,
+        bone_tree_index: Optional[BoneTreeIndex] = None,
     ) -> set[str]:
-        bones = armature_data.bones
+        if bone_tree_index is None:
+            bone_tree_index = BoneTreeIndex.get(armature_data)
+        bone_name_to_index = bone_tree_index.bone_name_to_index
+        error_bpy_bone_name_set = set(error_bpy_bone_names)
         human_bone_name_to_bpy_bone_name = {
             value.name: key
             for key, value in bpy_bone_name_to_human_bone_specification.items()
@@ -486,18 +614,20 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
 
         # If the target's ancestor has a Human Bone assignment, use that as the
         # search start bone
-        searching_bones: Optional[list[Bone]] = None
+        searching_indices: Optional[list[int]] = None
         ancestor: Optional[HumanBoneSpecification] = target.parent
         while ancestor:
             ancestor_bpy_bone_name = human_bone_name_to_bpy_bone_name.get(ancestor.name)
-            if not ancestor_bpy_bone_name or not (
-                ancestor_bpy_bone := bones.get(ancestor_bpy_bone_name)
+            if (
+                not ancestor_bpy_bone_name
+                or (ancestor_index := bone_name_to_index.get(ancestor_bpy_bone_name))
+                is None
             ):
                 # If there's no Human Bone assignment, traverse to the parent
                 ancestor = ancestor.parent
                 continue
 
-            if ancestor_bpy_bone.name in error_bpy_bone_names:
+            if ancestor_bpy_bone_name in error_bpy_bone_name_set:
                 # If there's an error in the Human Bone assignment, return empty result
                 if diagnostics_layout:
                     diagnostics_message = pgettext(
@@ -522,7 +652,7 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                 return set()
 
             # Use the child bones of the found ancestor bone as the search start bones
-            searching_bones = list(ancestor_bpy_bone.children)
+            searching_indices = list(bone_tree_index.children_indices[ancestor_index])
             if diagnostics_layout:
                 search_conditions.append(
                     pgettext(
@@ -535,36 +665,25 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                 )
             break
 
-        root_bones: Final[Sequence[Bone]] = [
-            bone for bone in bones.values() if not bone.parent
-        ]
+        root_indices: Final = bone_tree_index.root_indices
 
         # If no ancestor bone is found, use the root bone as the search start bone
-        if searching_bones is None and len(root_bones) > 1:
+        if searching_indices is None and len(root_indices) > 1:
             # If there are multiple root bones,
             # select the root bone of the already assigned bone
-            human_bone_specification = None
             for (
                 bpy_bone_name,
                 human_bone_specification,
             ) in bpy_bone_name_to_human_bone_specification.items():
                 if not bpy_bone_name:
                     continue
-                if bpy_bone_name in error_bpy_bone_names:
+                if bpy_bone_name in error_bpy_bone_name_set:
                     continue
-                bpy_bone = bones.get(bpy_bone_name)
-                if not bpy_bone:
+                bpy_bone_index = bone_name_to_index.get(bpy_bone_name)
+                if bpy_bone_index is None:
                     continue
 
-                main_root_bone: Optional[Bone] = None
-                parent: Optional[Bone] = bpy_bone
-                while parent:
-                    main_root_bone = parent
-                    parent = parent.parent
-                if not main_root_bone:
-                    continue
-
-                searching_bones = [main_root_bone]
+                searching_indices = [bone_tree_index.find_root_index(bpy_bone_index)]
                 if diagnostics_layout:
                     search_conditions.append(
                         pgettext(
@@ -576,69 +695,67 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                         )
                     )
                 break
-        if searching_bones is None:
-            searching_bones = list(root_bones)
-
-        # Bone candidates
-        bone_candidates: set[Bone] = set(searching_bones)
-
-        # First, register all descendant bones as candidates
-        filling_bones = searching_bones.copy()
-        while filling_bones:
-            filling_bone = filling_bones.pop()
-            bone_candidates.update(filling_bone.children)
-            filling_bones.extend(filling_bone.children)
-
-        removing_bone_tree = set[Bone]()
-
-        # Traverse descendant bones and when we encounter an already assigned bone,
-        # examine its relationship and exclude unnecessary candidates.
-        while searching_bones:
-            searching_bone = searching_bones.pop()
-            human_bone_specification = bpy_bone_name_to_human_bone_specification.get(
-                searching_bone.name
+        if searching_indices is None:
+            searching_indices = list(root_indices)
+
+        # First, register the search start bones and all their descendants
+        # as candidates
+        bone_candidate_indices = set[int]()
+        for searching_index in searching_indices:
+            bone_candidate_indices.update(
+                bone_tree_index.subtree_indices(searching_index)
             )
 
-            # If not assigned to a Human Bone or if it's the target bone,
-            # recursively traverse child bones
+        # Find the already assigned bones that are reached first when traversing
+        # from the search start bones. The bones below them are restricted by them,
+        # so they don't need to be examined. Since the indices are in preorder, a
+        # bone is below an already found bone if and only if it is in the subtree
+        # range of the bone found last.
+        assigned_bone_indices: list[tuple[int, HumanBoneSpecification]] = []
+        for (
+            bpy_bone_name,
+            human_bone_specification,
+        ) in bpy_bone_name_to_human_bone_specification.items():
             if (
-                human_bone_specification is None
-                or human_bone_specification == target
-                or searching_bone.name in error_bpy_bone_names
+                human_bone_specification == target
+                or bpy_bone_name in error_bpy_bone_name_set
             ):
-                searching_bones.extend(searching_bone.children)
                 continue
+            bpy_bone_index = bone_name_to_index.get(bpy_bone_name)
+            if bpy_bone_index is None or bpy_bone_index not in bone_candidate_indices:
+                continue
+            assigned_bone_indices.append((bpy_bone_index, human_bone_specification))
+        assigned_bone_indices.sort(
+            key=lambda assigned_bone_index: assigned_bone_index[0]
+        )
+        nearest_assigned_bone_indices: list[tuple[int, HumanBoneSpecification]] = []
+        for bpy_bone_index, human_bone_specification in assigned_bone_indices:
+            if nearest_assigned_bone_indices and bone_tree_index.is_ancestor_of(
+                nearest_assigned_bone_indices[-1][0], bpy_bone_index
+            ):
+                continue
+            nearest_assigned_bone_indices.append(
+                (bpy_bone_index, human_bone_specification)
+            )
 
+        # Examine the relationship to the already assigned bones and exclude
+        # unnecessary candidates.
+        for bpy_bone_index, human_bone_specification in nearest_assigned_bone_indices:
             if human_bone_specification.is_ancestor_of(target):
                 # If an ancestor bone has an assignment
                 # This case shouldn't exist since we start from the nearest
                 # ancestor bone
                 continue
 
+            bpy_bone_name = bone_tree_index.bone_names[bpy_bone_index]
             if target.is_ancestor_of(human_bone_specification):
                 # If a descendant bone has an assignment:
                 # - Exclude that bone and its descendants
                 # - Exclude branches when traversing from that bone to the root bone
-                removing_bone_tree.add(searching_bone)
-
-                parent = searching_bone
-                while parent:
-                    grand_parent = parent.parent
-                    if grand_parent is None:
-                        # If parent is a root bone,
-                        # exclude other root bones except parent
-                        removing_bone_tree.update(
-                            root_bone for root_bone in root_bones if root_bone != parent
-                        )
-                        break
-                    # Exclude sibling bones of parent
-                    removing_bone_tree.update(
-                        parent_sibling
-                        for parent_sibling in grand_parent.children
-                        if parent_sibling != parent
-                    )
-                    parent = grand_parent
-
+                # Only the ancestors of that bone remain.
+                bone_candidate_indices.intersection_update(
+                    bone_tree_index.ancestor_indices(bpy_bone_index)
+                )
                 if diagnostics_layout:
                     search_conditions.append(
                         pgettext(
@@ -646,19 +763,19 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                             + ' to the VRM Human Bone "{human_bone}"'
                         ).format(
                             human_bone=human_bone_specification.title,
-                            bpy_bone=searching_bone.name,
+                            bpy_bone=bpy_bone_name,
                         )
                     )
             else:
                 # If a bone that is neither ancestor nor descendant has an assignment:
                 # - Exclude that bone and its descendants
                 # - Exclude that bone and its ancestors
-                removing_bone_tree.add(searching_bone)
-
-                parent = searching_bone
-                while parent:
-                    bone_candidates.discard(parent)
-                    parent = parent.parent
+                bone_candidate_indices.difference_update(
+                    bone_tree_index.subtree_indices(bpy_bone_index)
+                )
+                bone_candidate_indices.difference_update(
+                    bone_tree_index.ancestor_indices(bpy_bone_index)
+                )
                 if diagnostics_layout:
                     search_conditions.append(
                         pgettext(
@@ -666,16 +783,10 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                             + ' to the VRM Human Bone "{human_bone}"'
                         ).format(
                             human_bone=human_bone_specification.title,
-                            bpy_bone=searching_bone.name,
+                            bpy_bone=bpy_bone_name,
                         )
                     )
 
-        bone_candidates.difference_update(removing_bone_tree)
-        while removing_bone_tree:
-            removing_bone = removing_bone_tree.pop()
-            bone_candidates.difference_update(removing_bone.children)
-            removing_bone_tree.update(removing_bone.children)
-
         if diagnostics_layout and search_conditions:
             diagnostics_layout.label(
                 text=pgettext(
@@ -692,11 +803,17 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                     icon="DOT",
                 )
 
-        return {bone_cancidate.name for bone_cancidate in bone_candidates}
+        bone_names = bone_tree_index.bone_names
+        return {bone_names[index] for index in bone_candidate_indices}
 
     @staticmethod
-    def update_all_vrm0_bone_name_candidates(armature_data: Armature) -> None:
+    def update_all_vrm0_bone_name_candidates(
+        armature_data: Armature,
+        bone_tree_index: Optional[BoneTreeIndex] = None,
+    ) -> None:
         ext = get_armature_extension(armature_data)
+        if bone_tree_index is None:
+            bone_tree_index = BoneTreeIndex.get(armature_data)
 
         bpy_bone_name_to_human_bone_specification: dict[
             str, vrm0_human_bone.HumanBoneSpecification
@@ -757,6 +874,7 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                         vrm0_human_bone.HumanBoneSpecifications.get(human_bone_name),
                         bpy_bone_name_to_human_bone_specification,
                         error_bpy_bone_names,
+                        bone_tree_index,
                     )
                 )
 
@@ -765,8 +883,13 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
             )
 
     @staticmethod
-    def update_all_vrm1_bone_name_candidates(armature_data: Armature) -> None:
+    def update_all_vrm1_bone_name_candidates(
+        armature_data: Armature,
+        bone_tree_index: Optional[BoneTreeIndex] = None,
+    ) -> None:
         ext = get_armature_extension(armature_data)
+        if bone_tree_index is None:
+            bone_tree_index = BoneTreeIndex.get(armature_data)
 
         human_bone_name_to_human_bone = (
             ext.vrm1.humanoid.human_bones.human_bone_name_to_human_bone()
@@ -814,6 +937,7 @@ class HumanoidStructureBonePropertyGroup(BonePropertyGroup):
                 traversing_human_bone_specification,
                 bpy_bone_name_to_human_bone_specification,
                 error_bpy_bone_names,
+                bone_tree_index,
             )
 
             traversing_human_bone_specifications.extend(
@@ -886,3 +1010,4 @@ class CollectionPropertyProtocol(Protocol[T_co]):
 def clear_global_variables() -> None:
     BonePropertyGroup.armature_data_name_and_bone_uuid_to_bone_name_cache.clear()
     HumanoidStructureBonePropertyGroup.pointer_to_bone_name_candidates.clear()
+    BoneTreeIndex.pointer_to_bone_tree_index.clear()
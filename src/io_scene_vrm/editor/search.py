@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from itertools import chain
 from typing import Final, Optional, Union
 
+from bpy.app.handlers import persistent
 from bpy.app.translations import pgettext
 from bpy.types import (
     Armature,
@@ -12,11 +14,13 @@ from bpy.types import (
     CopyRotationConstraint,
     Curve,
     DampedTrackConstraint,
+    Depsgraph,
     Material,
     Mesh,
     Object,
     ObjectConstraints,
     PoseBoneConstraints,
+    Scene,
 )
 
 from ..common.logger import get_logger
@@ -67,7 +71,34 @@ def export_materials(context: Context, objects: Sequence[Object]) -> Sequence[Ma
     return list(dict.fromkeys(result))  # Remove duplicates
 
 
+def _find_first_user_collection(
+    context: Context,
+    obj: Object,
+    collection_child_to_parent: dict[Collection, Optional[Collection]],
+) -> Optional[Collection]:
+    """Find the first collection of Object.users_collection in the hierarchy.
+
+    Object.users_collection copies the objects of every collection to find them,
+    so the objects are looked up by name instead.
+    """
+    object_name = obj.name
+    blend_data = context.blend_data
+    for collection in chain(
+        blend_data.collections, (scene.collection for scene in blend_data.scenes)
+    ):
+        if collection not in collection_child_to_parent:
+            continue
+        found_object = collection.objects.get(object_name)
+        if found_object is None:
+            continue
+        # Linked objects can have the same name
+        if found_object == obj or obj in collection.objects[:]:
+            return collection
+    return None
+
+
 def object_distance(
+    context: Context,
     source: Object,
     target: Object,
     collection_child_to_parent: dict[Collection, Optional[Collection]],
@@ -76,28 +107,20 @@ def object_distance(
         return (0, 0, 0, 0, 0, 0, 0)
 
     source_collection_path: list[Collection] = []
-    source_collections = [
-        collection
-        for collection in source.users_collection
-        if collection in collection_child_to_parent
-    ]
-    if source_collections:
-        source_collection: Optional[Collection] = source_collections[0]
-        while source_collection:
-            source_collection_path.insert(0, source_collection)
-            source_collection = collection_child_to_parent.get(source_collection)
+    source_collection = _find_first_user_collection(
+        context, source, collection_child_to_parent
+    )
+    while source_collection:
+        source_collection_path.insert(0, source_collection)
+        source_collection = collection_child_to_parent.get(source_collection)
 
     target_collection_path: list[Collection] = []
-    target_collections = [
-        collection
-        for collection in target.users_collection
-        if collection in collection_child_to_parent
-    ]
-    if target_collections:
-        target_collection: Optional[Collection] = target_collections[0]
-        while target_collection:
-            target_collection_path.insert(0, target_collection)
-            target_collection = collection_child_to_parent.get(target_collection)
+    target_collection = _find_first_user_collection(
+        context, target, collection_child_to_parent
+    )
+    while target_collection:
+        target_collection_path.insert(0, target_collection)
+        target_collection = collection_child_to_parent.get(target_collection)
 
     while (
         source_collection_path
@@ -138,11 +161,94 @@ def object_distance(
     )
 
 
-def armature_exists(context: Context) -> bool:
-    return any(armature.users > 0 for armature in context.blend_data.armatures) and any(
-        obj.type == "ARMATURE" for obj in context.blend_data.objects
+@dataclass
+class ArmatureObjectCache:
+    """Scan results for resolving the armature, reused until the next depsgraph update.
+
+    Panels resolve the armature in poll() and draw() on every redraw, so they
+    must not scan all objects each time.
+    """
+
+    armature_objects_key: Optional[tuple[int, tuple[tuple[int, int], ...]]] = None
+    armature_objects: tuple[Object, ...] = ()
+    armature_object_names: tuple[str, ...] = ()
+    collection_child_to_parent_key: Optional[tuple[int, int]] = None
+    collection_child_to_parent: Final[dict[Collection, Optional[Collection]]] = field(
+        default_factory=dict[Collection, Optional[Collection]]
     )
 
+    def clear(self) -> None:
+        self.armature_objects_key = None
+        self.armature_objects = ()
+        self.armature_object_names = ()
+        self.collection_child_to_parent_key = None
+        self.collection_child_to_parent.clear()
+
+
+_armature_object_cache: Final = ArmatureObjectCache()
+
+
+def _get_armature_objects(context: Context) -> tuple[Object, ...]:
+    blend_data = context.blend_data
+    # Scripts can add or remove objects without updating the depsgraph, but then
+    # the users of the armatures change. Counting the objects takes linear time.
+    key: tuple[int, tuple[tuple[int, int], ...]] = (
+        blend_data.as_pointer(),
+        tuple(
+            (armature.as_pointer(), armature.users) for armature in blend_data.armatures
+        ),
+    )
+    if _armature_object_cache.armature_objects_key == key:
+        try:
+            # Renaming an object changes the order of the objects but not the key
+            if all(
+                obj.type == "ARMATURE"
+                for obj in _armature_object_cache.armature_objects
+            ) and _armature_object_cache.armature_object_names == tuple(
+                obj.name for obj in _armature_object_cache.armature_objects
+            ):
+                return _armature_object_cache.armature_objects
+        except ReferenceError:
+            _logger.debug("A cached armature object has been removed")
+
+    armature_objects = tuple(
+        obj for obj in blend_data.objects if obj.type == "ARMATURE"
+    )
+    _armature_object_cache.armature_objects_key = key
+    _armature_object_cache.armature_objects = armature_objects
+    _armature_object_cache.armature_object_names = tuple(
+        obj.name for obj in armature_objects
+    )
+    return armature_objects
+
+
+def _get_collection_child_to_parent(
+    context: Context,
+) -> dict[Collection, Optional[Collection]]:
+    key = (context.scene.as_pointer(), len(context.blend_data.collections))
+    collection_child_to_parent = _armature_object_cache.collection_child_to_parent
+    if _armature_object_cache.collection_child_to_parent_key == key:
+        return collection_child_to_parent
+
+    collection_child_to_parent.clear()
+    collection_child_to_parent[context.scene.collection] = None
+
+    collections = [context.scene.collection]
+    while collections:
+        parent = collections.pop()
+        for child in parent.children:
+            collections.append(child)
+            collection_child_to_parent[child] = parent
+
+    _armature_object_cache.collection_child_to_parent_key = key
+    return collection_child_to_parent
+
+
+def armature_exists(context: Context) -> bool:
+    return any(
+        armature.users > 0 for armature in context.blend_data.armatures
+    ) and bool(_get_armature_objects(context))
+
 
 def current_armature_is_vrm0(context: Context) -> bool:
     live_armature_datum = [
@@ -155,7 +261,7 @@ def current_armature_is_vrm0(context: Context) -> bool:
     if all(
         get_armature_extension(armature_data).is_vrm0()
         for armature_data in live_armature_datum
-    ) and any(obj.type == "ARMATURE" for obj in context.blend_data.objects):
+    ) and _get_armature_objects(context):
         return True
     armature = current_armature(context)
     if armature is None:
@@ -177,7 +283,7 @@ def current_armature_is_vrm1(context: Context) -> bool:
     if all(
         get_armature_extension(armature_data).is_vrm1()
         for armature_data in live_armature_datum
-    ) and any(obj.type == "ARMATURE" for obj in context.blend_data.objects):
+    ) and _get_armature_objects(context):
         return True
     armature = current_armature(context)
     if armature is None:
@@ -196,19 +302,12 @@ def multiple_armatures_exist(context: Context) -> bool:
         if not first_data_exists:
             first_data_exists = True
             continue
-
-        first_obj_exists = False
-        for obj in context.blend_data.objects:
-            if obj.type == "ARMATURE":
-                if first_obj_exists:
-                    return True
-                first_obj_exists = True
-        break
+        return len(_get_armature_objects(context)) >= 2
     return False
 
 
 def current_armature(context: Context) -> Optional[Object]:
-    objects = [obj for obj in context.blend_data.objects if obj.type == "ARMATURE"]
+    objects = _get_armature_objects(context)
     if not objects:
         return None
 
@@ -221,21 +320,14 @@ def current_armature(context: Context) -> Optional[Object]:
     if not active_object:
         return objects[0]
 
-    collection_child_to_parent: dict[Collection, Optional[Collection]] = {
-        context.scene.collection: None
-    }
-
-    collections = [context.scene.collection]
-    while collections:
-        parent = collections.pop()
-        for child in parent.children:
-            collections.append(child)
-            collection_child_to_parent[child] = parent
+    collection_child_to_parent = _get_collection_child_to_parent(context)
 
     min_distance: Optional[tuple[int, int, int, int, int, int, int]] = None
     nearest_object: Optional[Object] = None
     for obj in objects:
-        distance = object_distance(active_object, obj, collection_child_to_parent)
+        distance = object_distance(
+            context, active_object, obj, collection_child_to_parent
+        )
         if min_distance is None or min_distance > distance:
             min_distance = distance
             nearest_object = obj
@@ -243,14 +335,46 @@ def current_armature(context: Context) -> Optional[Object]:
     return objects[0] if nearest_object is None else nearest_object
 
 
-def export_objects(
+@dataclass
+class ExportObjectCache:
+    """Export object candidates reused until the next depsgraph update.
+
+    The colliders are excluded from the candidates on each call because
+    changes to the collider settings don't update the depsgraph.
+    """
+
+    candidates: Final[dict[tuple[int, str, bool, bool], tuple[Object, ...]]] = field(
+        default_factory=dict[tuple[int, str, bool, bool], tuple[Object, ...]]
+    )
+
+    def clear(self) -> None:
+        self.candidates.clear()
+
+
+_export_object_cache: Final = ExportObjectCache()
+
+
+@persistent
+def depsgraph_update_post(_scene: Scene, _depsgraph: Depsgraph) -> None:
+    # Adding, removing, hiding or selecting objects updates the depsgraph.
+    # It is updated after undo as well, so no removed objects are returned.
+    _export_object_cache.clear()
+    _armature_object_cache.clear()
+
+
+def clear_global_variables() -> None:
+    _export_object_cache.clear()
+    _armature_object_cache.clear()
+
+
+def collect_export_object_candidates(
     context: Context,
     armature_object_name: Optional[str],
     *,
     export_invisibles: bool,
     export_only_selections: bool,
     export_lights: bool,
-) -> list[Object]:
+) -> tuple[Object, ...]:
     selected_objects = []
     if export_only_selections:
         selected_objects = list(context.selected_objects)
@@ -261,13 +385,13 @@ def export_objects(
 
     objects: list[Object] = []
 
-    # https://projects.blender.org/blender/blender/issues/113378
-    context.view_layer.update()
+    # Looking up names in view_layer.objects is a linear search
+    view_layer_objects = set(context.view_layer.objects)
 
     armature_object = None
     if armature_object_name:
         armature_object = context.blend_data.objects.get(armature_object_name)
-        if armature_object and armature_object.name in context.view_layer.objects:
+        if armature_object and armature_object in view_layer_objects:
             objects.append(armature_object)
         else:
             armature_object = None
@@ -275,40 +399,81 @@ def export_objects(
         objects.extend(
             obj
             for obj in context.blend_data.objects
-            if obj.type == "ARMATURE" and obj.name in context.view_layer.objects
+            if obj.type == "ARMATURE" and obj in view_layer_objects
         )
 
-    collider_bpy_objects: list[Optional[Object]] = []
-    for armature_data in context.blend_data.armatures:
-        ext = get_armature_extension(armature_data)
-        for spring_bone1_collider in ext.spring_bone1.colliders:
-            spring_bone1_collider_bpy_object = spring_bone1_collider.bpy_object
-            if not spring_bone1_collider_bpy_object:
-                continue
-            collider_bpy_objects.append(spring_bone1_collider_bpy_object)
-            collider_bpy_objects.extend(spring_bone1_collider_bpy_object.children)
-        for collider_group in ext.vrm0.secondary_animation.collider_groups:
-            collider_bpy_objects.extend(
-                collider.bpy_object for collider in collider_group.colliders
-            )
-
     for obj in selected_objects:
         if obj.type in {"ARMATURE", "CAMERA"}:
             continue
         if obj.type == "LIGHT" and not export_lights:
             continue
-        if obj.name not in context.view_layer.objects:
+        if obj not in view_layer_objects:
             continue
         if not export_invisibles and not obj.visible_get():
             continue
         objects.append(obj)
 
-    return [
-        # Remove colliders and duplicates
-        obj
-        for obj in dict.fromkeys(objects)
-        if obj not in collider_bpy_objects
-    ]
+    # Remove duplicates
+    return tuple(dict.fromkeys(objects))
+
+
+def export_objects(
+    context: Context,
+    armature_object_name: Optional[str],
+    *,
+    export_invisibles: bool,
+    export_only_selections: bool,
+    export_lights: bool,
+) -> list[Object]:
+    # https://projects.blender.org/blender/blender/issues/113378
+    # This also invokes depsgraph_update_post() for the pending changes.
+    context.view_layer.update()
+
+    # The selected objects in the context can be overridden, so they are not cached
+    cache_key: Optional[tuple[int, str, bool, bool]] = None
+    candidates: Optional[tuple[Object, ...]] = None
+    if not export_only_selections:
+        cache_key = (
+            context.view_layer.as_pointer(),
+            armature_object_name or "",
+            export_invisibles,
+            export_lights,
+        )
+        candidates = _export_object_cache.candidates.get(cache_key)
+    if candidates is None:
+        candidates = collect_export_object_candidates(
+            context,
+            armature_object_name,
+            export_invisibles=export_invisibles,
+            export_only_selections=export_only_selections,
+            export_lights=export_lights,
+        )
+        if cache_key is not None:
+            _export_object_cache.candidates[cache_key] = candidates
+
+    spring_bone1_collider_bpy_objects: set[Object] = set()
+    collider_bpy_objects: set[Optional[Object]] = set()
+    for armature_data in context.blend_data.armatures:
+        ext = get_armature_extension(armature_data)
+        for spring_bone1_collider in ext.spring_bone1.colliders:
+            spring_bone1_collider_bpy_object = spring_bone1_collider.bpy_object
+            if spring_bone1_collider_bpy_object:
+                spring_bone1_collider_bpy_objects.add(spring_bone1_collider_bpy_object)
+        for collider_group in ext.vrm0.secondary_animation.collider_groups:
+            collider_bpy_objects.update(
+                collider.bpy_object for collider in collider_group.colliders
+            )
+    if spring_bone1_collider_bpy_objects:
+        collider_bpy_objects.update(spring_bone1_collider_bpy_objects)
+        # Object.children searches all objects for each collider, so collect
+        # the children of the colliders at once.
+        collider_bpy_objects.update(
+            obj
+            for obj in context.blend_data.objects
+            if obj.parent in spring_bone1_collider_bpy_objects
+        )
+
+    return [obj for obj in candidates if obj not in collider_bpy_objects]
 
 
 @dataclass(frozen=True)
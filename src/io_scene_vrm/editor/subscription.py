@@ -22,6 +22,7 @@ class Subscription:
     bone_name_subscription_owner: Final[object] = field(default_factory=object)
     armature_name_subscription_owner: Final[object] = field(default_factory=object)
     setup_once: bool = False
+    moved_object_names: Final[set[str]] = field(default_factory=set[str])
 
 
 _subscription: Final = Subscription()
@@ -78,6 +79,9 @@ def setup_subscription(*, load_post: bool) -> None:
 
 def teardown_subscription() -> None:
     _subscription.setup_once = False
+    _subscription.moved_object_names.clear()
+    if bpy.app.timers.is_registered(_update_look_at_previews_timer_callback):
+        bpy.app.timers.unregister(_update_look_at_previews_timer_callback)
     bpy.msgbus.clear_by_owner(_subscription.armature_name_subscription_owner)
     bpy.msgbus.clear_by_owner(_subscription.bone_name_subscription_owner)
     bpy.msgbus.clear_by_owner(_subscription.object_location_subscription_owner)
@@ -98,7 +102,26 @@ def _on_change_bpy_object_location() -> None:
     active_object = context.active_object
     if not active_object:
         return
-    vrm1_property_group.Vrm1LookAtPropertyGroup.update_all_previews(context)
+
+    # This is notified many times during a transform drag or an animation, so only
+    # record the objects that may have moved and update the previews once in the
+    # next timer callback.
+    moved_object_names = _subscription.moved_object_names
+    moved_object_names.add(active_object.name)
+    moved_object_names.update(obj.name for obj in context.selected_objects)
+    if not bpy.app.timers.is_registered(_update_look_at_previews_timer_callback):
+        bpy.app.timers.register(_update_look_at_previews_timer_callback)
+
+
+def _update_look_at_previews_timer_callback() -> None:
+    """Update the Look At previews affected by the objects moved so far."""
+    context = bpy.context  # Context cannot span frames, so get it anew
+
+    moved_object_names = set(_subscription.moved_object_names)
+    _subscription.moved_object_names.clear()
+    vrm1_property_group.Vrm1LookAtPropertyGroup.update_previews_affected_by_moved_objects(
+        context, moved_object_names
+    )
 
 
 def _on_change_bpy_bone_name() -> None:
@@ -120,4 +143,4 @@ def _on_change_bpy_bone_name() -> None:
 def _on_change_bpy_armature_name() -> None:
     context = bpy.context
 
-    migrate_all_objects(context, heavy_migration=False)
+    migrate_all_objects(context, heavy_migration=False, changed_only=True)
@@ -6,12 +6,14 @@ from typing import TYPE_CHECKING, Final, Optional
 from urllib.parse import urlsplit
 
 import bpy
+from bpy.app.handlers import persistent
 from bpy.app.translations import pgettext
 from bpy.props import BoolProperty, CollectionProperty, IntProperty, StringProperty
 from bpy.types import (
     Armature,
     Bone,
     Context,
+    Depsgraph,
     Event,
     Image,
     Material,
@@ -20,6 +22,7 @@ from bpy.types import (
     Object,
     Operator,
     PropertyGroup,
+    Scene,
     ShaderNodeGroup,
     ShaderNodeTexImage,
     UILayout,
@@ -54,6 +57,60 @@ class ValidationState:
     used_materials: Final[list[Material]] = field(default_factory=list[Material])
 
 
+@dataclass(frozen=True)
+class MaterialValidationResult:
+    surface_warning_messages: tuple[str, ...]
+    node_input_error_messages: tuple[str, ...]
+    node_input_image_names: tuple[str, ...]
+    texture_warning_messages: tuple[str, ...]
+    texture_image_names: tuple[str, ...]
+
+
+@dataclass
+class ValidationCache:
+    """Validation results reused while their inputs are unchanged.
+
+    Each result is keyed by a cheap signature of its inputs. Changes that the
+    signatures can't capture, such as vertex weights or node values, are caught
+    by depsgraph_update_post(), which discards the mesh or material results.
+    """
+
+    locale: str = ""
+    mesh_non_triangular_faces: Final[dict[tuple[int, int, int], bool]] = field(
+        default_factory=dict[tuple[int, int, int], bool]
+    )
+    vertex_weight_info_messages: Final[dict[tuple[object, ...], tuple[str, ...]]] = (
+        field(default_factory=dict[tuple[object, ...], tuple[str, ...]])
+    )
+    material_results: Final[
+        dict[tuple[int, str, bool, bool], MaterialValidationResult]
+    ] = field(
+        default_factory=dict[tuple[int, str, bool, bool], MaterialValidationResult]
+    )
+
+    def clear_mesh_results(self) -> None:
+        self.mesh_non_triangular_faces.clear()
+        self.vertex_weight_info_messages.clear()
+
+    def clear_material_results(self) -> None:
+        self.material_results.clear()
+
+    def clear(self) -> None:
+        self.locale = ""
+        self.clear_mesh_results()
+        self.clear_material_results()
+
+    def update_locale(self, locale: str) -> None:
+        # The cached messages are already translated
+        if self.locale == locale:
+            return
+        self.clear()
+        self.locale = locale
+
+
+_cache: Final = ValidationCache()
+
+
 class VrmValidationError(PropertyGroup):
     message: StringProperty()  # type: ignore[valid-type]
     severity: IntProperty(min=0)  # type: ignore[valid-type]
@@ -227,6 +284,7 @@ class WM_OT_vrm_validator(Operator):
         is_vrm1: bool,
         execute_migration: bool,
         state: ValidationState,
+        cache: Optional[ValidationCache] = None,
     ) -> None:
         armature_count = sum(1 for obj in export_objects if obj.type == "ARMATURE")
         if armature_count >= 2:  # only one armature
@@ -312,15 +370,33 @@ class WM_OT_vrm_validator(Operator):
                 if not isinstance(mesh_data, Mesh):
                     _logger.error("%s is not a Mesh", type(mesh_data))
                     continue
-                for poly in mesh_data.polygons:
-                    if poly.loop_total > 3:  # polygons need all triangle
-                        state.info_messages.append(
-                            pgettext(
-                                'Non-triangular faces detected in "{name}". '
-                                + "They will be triangulated automatically.",
-                            ).format(name=obj.name)
-                        )
-                        break
+                if WM_OT_vrm_validator.has_non_triangular_faces(mesh_data, cache):
+                    state.info_messages.append(
+                        pgettext(
+                            'Non-triangular faces detected in "{name}". '
+                            + "They will be triangulated automatically.",
+                        ).format(name=obj.name)
+                    )
+
+    @staticmethod
+    def has_non_triangular_faces(
+        mesh_data: Mesh, cache: Optional[ValidationCache]
+    ) -> bool:
+        key = (
+            mesh_data.as_pointer(),
+            len(mesh_data.polygons),
+            len(mesh_data.loops),
+        )
+        if cache is not None:
+            cached = cache.mesh_non_triangular_faces.get(key)
+            if cached is not None:
+                return cached
+
+        # polygons need all triangle
+        result = any(poly.loop_total > 3 for poly in mesh_data.polygons)
+        if cache is not None:
+            cache.mesh_non_triangular_faces[key] = result
+        return result
 
     @staticmethod
     def validate_armature_object(
@@ -635,67 +711,171 @@ class WM_OT_vrm_validator(Operator):
         *,
         is_vrm1: bool,
         state: ValidationState,
+        cache: Optional[ValidationCache] = None,
     ) -> None:
         bones_names = (
             {b.name for b in armature_data.bones} if armature_data else set[str]()
         )
+
+        signature: Optional[tuple[object, ...]] = None
+        if cache is not None:
+            signature = (
+                is_vrm1,
+                armature is None,
+                frozenset(bones_names),
+                *(
+                    (
+                        obj.name,
+                        obj.parent_bone,
+                        mesh_data.as_pointer(),
+                        len(mesh_data.vertices),
+                        len(mesh_data.loops),
+                        tuple(vertex_group.name for vertex_group in obj.vertex_groups),
+                    )
+                    for obj in export_objects
+                    if obj.type == "MESH" and isinstance(mesh_data := obj.data, Mesh)
+                ),
+            )
+            cached_info_messages = cache.vertex_weight_info_messages.get(signature)
+            if cached_info_messages is not None:
+                state.info_messages.extend(cached_info_messages)
+                return
+
+        info_messages: list[str] = []
         vertex_error_count = 0
 
         for mesh in (obj for obj in export_objects if obj.type == "MESH"):
+            # Once the messages are reported up to the limit, remaining vertices
+            # and meshes don't need to be inspected.
+            if vertex_error_count > 5:
+                break
+            report_no_weight = not is_vrm1 and mesh.parent_bone == ""
+            if not report_no_weight and (armature is None or vertex_error_count >= 5):
+                continue
+
             if not isinstance(mesh_data := mesh.data, Mesh):
                 continue
 
-            mesh_vertex_group_names = tuple(g.name for g in mesh.vertex_groups)
+            bone_vertex_group_indices = {
+                vertex_group_index
+                for vertex_group_index, vertex_group in enumerate(mesh.vertex_groups)
+                if vertex_group.name in bones_names
+            }
 
-            for v in mesh_data.vertices:
-                if not v.groups and mesh.parent_bone == "":
-                    if vertex_error_count > 5:
-                        continue
-                    if is_vrm1:
+            for vertex_index, vertex in enumerate(mesh_data.vertices):
+                groups = vertex.groups
+                group_count = len(groups)
+                if 0 < group_count < 5:
+                    continue
+                if not group_count:
+                    if not report_no_weight:
                         continue
-                    state.info_messages.append(
+                    info_messages.append(
                         pgettext(
                             'vertex index "{vertex_index}" is no weight'
                             + ' in "{mesh_name}".'
                             + " Add weight to parent bone automatically."
-                        ).format(vertex_index=v.index, mesh_name=mesh.name)
+                        ).format(vertex_index=vertex_index, mesh_name=mesh.name)
                     )
                     vertex_error_count += 1
-                elif len(v.groups) >= 5 and armature is not None:
-                    weight_count = 0
-                    for g in v.groups:
-                        if (
-                            0 <= g.group < len(mesh_vertex_group_names)
-                            and mesh_vertex_group_names[g.group] in bones_names
-                            and g.weight < float_info.epsilon
-                        ):
-                            weight_count += 1
-                    if weight_count > 4 and vertex_error_count < 5:
-                        state.info_messages.append(
-                            pgettext(
-                                'vertex index "{vertex_index}" has'
-                                + ' too many (over 4) weight in "{mesh_name}".'
-                                + " It will be truncated to 4 descending"
-                                + " order by its weight."
-                            ).format(vertex_index=v.index, mesh_name=mesh.name)
-                        )
-                        vertex_error_count += 1
+                    if vertex_error_count > 5:
+                        break
+                    continue
+
+                if armature is None or vertex_error_count >= 5:
+                    continue
+                weight_count = sum(
+                    1
+                    for g in groups
+                    if g.group in bone_vertex_group_indices
+                    and g.weight < float_info.epsilon
+                )
+                if weight_count > 4:
+                    info_messages.append(
+                        pgettext(
+                            'vertex index "{vertex_index}" has'
+                            + ' too many (over 4) weight in "{mesh_name}".'
+                            + " It will be truncated to 4 descending"
+                            + " order by its weight."
+                        ).format(vertex_index=vertex_index, mesh_name=mesh.name)
+                    )
+                    vertex_error_count += 1
+                    if not report_no_weight and vertex_error_count >= 5:
+                        break
+
+        state.info_messages.extend(info_messages)
+        if cache is not None and signature is not None:
+            cache.vertex_weight_info_messages[signature] = tuple(info_messages)
 
     @staticmethod
     def validate_materials(
-        _context: Context,
+        context: Context,
         _export_objects: list[Object],
         *,
         is_vrm0: bool,
         state: ValidationState,
+        cache: Optional[ValidationCache] = None,
     ) -> None:
-        for material in state.used_materials:
-            if (
-                not (mat_node_tree := material.node_tree)
-                or get_material_extension(material).mtoon1.enabled
-                or shader.MmdMaterial.try_parse(material)
+        results = [
+            WM_OT_vrm_validator.get_material_validation_result(
+                context, material, is_vrm0=is_vrm0, cache=cache
+            )
+            for material in state.used_materials
+        ]
+        for result in results:
+            state.skippable_warning_messages.extend(result.surface_warning_messages)
+        for result in results:
+            state.error_messages.extend(result.node_input_error_messages)
+            for image_name in result.node_input_image_names:
+                image = context.blend_data.images[image_name]
+                if image not in state.used_images:
+                    state.used_images.append(image)
+        for result in results:
+            state.skippable_warning_messages.extend(result.texture_warning_messages)
+            for image_name in result.texture_image_names:
+                image = context.blend_data.images[image_name]
+                if image not in state.used_images:
+                    state.used_images.append(image)
+
+    @staticmethod
+    def get_material_validation_result(
+        context: Context,
+        material: Material,
+        *,
+        is_vrm0: bool,
+        cache: Optional[ValidationCache],
+    ) -> MaterialValidationResult:
+        mtoon1_enabled = get_material_extension(material).mtoon1.enabled
+        key = (material.as_pointer(), material.name, is_vrm0, mtoon1_enabled)
+        if cache is not None:
+            result = cache.material_results.get(key)
+            # Renamed or removed images aren't reported to the depsgraph
+            if result is not None and all(
+                image_name in context.blend_data.images
+                for image_name in (
+                    *result.node_input_image_names,
+                    *result.texture_image_names,
+                )
             ):
-                continue
+                return result
+
+        result = WM_OT_vrm_validator.create_material_validation_result(
+            material, is_vrm0=is_vrm0
+        )
+        if cache is not None:
+            cache.material_results[key] = result
+        return result
+
+    @staticmethod
+    def create_material_validation_result(
+        material: Material, *, is_vrm0: bool
+    ) -> MaterialValidationResult:
+        surface_warning_messages: list[str] = []
+        if (
+            (mat_node_tree := material.node_tree)
+            and not get_material_extension(material).mtoon1.enabled
+            and not shader.MmdMaterial.try_parse(material)
+        ):
             for node in mat_node_tree.nodes:
                 if node.type != "OUTPUT_MATERIAL":
                     continue
@@ -716,7 +896,7 @@ class WM_OT_vrm_validator(Operator):
                         ):
                             continue
 
-                state.skippable_warning_messages.append(
+                surface_warning_messages.append(
                     pgettext(
                         '"{material_name}" needs to enable'
                         + ' "VRM MToon Material" or connect'
@@ -725,10 +905,10 @@ class WM_OT_vrm_validator(Operator):
                     ).format(material_name=material.name)
                 )
 
-        for material in state.used_materials:
-            legacy_addon_material = LegacyAddonMaterial.try_parse(material)
-            if not legacy_addon_material:
-                continue
+        node_input_error_messages: list[str] = []
+        node_input_images: list[Image] = []
+        legacy_addon_material = LegacyAddonMaterial.try_parse(material)
+        if legacy_addon_material:
             # MToon
             if legacy_addon_material.shader_name == "MToon_unversioned":
                 for texture_val in MtoonUnversioned.texture_kind_exchange_dict.values():
@@ -738,8 +918,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "TEX_IMAGE",
                         texture_val + suffix,
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
                 for float_val in MtoonUnversioned.float_props_exchange_dict.values():
                     if float_val is None:
@@ -749,8 +929,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "VALUE",
                         float_val,
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
                 for k in ("_Color", "_ShadeColor", "_EmissionColor", "_OutlineColor"):
                     _node_material_input_check(
@@ -758,8 +938,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "RGB",
                         MtoonUnversioned.vector_props_exchange_dict[k],
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
             # GLTF
             elif legacy_addon_material.shader_name == "GLTF":
@@ -769,8 +949,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "TEX_IMAGE",
                         k,
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
                 for k in VAL_INPUT_NAMES:
                     _node_material_input_check(
@@ -778,8 +958,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "VALUE",
                         k,
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
                 for k in RGBA_INPUT_NAMES:
                     _node_material_input_check(
@@ -787,8 +967,8 @@ class WM_OT_vrm_validator(Operator):
                         material,
                         "RGB",
                         k,
-                        state.error_messages,
-                        state.used_images,
+                        node_input_error_messages,
+                        node_input_images,
                     )
             # Transparent_Zwrite
             elif legacy_addon_material.shader_name == "TRANSPARENT_ZWRITE":
@@ -797,24 +977,23 @@ class WM_OT_vrm_validator(Operator):
                     material,
                     "TEX_IMAGE",
                     "Main_Texture",
-                    state.error_messages,
-                    state.used_images,
+                    node_input_error_messages,
+                    node_input_images,
                 )
 
-        for material in state.used_materials:
-            gltf = get_material_extension(material).mtoon1
-            if not gltf.enabled:
-                continue
-
+        texture_warning_messages: list[str] = []
+        texture_images: list[Image] = []
+        gltf = get_material_extension(material).mtoon1
+        if gltf.enabled:
             for texture in gltf.all_textures(downgrade_to_mtoon0=is_vrm0):
                 source = texture.get_connected_node_image()
                 if not source:
                     continue
-                if source not in state.used_images:
-                    state.used_images.append(source)
+                if source not in texture_images:
+                    texture_images.append(source)
                 if source.colorspace_settings.name == texture.colorspace:
                     continue
-                state.skippable_warning_messages.append(
+                texture_warning_messages.append(
                     pgettext(
                         'It is recommended to set "{colorspace}"'
                         + ' to "{input_colorspace}" for "{texture_label}"'
@@ -829,8 +1008,8 @@ class WM_OT_vrm_validator(Operator):
 
             for texture_info in gltf.all_texture_info():
                 source = texture_info.index.get_connected_node_image()
-                if source and source not in state.used_images:
-                    state.used_images.append(source)
+                if source and source not in texture_images:
+                    texture_images.append(source)
 
                 if not is_vrm0 or not source:
                     continue
@@ -848,7 +1027,7 @@ class WM_OT_vrm_validator(Operator):
                         or abs(offset[0]) > 0
                         or abs(offset[1]) > 0
                     ):
-                        state.skippable_warning_messages.append(
+                        texture_warning_messages.append(
                             pgettext(
                                 'Material "{name}" {texture}\'s Offset and Scale are'
                                 + " ignored in VRM 0.0."
@@ -863,7 +1042,7 @@ class WM_OT_vrm_validator(Operator):
                     or abs(base_offset[0] - offset[0]) > 0
                     or abs(base_offset[1] - offset[1]) > 0
                 ):
-                    state.skippable_warning_messages.append(
+                    texture_warning_messages.append(
                         pgettext(
                             'Material "{name}" {texture}\'s Offset and Scale'
                             + " in VRM 0.0 are the values of"
@@ -874,6 +1053,14 @@ class WM_OT_vrm_validator(Operator):
                         )
                     )
 
+        return MaterialValidationResult(
+            surface_warning_messages=tuple(surface_warning_messages),
+            node_input_error_messages=tuple(node_input_error_messages),
+            node_input_image_names=tuple(image.name for image in node_input_images),
+            texture_warning_messages=tuple(texture_warning_messages),
+            texture_image_names=tuple(image.name for image in texture_images),
+        )
+
     @staticmethod
     def validate_vrm0_additional(
         context: Context,
@@ -1041,6 +1228,7 @@ class WM_OT_vrm_validator(Operator):
         execute_migration: bool = False,
     ) -> bool:
         state = ValidationState()
+        _cache.update_locale(bpy.app.translations.locale)
 
         # export object seeking
         preferences = get_preferences(context)
@@ -1098,6 +1286,7 @@ class WM_OT_vrm_validator(Operator):
             is_vrm1=is_vrm1,
             execute_migration=execute_migration,
             state=state,
+            cache=_cache,
         )
 
         if is_vrm1 and armature_data:
@@ -1113,12 +1302,14 @@ class WM_OT_vrm_validator(Operator):
             armature_data,
             is_vrm1=is_vrm1,
             state=state,
+            cache=_cache,
         )
         WM_OT_vrm_validator.validate_materials(
             context,
             export_objects,
             is_vrm0=is_vrm0,
             state=state,
+            cache=_cache,
         )
 
         if is_vrm0 and armature_data:
@@ -1261,6 +1452,30 @@ def _node_material_input_check(
                 )
 
 
+@persistent
+def depsgraph_update_post(_scene: Scene, depsgraph: Depsgraph) -> None:
+    # search.export_objects() updates the view layer before the validation,
+    # so the stale results are discarded here in time.
+    # Material changes also update meshes, but not their geometry
+    if (
+        depsgraph.id_type_updated("MESH") or depsgraph.id_type_updated("OBJECT")
+    ) and any(
+        update.is_updated_geometry and isinstance(update.id, (Mesh, Object))
+        for update in depsgraph.updates
+    ):
+        _cache.clear_mesh_results()
+    if (
+        depsgraph.id_type_updated("MATERIAL")
+        or depsgraph.id_type_updated("NODETREE")
+        or depsgraph.id_type_updated("IMAGE")
+    ):
+        _cache.clear_material_results()
+
+
+def clear_global_variables() -> None:
+    _cache.clear()
+
+
 def is_valid_url(url_str: str, *, allow_empty_str: bool) -> bool:
     if not url_str:
         return allow_empty_str
@@ -54,6 +54,7 @@ from ..mtoon1.property_group import (
 )
 from ..property_group import (
     BonePropertyGroup,
+    BoneTreeIndex,
     FloatPropertyGroup,
     HumanoidStructureBonePropertyGroup,
     MeshObjectPropertyGroup,
@@ -76,12 +77,14 @@ class Vrm0HumanoidBoneNodePropertyGroup(HumanoidStructureBonePropertyGroup):
         target: HumanBoneSpecification,
         bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
         error_bpy_bone_names: Sequence[str],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
     ) -> bool:
         new_candidates = HumanoidStructureBonePropertyGroup.find_bone_candidates(
             armature_data,
             target,
             bpy_bone_name_to_human_bone_specification,
             error_bpy_bone_names,
+            bone_tree_index=bone_tree_index,
         )
 
         bone_name_candidates = self.bone_name_candidates
@@ -205,7 +208,7 @@ class Vrm0HumanoidPropertyGroup(PropertyGroup):
     pose_marker_name: StringProperty()  # type: ignore[valid-type]
 
     # for UI
-    pointer_to_last_bone_names_str: ClassVar[dict[int, str]] = {}
+    pointer_to_last_bone_tree_index: ClassVar[dict[int, BoneTreeIndex]] = {}
     initial_automatic_bone_assignment: BoolProperty(  # type: ignore[valid-type]
         default=True
     )
@@ -316,22 +319,17 @@ class Vrm0HumanoidPropertyGroup(PropertyGroup):
         if not ext.is_vrm0():
             return
 
-        bone_names_str = "\n".join(
-            sorted(
-                bone.name + "\n" + (parent.name if (parent := bone.parent) else "")
-                for bone in armature_data.bones.values()
-            )
-        )
+        bone_tree_index = BoneTreeIndex.get(armature_data)
         humanoid = ext.vrm0.humanoid
         pointer_key = humanoid.as_pointer()
-        pointer_to_last_bone_names_str = humanoid.pointer_to_last_bone_names_str
-        last_bone_names_str = pointer_to_last_bone_names_str.get(pointer_key)
-        if not force and last_bone_names_str == bone_names_str:
+        pointer_to_last_bone_tree_index = humanoid.pointer_to_last_bone_tree_index
+        last_bone_tree_index = pointer_to_last_bone_tree_index.get(pointer_key)
+        if not force and last_bone_tree_index is bone_tree_index:
             return
-        pointer_to_last_bone_names_str[pointer_key] = bone_names_str
+        pointer_to_last_bone_tree_index[pointer_key] = bone_tree_index
 
         HumanoidStructureBonePropertyGroup.update_all_vrm0_bone_name_candidates(
-            armature_data
+            armature_data, bone_tree_index
         )
 
     @staticmethod
@@ -1814,5 +1812,5 @@ class Vrm0PropertyGroup(PropertyGroup):
 
 
 def clear_global_variables() -> None:
-    Vrm0HumanoidPropertyGroup.pointer_to_last_bone_names_str.clear()
+    Vrm0HumanoidPropertyGroup.pointer_to_last_bone_tree_index.clear()
     Vrm0BlendShapeGroupPropertyGroup.pending_preview_update_armature_data_names.clear()
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, ClassVar, Optional, Protocol
 
 import bpy
 from bpy.app.translations import pgettext
-from bpy.props import IntProperty, StringProperty
+from bpy.props import CollectionProperty, IntProperty, StringProperty
 from bpy.types import (
     ID,
     Armature,
@@ -28,7 +28,11 @@ from bpy.types import (
 )
 
 from ...common import shader
-from ...common.human_bone_mapper.human_bone_mapper import create_human_bone_mapping
+from ...common.human_bone_mapper.human_bone_mapper import (
+    HumanBoneMappingResult,
+    create_human_bone_mapping,
+    create_human_bone_mapping_results,
+)
 from ...common.logger import get_logger
 from ...common.shader import LegacyAddonMaterial
 from ...common.shape_key_mapper.arkit_mapping import (
@@ -59,7 +63,11 @@ from .. import search
 from ..extension_accessor import get_armature_extension, get_material_extension
 from ..menu import VRM_MT_bone_assignment
 from ..ops import VRM_OT_open_url_in_web_browser, layout_operator
-from ..property_group import HumanoidStructureBonePropertyGroup
+from ..property_group import (
+    CollectionPropertyProtocol,
+    HumanoidStructureBonePropertyGroup,
+    StringPropertyGroup,
+)
 from ..vrm0.property_group import (
     Vrm0HumanoidPropertyGroup,
 )
@@ -1717,7 +1725,10 @@ class VRM_OT_assign_vrm1_humanoid_human_bones_automatically(Operator):
 
 
 def assign_vrm1_humanoid_human_bones_automatically(
-    context: Context, armature: Object
+    context: Context,
+    armature: Object,
+    *,
+    generated_mapping: Optional[Mapping[str, HumanBoneSpecification]] = None,
 ) -> set[str]:
     if armature.type != "ARMATURE":
         return {"CANCELLED"}
@@ -1777,7 +1788,8 @@ def assign_vrm1_humanoid_human_bones_automatically(
         if human_bone_specification.requirement
     )
 
-    generated_mapping = create_human_bone_mapping(armature)
+    if generated_mapping is None:
+        generated_mapping = create_human_bone_mapping(armature)
     generated_required_bone_count = sum(
         1
         for human_bone_specification in generated_mapping.values()
@@ -1814,6 +1826,86 @@ def assign_vrm1_humanoid_human_bones_automatically(
     return {"FINISHED"}
 
 
+class VRM_OT_batch_assign_vrm1_humanoid_human_bones_automatically(Operator):
+    bl_idname = "vrm.batch_assign_vrm1_humanoid_human_bones_automatically"
+    bl_label = "Automatic Bone Assignment for Multiple Armatures"
+    bl_description = (
+        "Assign VRM 1.0 Humanoid Human Bones of the listed or selected armatures"
+    )
+    bl_options: ClassVar = {"REGISTER", "UNDO"}
+
+    armature_object_names: CollectionProperty(  # type: ignore[valid-type]
+        type=StringPropertyGroup,
+        options={"HIDDEN"},
+    )
+
+    def execute(self, context: Context) -> set[str]:
+        if self.armature_object_names:
+            armatures = [
+                armature
+                for armature_object_name in self.armature_object_names
+                if (
+                    armature := context.blend_data.objects.get(
+                        armature_object_name.value
+                    )
+                )
+                and armature.type == "ARMATURE"
+            ]
+        else:
+            armatures = [
+                obj for obj in context.selected_objects if obj.type == "ARMATURE"
+            ]
+        if not armatures:
+            return {"CANCELLED"}
+
+        results = batch_assign_vrm1_humanoid_human_bones_automatically(
+            context, armatures
+        )
+        assigned_count = sum(1 for _result, status in results if "FINISHED" in status)
+        self.report(
+            {"INFO"},
+            f"Assigned human bones of {assigned_count}/{len(results)} armatures",
+        )
+        return {"FINISHED"}
+
+    if TYPE_CHECKING:
+        # This code is auto generated.
+        # To regenerate, run the `uv run tools/property_typing.py` command.
+        armature_object_names: CollectionPropertyProtocol[  # type: ignore[no-redef]
+            StringPropertyGroup
+        ]
+
+
+def batch_assign_vrm1_humanoid_human_bones_automatically(
+    context: Context, armatures: Sequence[Object]
+) -> list[tuple[HumanBoneMappingResult, set[str]]]:
+    """Assign human bones of the armatures and return the results of each armature.
+
+    The mapping tables are prepared once for all armatures.
+    """
+    results: list[tuple[HumanBoneMappingResult, set[str]]] = []
+    for result in create_human_bone_mapping_results(armatures):
+        armature = context.blend_data.objects.get(result.armature_object_name)
+        if armature is None:
+            continue
+        status = assign_vrm1_humanoid_human_bones_automatically(
+            context, armature, generated_mapping=result.mapping
+        )
+        logger.info(
+            'Auto-assigned "%s" as "%s" bone mappings:'
+            " status=%s confidence=%.2f (%d/%d required bones) time=%.3fs",
+            result.armature_object_name,
+            result.mapping_name,
+            ",".join(sorted(status)),
+            result.confidence,
+            result.required_count,
+            result.wanted_required_count,
+            result.elapsed_seconds,
+        )
+        results.append((result, status))
+    return results
+
+
 class VRM_OT_update_vrm1_expression_ui_list_elements(Operator):
     bl_idname = "vrm.update_vrm1_expression_ui_list_elements"
     bl_label = "Update VRM 1.0 Expression UI List Elements"
@@ -46,6 +46,7 @@ from ...common.vrm1.human_bone import (
 from ..extension_accessor import get_armature_extension, get_material_extension
 from ..mtoon1.property_group import Mtoon1MatcapTextureInfoPropertyGroup
 from ..property_group import (
+    BoneTreeIndex,
     HumanoidStructureBonePropertyGroup,
     MaterialPropertyGroup,
     MeshObjectPropertyGroup,
@@ -68,12 +69,14 @@ class Vrm1HumanBoneNodePropertyGroup(HumanoidStructureBonePropertyGroup):
         target: HumanBoneSpecification,
         bpy_bone_name_to_human_bone_specification: dict[str, HumanBoneSpecification],
         error_bpy_bone_names: Sequence[str],
+        bone_tree_index: Optional[BoneTreeIndex] = None,
     ) -> bool:
         new_candidates = HumanoidStructureBonePropertyGroup.find_bone_candidates(
             armature_data,
             target,
             bpy_bone_name_to_human_bone_specification,
             error_bpy_bone_names,
+            bone_tree_index=bone_tree_index,
         )
 
         bone_name_candidates = self.bone_name_candidates
@@ -266,7 +269,7 @@ class Vrm1HumanBonesPropertyGroup(PropertyGroup):
     )
 
     # for UI
-    pointer_to_last_bone_names_str: ClassVar[dict[int, str]] = {}
+    pointer_to_last_bone_tree_index: ClassVar[dict[int, BoneTreeIndex]] = {}
     initial_automatic_bone_assignment: BoolProperty(  # type: ignore[valid-type]
         default=True
     )
@@ -482,22 +485,17 @@ class Vrm1HumanBonesPropertyGroup(PropertyGroup):
         if not ext.is_vrm1():
             return
 
-        bone_names_str = "\n".join(
-            sorted(
-                bone.name + "\n" + (parent.name if (parent := bone.parent) else "")
-                for bone in armature_data.bones.values()
-            )
-        )
+        bone_tree_index = BoneTreeIndex.get(armature_data)
         human_bones = ext.vrm1.humanoid.human_bones
         pointer_key = human_bones.as_pointer()
-        pointer_to_last_bone_names_str = human_bones.pointer_to_last_bone_names_str
-        last_bone_names_str = pointer_to_last_bone_names_str.get(pointer_key)
-        if not force and last_bone_names_str == bone_names_str:
+        pointer_to_last_bone_tree_index = human_bones.pointer_to_last_bone_tree_index
+        last_bone_tree_index = pointer_to_last_bone_tree_index.get(pointer_key)
+        if not force and last_bone_tree_index is bone_tree_index:
             return
-        pointer_to_last_bone_names_str[pointer_key] = bone_names_str
+        pointer_to_last_bone_tree_index[pointer_key] = bone_tree_index
 
         HumanoidStructureBonePropertyGroup.update_all_vrm1_bone_name_candidates(
-            armature_data
+            armature_data, bone_tree_index
         )
 
     if TYPE_CHECKING:
@@ -720,6 +718,45 @@ class Vrm1LookAtPropertyGroup(PropertyGroup):
             look_at = vrm1.look_at
             look_at.update_preview(context, armature_object, vrm1, check_only=False)
 
+    @staticmethod
+    def update_previews_affected_by_moved_objects(
+        context: Context, moved_object_names: set[str]
+    ) -> None:
+        """Update previews where the target or the armature follows moved objects.
+
+        Changes not caused by moving an object or its ancestors, such as
+        constraints, are left to LookAtPreviewUpdater.
+        """
+        if not moved_object_names:
+            return
+
+        def follows_moved_object(obj: Object) -> bool:
+            ancestor: Optional[Object] = obj
+            while ancestor:
+                if ancestor.name in moved_object_names:
+                    return True
+                ancestor = ancestor.parent
+            return False
+
+        for armature_object in context.visible_objects:
+            if armature_object.type != "ARMATURE":
+                continue
+            armature_data = armature_object.data
+            if not isinstance(armature_data, Armature):
+                continue
+            vrm1 = get_armature_extension(armature_data).vrm1
+            look_at = vrm1.look_at
+            if not look_at.enable_preview:
+                continue
+            preview_target_bpy_object = look_at.preview_target_bpy_object
+            if not preview_target_bpy_object:
+                continue
+            if not follows_moved_object(
+                preview_target_bpy_object
+            ) and not follows_moved_object(armature_object):
+                continue
+            look_at.update_preview(context, armature_object, vrm1, check_only=False)
+
     def update_preview(
         self,
         _context: Context,
@@ -2083,5 +2120,5 @@ class Vrm1PropertyGroup(PropertyGroup):
 
 
 def clear_global_variables() -> None:
-    Vrm1HumanBonesPropertyGroup.pointer_to_last_bone_names_str.clear()
+    Vrm1HumanBonesPropertyGroup.pointer_to_last_bone_tree_index.clear()
     Vrm1ExpressionPropertyGroup.pending_preview_update_armature_data_names.clear()
@@ -2,17 +2,27 @@
 import secrets
 import string
 from abc import ABC, abstractmethod
+from array import array
 from collections.abc import Generator, Mapping, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Optional, TypeVar, Union
+from typing import Final, Optional, TypeVar, Union
 
 import bmesh
 import bpy
-from bpy.types import Armature, Constraint, Context, Mesh, NodesModifier, Object
-from mathutils import Vector
+from bpy.types import (
+    Armature,
+    Constraint,
+    Context,
+    Key,
+    Mesh,
+    NodesModifier,
+    Object,
+    ShapeKey,
+)
 
 from ..common import shader
+from ..common.animation import suspend_shape_key_update
 from ..common.convert import Json
 from ..common.deep import make_json
 from ..common.logger import get_logger
@@ -22,6 +32,8 @@ from ..common.workspace import save_workspace
 from ..editor.extension_accessor import get_armature_extension, get_material_extension
 from ..editor.property_group import BonePropertyGroup, BonePropertyGroupType
 from ..editor.search import MESH_CONVERTIBLE_OBJECT_TYPES
+from ..editor.vrm0.property_group import Vrm0BlendShapeGroupPropertyGroup
+from ..editor.vrm1.property_group import Vrm1ExpressionPropertyGroup
 from ..external import io_scene_gltf2_support
 
 HumanBoneSpecification = TypeVar(
@@ -66,13 +78,58 @@ class AbstractBaseVrmExporter(ABC):
     def export(self) -> Optional[bytes]:
         pass
 
+    @staticmethod
+    def collect_blend_shape_proxy_preview_meshes(
+        context: Context,
+        armature_data: Armature,
+        export_objects: Sequence[Object],
+    ) -> list[Mesh]:
+        """Return the meshes whose shape keys the export or the previews touch."""
+        ext = get_armature_extension(armature_data)
+        mesh_object_names = [obj.name for obj in export_objects]
+        for blend_shape_group in ext.vrm0.blend_shape_master.blend_shape_groups:
+            mesh_object_names.extend(
+                bind.mesh.mesh_object_name for bind in blend_shape_group.binds
+            )
+        for expression in ext.vrm1.expressions.all_name_to_expression_dict().values():
+            mesh_object_names.extend(
+                morph_target_bind.node.mesh_object_name
+                for morph_target_bind in expression.morph_target_binds
+            )
+
+        meshes: list[Mesh] = []
+        mesh_names: set[str] = set()
+        for mesh_object_name in mesh_object_names:
+            mesh_object = context.blend_data.objects.get(mesh_object_name)
+            if not mesh_object:
+                continue
+            mesh = mesh_object.data
+            if not isinstance(mesh, Mesh) or mesh.name in mesh_names:
+                continue
+            mesh_names.add(mesh.name)
+            meshes.append(mesh)
+        return meshes
+
     @staticmethod
     def enter_clear_blend_shape_proxy_previews(
         context: Context,
         armature_data: Armature,
+        export_objects: Optional[Sequence[Object]] = None,
     ) -> tuple[Sequence[float], Mapping[str, float], Mapping[str, Mapping[str, float]]]:
+        """Set all expression previews to 0 and save the values to restore.
+
+        If export_objects is given, only the shape keys of the exported meshes
+        and the meshes bound to the expressions are saved instead of all meshes.
+        """
+        if export_objects is None:
+            meshes = list(context.blend_data.meshes)
+        else:
+            meshes = AbstractBaseVrmExporter.collect_blend_shape_proxy_preview_meshes(
+                context, armature_data, export_objects
+            )
+
         saved_key_block_values: dict[str, Mapping[str, float]] = {}
-        for mesh in context.blend_data.meshes:
+        for mesh in meshes:
             shape_keys = mesh.shape_keys
             if not shape_keys:
                 continue
@@ -83,17 +140,23 @@ class AbstractBaseVrmExporter(ABC):
         ext = get_armature_extension(armature_data)
 
         saved_vrm1_previews: dict[str, float] = {}
-        for (
-            name,
-            expression,
-        ) in ext.vrm1.expressions.all_name_to_expression_dict().items():
-            saved_vrm1_previews[name] = expression.preview
-            expression.preview = 0
-
         saved_vrm0_previews: list[float] = []
-        for blend_shape_group in ext.vrm0.blend_shape_master.blend_shape_groups:
-            saved_vrm0_previews.append(blend_shape_group.preview)
-            blend_shape_group.preview = 0
+        with suspend_shape_key_update():
+            for (
+                name,
+                expression,
+            ) in ext.vrm1.expressions.all_name_to_expression_dict().items():
+                saved_vrm1_previews[name] = expression.preview
+                expression.preview = 0
+
+            for blend_shape_group in ext.vrm0.blend_shape_master.blend_shape_groups:
+                saved_vrm0_previews.append(blend_shape_group.preview)
+                blend_shape_group.preview = 0
+
+        Vrm1ExpressionPropertyGroup.apply_pending_preview_update_to_armatures(context)
+        Vrm0BlendShapeGroupPropertyGroup.apply_pending_preview_update_to_armatures(
+            context
+        )
 
         return saved_vrm0_previews, saved_vrm1_previews, saved_key_block_values
 
@@ -107,20 +170,29 @@ class AbstractBaseVrmExporter(ABC):
     ) -> None:
         ext = get_armature_extension(armature_data)
 
-        for blend_shape_group, blend_shape_preview in reversed(
-            list(
-                zip(ext.vrm0.blend_shape_master.blend_shape_groups, saved_vrm0_previews)
-            )
-        ):
-            blend_shape_group.preview = blend_shape_preview
+        with suspend_shape_key_update():
+            for blend_shape_group, blend_shape_preview in reversed(
+                list(
+                    zip(
+                        ext.vrm0.blend_shape_master.blend_shape_groups,
+                        saved_vrm0_previews,
+                    )
+                )
+            ):
+                blend_shape_group.preview = blend_shape_preview
 
-        for (
-            name,
-            expression,
-        ) in ext.vrm1.expressions.all_name_to_expression_dict().items():
-            expression_preview = saved_vrm1_previews.get(name)
-            if expression_preview is not None:
-                expression.preview = expression_preview
+            for (
+                name,
+                expression,
+            ) in ext.vrm1.expressions.all_name_to_expression_dict().items():
+                expression_preview = saved_vrm1_previews.get(name)
+                if expression_preview is not None:
+                    expression.preview = expression_preview
+
+        Vrm0BlendShapeGroupPropertyGroup.apply_pending_preview_update_to_armatures(
+            context
+        )
+        Vrm1ExpressionPropertyGroup.apply_pending_preview_update_to_armatures(context)
 
         for mesh_name, key_block_name_to_values in reversed(
             list(saved_key_block_values.items())
@@ -143,7 +215,9 @@ class AbstractBaseVrmExporter(ABC):
         self, context: Context, armature_data: Armature
     ) -> Generator[None]:
         saved_vrm0_previews, saved_vrm1_previews, saved_key_block_values = (
-            self.enter_clear_blend_shape_proxy_previews(context, armature_data)
+            self.enter_clear_blend_shape_proxy_previews(
+                context, armature_data, self._export_objects
+            )
         )
         try:
             yield
@@ -536,6 +610,119 @@ def generate_evaluated_mesh(context: Context, obj: Object) -> Optional[Mesh]:
     return evaluated_mesh
 
 
+# Modifiers that neither move vertices nor change the topology
+VERTEX_POSITION_PRESERVING_MODIFIER_TYPES: Final = (
+    "NORMAL_EDIT",
+    "UV_PROJECT",
+    "UV_WARP",
+    "VERTEX_WEIGHT_EDIT",
+    "VERTEX_WEIGHT_MIX",
+    "VERTEX_WEIGHT_PROXIMITY",
+    "WEIGHTED_NORMAL",
+)
+
+
+def shape_keys_require_evaluation(obj: Object, shape_keys: Key) -> bool:
+    """Return False if each shape key evaluates to the basis plus its offsets.
+
+    In that case, the shape keys of the modifier-applied mesh can be built
+    without evaluating the depsgraph once per shape key.
+    """
+    if not shape_keys.use_relative:
+        return True
+    animation_data = shape_keys.animation_data
+    if animation_data and (animation_data.action or animation_data.drivers):
+        return True
+    if any(key_block.vertex_group for key_block in shape_keys.key_blocks):
+        return True
+    return any(
+        modifier.show_viewport
+        and modifier.type not in VERTEX_POSITION_PRESERVING_MODIFIER_TYPES
+        for modifier in obj.modifiers
+    )
+
+
+def get_vertex_coordinates(mesh: Mesh) -> "array[float]":
+    coordinates = array("f", bytes(len(mesh.vertices) * 3 * 4))
+    mesh.vertices.foreach_get("co", coordinates)
+    return coordinates
+
+
+def get_key_block_coordinates(key_block: ShapeKey) -> "array[float]":
+    coordinates = array("f", bytes(len(key_block.data) * 3 * 4))
+    key_block.data.foreach_get("co", coordinates)
+    return coordinates
+
+
+def copy_vertex_coordinates(
+    source_coordinates: Sequence[float], destination_key_block: ShapeKey
+) -> None:
+    destination_data = destination_key_block.data
+    destination_coordinates = get_key_block_coordinates(destination_key_block)
+
+    # TODO: If the number of vertices is different, we should use advanced
+    # graph matching algorithm.
+    length = min(len(destination_coordinates), len(source_coordinates))
+    destination_coordinates[:length] = array("f", source_coordinates[:length])
+    destination_data.foreach_set("co", destination_coordinates)
+
+
+def apply_shape_key_offsets_to_evaluated_mesh(
+    shape_keys: Key,
+    evaluated_mesh_data: Mesh,
+    evaluated_shape_keys: Key,
+) -> bool:
+    """Build the evaluated shape keys from a single evaluation and the offsets.
+
+    This requires that the modifiers preserve the vertex positions. See
+    shape_keys_require_evaluation().
+    """
+    reference_key = shape_keys.reference_key
+    if any(
+        len(key_block.data) != len(evaluated_mesh_data.vertices)
+        for key_block in shape_keys.key_blocks
+    ):
+        return False
+
+    evaluated_basis_coordinates = get_vertex_coordinates(evaluated_mesh_data)
+
+    key_block_name_to_coordinates: dict[str, array[float]] = {}
+
+    def get_coordinates(key_block: ShapeKey) -> "array[float]":
+        coordinates = key_block_name_to_coordinates.get(key_block.name)
+        if coordinates is None:
+            coordinates = get_key_block_coordinates(key_block)
+            key_block_name_to_coordinates[key_block.name] = coordinates
+        return coordinates
+
+    for key_block in shape_keys.key_blocks:
+        if key_block.name == reference_key.name:
+            continue
+        evaluated_key_block = evaluated_shape_keys.key_blocks.get(key_block.name)
+        if not evaluated_key_block:
+            continue
+
+        relative_key = key_block.relative_key
+        # The same value force_apply_modifiers() would assign
+        factor = max(key_block.slider_min, min(1.0, key_block.slider_max))
+        if key_block.mute or relative_key.name == key_block.name or not factor:
+            copy_vertex_coordinates(evaluated_basis_coordinates, evaluated_key_block)
+            continue
+
+        copy_vertex_coordinates(
+            [
+                basis + (value - relative_value) * factor
+                for basis, value, relative_value in zip(
+                    evaluated_basis_coordinates,
+                    get_coordinates(key_block),
+                    get_coordinates(relative_key),
+                )
+            ],
+            evaluated_key_block,
+        )
+    return True
+
+
 def force_apply_modifiers(context: Context, obj: Object) -> Optional[Mesh]:
     if obj.type not in MESH_CONVERTIBLE_OBJECT_TYPES:
         return None
@@ -569,6 +756,13 @@ def force_apply_modifiers(context: Context, obj: Object) -> Optional[Mesh]:
         if not evaluated_mesh_data_shape_keys:
             return evaluated_mesh_data
 
+        if not shape_keys_require_evaluation(
+            obj, shape_keys
+        ) and apply_shape_key_offsets_to_evaluated_mesh(
+            shape_keys, evaluated_mesh_data, evaluated_mesh_data_shape_keys
+        ):
+            return evaluated_mesh_data
+
         # If the mesh has shape keys, reproduce them as much as possible
         for key_block in shape_keys.key_blocks:
             evaluated_key_block = evaluated_mesh_data_shape_keys.key_blocks.get(
@@ -589,21 +783,9 @@ def force_apply_modifiers(context: Context, obj: Object) -> Optional[Mesh]:
                 preserve_all_data_layers=True, depsgraph=depsgraph
             )
             if baked_key_block_mesh:
-                evaluated_key_block_data = evaluated_key_block.data
-                baked_key_block_mesh_vertices = baked_key_block_mesh.vertices
-
-                # TODO: If the number of vertices is different, we should use advanced
-                # graph matching algorithm.
-                for i in range(
-                    min(
-                        len(evaluated_key_block_data),
-                        len(baked_key_block_mesh_vertices),
-                    )
-                ):
-                    evaluated_key_block_data[i].co = Vector(
-                        baked_key_block_mesh_vertices[i].co
-                    )
-
+                copy_vertex_coordinates(
+                    get_vertex_coordinates(baked_key_block_mesh), evaluated_key_block
+                )
                 baked_key_block_obj.to_mesh_clear()
             key_block.value = 0.0
 
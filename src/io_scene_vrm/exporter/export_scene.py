@@ -5,7 +5,13 @@ from typing import TYPE_CHECKING, ClassVar, Optional
 
 import bpy
 from bpy.app.translations import pgettext
-from bpy.props import BoolProperty, CollectionProperty, StringProperty
+from bpy.props import (
+    BoolProperty,
+    CollectionProperty,
+    EnumProperty,
+    FloatProperty,
+    StringProperty,
+)
 from bpy.types import (
     Armature,
     Context,
@@ -27,11 +33,17 @@ from ..common.preferences import (
     draw_export_preferences_layout,
     get_preferences,
 )
+from ..common.profiling import span
+from ..common.progress import ProgressCancelledError
 from ..common.workspace import save_workspace
 from ..editor import migration, search, validation
 from ..editor.extension_accessor import get_armature_extension
 from ..editor.ops import VRM_OT_open_url_in_web_browser, layout_operator
-from ..editor.property_group import CollectionPropertyProtocol, StringPropertyGroup
+from ..editor.property_group import (
+    CollectionPropertyProtocol,
+    StringPropertyGroup,
+    property_group_enum,
+)
 from ..editor.validation import VrmValidationError, WM_OT_vrm_validator
 from ..editor.vrm0.ops import assign_vrm0_humanoid_human_bones_automatically
 from ..editor.vrm0.panel import (
@@ -49,11 +61,10 @@ from ..editor.vrm1.panel import (
     draw_vrm1_humanoid_required_bones_layout,
 )
 from ..editor.vrm1.property_group import Vrm1HumanBonesPropertyGroup
-from .abstract_base_vrm_exporter import AbstractBaseVrmExporter
-from .khr_character_exporter import KhrCharacterExporter
-from .vrm0_exporter import Vrm0Exporter
-from .vrm1_exporter import Vrm1Exporter
-from .vrm_animation_exporter import VrmAnimationExporter
+from .vrm_animation_exporter import KeyframeReduction, VrmAnimationExporter
+
+if TYPE_CHECKING:
+    from .abstract_base_vrm_exporter import AbstractBaseVrmExporter
 
 _logger = get_logger(__name__)
 
@@ -137,12 +148,13 @@ class EXPORT_SCENE_OT_vrm(Operator, ExportHelper):
                     source=get_preferences(context), destination=self
                 )
 
-            return _export_vrm(
-                Path(self.filepath),
-                self,
-                context,
-                armature_object_name=self.armature_object_name,
-            )
+            with span("export_vrm"):
+                return _export_vrm(
+                    Path(self.filepath),
+                    self,
+                    context,
+                    armature_object_name=self.armature_object_name,
+                )
         except Exception:
             show_error_dialog(
                 pgettext("Failed to export VRM."),
@@ -250,12 +262,14 @@ def _export_vrm(
     *,
     armature_object_name: str,
 ) -> set[str]:
-    if WM_OT_vrm_validator.detect_errors(
-        context,
-        error_collection=None,
-        armature_object_name=armature_object_name,
-        execute_migration=True,
-    ):
+    with span("validate"):
+        has_errors = WM_OT_vrm_validator.detect_errors(
+            context,
+            error_collection=None,
+            armature_object_name=armature_object_name,
+            execute_migration=True,
+        )
+    if has_errors:
         return {"CANCELLED"}
 
     armature_objects, export_objects = _collect_export_objects(
@@ -291,6 +305,11 @@ def _export_vrm(
 
             migration.migrate(context, armature_object.name, heavy_migration=True)
 
+            # The exporters are imported on first use to keep the add-on startup fast
+            from .khr_character_exporter import KhrCharacterExporter
+            from .vrm0_exporter import Vrm0Exporter
+            from .vrm1_exporter import Vrm1Exporter
+
             if is_khr_character:
                 exporter: AbstractBaseVrmExporter = KhrCharacterExporter(
                     context,
@@ -312,7 +331,11 @@ def _export_vrm(
                     armature_object,
                 )
 
-            glb_bytes = exporter.export()
+            try:
+                glb_bytes = exporter.export()
+            except ProgressCancelledError:
+                _logger.warning("Cancelled exporting %s", filepath)
+                glb_bytes = None
     finally:
         if armature_object and armature_object_is_temporary:
             if not isinstance(armature_data := armature_object.data, Armature):
@@ -420,6 +443,39 @@ class VRM_PT_export_vrma_help(Panel):
         _draw_help_message(self.layout)
 
 
+class VRM_PT_export_vrma_keyframe_reduction(Panel):
+    bl_idname = "VRM_PT_export_vrma_keyframe_reduction"
+    bl_space_type = "FILE_BROWSER"
+    bl_region_type = "TOOL_PROPS"
+    bl_parent_id = "FILE_PT_operator"
+    bl_label = ""
+    bl_options: ClassVar = {"HIDE_HEADER"}
+
+    @classmethod
+    def poll(cls, context: Context) -> bool:
+        space_data = context.space_data
+        if not isinstance(space_data, SpaceFileBrowser):
+            return False
+        return space_data.active_operator.bl_idname == "EXPORT_SCENE_OT_vrma"
+
+    def draw(self, context: Context) -> None:
+        space_data = context.space_data
+        if not isinstance(space_data, SpaceFileBrowser):
+            return
+
+        operator = space_data.active_operator
+        if not isinstance(operator, EXPORT_SCENE_OT_vrma):
+            return
+
+        layout = self.layout
+        layout.prop(operator, "keyframe_reduction")
+        tolerance_column = layout.column()
+        tolerance_column.enabled = operator.keyframe_reduction != "NONE"
+        tolerance_column.prop(operator, "rotation_tolerance")
+        tolerance_column.prop(operator, "translation_tolerance")
+        tolerance_column.prop(operator, "expression_tolerance")
+
+
 def menu_export(menu_op: Operator, _context: Context) -> None:
     vrm_export_op = layout_operator(
         menu_op.layout, EXPORT_SCENE_OT_vrm, text="VRM (.vrm)"
@@ -450,6 +506,54 @@ class EXPORT_SCENE_OT_vrma(Operator, ExportHelper):
         options={"HIDDEN"},
     )
 
+    keyframe_reduction_enum, *__keyframe_reductions = property_group_enum(
+        ("NONE", "None", "Export every frame", "NONE", 0),
+        (
+            "SIMPLIFY",
+            "Simplify",
+            "Export only the frames needed to stay within the tolerances",
+            "NONE",
+            1,
+        ),
+        (
+            "SOURCE_KEYFRAMES",
+            "Source Keyframes",
+            "Export the frames of the source keyframes of each bone, expression"
+            + " and look at target. Frames are added where the tolerances are"
+            + " exceeded",
+            "NONE",
+            2,
+        ),
+    )
+    keyframe_reduction: EnumProperty(  # type: ignore[valid-type]
+        items=keyframe_reduction_enum.items(),
+        name="Keyframe Reduction",
+        description="Reduce the exported keyframes",
+    )
+    rotation_tolerance: FloatProperty(  # type: ignore[valid-type]
+        name="Rotation Tolerance",
+        description="Maximum rotation error of the humanoid bones",
+        subtype="ANGLE",
+        min=0.0,
+        default=KeyframeReduction.rotation_tolerance,
+    )
+    translation_tolerance: FloatProperty(  # type: ignore[valid-type]
+        name="Translation Tolerance",
+        description="Maximum translation error of the hips and the look at target",
+        subtype="DISTANCE",
+        min=0.0,
+        precision=4,
+        default=KeyframeReduction.translation_tolerance,
+    )
+    expression_tolerance: FloatProperty(  # type: ignore[valid-type]
+        name="Expression Tolerance",
+        description="Maximum error of the expression preview values",
+        min=0.0,
+        max=1.0,
+        precision=4,
+        default=KeyframeReduction.expression_tolerance,
+    )
+
     def execute(self, context: Context) -> set[str]:
         try:
             if WM_OT_vrma_export_prerequisite.detect_errors(
@@ -464,7 +568,17 @@ class EXPORT_SCENE_OT_vrma(Operator, ExportHelper):
                 armature = context.blend_data.objects.get(self.armature_object_name)
             if not armature:
                 return {"CANCELLED"}
-            return VrmAnimationExporter.execute(context, Path(self.filepath), armature)
+            return VrmAnimationExporter.execute(
+                context,
+                Path(self.filepath),
+                armature,
+                keyframe_reduction=KeyframeReduction(
+                    mode=self.keyframe_reduction,
+                    rotation_tolerance=self.rotation_tolerance,
+                    translation_tolerance=self.translation_tolerance,
+                    expression_tolerance=self.expression_tolerance,
+                ),
+            )
         except Exception:
             show_error_dialog(
                 pgettext("Failed to export VRM Animation."),
@@ -490,6 +604,10 @@ class EXPORT_SCENE_OT_vrma(Operator, ExportHelper):
         # To regenerate, run the `uv run tools/property_typing.py` command.
         filter_glob: str  # type: ignore[no-redef]
         armature_object_name: str  # type: ignore[no-redef]
+        keyframe_reduction: str  # type: ignore[no-redef]
+        rotation_tolerance: float  # type: ignore[no-redef]
+        translation_tolerance: float  # type: ignore[no-redef]
+        expression_tolerance: float  # type: ignore[no-redef]
 
 
 class WM_OT_vrm_export_human_bones_assignment(Operator):
@@ -2,11 +2,12 @@
 import bpy
 from io_scene_gltf2.io.com import gltf2_io
 
-from .abstract_base_vrm_exporter import AbstractBaseVrmExporter
-
 
 class glTF2ExportUserExtension:
     def __init__(self) -> None:
+        # Imported here because this module is loaded on the add-on startup
+        from .abstract_base_vrm_exporter import AbstractBaseVrmExporter
+
         context = bpy.context
 
         self.object_name_to_modifier_names = (
@@ -14,6 +15,8 @@ class glTF2ExportUserExtension:
         )
 
     def cleanup(self) -> None:
+        from .abstract_base_vrm_exporter import AbstractBaseVrmExporter
+
         context = bpy.context
 
         AbstractBaseVrmExporter.exit_hide_mtoon1_outline_geometry_nodes(
@@ -6,6 +6,7 @@ import math
 import re
 import statistics
 import struct
+from array import array
 from collections.abc import Mapping, MutableSequence, Sequence
 from dataclasses import dataclass, field
 from os import environ
@@ -45,6 +46,7 @@ from ..common.gltf import (
 )
 from ..common.logger import get_logger
 from ..common.mtoon_unversioned import MtoonUnversioned
+from ..common.profiling import span
 from ..common.progress import Progress, create_progress
 from ..common.shader import LegacyAddonMaterial, MmdMaterial
 from ..common.version import get_addon_version
@@ -269,7 +271,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             json_dict: dict[str, Json] = {}
             buffer0 = bytearray()
             self.write_glb_structure(progress, json_dict, buffer0)
-            return gltf.pack_glb(json_dict, buffer0)
+            with span("pack_glb"):
+                return gltf.pack_glb(json_dict, buffer0)
 
     @staticmethod
     def enter_setup_flexible_hierarchy_bones(
@@ -391,20 +394,21 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             mesh_object_name_to_mesh_index,
             material_name_to_material_index,
         )
-        self.write_extensions_vrm(
-            progress,
-            mesh_dicts,
-            texture_dicts,
-            sampler_dicts,
-            image_dicts,
-            buffer_view_dicts,
-            extensions_vrm_dict,
-            extensions_used,
-            buffer0,
-            image_name_to_image_index,
-            bone_name_to_node_index,
-            mesh_object_name_to_mesh_index,
-        )
+        with progress.phase("write_extensions_vrm", 1):
+            self.write_extensions_vrm(
+                progress,
+                mesh_dicts,
+                texture_dicts,
+                sampler_dicts,
+                image_dicts,
+                buffer_view_dicts,
+                extensions_vrm_dict,
+                extensions_used,
+                buffer0,
+                image_name_to_image_index,
+                bone_name_to_node_index,
+                mesh_object_name_to_mesh_index,
+            )
 
         if scene_dicts:
             json_dict["scenes"] = make_json(scene_dicts)
@@ -914,14 +918,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
     ) -> None:
         scene0_nodes: list[Json] = []
 
-        armature_root_node_indices, skin_dict, skin_joints = self.write_armature(
-            progress,
-            node_dicts,
-            accessor_dicts,
-            buffer_view_dicts,
-            buffer0,
-            bone_name_to_node_index,
-        )
+        with progress.phase("write_armature", 0.35):
+            armature_root_node_indices, skin_dict, skin_joints = self.write_armature(
+                progress,
+                node_dicts,
+                accessor_dicts,
+                buffer_view_dicts,
+                buffer0,
+                bone_name_to_node_index,
+            )
         scene0_nodes.extend(armature_root_node_indices)
         scene0_nodes.extend(
             self.write_mesh_nodes(
@@ -2447,7 +2452,7 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
     def write_materials(
         self,
-        _progress: Progress,
+        progress: Progress,
         material_dicts: list[dict[str, Json]],
         texture_dicts: list[dict[str, Json]],
         sampler_dicts: list[dict[str, Json]],
@@ -2460,22 +2465,25 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         image_name_to_image_index: dict[str, int],
     ) -> None:
         gltf2_io_texture_images: list[Vrm0Exporter.Gltf2IoTextureImage] = []
-        for material in search.export_materials(self._context, self._export_objects):
-            self.write_material(
-                _progress,
-                material_dicts,
-                texture_dicts,
-                sampler_dicts,
-                image_dicts,
-                buffer_view_dicts,
-                extensions_vrm_material_property_dicts,
-                extensions_used,
-                buffer0,
-                material_name_to_material_index,
-                image_name_to_image_index,
-                gltf2_io_texture_images,
-                material,
-            )
+        materials = list(search.export_materials(self._context, self._export_objects))
+        with progress.phase("write_materials", 0.3) as phase_progress:
+            for material_index, material in enumerate(materials):
+                self.write_material(
+                    progress,
+                    material_dicts,
+                    texture_dicts,
+                    sampler_dicts,
+                    image_dicts,
+                    buffer_view_dicts,
+                    extensions_vrm_material_property_dicts,
+                    extensions_used,
+                    buffer0,
+                    material_name_to_material_index,
+                    image_name_to_image_index,
+                    gltf2_io_texture_images,
+                    material,
+                )
+                phase_progress.update_items(material_index + 1, len(materials))
 
     def write_armature(
         self,
@@ -2548,30 +2556,19 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             _logger.error("No human bone")
             return [root_node_index], {}, []
 
-        while len(buffer0) % 4:
-            buffer0.append(0)
-        inverse_bind_matrices_offset = len(buffer0)
-
         skin_joint_node_indices: list[int] = []
-        inverse_bind_matrix_struct = struct.Struct("<16f")
+        inverse_bind_matrix_floats = array("f")
         for bone_name, node_index in bone_name_to_node_index.items():
             skin_joint_node_indices.append(node_index)
             inverse_bind_matrix = bone_name_to_inverse_bind_matrix.get(bone_name)
             if inverse_bind_matrix is None:
                 message = f"No inverse bind matrix for {bone_name}"
                 raise AssertionError(message)
-            buffer0.extend(
-                inverse_bind_matrix_struct.pack(*itertools.chain(*inverse_bind_matrix))
-            )
+            inverse_bind_matrix_floats.extend(itertools.chain(*inverse_bind_matrix))
 
-        buffer_view_index = len(buffer_view_dicts)
-        buffer_view_dicts.append(
-            {
-                "buffer": 0,
-                "byteOffset": inverse_bind_matrices_offset,
-                "byteLength": len(buffer0) - inverse_bind_matrices_offset,
-            }
-        )
+        buffer_view_index = gltf.BufferBuilder(
+            buffer0, buffer_view_dicts, accessor_dicts
+        ).append_buffer_view(inverse_bind_matrix_floats)
 
         accessor_index = len(accessor_dicts)
         accessor_dicts.append(
@@ -3213,25 +3210,15 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
         primitive_dicts: list[dict[str, Json]] = []
 
-        while len(buffer0) % 4:
-            buffer0.append(0)
-
-        # TODO: Make buffer writing class independent
+        buffer_builder = gltf.BufferBuilder(buffer0, buffer_view_dicts, accessor_dicts)
 
         # Write indices
         for (
             primitive_material_index,
             vertex_indices,
         ) in material_index_to_vertex_indices.items():
-            indices_buffer_offset = len(buffer0)
-            buffer0.extend(vertex_indices)
-            indices_buffer_view_index = len(buffer_view_dicts)
-            buffer_view_dicts.append(
-                {
-                    "buffer": 0,
-                    "byteOffset": indices_buffer_offset,
-                    "byteLength": len(vertex_indices),
-                }
+            indices_buffer_view_index = buffer_builder.append_buffer_view(
+                vertex_indices
             )
             indices_accessor_index = len(accessor_dicts)
             if vertex_indices_struct.size == 0:
@@ -3265,15 +3252,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         for primitive_dict in primitive_dicts:
             primitive_dict["attributes"] = primitive_attribute_dict
 
-        position_buffer_offset = len(buffer0)
-        buffer0.extend(vertex_attributes_collector.position)
-        position_buffer_view_index = len(buffer_view_dicts)
-        buffer_view_dicts.append(
-            {
-                "buffer": 0,
-                "byteOffset": position_buffer_offset,
-                "byteLength": len(vertex_attributes_collector.position),
-            }
+        position_buffer_view_index = buffer_builder.append_buffer_view(
+            vertex_attributes_collector.position
         )
         position_accessor_index = len(accessor_dicts)
 
@@ -3298,15 +3278,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         )
         primitive_attribute_dict["POSITION"] = position_accessor_index
 
-        normal_buffer_offset = len(buffer0)
-        buffer0.extend(vertex_attributes_collector.normal)
-        normal_buffer_view_index = len(buffer_view_dicts)
-        buffer_view_dicts.append(
-            {
-                "buffer": 0,
-                "byteOffset": normal_buffer_offset,
-                "byteLength": len(vertex_attributes_collector.normal),
-            }
+        normal_buffer_view_index = buffer_builder.append_buffer_view(
+            vertex_attributes_collector.normal
         )
         normal_accessor_index = len(accessor_dicts)
         accessor_dicts.append(
@@ -3322,15 +3295,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
         primitive_texcoord = vertex_attributes_collector.texcoord
         if primitive_texcoord:
-            texcoord_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_texcoord)
-            texcoord_buffer_view_index = len(buffer_view_dicts)
-            buffer_view_dicts.append(
-                {
-                    "buffer": 0,
-                    "byteOffset": texcoord_buffer_offset,
-                    "byteLength": len(primitive_texcoord),
-                }
+            texcoord_buffer_view_index = buffer_builder.append_buffer_view(
+                primitive_texcoord
             )
             texcoord_accessor_index = len(accessor_dicts)
             accessor_dicts.append(
@@ -3346,15 +3312,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
         primitive_joints = vertex_attributes_collector.joints
         if primitive_joints:
-            joints_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_joints)
-            joints_buffer_view_index = len(buffer_view_dicts)
-            buffer_view_dicts.append(
-                {
-                    "buffer": 0,
-                    "byteOffset": joints_buffer_offset,
-                    "byteLength": len(primitive_joints),
-                }
+            joints_buffer_view_index = buffer_builder.append_buffer_view(
+                primitive_joints
             )
             joints_accessor_index = len(accessor_dicts)
             accessor_dicts.append(
@@ -3370,18 +3329,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
 
         primitive_weights = vertex_attributes_collector.weights
         if primitive_weights:
-            while len(buffer0) % 4:
-                buffer0.append(0)
-
-            weights_buffer_offset = len(buffer0)
-            buffer0.extend(primitive_weights)
-            weights_buffer_view_index = len(buffer_view_dicts)
-            buffer_view_dicts.append(
-                {
-                    "buffer": 0,
-                    "byteOffset": weights_buffer_offset,
-                    "byteLength": len(primitive_weights),
-                }
+            weights_buffer_view_index = buffer_builder.append_buffer_view(
+                primitive_weights
             )
             weights_accessor_index = len(accessor_dicts)
             accessor_dicts.append(
@@ -3398,20 +3347,10 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
         # Made targets shared by design
         morph_target_names = make_json(vertex_morph_target_collectors.keys())
         if vertex_morph_target_collectors:
-            while len(buffer0) % 4:
-                buffer0.append(0)
-
             primitive_target_dicts: list[dict[str, Json]] = []
             for target in vertex_morph_target_collectors.values():
-                target_position_buffer_offset = len(buffer0)
-                buffer0.extend(target.position)
-                target_position_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": 0,
-                        "byteOffset": target_position_buffer_offset,
-                        "byteLength": len(target.position),
-                    }
+                target_position_buffer_view_index = buffer_builder.append_buffer_view(
+                    target.position
                 )
                 target_position_accessor_index = len(accessor_dicts)
 
@@ -3435,15 +3374,8 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
                     }
                 )
 
-                target_normal_buffer_offset = len(buffer0)
-                buffer0.extend(target.normal)
-                target_normal_buffer_view_index = len(buffer_view_dicts)
-                buffer_view_dicts.append(
-                    {
-                        "buffer": 0,
-                        "byteOffset": target_normal_buffer_offset,
-                        "byteLength": len(target.normal),
-                    }
+                target_normal_buffer_view_index = buffer_builder.append_buffer_view(
+                    target.normal
                 )
                 target_normal_accessor_index = len(accessor_dicts)
                 accessor_dicts.append(
@@ -3593,31 +3525,33 @@ class Vrm0Exporter(AbstractBaseVrmExporter):
             if not swapped:
                 break
 
-        for obj in self._export_objects:
-            node_index = None
-            with save_workspace(self._context, obj):
-                node_index = self.write_mesh_node(
-                    progress,
-                    node_dicts,
-                    mesh_dicts,
-                    skin_dicts,
-                    material_dicts,
-                    accessor_dicts,
-                    buffer_view_dicts,
-                    extensions_vrm_material_property_dicts,
-                    buffer0,
-                    object_name_to_node_index,
-                    bone_name_to_node_index,
-                    obj,
-                    mesh_convertible_objects,
-                    mesh_object_name_to_mesh_index,
-                    material_name_to_material_index,
-                    skin_dict,
-                    skin_joints,
-                )
-            if node_index is None:
-                continue
-            node_indices.append(node_index)
+        with progress.phase("write_mesh_nodes", 0.9) as phase_progress:
+            for object_index, obj in enumerate(self._export_objects):
+                node_index = None
+                with save_workspace(self._context, obj):
+                    node_index = self.write_mesh_node(
+                        progress,
+                        node_dicts,
+                        mesh_dicts,
+                        skin_dicts,
+                        material_dicts,
+                        accessor_dicts,
+                        buffer_view_dicts,
+                        extensions_vrm_material_property_dicts,
+                        buffer0,
+                        object_name_to_node_index,
+                        bone_name_to_node_index,
+                        obj,
+                        mesh_convertible_objects,
+                        mesh_object_name_to_mesh_index,
+                        material_name_to_material_index,
+                        skin_dict,
+                        skin_joints,
+                    )
+                phase_progress.update_items(object_index + 1, len(self._export_objects))
+                if node_index is None:
+                    continue
+                node_indices.append(node_index)
 
         return node_indices
 
@@ -40,6 +40,8 @@ from ..common.gl import GL_LINEAR, GL_REPEAT
 from ..common.gltf import pack_glb, parse_glb, parse_gltf_node_matrix
 from ..common.logger import get_logger
 from ..common.preferences import ExportPreferencesProtocol
+from ..common.profiling import span
+from ..common.progress import PartialProgress, Progress, create_progress
 from ..common.rotation import (
     ROTATION_MODE_EULER,
     get_rotation_as_quaternion,
@@ -2088,6 +2090,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
     @classmethod
     def save_vrm_materials(
         cls,
+        progress: PartialProgress,
         context: Context,
         json_dict: dict[str, Json],
         buffer0: bytearray,
@@ -2100,7 +2103,10 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             material_dicts = []
             json_dict["materials"] = material_dicts
 
-        for material_name, index in material_name_to_index_dict.items():
+        for material_index, (material_name, index) in enumerate(
+            material_name_to_index_dict.items()
+        ):
+            progress.update_items(material_index + 1, len(material_name_to_index_dict))
             material = context.blend_data.materials.get(material_name)
             if not isinstance(material, Material) or not (
                 0 <= index < len(material_dicts)
@@ -2832,6 +2838,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             self.enable_deform_for_all_referenced_bones(armature_data),
             setup_humanoid_t_pose(self._context, self._armature),
             self.overwrite_object_visibility_and_selection(),
+            create_progress(self._context) as progress,
         ):
             with (
                 self.disable_constraints(self._context),
@@ -2842,37 +2849,42 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
                 self.assign_export_custom_properties(),
                 tempfile.TemporaryDirectory() as temp_dir,
             ):
-                _force_apply_modifiers_to_objects(
-                    self._context, self._armature, mesh_compat_object_names
-                )
-                _remove_inactive_uv_maps(self._context, mesh_compat_object_names)
+                with progress.phase("apply_modifiers", 0.2) as phase_progress:
+                    _force_apply_modifiers_to_objects(
+                        phase_progress,
+                        self._context,
+                        self._armature,
+                        mesh_compat_object_names,
+                    )
+                    _remove_inactive_uv_maps(self._context, mesh_compat_object_names)
 
                 filepath = Path(temp_dir, "out.glb")
-                export_scene_gltf_result = export_scene_gltf(
-                    ExportSceneGltfArguments(
-                        filepath=str(filepath),
-                        check_existing=False,
-                        export_format="GLB",
-                        export_extras=True,
-                        export_def_bones=True,
-                        export_current_frame=True,
-                        use_selection=True,
-                        use_active_scene=True,
-                        export_animations=self._export_gltf_animations,
-                        export_armature_object_remove=(
-                            self.gltf_export_armature_object_remove(
-                                self._context, mesh_compat_object_names
-                            )
-                        ),
-                        export_rest_position_armature=False,
-                        export_apply=False,
-                        # Models may appear incorrectly in many viewers
-                        export_all_influences=self._export_all_influences,
-                        export_lights=self._export_lights,
-                        export_try_sparse_sk=self._export_try_sparse_sk,
-                        export_vertex_color="MATERIAL",
+                with progress.phase("export_scene_gltf", 0.7):
+                    export_scene_gltf_result = export_scene_gltf(
+                        ExportSceneGltfArguments(
+                            filepath=str(filepath),
+                            check_existing=False,
+                            export_format="GLB",
+                            export_extras=True,
+                            export_def_bones=True,
+                            export_current_frame=True,
+                            use_selection=True,
+                            use_active_scene=True,
+                            export_animations=self._export_gltf_animations,
+                            export_armature_object_remove=(
+                                self.gltf_export_armature_object_remove(
+                                    self._context, mesh_compat_object_names
+                                )
+                            ),
+                            export_rest_position_armature=False,
+                            export_apply=False,
+                            # Models may appear incorrectly in many viewers
+                            export_all_influences=self._export_all_influences,
+                            export_lights=self._export_lights,
+                            export_try_sparse_sk=self._export_try_sparse_sk,
+                            export_vertex_color="MATERIAL",
+                        )
                     )
-                )
                 if export_scene_gltf_result == {"CANCELLED"}:
                     return None
                 if export_scene_gltf_result != {"FINISHED"}:
@@ -2882,7 +2894,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
                     )
                     raise AssertionError(message)
                 extra_name_assigned_glb = filepath.read_bytes()
-            vrm_bytes = self.add_vrm_extension_to_glb(extra_name_assigned_glb)
+            vrm_bytes = self.add_vrm_extension_to_glb(progress, extra_name_assigned_glb)
             if vrm_bytes is None:
                 return None
             _logger.info("Generated VRM size: %s bytes", len(vrm_bytes))
@@ -3010,7 +3022,7 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             armature_node_dict["name"] = "secondary"  # Assign dummy name
 
     def add_vrm_extension_to_glb(
-        self, extra_name_assigned_glb: bytes
+        self, progress: Progress, extra_name_assigned_glb: bytes
     ) -> Optional[bytes]:
         armature_data = self._armature.data
         if not isinstance(armature_data, Armature):
@@ -3100,9 +3112,10 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
 
         node_constraint_spec_version = "1.0"
         use_node_constraint = False
-        object_constraints, bone_constraints, _ = search.export_constraints(
-            self._export_objects, self._armature
-        )
+        with span("export_constraints"):
+            object_constraints, bone_constraints, _ = search.export_constraints(
+                self._export_objects, self._armature
+            )
 
         for object_name, node_index in object_name_to_index_dict.items():
             if not (0 <= node_index < len(node_dicts)):
@@ -3176,14 +3189,16 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             if not extras_dict:
                 material_dict.pop("extras", None)
 
-        self.save_vrm_materials(
-            self._context,
-            json_dict,
-            buffer0,
-            material_name_to_index_dict,
-            image_name_to_index_dict,
-            self._gltf2_addon_export_settings,
-        )
+        with progress.phase("save_vrm_materials", 0.9) as phase_progress:
+            self.save_vrm_materials(
+                phase_progress,
+                self._context,
+                json_dict,
+                buffer0,
+                material_name_to_index_dict,
+                image_name_to_index_dict,
+                self._gltf2_addon_export_settings,
+            )
         self.unassign_normal_from_mtoon_primitive_morph_target(
             self._context, json_dict, material_name_to_index_dict
         )
@@ -3315,7 +3330,8 @@ class Vrm1Exporter(AbstractBaseVrmExporter):
             if not json_dict.get(key):
                 json_dict.pop(key, None)
 
-        return pack_glb(json_dict, buffer0)
+        with span("pack_glb"):
+            return pack_glb(json_dict, buffer0)
 
 
 def _remove_inactive_uv_maps(
@@ -3410,6 +3426,7 @@ def _set_node_matrix(node_dict: dict[str, Json], matrix: Matrix) -> None:
 
 
 def _force_apply_modifiers_to_objects(
+    progress: PartialProgress,
     context: Context,
     armature_object: Object,
     mesh_compatible_object_names: Sequence[str],
@@ -3417,10 +3434,13 @@ def _force_apply_modifiers_to_objects(
     selected_object_names: list[str] = [
         obj.name for obj in context.selectable_objects if obj.select_get()
     ]
-    for mesh_compatible_object_name in mesh_compatible_object_names:
+    for object_index, mesh_compatible_object_name in enumerate(
+        mesh_compatible_object_names
+    ):
         _force_apply_modifiers_to_object(
             context, armature_object, mesh_compatible_object_name
         )
+        progress.update_items(object_index + 1, len(mesh_compatible_object_names))
     for obj in context.selectable_objects:
         obj.select_set(obj.name in selected_object_names)
 
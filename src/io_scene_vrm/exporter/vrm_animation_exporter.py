@@ -1,16 +1,19 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import itertools
-import struct
-from collections.abc import Mapping, Sequence
+import math
+from array import array
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from os import environ
 from pathlib import Path
 from sys import float_info
-from typing import Optional
+from typing import Optional, TypeVar
 
 import bpy
 from bpy.types import (
     Action,
     Armature,
+    Constraint,
     Context,
     FCurve,
     Object,
@@ -21,9 +24,16 @@ from mathutils import Matrix, Quaternion, Vector
 from ..common import version
 from ..common.convert import Json
 from ..common.deep import make_json
-from ..common.gl import GL_FLOAT
-from ..common.gltf import pack_glb
+from ..common.fcurve import evaluate_fcurve
+from ..common.gltf import BufferBuilder, ChunkedBuffer, write_glb
 from ..common.logger import get_logger
+from ..common.profiling import span
+from ..common.progress import (
+    PartialProgress,
+    Progress,
+    ProgressCancelledError,
+    create_progress,
+)
 from ..common.vrm1.human_bone import (
     HumanBoneName,
     HumanBoneSpecification,
@@ -32,25 +42,232 @@ from ..common.vrm1.human_bone import (
 from ..common.workspace import save_workspace
 from ..editor.extension_accessor import get_armature_extension
 from ..editor.t_pose import setup_humanoid_t_pose
-from ..editor.vrm1.property_group import Vrm1HumanBonesPropertyGroup, Vrm1PropertyGroup
+from ..editor.vrm1.property_group import (
+    Vrm1HumanBonePropertyGroup,
+    Vrm1HumanBonesPropertyGroup,
+    Vrm1PropertyGroup,
+)
 
 _logger = get_logger(__name__)
 
+SampledValue = TypeVar("SampledValue", Quaternion, Vector)
+
+
+@dataclass(frozen=True)
+class KeyframeReduction:
+    """Which of the sampled frames are exported for each animation channel.
+
+    mode is one of:
+    - "NONE": Export every frame between the frame start and the frame end.
+    - "SIMPLIFY": Export only the frames needed to linearly interpolate every
+      sampled frame within the tolerance of the channel.
+    - "SOURCE_KEYFRAMES": Export the frames of the source keyframes that move
+      the channel, adding sampled frames only where they are not enough to
+      stay within the tolerance of the channel.
+    """
+
+    mode: str = "NONE"
+    rotation_tolerance: float = math.radians(0.1)
+    translation_tolerance: float = 0.0001
+    expression_tolerance: float = 0.001
+
+    def reduce(
+        self,
+        sample_count: int,
+        source_frame_offsets: Iterable[int],
+        calculate_error: Callable[[int, int, int], float],
+        tolerance: float,
+    ) -> Sequence[int]:
+        """Return the sorted indices of the samples to export.
+
+        calculate_error(begin, end, index) returns the error of the sample at
+        index when it is interpolated from the samples at begin and end.
+        """
+        if self.mode not in {"SIMPLIFY", "SOURCE_KEYFRAMES"} or sample_count <= 2:
+            return range(sample_count)
+
+        last_index = sample_count - 1
+        indices = {0, last_index}
+        if self.mode == "SOURCE_KEYFRAMES":
+            indices.update(
+                offset for offset in source_frame_offsets if 0 < offset < last_index
+            )
+
+        # Ramer-Douglas-Peucker algorithm
+        sorted_indices = sorted(indices)
+        spans = list(zip(sorted_indices, sorted_indices[1:]))
+        while spans:
+            begin, end = spans.pop()
+            worst_index: Optional[int] = None
+            worst_error = tolerance
+            for index in range(begin + 1, end):
+                error = calculate_error(begin, end, index)
+                if error > worst_error:
+                    worst_index = index
+                    worst_error = error
+            if worst_index is None:
+                continue
+            indices.add(worst_index)
+            spans.append((begin, worst_index))
+            spans.append((worst_index, end))
+        return sorted(indices)
+
+
+def _get_source_frame_offsets(
+    fcurves: Iterable[FCurve], frame_start: int, frame_end: int
+) -> set[int]:
+    frame_offsets: set[int] = set()
+    for fcurve in fcurves:
+        for keyframe in fcurve.keyframe_points:
+            frame = keyframe.co[0]
+            for rounded_frame in (math.floor(frame), math.ceil(frame)):
+                if frame_start <= rounded_frame <= frame_end:
+                    frame_offsets.add(rounded_frame - frame_start)
+    return frame_offsets
+
+
+def _create_bone_name_to_fcurves(
+    armature: Object, fcurves: Iterable[FCurve]
+) -> dict[str, list[FCurve]]:
+    bone_path_to_bone_name = {
+        pose_bone.path_from_id(): pose_bone.name for pose_bone in armature.pose.bones
+    }
+    bone_name_to_fcurves: dict[str, list[FCurve]] = {}
+    for fcurve in fcurves:
+        if fcurve.mute:
+            continue
+        if not fcurve.is_valid:
+            continue
+        data_path = fcurve.data_path
+        # Bone names may contain '"]', so try every candidate end of the path
+        end = data_path.find('"]')
+        while end >= 0:
+            bone_name = bone_path_to_bone_name.get(data_path[: end + 2])
+            if bone_name is not None:
+                bone_name_to_fcurves.setdefault(bone_name, []).append(fcurve)
+                break
+            end = data_path.find('"]', end + 1)
+    return bone_name_to_fcurves
+
+
+def _get_bone_source_frame_offsets(
+    armature: Object,
+    bone_name_to_fcurves: Mapping[str, Sequence[FCurve]],
+    bone_name: str,
+    parent_bone_name: Optional[str],
+    frame_start: int,
+    frame_end: int,
+) -> set[int]:
+    """Return the frame offsets of the keyframes that move the bone.
+
+    The keyframes of the bone and its ancestors below parent_bone_name move the
+    bone relative to parent_bone_name.
+    """
+    fcurves: list[FCurve] = []
+    pose_bone = armature.pose.bones.get(bone_name)
+    while pose_bone and pose_bone.name != parent_bone_name:
+        fcurves.extend(bone_name_to_fcurves.get(pose_bone.name, []))
+        pose_bone = pose_bone.parent
+    return _get_source_frame_offsets(fcurves, frame_start, frame_end)
+
+
+def _calculate_rotation_error(
+    quaternions: Sequence[Quaternion], begin: int, end: int, index: int
+) -> float:
+    interpolated_quaternion = quaternions[begin].slerp(
+        quaternions[end], (index - begin) / (end - begin)
+    )
+    return 2 * math.acos(min(1.0, abs(interpolated_quaternion.dot(quaternions[index]))))
+
+
+def _calculate_translation_error(
+    translations: Sequence[Vector], begin: int, end: int, index: int
+) -> float:
+    interpolated_translation = translations[begin].lerp(
+        translations[end], (index - begin) / (end - begin)
+    )
+    return (interpolated_translation - translations[index]).length
+
+
+def _create_sampled_error_function(
+    samples: "array[float]",
+    component_count: int,
+    create_value: Callable[[Sequence[float]], SampledValue],
+    calculate_error: Callable[[Sequence[SampledValue], int, int, int], float],
+) -> Callable[[int, int, int], float]:
+    """Wrap calculate_error to take the components of the samples in an array.
+
+    The samples are unpacked into mathutils values on the first call only, so
+    no values are created unless the keyframes are reduced, and only the values
+    of the channel being reduced exist at a time.
+    """
+    values: list[SampledValue] = []
+
+    def calculate_sampled_error(begin: int, end: int, index: int) -> float:
+        if not values:
+            values.extend(
+                create_value(samples[offset : offset + component_count])
+                for offset in range(0, len(samples), component_count)
+            )
+        return calculate_error(values, begin, end, index)
+
+    return calculate_sampled_error
+
+
+def _calculate_expression_error(
+    expression_values: Sequence[float],
+    begin: int,
+    end: int,
+    index: int,
+) -> float:
+    begin_value = expression_values[begin]
+    end_value = expression_values[end]
+    factor = (index - begin) / (end - begin)
+    return abs(
+        begin_value + (end_value - begin_value) * factor - expression_values[index]
+    )
+
+
+def _create_timestamps(
+    frame_indices: Iterable[int], frame_to_timestamp_factor: float
+) -> "array[float]":
+    return array("f", (frame * frame_to_timestamp_factor for frame in frame_indices))
+
 
 class VrmAnimationExporter:
     @staticmethod
-    def execute(context: Context, path: Path, armature: Object) -> set[str]:
+    def execute(
+        context: Context,
+        path: Path,
+        armature: Object,
+        *,
+        keyframe_reduction: Optional[KeyframeReduction] = None,
+    ) -> set[str]:
+        if keyframe_reduction is None:
+            keyframe_reduction = KeyframeReduction()
         armature_data = armature.data
         if not isinstance(armature_data, Armature):
             return {"CANCELLED"}
 
-        with (
-            setup_humanoid_t_pose(context, armature),
-            save_workspace(context, armature, mode="POSE"),
-        ):
-            output_bytes = _export_vrm_animation(context, armature)
+        with span("export_vrm_animation"):
+            try:
+                with (
+                    setup_humanoid_t_pose(context, armature),
+                    save_workspace(context, armature, mode="POSE"),
+                    create_progress(context) as progress,
+                ):
+                    vrma_dict, buffer0 = _export_vrm_animation(
+                        context,
+                        armature,
+                        progress,
+                        keyframe_reduction=keyframe_reduction,
+                    )
+            except ProgressCancelledError:
+                _logger.warning("Cancelled exporting %s", path)
+                return {"CANCELLED"}
 
-        path.write_bytes(output_bytes)
+            with span("write_glb"), path.open("wb") as output:
+                write_glb(output, vrma_dict, buffer0)
         return {"FINISHED"}
 
 
@@ -152,7 +369,13 @@ def _create_node_dicts(
     return [node_index]
 
 
-def _export_vrm_animation(context: Context, armature: Object) -> bytes:
+def _export_vrm_animation(
+    context: Context,
+    armature: Object,
+    progress: Progress,
+    *,
+    keyframe_reduction: KeyframeReduction,
+) -> tuple[dict[str, Json], ChunkedBuffer]:
     armature_data = armature.data
     if not isinstance(armature_data, Armature):
         message = "Armature data is not an Armature"
@@ -209,9 +432,12 @@ def _export_vrm_animation(context: Context, armature: Object) -> bytes:
         context.scene.render.fps
     )
 
-    buffer0_bytearray = bytearray()
+    # The accessors are kept as separate chunks and streamed to the file
+    # without being concatenated
+    buffer0 = ChunkedBuffer()
     accessor_dicts: list[dict[str, Json]] = []
     buffer_view_dicts: list[dict[str, Json]] = []
+    buffer_builder = BufferBuilder(buffer0, buffer_view_dicts, accessor_dicts)
     animation_sampler_dicts: list[dict[str, Json]] = []
     animation_channel_dicts: list[dict[str, Json]] = []
     preset_expression_dict: dict[str, dict[str, Json]] = {}
@@ -220,52 +446,53 @@ def _export_vrm_animation(context: Context, armature: Object) -> bytes:
     frame_start = context.scene.frame_start
     frame_end = context.scene.frame_end
 
-    _create_expression_animation(
-        vrm1,
-        frame_start=frame_start,
-        frame_end=frame_end,
-        frame_to_timestamp_factor=frame_to_timestamp_factor,
-        armature_data=armature_data,
-        node_dicts=node_dicts,
-        accessor_dicts=accessor_dicts,
-        buffer_view_dicts=buffer_view_dicts,
-        animation_channel_dicts=animation_channel_dicts,
-        animation_sampler_dicts=animation_sampler_dicts,
-        scene_node_indices=scene_node_indices,
-        buffer0_bytearray=buffer0_bytearray,
-        preset_expression_dict=preset_expression_dict,
-        custom_expression_dict=custom_expression_dict,
-    )
+    with progress.phase("create_expression_animation", 0.1):
+        _create_expression_animation(
+            vrm1,
+            frame_start=frame_start,
+            frame_end=frame_end,
+            frame_to_timestamp_factor=frame_to_timestamp_factor,
+            keyframe_reduction=keyframe_reduction,
+            armature_data=armature_data,
+            node_dicts=node_dicts,
+            buffer_builder=buffer_builder,
+            animation_channel_dicts=animation_channel_dicts,
+            animation_sampler_dicts=animation_sampler_dicts,
+            scene_node_indices=scene_node_indices,
+            preset_expression_dict=preset_expression_dict,
+            custom_expression_dict=custom_expression_dict,
+        )
 
-    _create_node_animation(
-        context=context,
-        frame_start=frame_start,
-        frame_end=frame_end,
-        frame_to_timestamp_factor=frame_to_timestamp_factor,
-        armature=armature,
-        human_bones=human_bones,
-        bone_name_to_node_index=bone_name_to_node_index,
-        buffer0_bytearray=buffer0_bytearray,
-        buffer_view_dicts=buffer_view_dicts,
-        accessor_dicts=accessor_dicts,
-        animation_channel_dicts=animation_channel_dicts,
-        animation_sampler_dicts=animation_sampler_dicts,
-    )
+    with progress.phase("create_node_animation", 0.9) as phase_progress:
+        _create_node_animation(
+            context=context,
+            progress=phase_progress,
+            frame_start=frame_start,
+            frame_end=frame_end,
+            frame_to_timestamp_factor=frame_to_timestamp_factor,
+            keyframe_reduction=keyframe_reduction,
+            armature=armature,
+            human_bones=human_bones,
+            bone_name_to_node_index=bone_name_to_node_index,
+            buffer_builder=buffer_builder,
+            animation_channel_dicts=animation_channel_dicts,
+            animation_sampler_dicts=animation_sampler_dicts,
+        )
 
-    look_at_target_node_index = _create_look_at_animation(
-        vrm1,
-        frame_start=frame_start,
-        frame_end=frame_end,
-        frame_to_timestamp_factor=frame_to_timestamp_factor,
-        node_dicts=node_dicts,
-        accessor_dicts=accessor_dicts,
-        buffer_view_dicts=buffer_view_dicts,
-        animation_channel_dicts=animation_channel_dicts,
-        animation_sampler_dicts=animation_sampler_dicts,
-        buffer0_bytearray=buffer0_bytearray,
-    )
+    with progress.phase("create_look_at_animation", 1):
+        look_at_target_node_index = _create_look_at_animation(
+            vrm1,
+            frame_start=frame_start,
+            frame_end=frame_end,
+            frame_to_timestamp_factor=frame_to_timestamp_factor,
+            keyframe_reduction=keyframe_reduction,
+            node_dicts=node_dicts,
+            buffer_builder=buffer_builder,
+            animation_channel_dicts=animation_channel_dicts,
+            animation_sampler_dicts=animation_sampler_dicts,
+        )
 
-    buffer_dicts: list[dict[str, Json]] = [{"byteLength": len(buffer0_bytearray)}]
+    buffer_dicts: list[dict[str, Json]] = [{"byteLength": len(buffer0)}]
 
     human_bones_dict: dict[str, Json] = {}
     human_bone_name_to_human_bone = human_bones.human_bone_name_to_human_bone()
@@ -330,7 +557,7 @@ def _export_vrm_animation(context: Context, armature: Object) -> bytes:
             ]
         )
 
-    return pack_glb(vrma_dict, buffer0_bytearray)
+    return vrma_dict, buffer0
 
 
 def _create_look_at_animation(
@@ -339,12 +566,11 @@ def _create_look_at_animation(
     frame_start: int,
     frame_end: int,
     frame_to_timestamp_factor: float,
+    keyframe_reduction: KeyframeReduction,
     node_dicts: list[dict[str, Json]],
-    accessor_dicts: list[dict[str, Json]],
-    buffer_view_dicts: list[dict[str, Json]],
+    buffer_builder: BufferBuilder,
     animation_channel_dicts: list[dict[str, Json]],
     animation_sampler_dicts: list[dict[str, Json]],
-    buffer0_bytearray: bytearray,
 ) -> Optional[int]:
     look_at_target_object = vrm1.look_at.preview_target_bpy_object
     if not look_at_target_object:
@@ -358,7 +584,9 @@ def _create_look_at_animation(
     if not action:
         return None
 
-    look_at_translation_offsets: list[Vector] = []
+    frame_count = frame_end - frame_start + 1
+    axis_values: list[Sequence[float]] = [(0.0,) * frame_count] * 3
+    look_at_fcurves: list[FCurve] = []
     data_path = look_at_target_object.path_from_id("location")
     for fcurve in _get_action_fcurves(action):
         if fcurve.mute:
@@ -367,25 +595,36 @@ def _create_look_at_animation(
             continue
         if fcurve.data_path != data_path:
             continue
-        for frame in range(frame_start, frame_end + 1):
-            offset = frame - frame_start
-            value = float(fcurve.evaluate(frame))
-            if offset < len(look_at_translation_offsets):
-                translation_offset = look_at_translation_offsets[offset]
-            else:
-                translation_offset = Vector((0.0, 0.0, 0.0))
-                look_at_translation_offsets.append(translation_offset)
-            translation_offset[fcurve.array_index] = value
+        if not 0 <= fcurve.array_index < 3:
+            continue
+        look_at_fcurves.append(fcurve)
+        axis_values[fcurve.array_index] = evaluate_fcurve(
+            fcurve, frame_start, frame_end
+        )
+    if not look_at_fcurves:
+        return None
+
+    if frame_count <= 0:
+        return None
 
     parent = look_at_target_object.parent
     parent_world_matrix = parent.matrix_world if parent else Matrix()
 
-    look_at_translations = [
-        parent_world_matrix @ look_at_translation_offset
-        for look_at_translation_offset in look_at_translation_offsets
-    ]
-    if not look_at_translations:
-        return None
+    look_at_translations = array("f", bytes(frame_count * 3 * 4))
+    for frame_index, look_at_translation_offset in enumerate(zip(*axis_values)):
+        look_at_translation = parent_world_matrix @ Vector(look_at_translation_offset)
+        look_at_translations[frame_index * 3] = look_at_translation.x
+        look_at_translations[frame_index * 3 + 1] = look_at_translation.y
+        look_at_translations[frame_index * 3 + 2] = look_at_translation.z
+
+    frame_indices = keyframe_reduction.reduce(
+        frame_count,
+        _get_source_frame_offsets(look_at_fcurves, frame_start, frame_end),
+        _create_sampled_error_function(
+            look_at_translations, 3, Vector, _calculate_translation_error
+        ),
+        keyframe_reduction.translation_tolerance,
+    )
 
     look_at_target_node_index = len(node_dicts)
     look_at_default_node_translation = (
@@ -402,82 +641,25 @@ def _create_look_at_animation(
         }
     )
 
-    input_byte_offset = len(buffer0_bytearray)
-    input_floats = [
-        frame * frame_to_timestamp_factor
-        for frame, _ in enumerate(look_at_translations)
-    ]
-    input_bytes = struct.pack("<" + "f" * len(input_floats), *input_floats)
-    buffer0_bytearray.extend(input_bytes)
-    while len(buffer0_bytearray) % 4:
-        buffer0_bytearray.append(0)
-    input_buffer_view_index = len(buffer_view_dicts)
-    input_buffer_view_dict: dict[str, Json] = {
-        "buffer": 0,
-        "byteLength": len(input_bytes),
-    }
-    if input_byte_offset > 0:
-        input_buffer_view_dict["byteOffset"] = input_byte_offset
-    buffer_view_dicts.append(input_buffer_view_dict)
-
-    output_byte_offset = len(buffer0_bytearray)
-    gltf_translations = [
-        (
-            translation.x,
-            translation.z,
-            -translation.y,
-        )
-        for translation in look_at_translations
-    ]
-    translation_floats = list(itertools.chain(*gltf_translations))
-    translation_bytes = struct.pack(
-        "<" + "f" * len(translation_floats), *translation_floats
+    input_accessor_index = buffer_builder.append_accessor(
+        _create_timestamps(frame_indices, frame_to_timestamp_factor),
+        "SCALAR",
+        min_max=True,
     )
-    buffer0_bytearray.extend(translation_bytes)
-    while len(buffer0_bytearray) % 4:
-        buffer0_bytearray.append(0)
-    output_buffer_view_index = len(buffer_view_dicts)
-    output_buffer_view_dict: dict[str, Json] = {
-        "buffer": 0,
-        "byteLength": len(translation_bytes),
-    }
-    if output_byte_offset > 0:
-        output_buffer_view_dict["byteOffset"] = output_byte_offset
-    buffer_view_dicts.append(output_buffer_view_dict)
-
-    input_accessor_index = len(accessor_dicts)
-    accessor_dicts.append(
-        {
-            "bufferView": input_buffer_view_index,
-            "componentType": GL_FLOAT,
-            "count": len(input_floats),
-            "type": "SCALAR",
-            "min": [min(input_floats)],
-            "max": [max(input_floats)],
-        }
-    )
-
-    output_accessor_index = len(accessor_dicts)
-    gltf_translation_x_values = [t[0] for t in gltf_translations]
-    gltf_translation_y_values = [t[1] for t in gltf_translations]
-    gltf_translation_z_values = [t[2] for t in gltf_translations]
-    accessor_dicts.append(
-        {
-            "bufferView": output_buffer_view_index,
-            "componentType": GL_FLOAT,
-            "count": len(look_at_translations),
-            "type": "VEC3",
-            "min": [
-                min(gltf_translation_x_values),
-                min(gltf_translation_y_values),
-                min(gltf_translation_z_values),
-            ],
-            "max": [
-                max(gltf_translation_x_values),
-                max(gltf_translation_y_values),
-                max(gltf_translation_z_values),
-            ],
-        }
+    output_accessor_index = buffer_builder.append_accessor(
+        array(
+            "f",
+            itertools.chain.from_iterable(
+                (
+                    look_at_translations[i * 3],
+                    look_at_translations[i * 3 + 2],
+                    -look_at_translations[i * 3 + 1],
+                )
+                for i in frame_indices
+            ),
+        ),
+        "VEC3",
+        min_max=True,
     )
 
     animation_sampler_index = len(animation_sampler_dicts)
@@ -506,14 +688,13 @@ def _create_expression_animation(
     frame_start: int,
     frame_end: int,
     frame_to_timestamp_factor: float,
+    keyframe_reduction: KeyframeReduction,
     armature_data: Armature,
     node_dicts: list[dict[str, Json]],
-    accessor_dicts: list[dict[str, Json]],
-    buffer_view_dicts: list[dict[str, Json]],
+    buffer_builder: BufferBuilder,
     animation_channel_dicts: list[dict[str, Json]],
     animation_sampler_dicts: list[dict[str, Json]],
     scene_node_indices: list[int],
-    buffer0_bytearray: bytearray,
     preset_expression_dict: dict[str, dict[str, Json]],
     custom_expression_dict: dict[str, dict[str, Json]],
 ) -> None:
@@ -541,9 +722,9 @@ def _create_expression_animation(
             expression_name
         )
 
-    expression_name_to_expression_values: dict[
-        str, list[tuple[float, float, float]]
-    ] = {}
+    expression_name_to_expression_values: dict[str, array[float]] = {}
+    expression_name_to_z: dict[str, float] = {}
+    expression_name_to_fcurves: dict[str, list[FCurve]] = {}
 
     expression_export_index = 0
     for fcurve in _get_action_fcurves(action):
@@ -554,28 +735,20 @@ def _create_expression_animation(
         expression_name = data_path_to_expression_name.get(fcurve.data_path)
         if not expression_name:
             continue
-        for frame in range(frame_start, frame_end + 1):
-            expression_values = expression_name_to_expression_values.get(
-                expression_name
-            )
-            if not expression_values:
-                expression_values = []
-                expression_name_to_expression_values[expression_name] = (
-                    expression_values
-                )
-            expression_values.append(
-                (
-                    max(0, min(fcurve.evaluate(frame), 1)),
-                    0,
-                    expression_export_index / 8.0,
-                )
-            )
+        expression_name_to_fcurves.setdefault(expression_name, []).append(fcurve)
+        expression_name_to_z.setdefault(expression_name, expression_export_index / 8.0)
+        expression_name_to_expression_values.setdefault(
+            expression_name, array("d")
+        ).extend(
+            max(0, min(value, 1))
+            for value in evaluate_fcurve(fcurve, frame_start, frame_end)
+        )
         expression_export_index += 1
 
     node_index: Optional[int] = None
     for (
         expression_name,
-        expression_translations,
+        sampled_expression_values,
     ) in expression_name_to_expression_values.items():
         node_index = len(node_dicts)
         node_dicts.append(
@@ -594,84 +767,34 @@ def _create_expression_animation(
             }
         scene_node_indices.append(node_index)
 
-        input_byte_offset = len(buffer0_bytearray)
-        input_floats = [
-            frame * frame_to_timestamp_factor
-            for frame, _ in enumerate(expression_translations)
-        ]
-        input_bytes = struct.pack("<" + "f" * len(input_floats), *input_floats)
-        buffer0_bytearray.extend(input_bytes)
-        while len(buffer0_bytearray) % 4:
-            buffer0_bytearray.append(0)
-        input_buffer_view_index = len(buffer_view_dicts)
-        input_buffer_view_dict: dict[str, Json] = {
-            "buffer": 0,
-            "byteLength": len(input_bytes),
-        }
-        if input_byte_offset > 0:
-            input_buffer_view_dict["byteOffset"] = input_byte_offset
-        buffer_view_dicts.append(input_buffer_view_dict)
-
-        output_byte_offset = len(buffer0_bytearray)
-        expression_translation_floats: list[float] = list(
-            itertools.chain(*expression_translations)
-        )
-        translation_bytes = struct.pack(
-            "<" + "f" * len(expression_translation_floats),
-            *expression_translation_floats,
+        frame_indices = keyframe_reduction.reduce(
+            len(sampled_expression_values),
+            _get_source_frame_offsets(
+                expression_name_to_fcurves.get(expression_name, []),
+                frame_start,
+                frame_end,
+            ),
+            lambda begin, end, index, values=sampled_expression_values: (
+                _calculate_expression_error(values, begin, end, index)
+            ),
+            keyframe_reduction.expression_tolerance,
         )
-        buffer0_bytearray.extend(translation_bytes)
-        while len(buffer0_bytearray) % 4:
-            buffer0_bytearray.append(0)
-        output_buffer_view_index = len(buffer_view_dicts)
-        output_buffer_view_dict: dict[str, Json] = {
-            "buffer": 0,
-            "byteLength": len(translation_bytes),
-        }
-        if output_byte_offset > 0:
-            output_buffer_view_dict["byteOffset"] = output_byte_offset
-        buffer_view_dicts.append(output_buffer_view_dict)
+        z = expression_name_to_z[expression_name]
 
-        input_accessor_index = len(accessor_dicts)
-        accessor_dicts.append(
-            {
-                "bufferView": input_buffer_view_index,
-                "componentType": GL_FLOAT,
-                "count": len(input_floats),
-                "type": "SCALAR",
-                "min": [min(input_floats)],
-                "max": [max(input_floats)],
-            }
+        input_accessor_index = buffer_builder.append_accessor(
+            _create_timestamps(frame_indices, frame_to_timestamp_factor),
+            "SCALAR",
+            min_max=True,
         )
-
-        output_accessor_index = len(accessor_dicts)
-        accessor_dicts.append(
-            {
-                "bufferView": output_buffer_view_index,
-                "componentType": GL_FLOAT,
-                "count": len(expression_translations),
-                "type": "VEC3",
-                "min": [
-                    min(values)
-                    for values in (
-                        (
-                            gltf_translation[i]
-                            for gltf_translation in expression_translations
-                        )
-                        for i in range(3)
-                    )
-                ],
-                "max": [
-                    max(values)
-                    for values in (
-                        (
-                            gltf_translation[i]
-                            for gltf_translation in expression_translations
-                        )
-                        for i in range(3)
-                    )
-                ],
-            }
+        output_accessor_index = buffer_builder.append_accessor(
+            array(
+                "f",
+                itertools.chain.from_iterable(
+                    (sampled_expression_values[i], 0, z) for i in frame_indices
+                ),
+            ),
+            "VEC3",
+            min_max=True,
         )
 
         animation_sampler_index = len(animation_sampler_dicts)
@@ -689,65 +812,121 @@ def _create_expression_animation(
         )
 
 
-def _set_frame_rotations(
+def _create_humanoid_bone_name_and_parent_bone_names(
     armature: Object,
-    human_bones: Vrm1HumanBonesPropertyGroup,
+    human_bone_name_to_human_bone: Mapping[HumanBoneName, Vrm1HumanBonePropertyGroup],
     human_bone_specification: HumanBoneSpecification,
-    parent_current_pose_matrix: Matrix,
-    bone_name_to_node_index: Mapping[str, int],
-    bone_name_to_quaternions: dict[str, list[Quaternion]],
+    parent_bone_name: Optional[str],
+    humanoid_bone_name_and_parent_bone_names: list[tuple[str, Optional[str]]],
 ) -> None:
-    human_bone = human_bones.human_bone_name_to_human_bone().get(
-        human_bone_specification.name
-    )
+    human_bone = human_bone_name_to_human_bone.get(human_bone_specification.name)
     if not human_bone:
         _logger.error("Failed to find human bone %s", human_bone_specification.name)
         return
 
     bone = armature.pose.bones.get(human_bone.node.bone_name)
-    if not bone:
-        for child in human_bone_specification.children:
-            _set_frame_rotations(
-                armature,
-                human_bones,
-                child,
-                parent_current_pose_matrix,
-                bone_name_to_node_index,
-                bone_name_to_quaternions,
-            )
-        return
-
-    matrix = parent_current_pose_matrix.inverted() @ bone.matrix
-    quaternion = matrix.to_quaternion()
-
-    quaternions = bone_name_to_quaternions.get(bone.name)
-    if quaternions is None:
-        quaternions = []
-        bone_name_to_quaternions[bone.name] = quaternions
-    quaternions.append(quaternion)
+    if bone:
+        humanoid_bone_name_and_parent_bone_names.append((bone.name, parent_bone_name))
+        parent_bone_name = bone.name
 
     for child in human_bone_specification.children:
-        _set_frame_rotations(
+        _create_humanoid_bone_name_and_parent_bone_names(
             armature,
-            human_bones,
+            human_bone_name_to_human_bone,
             child,
-            bone.matrix,
-            bone_name_to_node_index,
-            bone_name_to_quaternions,
+            parent_bone_name,
+            humanoid_bone_name_and_parent_bone_names,
         )
 
 
+def _pose_bone_matrices_require_depsgraph(armature: Object) -> bool:
+    """Whether the pose bone matrices depend on more than the bone channels.
+
+    Constraints and drivers are only evaluated by the depsgraph, so the forward
+    kinematics of _calculate_pose_bone_matrix() cannot reproduce them.
+    """
+    animation_data = armature.animation_data
+    if animation_data and animation_data.drivers:
+        return True
+    return any(
+        isinstance(constraint, Constraint) and constraint.enabled
+        for pose_bone in armature.pose.bones
+        for constraint in pose_bone.constraints
+    )
+
+
+def _calculate_pose_bone_matrix(
+    pose_bone: PoseBone, bone_name_to_matrix: dict[str, Matrix]
+) -> Matrix:
+    """Calculate PoseBone.matrix from the bone channels without the depsgraph."""
+    matrix = bone_name_to_matrix.get(pose_bone.name)
+    if matrix is not None:
+        return matrix
+
+    bone = pose_bone.bone
+    parent_pose_bone = pose_bone.parent
+    if parent_pose_bone is None:
+        matrix = bone.convert_local_to_pose(pose_bone.matrix_basis, bone.matrix_local)
+    else:
+        matrix = bone.convert_local_to_pose(
+            pose_bone.matrix_basis,
+            bone.matrix_local,
+            parent_matrix=_calculate_pose_bone_matrix(
+                parent_pose_bone, bone_name_to_matrix
+            ),
+            parent_matrix_local=parent_pose_bone.bone.matrix_local,
+        )
+    bone_name_to_matrix[pose_bone.name] = matrix
+    return matrix
+
+
+def _calculate_pose_bone_matrices(
+    armature: Object, bone_names: Iterable[str]
+) -> dict[str, Matrix]:
+    bone_name_to_matrix: dict[str, Matrix] = {}
+    for bone_name in bone_names:
+        pose_bone = armature.pose.bones.get(bone_name)
+        if pose_bone:
+            _calculate_pose_bone_matrix(pose_bone, bone_name_to_matrix)
+    return bone_name_to_matrix
+
+
+def _validate_pose_bone_matrices(
+    context: Context,
+    armature: Object,
+    frame: int,
+    bone_name_to_matrix: Mapping[str, Matrix],
+) -> None:
+    context.view_layer.update()
+    for bone_name, matrix in bone_name_to_matrix.items():
+        pose_bone = armature.pose.bones.get(bone_name)
+        if not pose_bone:
+            continue
+        difference = max(
+            abs(value - expected_value)
+            for row, expected_row in zip(matrix, pose_bone.matrix)
+            for value, expected_value in zip(row, expected_row)
+        )
+        if difference > 0.0001:
+            _logger.error(
+                "Pose sampling mismatch at frame %d for bone %s: %s",
+                frame,
+                bone_name,
+                difference,
+            )
+
+
 def _create_node_animation(
     context: Context,
+    progress: PartialProgress,
     frame_start: int,
     frame_end: int,
     frame_to_timestamp_factor: float,
+    keyframe_reduction: KeyframeReduction,
     armature: Object,
     human_bones: Vrm1HumanBonesPropertyGroup,
     bone_name_to_node_index: Mapping[str, int],
-    buffer0_bytearray: bytearray,
-    buffer_view_dicts: list[dict[str, Json]],
-    accessor_dicts: list[dict[str, Json]],
+    buffer_builder: BufferBuilder,
     animation_channel_dicts: list[dict[str, Json]],
     animation_sampler_dicts: list[dict[str, Json]],
 ) -> None:
@@ -761,36 +940,93 @@ def _create_node_animation(
     if not action:
         return
 
-    bone_name_to_quaternions: dict[str, list[Quaternion]] = {}
-    hips_translations: list[Vector] = []
+    # The samples are written to arrays preallocated for the frame range.
+    # Their float32 components hold Quaternion and Vector values exactly.
+    frame_count = max(0, frame_end - frame_start + 1)
+    bone_name_to_quaternions: dict[str, array[float]] = {}
+    hips_translations = array("f", bytes(frame_count * 3 * 4))
 
-    hips_bone = human_bones.human_bone_name_to_human_bone().get(HumanBoneName.HIPS)
+    hips_bone = human_bone_name_to_human_bone.get(HumanBoneName.HIPS)
     if not hips_bone:
         _logger.error("Failed to find hips bone")
         return
     hips_bone_name = hips_bone.node.bone_name
 
-    for frame in range(frame_start, frame_end + 1):
+    humanoid_bone_name_and_parent_bone_names: list[tuple[str, Optional[str]]] = []
+    _create_humanoid_bone_name_and_parent_bone_names(
+        armature,
+        human_bone_name_to_human_bone,
+        HumanBoneSpecifications.HIPS,
+        None,
+        humanoid_bone_name_and_parent_bone_names,
+    )
+    for bone_name, _ in humanoid_bone_name_and_parent_bone_names:
+        bone_name_to_quaternions[bone_name] = array("f", bytes(frame_count * 4 * 4))
+    sampled_bone_names = [
+        bone_name for bone_name, _ in humanoid_bone_name_and_parent_bone_names
+    ]
+    if hips_bone_name not in bone_name_to_quaternions:
+        sampled_bone_names.append(hips_bone_name)
+
+    # Unless constraints or drivers are involved, the pose bone matrices are
+    # calculated from the bone channels. This avoids evaluating the whole scene
+    # for every frame.
+    use_depsgraph = _pose_bone_matrices_require_depsgraph(armature)
+    validate = (
+        not use_depsgraph
+        and environ.get("BLENDER_VRM_VALIDATE_VRM_ANIMATION_POSE_SAMPLING") == "true"
+    )
+
+    for frame_index, frame in enumerate(range(frame_start, frame_end + 1)):
+        progress.update_items(frame_index + 1, frame_count)
         armature.pose.apply_pose_from_action(action, evaluation_time=frame)
-        context.view_layer.update()
-        _set_frame_rotations(
-            armature,
-            human_bones,
-            HumanBoneSpecifications.HIPS,
-            Matrix(),
-            bone_name_to_node_index,
-            bone_name_to_quaternions,
-        )
-        hips_pose_bone = armature.pose.bones.get(hips_bone_name)
-        if not hips_pose_bone:
+        if use_depsgraph:
+            context.view_layer.update()
+            bone_name_to_matrix = {
+                bone_name: pose_bone.matrix.copy()
+                for bone_name in sampled_bone_names
+                if (pose_bone := armature.pose.bones.get(bone_name))
+            }
+        else:
+            bone_name_to_matrix = _calculate_pose_bone_matrices(
+                armature, sampled_bone_names
+            )
+            if validate:
+                _validate_pose_bone_matrices(
+                    context, armature, frame, bone_name_to_matrix
+                )
+
+        for bone_name, parent_bone_name in humanoid_bone_name_and_parent_bone_names:
+            matrix = bone_name_to_matrix[bone_name]
+            if parent_bone_name is not None:
+                matrix = bone_name_to_matrix[parent_bone_name].inverted() @ matrix
+            quaternion = matrix.to_quaternion()
+            quaternions = bone_name_to_quaternions[bone_name]
+            quaternions[frame_index * 4] = quaternion.w
+            quaternions[frame_index * 4 + 1] = quaternion.x
+            quaternions[frame_index * 4 + 2] = quaternion.y
+            quaternions[frame_index * 4 + 3] = quaternion.z
+
+        hips_matrix = bone_name_to_matrix.get(hips_bone_name)
+        if hips_matrix is None:
             _logger.error("Failed to find hips bone %s", hips_bone_name)
             continue
-        hips_translations.append(hips_pose_bone.matrix.to_translation())
+        hips_translation = hips_matrix.to_translation()
+        hips_translations[frame_index * 3] = hips_translation.x
+        hips_translations[frame_index * 3 + 1] = hips_translation.y
+        hips_translations[frame_index * 3 + 2] = hips_translation.z
+
+    bone_name_to_fcurves = _create_bone_name_to_fcurves(
+        armature, _get_action_fcurves(action)
+    )
+    bone_name_to_parent_bone_name = dict(humanoid_bone_name_and_parent_bone_names)
 
     # Export rotation
-    for bone_name, quaternions in bone_name_to_quaternions.items():
+    for bone_name, sampled_quaternions in bone_name_to_quaternions.items():
         if all(
-            abs(quaternion.angle) < float_info.epsilon for quaternion in quaternions
+            abs(Quaternion(sampled_quaternions[offset : offset + 4]).angle)
+            < float_info.epsilon
+            for offset in range(0, len(sampled_quaternions), 4)
         ):
             continue
         human_bone_name = next(
@@ -811,83 +1047,42 @@ def _create_node_animation(
             _logger.error("Failed to find node index for bone %s", bone_name)
             continue
 
-        input_byte_offset = len(buffer0_bytearray)
-        input_floats = [
-            frame * frame_to_timestamp_factor for frame, _ in enumerate(quaternions)
-        ]
-        input_bytes = struct.pack("<" + "f" * len(input_floats), *input_floats)
-        buffer0_bytearray.extend(input_bytes)
-        while len(buffer0_bytearray) % 4:
-            buffer0_bytearray.append(0)
-        input_buffer_view_index = len(buffer_view_dicts)
-        input_buffer_view_dict: dict[str, Json] = {
-            "buffer": 0,
-            "byteLength": len(input_bytes),
-        }
-        if input_byte_offset > 0:
-            input_buffer_view_dict["byteOffset"] = input_byte_offset
-        buffer_view_dicts.append(input_buffer_view_dict)
-
-        output_byte_offset = len(buffer0_bytearray)
-        gltf_quaternions = [
-            (
-                quaternion.x,
-                quaternion.z,
-                -quaternion.y,
-                quaternion.w,
-            )
-            for quaternion in quaternions
-        ]
-        quaternion_floats: list[float] = list(itertools.chain(*gltf_quaternions))
-        quaternion_bytes = struct.pack(
-            "<" + "f" * len(quaternion_floats), *quaternion_floats
+        frame_indices = keyframe_reduction.reduce(
+            frame_count,
+            _get_bone_source_frame_offsets(
+                armature,
+                bone_name_to_fcurves,
+                bone_name,
+                bone_name_to_parent_bone_name.get(bone_name),
+                frame_start,
+                frame_end,
+            ),
+            _create_sampled_error_function(
+                sampled_quaternions, 4, Quaternion, _calculate_rotation_error
+            ),
+            keyframe_reduction.rotation_tolerance,
         )
-        buffer0_bytearray.extend(quaternion_bytes)
-        while len(buffer0_bytearray) % 4:
-            buffer0_bytearray.append(0)
-        output_buffer_view_index = len(buffer_view_dicts)
-        output_buffer_view_dict: dict[str, Json] = {
-            "buffer": 0,
-            "byteLength": len(quaternion_bytes),
-        }
-        if output_byte_offset > 0:
-            output_buffer_view_dict["byteOffset"] = output_byte_offset
-        buffer_view_dicts.append(output_buffer_view_dict)
 
-        input_accessor_index = len(accessor_dicts)
-        accessor_dicts.append(
-            {
-                "bufferView": input_buffer_view_index,
-                "componentType": GL_FLOAT,
-                "count": len(input_floats),
-                "type": "SCALAR",
-                "min": [min(input_floats)],
-                "max": [max(input_floats)],
-            }
+        input_accessor_index = buffer_builder.append_accessor(
+            _create_timestamps(frame_indices, frame_to_timestamp_factor),
+            "SCALAR",
+            min_max=True,
         )
-
-        output_accessor_index = len(accessor_dicts)
-        accessor_dicts.append(
-            {
-                "bufferView": output_buffer_view_index,
-                "componentType": GL_FLOAT,
-                "count": len(quaternions),
-                "type": "VEC4",
-                "min": [
-                    min(values)
-                    for values in (
-                        (gltf_quaternion[i] for gltf_quaternion in gltf_quaternions)
-                        for i in range(4)
-                    )
-                ],
-                "max": [
-                    max(values)
-                    for values in (
-                        (gltf_quaternion[i] for gltf_quaternion in gltf_quaternions)
-                        for i in range(4)
+        output_accessor_index = buffer_builder.append_accessor(
+            array(
+                "f",
+                itertools.chain.from_iterable(
+                    (
+                        sampled_quaternions[i * 4 + 1],
+                        sampled_quaternions[i * 4 + 3],
+                        -sampled_quaternions[i * 4 + 2],
+                        sampled_quaternions[i * 4],
                     )
-                ],
-            }
+                    for i in frame_indices
+                ),
+            ),
+            "VEC4",
+            min_max=True,
         )
 
         animation_sampler_index = len(animation_sampler_dicts)
@@ -910,86 +1105,47 @@ def _create_node_animation(
         _logger.error("Failed to find node index for hips bone %s", hips_bone_name)
         return
     if all(
-        hips_translation.length_squared < float_info.epsilon
-        for hips_translation in hips_translations
+        Vector(hips_translations[offset : offset + 3]).length_squared
+        < float_info.epsilon
+        for offset in range(0, len(hips_translations), 3)
     ):
         return
 
-    input_byte_offset = len(buffer0_bytearray)
-    input_floats = [
-        frame * frame_to_timestamp_factor for frame, _ in enumerate(hips_translations)
-    ]
-    input_bytes = struct.pack("<" + "f" * len(input_floats), *input_floats)
-    buffer0_bytearray.extend(input_bytes)
-    while len(buffer0_bytearray) % 4:
-        buffer0_bytearray.append(0)
-    input_buffer_view_index = len(buffer_view_dicts)
-    input_buffer_view_dict = {
-        "buffer": 0,
-        "byteLength": len(input_bytes),
-    }
-    if input_byte_offset > 0:
-        input_buffer_view_dict["byteOffset"] = input_byte_offset
-    buffer_view_dicts.append(input_buffer_view_dict)
-
-    output_byte_offset = len(buffer0_bytearray)
-    gltf_translations = [
-        (
-            translation.x,
-            translation.z,
-            -translation.y,
-        )
-        for translation in hips_translations
-    ]
-    translation_floats: list[float] = list(itertools.chain(*gltf_translations))
-    translation_bytes = struct.pack(
-        "<" + "f" * len(translation_floats), *translation_floats
+    frame_indices = keyframe_reduction.reduce(
+        frame_count,
+        _get_bone_source_frame_offsets(
+            armature,
+            bone_name_to_fcurves,
+            hips_bone_name,
+            None,
+            frame_start,
+            frame_end,
+        ),
+        _create_sampled_error_function(
+            hips_translations, 3, Vector, _calculate_translation_error
+        ),
+        keyframe_reduction.translation_tolerance,
     )
-    buffer0_bytearray.extend(translation_bytes)
-    while len(buffer0_bytearray) % 4:
-        buffer0_bytearray.append(0)
-    output_buffer_view_index = len(buffer_view_dicts)
-    output_buffer_view_dict = {
-        "buffer": 0,
-        "byteLength": len(translation_bytes),
-    }
-    if output_byte_offset > 0:
-        output_buffer_view_dict["byteOffset"] = output_byte_offset
-    buffer_view_dicts.append(output_buffer_view_dict)
 
-    input_accessor_index = len(accessor_dicts)
-    accessor_dicts.append(
-        {
-            "bufferView": input_buffer_view_index,
-            "componentType": GL_FLOAT,
-            "count": len(input_floats),
-            "type": "SCALAR",
-            "min": [min(input_floats)],
-            "max": [max(input_floats)],
-        }
+    input_accessor_index = buffer_builder.append_accessor(
+        _create_timestamps(frame_indices, frame_to_timestamp_factor),
+        "SCALAR",
+        min_max=True,
     )
-
-    output_accessor_index = len(accessor_dicts)
-    gltf_translation_x_values = [t[0] for t in gltf_translations]
-    gltf_translation_y_values = [t[1] for t in gltf_translations]
-    gltf_translation_z_values = [t[2] for t in gltf_translations]
-    accessor_dicts.append(
-        {
-            "bufferView": output_buffer_view_index,
-            "componentType": GL_FLOAT,
-            "count": len(hips_translations),
-            "type": "VEC3",
-            "min": [
-                min(gltf_translation_x_values),
-                min(gltf_translation_y_values),
-                min(gltf_translation_z_values),
-            ],
-            "max": [
-                max(gltf_translation_x_values),
-                max(gltf_translation_y_values),
-                max(gltf_translation_z_values),
-            ],
-        }
+    output_accessor_index = buffer_builder.append_accessor(
+        array(
+            "f",
+            itertools.chain.from_iterable(
+                (
+                    hips_translations[i * 3],
+                    hips_translations[i * 3 + 2],
+                    -hips_translations[i * 3 + 1],
+                )
+                for i in frame_indices
+            ),
+        ),
+        "VEC3",
+        min_max=True,
     )
 
     animation_sampler_index = len(animation_sampler_dicts)
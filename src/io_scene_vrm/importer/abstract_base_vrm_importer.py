@@ -3,18 +3,17 @@
 
 import base64
 import contextlib
-import functools
+import hashlib
 import math
 import os
 import re
-import secrets
 import shutil
-import string
 import struct
 import tempfile
 import uuid
 from abc import ABC, abstractmethod
 from collections.abc import Generator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -38,6 +37,7 @@ from ..common.deep import make_json
 from ..common.fs import (
     create_unique_indexed_directory_path,
     create_unique_indexed_file_path,
+    find_indexed_file_path_with_same_content,
 )
 from ..common.gl import GL_FLOAT, GL_LINEAR, GL_REPEAT, GL_UNSIGNED_SHORT
 from ..common.gltf import (
@@ -98,6 +98,39 @@ class ParseResult:
         if not isinstance(image_index, int):
             return None
 
+        image_bytes = self.read_image_bytes(image_index)
+        if not image_bytes:
+            return None
+
+        image_dicts = self.json_dict.get("images")
+        if not isinstance(image_dicts, list):
+            return None
+        image_dict = image_dicts[image_index]
+        if not isinstance(image_dict, dict):
+            return None
+
+        mime_type = image_dict.get("mimeType")
+        if mime_type == "image/jpeg":
+            suffix = ".jpg"
+        elif mime_type == "image/png":
+            suffix = ".png"
+        else:
+            return None
+
+        temp_dir = tempfile.TemporaryDirectory()
+        try:
+            temp_file_path = Path(temp_dir.name) / f"thumbnail{suffix}"
+            temp_file_path.write_bytes(image_bytes)
+            image = context.blend_data.images.load(str(temp_file_path))
+            image.name = "vrm-thumbnail-" + uuid.uuid4().hex
+            image.pack()
+        finally:
+            with contextlib.suppress(OSError):
+                temp_dir.cleanup()
+        return image.name
+
+    def read_image_bytes(self, image_index: int) -> Optional[bytes]:
+        """Read the encoded bytes of an image stored in a buffer view."""
         image_dicts = self.json_dict.get("images")
         if not isinstance(image_dicts, list):
             return None
@@ -130,31 +163,7 @@ class ParseResult:
         if not isinstance(buffer_view_dict, dict):
             return None
 
-        image_bytes = read_buffer_view_as_bytes(
-            buffer_view_dict, buffer_dicts, self.bin_chunk
-        )
-        if not image_bytes:
-            return None
-
-        mime_type = image_dict.get("mimeType")
-        if mime_type == "image/jpeg":
-            suffix = ".jpg"
-        elif mime_type == "image/png":
-            suffix = ".png"
-        else:
-            return None
-
-        temp_dir = tempfile.TemporaryDirectory()
-        try:
-            temp_file_path = Path(temp_dir.name) / f"thumbnail{suffix}"
-            temp_file_path.write_bytes(image_bytes)
-            image = context.blend_data.images.load(str(temp_file_path))
-            image.name = "vrm-thumbnail-" + uuid.uuid4().hex
-            image.pack()
-        finally:
-            with contextlib.suppress(OSError):
-                temp_dir.cleanup()
-        return image.name
+        return read_buffer_view_as_bytes(buffer_view_dict, buffer_dicts, self.bin_chunk)
 
 
 class AbstractBaseVrmImporter(ABC):
@@ -197,36 +206,33 @@ class AbstractBaseVrmImporter(ABC):
             with create_progress(self._context) as progress:
                 with save_workspace(self._context):
                     progress.update(0.1)
-                    self.import_gltf2_with_indices()
-                    progress.update(0.4)
+                    with progress.phase("import_gltf", 0.4):
+                        self.import_gltf2_with_indices()
                     if (
                         self._parse_result.vrm1_extension_dict
                         or self._parse_result.vrm0_extension_dict
                     ):
-                        self.load_materials(progress.partial_progress(0.9))
-                    if (
-                        self._parse_result.vrm1_extension_dict
-                        or self._parse_result.vrm0_extension_dict
-                    ):
-                        self.load_gltf_extensions()
-                    progress.update(0.92)
-                    self.setup_viewport()
-                    progress.update(0.94)
-                    self._context.view_layer.update()
-                    progress.update(0.96)
-
-                    # Texture extraction occurs. During this process, .blend file saving
-                    # may occur and save callbacks may run, so be careful not to apply
-                    # those callbacks to incompletely imported VRM data
-                    if self._preferences.extract_textures_into_folder:
-                        self.extract_textures(repack=False)
-                    elif bpy.app.version < (3, 1):
-                        self.extract_textures(repack=True)
-                    else:
-                        self.assign_packed_image_filepaths()
+                        with progress.phase("load_materials", 0.9) as phase_progress:
+                            self.load_materials(phase_progress)
+                    with progress.phase("load_gltf_extensions", 0.92):
+                        if (
+                            self._parse_result.vrm1_extension_dict
+                            or self._parse_result.vrm0_extension_dict
+                        ):
+                            self.load_gltf_extensions()
+                    with progress.phase("setup_viewport", 0.96):
+                        self.setup_viewport()
+                        self._context.view_layer.update()
+
+                    with progress.phase("extract_textures", 0.97):
+                        if self._preferences.extract_textures_into_folder:
+                            self.extract_textures(repack=False)
+                        elif bpy.app.version < (3, 1):
+                            self.extract_textures(repack=True)
+                        else:
+                            self.assign_packed_image_filepaths()
 
                 self.save_t_pose_action()
-                progress.update(0.97)
                 self.setup_object_selection_and_activation()
                 progress.update(0.98)
         finally:
@@ -355,29 +361,19 @@ class AbstractBaseVrmImporter(ABC):
     def extract_textures(self, *, repack: bool) -> None:
         """Extract textures to a folder as files.
 
-        In Blender 3.1 and later, texture extraction requires saving the .blend file.
-        Therefore, the file is saved, but be careful that file save callbacks may run
-        during this process.
+        The original encoded bytes are taken from the buffer views of the VRM file,
+        so neither unpacking nor saving the .blend file is required. Files with the
+        same content are shared instead of being written again, the files are
+        written in parallel and then the images are pointed to them.
         """
         dir_path = self._parse_result.filepath.with_suffix(".vrm.textures").absolute()
         if self._preferences.make_new_texture_folder or repack:
             dir_path = create_unique_indexed_directory_path(dir_path)
         dir_path.mkdir(parents=True, exist_ok=True)
 
-        if bpy.app.version >= (3, 1) and not self._context.blend_data.filepath:
-            temp_blend_path = None
-            for _ in range(10000):
-                image_suffix = (
-                    ".temp"
-                    + "".join(secrets.choice(string.digits) for _ in range(15))
-                    + ".blend"
-                )
-                temp_blend_path = self._parse_result.filepath.with_suffix(image_suffix)
-                if not temp_blend_path.exists():
-                    break
-            if temp_blend_path is not None:
-                bpy.ops.wm.save_as_mainfile(filepath=str(temp_blend_path))
-
+        image_paths: dict[int, Path] = {}
+        digest_to_image_path: dict[bytes, Path] = {}
+        image_path_to_bytes: dict[Path, bytes] = {}
         for image_index, image in self._images.items():
             image_original_file_path = Path(image.filepath_from_user())
             image_path_stem = image_original_file_path.stem
@@ -407,23 +403,55 @@ class AbstractBaseVrmImporter(ABC):
 
             image_path = dir_path / (image_path_stem + image_path_suffix)
 
-            try:
-                image.unpack(method="WRITE_ORIGINAL")
-            except RuntimeError:
-                _logger.exception("Failed to unpack %s", image.name)
+            # The packed file is the original file unless the glTF importer
+            # converted it, so the buffer view is used only if the sizes match
+            packed_file = image.packed_file
+            image_bytes = self._parse_result.read_image_bytes(image_index)
+            if packed_file is not None and (
+                image_bytes is None or packed_file.size != len(image_bytes)
+            ):
+                image_bytes = packed_file.data
+            if not image_bytes:
                 continue
 
-            image_unpacked_path_str = image.filepath_from_user()
-            if not image_unpacked_path_str:
-                continue
-            image_unpacked_file_path = Path(image_unpacked_path_str)
-            if not image_unpacked_file_path.exists():
+            digest = hashlib.sha256(image_bytes).digest()
+            existing_image_path = digest_to_image_path.get(digest)
+            if existing_image_path is None:
+                existing_image_path = find_indexed_file_path_with_same_content(
+                    image_path, image_bytes
+                )
+            if existing_image_path is None:
+                # Reserve the file name here to keep the names deterministic
+                image_path = create_unique_indexed_file_path(image_path, b"")
+                image_path_to_bytes[image_path] = image_bytes
+            else:
+                image_path = existing_image_path
+            digest_to_image_path[digest] = image_path
+            image_paths[image_index] = image_path
+
+        failed_image_paths: set[Path] = set()
+        with ThreadPoolExecutor() as executor:
+            futures = {
+                image_path: executor.submit(image_path.write_bytes, image_bytes)
+                for image_path, image_bytes in image_path_to_bytes.items()
+            }
+            for image_path, future in futures.items():
+                try:
+                    future.result()
+                except OSError:
+                    _logger.exception("Failed to write %s", image_path)
+                    failed_image_paths.add(image_path)
+                    with contextlib.suppress(OSError):
+                        image_path.unlink()
+
+        for image_index, image_path in image_paths.items():
+            if image_path in failed_image_paths:
                 continue
-
-            image_bytes = image_unpacked_file_path.read_bytes()
-            with contextlib.suppress(OSError):
-                image_unpacked_file_path.unlink()
-            image_path = create_unique_indexed_file_path(image_path, image_bytes)
+            image = self._images[image_index]
+            # Remove the packed file first, otherwise assigning the filepath
+            # reports an error while trying to reload the packed file
+            if image.packed_file is not None:
+                image.unpack(method="REMOVE")
             if image.filepath != str(image_path):
                 image.filepath = str(image_path)
             image.reload()
@@ -438,159 +466,13 @@ class AbstractBaseVrmImporter(ABC):
     # - Root bones
     # - Bones that have meshes parented to them
     def find_retain_node_indices(self, scene_dict: dict[str, Json]) -> list[int]:
-        scene_node_index_jsons = scene_dict.get("nodes")
-        if not isinstance(scene_node_index_jsons, list):
-            return []
-        scene_node_indices = [
-            index for index in scene_node_index_jsons if isinstance(index, int)
-        ]
-        json_dict = self._parse_result.json_dict
-        node_dict_jsons = json_dict.get("nodes")
-        if not isinstance(node_dict_jsons, list):
-            return []
-        node_dicts = [
-            node_dict for node_dict in node_dict_jsons if isinstance(node_dict, dict)
-        ]
-        skin_dict_jsons = json_dict.get("skins")
-        if not isinstance(skin_dict_jsons, list):
-            skin_dict_jsons = []
-        skin_dicts = [
-            skin_dict for skin_dict in skin_dict_jsons if isinstance(skin_dict, dict)
-        ]
-
-        bone_node_indices = self.find_vrm_bone_node_indices()
-
-        # Collect all nodes in the scene node tree where the hips bone exists.
-        # Also treat the root node of that tree as a bone.
-        all_scene_node_indices: list[int] = []
-        hips_found = False
-        for scene_node_index in scene_node_indices:
-            all_scene_node_indices.clear()
-
-            search_scene_node_indices = [scene_node_index]
-            while search_scene_node_indices:
-                search_scene_node_index = search_scene_node_indices.pop()
-                if search_scene_node_index == self._parse_result.hips_node_index:
-                    bone_node_indices.append(scene_node_index)
-                    hips_found = True
-                if not (0 <= search_scene_node_index < len(node_dicts)):
-                    continue
-                node_dict = node_dicts[search_scene_node_index]
-                all_scene_node_indices.append(search_scene_node_index)
-                child_indices = node_dict.get("children")
-                if not isinstance(child_indices, list):
-                    continue
-                for child_index in child_indices:
-                    if not isinstance(child_index, int):
-                        continue
-                    if child_index in all_scene_node_indices:
-                        # Avoid recursive nodes
-                        continue
-                    search_scene_node_indices.append(child_index)
-            if hips_found:
-                break
-        if not hips_found:
-            return []
-
-        all_scene_node_indices = list(dict.fromkeys(all_scene_node_indices))  # Distinct
-
-        # Also treat indices registered in skin as bones
-        for node_index in all_scene_node_indices:
-            if not (0 <= node_index < len(node_dicts)):
-                continue
-            node_dict = node_dicts[node_index]
-            skin_index = node_dict.get("skin")
-            if not isinstance(skin_index, int) or not (
-                0 <= skin_index < len(skin_dicts)
-            ):
-                continue
-            skin_dict = skin_dicts[skin_index]
-            skeleton_index = skin_dict.get("skeleton")
-            if isinstance(skeleton_index, int):
-                bone_node_indices.append(skeleton_index)
-            joint_indices = skin_dict.get("joints")
-            if isinstance(joint_indices, list):
-                for joint_index in joint_indices:
-                    if isinstance(joint_index, int):
-                        bone_node_indices.append(joint_index)
-
-        # Remove bone indices that are not in the scene node index
-        for bone_node_index in list(bone_node_indices):
-            if bone_node_index not in all_scene_node_indices:
-                bone_node_indices.remove(bone_node_index)
-
-        # Add children from currently found bone nodes until hitting mesh nodes
-        search_bone_node_indices = list(bone_node_indices)
-        while search_bone_node_indices:
-            search_bone_node_index = search_bone_node_indices.pop()
-            if not (0 <= search_bone_node_index < len(node_dicts)):
-                continue
-            node_dict = node_dicts[search_bone_node_index]
-            if isinstance(node_dict.get("mesh"), int):
-                continue
-
-            bone_node_indices.append(search_bone_node_index)
-
-            child_indices = node_dict.get("children")
-            if not isinstance(child_indices, list):
-                continue
-            for child_index in child_indices:
-                if not isinstance(child_index, int):
-                    continue
-                if child_index in bone_node_indices:
-                    continue
-                search_bone_node_indices.append(child_index)
-
-        # If a mesh node has bone nodes as children,
-        # treat that mesh node as a bone too
-        bone_node_indices.extend(
-            functools.reduce(
-                lambda left, right: left + right,
-                [
-                    self.find_middle_bone_indices(
-                        node_dicts, bone_node_indices, bone_node_index, []
-                    )
-                    for bone_node_index in bone_node_indices
-                ],
-                list[int](),
-            )
+        return find_retain_node_indices(
+            self._parse_result.json_dict,
+            scene_dict,
+            self.find_vrm_bone_node_indices(),
+            self._parse_result.hips_node_index,
         )
 
-        return list(dict.fromkeys(bone_node_indices))  # Distinct
-
-    def find_middle_bone_indices(
-        self,
-        node_dicts: list[dict[str, Json]],
-        bone_node_indices: list[int],
-        bone_node_index: int,
-        middle_bone_node_indices: list[int],
-    ) -> list[int]:
-        if not (0 <= bone_node_index < len(node_dicts)):
-            return []
-        node_dict = node_dicts[bone_node_index]
-        child_indices = node_dict.get("children")
-        if not isinstance(child_indices, list):
-            return []
-
-        result: list[int] = []
-        for child_index in child_indices:
-            if not isinstance(child_index, int):
-                continue
-            if not (0 <= child_index < len(node_dicts)):
-                continue
-            if child_index in bone_node_indices:
-                result.extend(middle_bone_node_indices)
-                continue
-            result.extend(
-                self.find_middle_bone_indices(
-                    node_dicts,
-                    bone_node_indices,
-                    child_index,
-                    [*middle_bone_node_indices, bone_node_index],
-                )
-            )
-        return result
-
     def import_gltf2_with_indices(self) -> None:
         json_dict, buffer0_bytes = parse_glb(self._parse_result.filepath.read_bytes())
 
@@ -1386,6 +1268,157 @@ class AbstractBaseVrmImporter(ABC):
             self._context.view_layer.objects.active = self._armature
 
 
+def find_retain_node_indices(
+    json_dict: Mapping[str, Json],
+    scene_dict: dict[str, Json],
+    bone_node_indices: list[int],
+    hips_node_index: Optional[int],
+) -> list[int]:
+    scene_node_index_jsons = scene_dict.get("nodes")
+    if not isinstance(scene_node_index_jsons, list):
+        return []
+    scene_node_indices = [
+        index for index in scene_node_index_jsons if isinstance(index, int)
+    ]
+    node_dict_jsons = json_dict.get("nodes")
+    if not isinstance(node_dict_jsons, list):
+        return []
+    node_dicts = [
+        node_dict for node_dict in node_dict_jsons if isinstance(node_dict, dict)
+    ]
+    skin_dict_jsons = json_dict.get("skins")
+    if not isinstance(skin_dict_jsons, list):
+        skin_dict_jsons = []
+    skin_dicts = [
+        skin_dict for skin_dict in skin_dict_jsons if isinstance(skin_dict, dict)
+    ]
+
+    # Resolve the valid child indices once so that each traversal below
+    # only does list and set operations
+    node_child_indices: list[list[int]] = []
+    for node_dict in node_dicts:
+        child_indices = node_dict.get("children")
+        if isinstance(child_indices, list):
+            node_child_indices.append(
+                [
+                    child_index
+                    for child_index in child_indices
+                    if isinstance(child_index, int)
+                ]
+            )
+        else:
+            node_child_indices.append([])
+    node_count = len(node_dicts)
+
+    bone_node_indices = list(bone_node_indices)
+
+    # Collect all nodes in the scene node tree where the hips bone exists.
+    # Also treat the root node of that tree as a bone.
+    all_scene_node_indices: dict[int, None] = {}
+    hips_found = False
+    for scene_node_index in scene_node_indices:
+        all_scene_node_indices.clear()
+
+        search_scene_node_indices = [scene_node_index]
+        while search_scene_node_indices:
+            search_scene_node_index = search_scene_node_indices.pop()
+            if search_scene_node_index == hips_node_index:
+                bone_node_indices.append(scene_node_index)
+                hips_found = True
+            if not (0 <= search_scene_node_index < node_count):
+                continue
+            all_scene_node_indices[search_scene_node_index] = None
+            search_scene_node_indices.extend(
+                child_index
+                for child_index in node_child_indices[search_scene_node_index]
+                # Avoid recursive nodes
+                if child_index not in all_scene_node_indices
+            )
+        if hips_found:
+            break
+    if not hips_found:
+        return []
+
+    # Also treat indices registered in skin as bones
+    for node_index in all_scene_node_indices:
+        skin_index = node_dicts[node_index].get("skin")
+        if not isinstance(skin_index, int) or not (0 <= skin_index < len(skin_dicts)):
+            continue
+        skin_dict = skin_dicts[skin_index]
+        skeleton_index = skin_dict.get("skeleton")
+        if isinstance(skeleton_index, int):
+            bone_node_indices.append(skeleton_index)
+        joint_indices = skin_dict.get("joints")
+        if isinstance(joint_indices, list):
+            bone_node_indices.extend(
+                joint_index
+                for joint_index in joint_indices
+                if isinstance(joint_index, int)
+            )
+
+    # Remove bone indices that are not in the scene node index
+    bone_node_indices = [
+        bone_node_index
+        for bone_node_index in bone_node_indices
+        if bone_node_index in all_scene_node_indices
+    ]
+
+    # Add children from currently found bone nodes until hitting mesh nodes
+    bone_node_index_set = set(bone_node_indices)
+    search_bone_node_indices = list(bone_node_indices)
+    while search_bone_node_indices:
+        search_bone_node_index = search_bone_node_indices.pop()
+        if not (0 <= search_bone_node_index < node_count):
+            continue
+        if isinstance(node_dicts[search_bone_node_index].get("mesh"), int):
+            continue
+
+        bone_node_indices.append(search_bone_node_index)
+        bone_node_index_set.add(search_bone_node_index)
+
+        search_bone_node_indices.extend(
+            child_index
+            for child_index in node_child_indices[search_bone_node_index]
+            if child_index not in bone_node_index_set
+        )
+
+    retain_node_indices = dict.fromkeys(bone_node_indices)  # Distinct
+
+    # If a mesh node has bone nodes as children,
+    # treat that mesh node as a bone too
+    for bone_node_index in list(retain_node_indices):
+        if not (0 <= bone_node_index < node_count):
+            continue
+        # The path from the bone node to the node being searched. The nodes
+        # before retained_path_length have already been added to the result.
+        path = [bone_node_index]
+        path_set = {bone_node_index}
+        retained_path_length = 0
+        child_index_iterators = [iter(node_child_indices[bone_node_index])]
+        while child_index_iterators:
+            child_index = next(child_index_iterators[-1], None)
+            if child_index is None:
+                child_index_iterators.pop()
+                path_set.discard(path.pop())
+                retained_path_length = min(retained_path_length, len(path))
+                continue
+            if not (0 <= child_index < node_count):
+                continue
+            if child_index in bone_node_index_set:
+                for middle_bone_node_index in path[retained_path_length:-1]:
+                    retain_node_indices[middle_bone_node_index] = None
+                retained_path_length = max(retained_path_length, len(path) - 1)
+                continue
+            if child_index in path_set:
+                # Avoid recursive nodes
+                continue
+            path.append(child_index)
+            path_set.add(child_index)
+            child_index_iterators.append(iter(node_child_indices[child_index]))
+
+    return list(retain_node_indices)
+
+
 def parse_vrm_json(filepath: Path, *, license_validation: bool) -> ParseResult:
     json_dict, bin_chunk = parse_glb(filepath.read_bytes())
 
@@ -2,12 +2,11 @@
 import secrets
 import string
 from collections.abc import Mapping
-from typing import ClassVar, Final, Optional
+from typing import TYPE_CHECKING, ClassVar, Final, Optional
 
 import bpy
 from bpy.types import Armature, Image, Object, Scene
 from io_scene_gltf2.io.com import gltf2_io
-from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
 
 from ..common.deep import Json, make_json
 from ..common.logger import get_logger
@@ -19,10 +18,14 @@ from ..editor.khr_xmp_json_ld.property_group import (
     KhrXmpJsonLdKhrCharacterPacketPropertyGroup,
 )
 
-if bpy.app.version >= (4, 3):
-    from io_scene_gltf2.blender.imp.vnode import VNode
-else:
-    from io_scene_gltf2.blender.imp.gltf2_blender_vnode import VNode
+if TYPE_CHECKING:
+    # These modules import numpy, which is slow to load on the add-on startup
+    from io_scene_gltf2.io.imp.gltf2_io_gltf import glTFImporter
+
+    if bpy.app.version >= (4, 3):
+        from io_scene_gltf2.blender.imp.vnode import VNode
+    else:
+        from io_scene_gltf2.blender.imp.gltf2_blender_vnode import VNode
 
 KHR_CHARACTER_SUPPORTED: Final[bool] = bpy.app.version >= (100000,)
 
@@ -76,7 +79,7 @@ class Gltf2ImportUserExtensionVrm:
         self,
         gltf_image: gltf2_io.Image,
         blender_image: Image,
-        gltf: glTFImporter,
+        gltf: "glTFImporter",
     ) -> None:
         current_import_id = self._current_import_id
         if current_import_id is None:
@@ -105,7 +108,7 @@ class Gltf2ImportUserExtensionVrmKhrCharacter(Gltf2ImportUserExtensionVrm):
         self,
         gltf_image: gltf2_io.Image,
         blender_image: Image,
-        gltf: glTFImporter,
+        gltf: "glTFImporter",
     ) -> None:
         super().gather_import_image_after_hook(gltf_image, blender_image, gltf)
 
@@ -122,10 +125,10 @@ class Gltf2ImportUserExtensionVrmKhrCharacter(Gltf2ImportUserExtensionVrm):
 
     def gather_import_node_after_hook(
         self,
-        _vnode: VNode,
+        _vnode: "VNode",
         _gltf_node: gltf2_io.Node,
         blender_object: Object,
-        _gltf: glTFImporter,
+        _gltf: "glTFImporter",
     ) -> None:
         """Track armature objects created during import for KHR_character processing."""
         if blender_object.type == "ARMATURE":
@@ -135,7 +138,7 @@ class Gltf2ImportUserExtensionVrmKhrCharacter(Gltf2ImportUserExtensionVrm):
         self,
         _gltf_scene: gltf2_io.Scene,
         _blender_scene: Scene,
-        gltf: glTFImporter,
+        gltf: "glTFImporter",
     ) -> None:
         """Read KHR_character/KHR_xmp_json_ld and fill armature custom properties."""
         if not isinstance(gltf_data := getattr(gltf, "data", None), gltf2_io.Gltf):
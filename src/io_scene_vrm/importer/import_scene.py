@@ -2,7 +2,7 @@
 import traceback
 from os import environ
 from pathlib import Path
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, ClassVar, Optional
 
 import bpy
 from bpy.app.translations import pgettext
@@ -11,7 +11,9 @@ from bpy.types import (
     Armature,
     Context,
     Event,
+    Object,
     Operator,
+    OperatorFileListElement,
     Panel,
     PropertyGroup,
     SpaceFileBrowser,
@@ -28,15 +30,16 @@ from ..common.preferences import (
     draw_import_preferences_layout,
     get_preferences,
 )
+from ..common.profiling import span
+from ..common.progress import ProgressCancelledError
 from ..editor import search
 from ..editor.extension_accessor import get_armature_extension
 from ..editor.ops import VRM_OT_open_url_in_web_browser, layout_operator
 from ..editor.property_group import CollectionPropertyProtocol, StringPropertyGroup
-from .abstract_base_vrm_importer import AbstractBaseVrmImporter, parse_vrm_json
 from .license_validation import LicenseConfirmationRequiredError
-from .vrm0_importer import Vrm0Importer
-from .vrm1_importer import Vrm1Importer
-from .vrm_animation_importer import VrmAnimationImporter
+
+if TYPE_CHECKING:
+    from .abstract_base_vrm_importer import AbstractBaseVrmImporter
 
 _logger = get_logger(__name__)
 
@@ -148,6 +151,8 @@ class IMPORT_SCENE_OT_vrm(Operator, ImportHelper):
 
         _logger.warning(license_error.description())
 
+        from .abstract_base_vrm_importer import parse_vrm_json
+
         thumbnail_image_name = None
         try:
             thumbnail_image_name = parse_vrm_json(
@@ -386,21 +391,34 @@ def import_vrm(
     *,
     license_validation: bool,
 ) -> set[str]:
-    parse_result = parse_vrm_json(filepath, license_validation=license_validation)
-    if parse_result.spec_version_number >= (1,):
-        vrm_importer: AbstractBaseVrmImporter = Vrm1Importer(
-            context,
-            parse_result,
-            preferences,
-        )
-    else:
-        vrm_importer = Vrm0Importer(
-            context,
-            parse_result,
-            preferences,
-        )
+    # The importers are imported on first use to keep the add-on startup fast
+    from .abstract_base_vrm_importer import parse_vrm_json
+    from .vrm0_importer import Vrm0Importer
+    from .vrm1_importer import Vrm1Importer
+
+    with span("import_vrm"):
+        with span("parse_vrm_json"):
+            parse_result = parse_vrm_json(
+                filepath, license_validation=license_validation
+            )
+        if parse_result.spec_version_number >= (1,):
+            vrm_importer: AbstractBaseVrmImporter = Vrm1Importer(
+                context,
+                parse_result,
+                preferences,
+            )
+        else:
+            vrm_importer = Vrm0Importer(
+                context,
+                parse_result,
+                preferences,
+            )
 
-    vrm_importer.import_vrm()
+        try:
+            vrm_importer.import_vrm()
+        except ProgressCancelledError:
+            _logger.warning("Cancelled importing %s", filepath)
+            return {"CANCELLED"}
 
     return {"FINISHED"}
 
@@ -418,6 +436,45 @@ def menu_import(
     )
     vrma_import_op.armature_object_name = ""
 
+    vrma_batch_import_op = layout_operator(
+        menu_op.layout,
+        IMPORT_SCENE_OT_vrma_batch,
+        text="VRM Animation (.vrma) Multiple Files",
+    )
+    vrma_batch_import_op.armature_object_name = ""
+
+
+def find_or_create_vrma_import_armature(
+    context: Context, armature_object_name: str
+) -> tuple[Optional[Object], set[str]]:
+    """Return the armature to import VRM Animation into.
+
+    If no armature is found, return None and the operator result to return.
+    """
+    armature = None
+    if armature_object_name:
+        armature = context.blend_data.objects.get(armature_object_name)
+        if not armature:
+            return None, {"CANCELLED"}
+
+    if not armature:
+        armature = search.current_armature(context)
+
+    if not armature:
+        added = ops.icyp.make_basic_armature()
+        if added != {"FINISHED"}:
+            return None, added
+        armature = search.current_armature(context)
+        if not armature:
+            return None, {"CANCELLED"}
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            return None, {"CANCELLED"}
+        ext = get_armature_extension(armature_data)
+        ext.spec_version = ext.SPEC_VERSION_VRM1
+
+    return armature, {"FINISHED"}
+
 
 class IMPORT_SCENE_OT_vrma(Operator, ImportHelper):
     bl_idname = "import_scene.vrma"
@@ -449,27 +506,13 @@ class IMPORT_SCENE_OT_vrma(Operator, ImportHelper):
             if not filepath.is_file():
                 return {"CANCELLED"}
 
-            armature = None
-            if self.armature_object_name:
-                armature = context.blend_data.objects.get(self.armature_object_name)
-                if not armature:
-                    return {"CANCELLED"}
-
+            armature, result = find_or_create_vrma_import_armature(
+                context, self.armature_object_name
+            )
             if not armature:
-                armature = search.current_armature(context)
+                return result
 
-            if not armature:
-                added = ops.icyp.make_basic_armature()
-                if added != {"FINISHED"}:
-                    return added
-                armature = search.current_armature(context)
-                if not armature:
-                    return {"CANCELLED"}
-                armature_data = armature.data
-                if not isinstance(armature_data, Armature):
-                    return {"CANCELLED"}
-                ext = get_armature_extension(armature_data)
-                ext.spec_version = ext.SPEC_VERSION_VRM1
+            from .vrm_animation_importer import VrmAnimationImporter
 
             return VrmAnimationImporter.execute(context, filepath, armature)
         except Exception:
@@ -496,6 +539,95 @@ class IMPORT_SCENE_OT_vrma(Operator, ImportHelper):
         armature_object_name: str  # type: ignore[no-redef]
 
 
+class IMPORT_SCENE_OT_vrma_batch(Operator, ImportHelper):
+    bl_idname = "import_scene.vrma_batch"
+    bl_label = "Open"
+    bl_description = "Import multiple VRM Animations into one armature"
+    bl_options: ClassVar = {"REGISTER", "UNDO"}
+
+    filename_ext = ".vrma"
+    filter_glob: StringProperty(  # type: ignore[valid-type]
+        default="*.vrma",
+        options={"HIDDEN"},
+    )
+
+    armature_object_name: StringProperty(  # type: ignore[valid-type]
+        options={"HIDDEN"},
+    )
+
+    push_to_nla: BoolProperty(  # type: ignore[valid-type]
+        name="Push to NLA Tracks",
+        description="Push the action of each file down to its own NLA track",
+    )
+
+    files: CollectionProperty(  # type: ignore[valid-type]
+        type=OperatorFileListElement,
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    directory: StringProperty(  # type: ignore[valid-type]
+        subtype="DIR_PATH",
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    def execute(self, context: Context) -> set[str]:
+        try:
+            errors = WM_OT_vrma_import_prerequisite.detect_errors(
+                context, self.armature_object_name
+            )
+            if errors:
+                for error in errors:
+                    _logger.error(error)
+                return {"CANCELLED"}
+
+            directory = Path(self.directory)
+            filepaths = [directory / file.name for file in self.files if file.name]
+            if not filepaths and self.filepath:
+                filepaths = [Path(self.filepath)]
+            filepaths = [filepath for filepath in filepaths if filepath.is_file()]
+            if not filepaths:
+                return {"CANCELLED"}
+
+            armature, result = find_or_create_vrma_import_armature(
+                context, self.armature_object_name
+            )
+            if not armature:
+                return result
+
+            from .vrm_animation_importer import VrmAnimationImporter
+
+            return VrmAnimationImporter.execute_batch(
+                context, filepaths, armature, push_to_nla=self.push_to_nla
+            )
+        except Exception:
+            show_error_dialog(
+                pgettext("Failed to import VRM Animation."),
+                traceback.format_exc(),
+            )
+            raise
+
+    def invoke(self, context: Context, event: Event) -> set[str]:
+        errors = WM_OT_vrma_import_prerequisite.detect_errors(
+            context, self.armature_object_name
+        )
+        if errors:
+            for error in errors:
+                self.report({"ERROR"}, error)
+            return {"CANCELLED"}
+        return ImportHelper.invoke(self, context, event)
+
+    if TYPE_CHECKING:
+        # This code is auto generated.
+        # To regenerate, run the `uv run tools/property_typing.py` command.
+        filter_glob: str  # type: ignore[no-redef]
+        armature_object_name: str  # type: ignore[no-redef]
+        push_to_nla: bool  # type: ignore[no-redef]
+        files: CollectionPropertyProtocol[  # type: ignore[no-redef]
+            OperatorFileListElement
+        ]
+        directory: str  # type: ignore[no-redef]
+
+
 class WM_OT_vrma_import_prerequisite(Operator):
     bl_label = "VRM Animation Import Prerequisite"
     bl_idname = "wm.vrma_import_prerequisite"
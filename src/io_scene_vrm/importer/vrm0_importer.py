@@ -23,6 +23,7 @@ from ..common import convert, shader
 from ..common.convert import Json
 from ..common.logger import get_logger
 from ..common.preferences import get_preferences
+from ..common.profiling import span
 from ..common.progress import PartialProgress
 from ..common.version import get_addon_version
 from ..common.vrm0.human_bone import HumanBoneName, HumanBoneSpecifications
@@ -255,7 +256,7 @@ class Vrm0Importer(AbstractBaseVrmImporter):
 
             self.reset_material(material)
             assignment_method(material, material_property)
-            progress.update(float(index) / len(material_properties))
+            progress.update_items(index + 1, len(material_properties))
 
         progress.update(1)
 
@@ -797,20 +798,25 @@ class Vrm0Importer(AbstractBaseVrmImporter):
         textblock.write(json.dumps(self._parse_result.json_dict, indent=4))
 
         self.load_vrm0_meta(vrm0.meta, vrm0_extension.get("meta"))
-        self.load_vrm0_humanoid(
-            vrm0.humanoid, vrm0_extension.get("humanoid"), vrm1.humanoid.human_bones
-        )
-        _setup_bones(self._context, armature)
+        with span("load_humanoid"):
+            self.load_vrm0_humanoid(
+                vrm0.humanoid,
+                vrm0_extension.get("humanoid"),
+                vrm1.humanoid.human_bones,
+            )
+            _setup_bones(self._context, armature)
         self.load_vrm0_first_person(
             vrm0.first_person, vrm0_extension.get("firstPerson")
         )
         self.load_vrm0_blend_shape_master(
             vrm0.blend_shape_master, vrm0_extension.get("blendShapeMaster")
         )
-        self.load_vrm0_secondary_animation(
-            vrm0.secondary_animation, vrm0_extension.get("secondaryAnimation")
-        )
-        migration.migrate(self._context, armature.name, heavy_migration=True)
+        with span("load_spring_bones"):
+            self.load_vrm0_secondary_animation(
+                vrm0.secondary_animation, vrm0_extension.get("secondaryAnimation")
+            )
+        with span("migrate"):
+            migration.migrate(self._context, armature.name, heavy_migration=True)
 
     def load_vrm0_meta(self, meta: Vrm0MetaPropertyGroup, meta_dict: Json) -> None:
         if not isinstance(meta_dict, dict):
@@ -19,6 +19,7 @@ from ..common import convert, shader
 from ..common.convert import Json
 from ..common.logger import get_logger
 from ..common.preferences import get_preferences
+from ..common.profiling import span
 from ..common.progress import PartialProgress
 from ..common.version import get_addon_version
 from ..common.vrm1.human_bone import HumanBoneName, HumanBoneSpecifications
@@ -425,7 +426,7 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         for index, material_dict in enumerate(material_dicts):
             if isinstance(material_dict, dict):
                 self.make_mtoon1_material(index, material_dict)
-            progress.update(float(index) / len(material_dicts))
+            progress.update_items(index + 1, len(material_dicts))
         progress.update(1)
 
     def find_vrm1_bone_node_indices(self) -> list[int]:
@@ -921,10 +922,11 @@ class Vrm1Importer(AbstractBaseVrmImporter):
         textblock.write(json.dumps(self._parse_result.json_dict, indent=4))
 
         self.load_vrm1_meta(vrm1.meta, vrm1_extension_dict.get("meta"))
-        self.load_vrm1_humanoid(
-            vrm1.humanoid, vrm1_extension_dict.get("humanoid"), vrm0.humanoid
-        )
-        self.setup_vrm1_humanoid_bones()
+        with span("load_humanoid"):
+            self.load_vrm1_humanoid(
+                vrm1.humanoid, vrm1_extension_dict.get("humanoid"), vrm0.humanoid
+            )
+            self.setup_vrm1_humanoid_bones()
         self.load_vrm1_first_person(
             vrm1.first_person, vrm1_extension_dict.get("firstPerson")
         )
@@ -935,12 +937,16 @@ class Vrm1Importer(AbstractBaseVrmImporter):
 
         extensions_dict = self._parse_result.json_dict.get("extensions")
         if isinstance(extensions_dict, dict):
-            self.load_spring_bone1(
-                addon_extension.spring_bone1, extensions_dict.get("VRMC_springBone")
-            )
+            with span("load_spring_bones"):
+                self.load_spring_bone1(
+                    addon_extension.spring_bone1,
+                    extensions_dict.get("VRMC_springBone"),
+                )
 
-        self.load_node_constraint1()
-        migration.migrate(self._context, armature.name, heavy_migration=True)
+        with span("load_constraints"):
+            self.load_node_constraint1()
+        with span("migrate"):
+            migration.migrate(self._context, armature.name, heavy_migration=True)
 
     def load_vrm1_meta(self, meta: Vrm1MetaPropertyGroup, meta_dict: Json) -> None:
         if not isinstance(meta_dict, dict):
@@ -1,36 +1,49 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import itertools
 import math
-from dataclasses import dataclass
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Optional, TypeVar, Union
 
 import bpy
-from bpy.types import Armature, Context, Object
+from bpy.types import (
+    Action,
+    AnimData,
+    Armature,
+    Context,
+    EnumProperty,
+    Keyframe,
+    Object,
+    PoseBone,
+)
 from mathutils import Matrix, Quaternion, Vector
 
 from ..common import convert
 from ..common.convert import Json
 from ..common.debug import dump
 from ..common.gltf import (
+    AnimationSamplerAccessorCache,
     parse_glb,
     parse_gltf_node_matrix,
-    read_accessor_as_animation_sampler_input,
-    read_accessor_as_animation_sampler_rotation_output,
-    read_accessor_as_animation_sampler_translation_output,
 )
 from ..common.logger import get_logger
+from ..common.profiling import span
 from ..common.rotation import (
+    convert_quaternion_to_rotation_values,
     get_rotation_as_quaternion,
-    insert_rotation_keyframe,
-    set_rotation_without_mode_change,
+    get_rotation_data_path,
 )
 from ..common.vrm1.human_bone import HumanBoneName
 from ..common.workspace import save_workspace
 from ..editor.extension_accessor import get_armature_extension
 from ..editor.t_pose import setup_humanoid_t_pose
+from ..editor.vrm1.property_group import Vrm1ExpressionPropertyGroup
 
 _logger = get_logger(__name__)
 
+KeyframeValue = TypeVar("KeyframeValue", Vector, Quaternion)
+
 
 class VrmAnimationImporter:
     @staticmethod
@@ -45,15 +58,160 @@ class VrmAnimationImporter:
             return {"CANCELLED"}
 
         with (
+            span("import_vrma"),
             setup_humanoid_t_pose(context, armature),
             save_workspace(context, armature, mode="POSE"),
         ):
             bpy.ops.pose.select_all(action="DESELECT")
-            result = _import_vrm_animation(context, path, armature)
+            imported_animation = _import_vrm_animation(
+                context,
+                path,
+                armature,
+                HumanoidRestPose.create(armature),
+                AnimationSamplerAccessorCache(),
+                humanoid_action_name="Humanoid",
+                expression_action_name="Expressions",
+            )
+            if imported_animation and imported_animation.hips_translation_imported:
+                _disconnect_hips_bone(context, armature)
             look_at_preview_enabled = ext.vrm1.look_at.enable_preview
 
         ext.vrm1.look_at.enable_preview = look_at_preview_enabled
-        return result
+        if not imported_animation:
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+    @staticmethod
+    def execute_batch(
+        context: Context,
+        paths: Sequence[Path],
+        armature: Object,
+        *,
+        push_to_nla: bool,
+    ) -> set[str]:
+        """Import each VRM Animation file as separate actions for an armature.
+
+        The T-pose, the human bone states of the armature and the decoded
+        accessors are shared by all the files. The actions are named after the
+        file names and are either pushed down to NLA tracks or kept with fake
+        users, so that they are not lost when the next file is imported.
+        """
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            return {"CANCELLED"}
+
+        ext = get_armature_extension(armature_data)
+        humanoid = ext.vrm1.humanoid
+        if not humanoid.human_bones.bones_are_correctly_assigned():
+            return {"CANCELLED"}
+
+        imported_animations: list[ImportedVrmAnimation] = []
+        with (
+            span("import_vrma"),
+            setup_humanoid_t_pose(context, armature),
+            save_workspace(context, armature, mode="POSE"),
+        ):
+            bpy.ops.pose.select_all(action="DESELECT")
+            humanoid_rest_pose = HumanoidRestPose.create(armature)
+            accessor_cache = AnimationSamplerAccessorCache()
+            for path in paths:
+                imported_animation = _import_vrm_animation(
+                    context,
+                    path,
+                    armature,
+                    humanoid_rest_pose,
+                    accessor_cache,
+                    humanoid_action_name=path.stem,
+                    expression_action_name=path.stem + " Expressions",
+                    look_at_action_name=path.stem + " LookAt",
+                )
+                if not imported_animation:
+                    _logger.warning("Failed to import VRM Animation: %s", path)
+                    continue
+                imported_animations.append(imported_animation)
+                _store_batch_imported_action(
+                    context,
+                    armature.animation_data,
+                    imported_animation.humanoid_action,
+                    path.stem,
+                    push_to_nla=push_to_nla,
+                )
+                _store_batch_imported_action(
+                    context,
+                    armature_data.animation_data,
+                    imported_animation.expression_action,
+                    path.stem,
+                    push_to_nla=push_to_nla,
+                )
+                look_at_target_object = imported_animation.look_at_target_object
+                look_at_action = imported_animation.look_at_action
+                if look_at_target_object and look_at_action:
+                    _store_batch_imported_action(
+                        context,
+                        look_at_target_object.animation_data,
+                        look_at_action,
+                        path.stem,
+                        push_to_nla=push_to_nla,
+                    )
+            if any(
+                imported_animation.hips_translation_imported
+                for imported_animation in imported_animations
+            ):
+                _disconnect_hips_bone(context, armature)
+            look_at_preview_enabled = ext.vrm1.look_at.enable_preview
+
+        ext.vrm1.look_at.enable_preview = look_at_preview_enabled
+        if not imported_animations:
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+@dataclass(frozen=True)
+class ImportedVrmAnimation:
+    humanoid_action: Action
+    expression_action: Action
+    look_at_target_object: Optional[Object]
+    look_at_action: Optional[Action]
+    hips_translation_imported: bool
+
+
+def _store_batch_imported_action(
+    context: Context,
+    animation_data: Optional[AnimData],
+    action: Action,
+    name: str,
+    *,
+    push_to_nla: bool,
+) -> None:
+    if not action.fcurves:
+        if animation_data and animation_data.action == action:
+            animation_data.action = None
+        context.blend_data.actions.remove(action)
+        return
+    if not push_to_nla or not animation_data:
+        action.use_fake_user = True
+        return
+    nla_track = animation_data.nla_tracks.new()
+    nla_track.name = name
+    frame_start, _ = action.frame_range
+    nla_track.strips.new(name, int(frame_start), action)
+    animation_data.action = None
+
+
+def _disconnect_hips_bone(context: Context, armature: Object) -> None:
+    # If translation is assigned to hips and hips is connected to parent
+    # with "use_connect", the movement animation will not be reflected, so
+    # we need to disconnect it
+    with save_workspace(context, armature, mode="EDIT"):
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+        humanoid = get_armature_extension(armature_data).vrm1.humanoid
+        hips_bone = armature_data.edit_bones.get(
+            humanoid.human_bones.hips.node.bone_name
+        )
+        if hips_bone and hips_bone.use_connect:
+            hips_bone.use_connect = False
 
 
 def _find_root_node_index(
@@ -79,59 +237,70 @@ def _find_root_node_index(
     return node_index
 
 
-def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set[str]:
+def _import_vrm_animation(
+    context: Context,
+    path: Path,
+    armature: Object,
+    humanoid_rest_pose: "HumanoidRestPose",
+    accessor_cache: AnimationSamplerAccessorCache,
+    *,
+    humanoid_action_name: str,
+    expression_action_name: str,
+    look_at_action_name: Optional[str] = None,
+) -> Optional[ImportedVrmAnimation]:
     if not path.exists():
-        return {"CANCELLED"}
+        return None
     armature_data = armature.data
     if not isinstance(armature_data, Armature):
-        return {"CANCELLED"}
+        return None
     humanoid = get_armature_extension(armature_data).vrm1.humanoid
     if not humanoid.human_bones.bones_are_correctly_assigned():
-        return {"CANCELLED"}
+        return None
     look_at = get_armature_extension(armature_data).vrm1.look_at
 
-    vrma_dict, buffer0_bytes = parse_glb(path.read_bytes())
+    with span("parse_vrma"):
+        vrma_dict, buffer0_bytes = parse_glb(path.read_bytes())
 
     node_dicts = vrma_dict.get("nodes")
     if not isinstance(node_dicts, list) or not node_dicts:
-        return {"CANCELLED"}
+        return None
 
     animation_dicts = vrma_dict.get("animations")
     if not isinstance(animation_dicts, list) or not animation_dicts:
-        return {"CANCELLED"}
+        return None
     animation_dict = animation_dicts[0]
     if not isinstance(animation_dict, dict):
-        return {"CANCELLED"}
+        return None
     animation_channel_dicts = animation_dict.get("channels")
     if not isinstance(animation_channel_dicts, list) or not animation_channel_dicts:
-        return {"CANCELLED"}
+        return None
     animation_sampler_dicts = animation_dict.get("samplers")
     if not isinstance(animation_sampler_dicts, list) or not animation_sampler_dicts:
-        return {"CANCELLED"}
+        return None
 
     extensions_dict = vrma_dict.get("extensions")
     if not isinstance(extensions_dict, dict):
-        return {"CANCELLED"}
+        return None
     vrmc_vrm_animation_dict = extensions_dict.get("VRMC_vrm_animation")
     if not isinstance(vrmc_vrm_animation_dict, dict):
-        return {"CANCELLED"}
+        return None
     humanoid_dict = vrmc_vrm_animation_dict.get("humanoid")
     if not isinstance(humanoid_dict, dict):
-        return {"CANCELLED"}
+        return None
     human_bones_dict = humanoid_dict.get("humanBones")
     if not isinstance(human_bones_dict, dict):
-        return {"CANCELLED"}
+        return None
     hips_dict = human_bones_dict.get("hips")
     if not isinstance(hips_dict, dict):
-        return {"CANCELLED"}
+        return None
     hips_node_index = hips_dict.get("node")
     if not isinstance(hips_node_index, int):
-        return {"CANCELLED"}
+        return None
     if not (0 <= hips_node_index < len(node_dicts)):
-        return {"CANCELLED"}
+        return None
     hips_node_dict = node_dicts[hips_node_index]
     if not isinstance(hips_node_dict, dict):
-        return {"CANCELLED"}
+        return None
 
     expression_name_to_node_index: dict[str, int] = {}
     expressions_dict = vrmc_vrm_animation_dict.get("expressions")
@@ -177,20 +346,20 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
         node_dicts, root_node_index, is_root=True
     )
     if len(node_rest_pose_trees) != 1:
-        return {"CANCELLED"}
+        return None
     node_rest_pose_tree = node_rest_pose_trees[0]
 
     accessor_dicts = vrma_dict.get("accessors")
     if not isinstance(accessor_dicts, list):
-        return {"CANCELLED"}
+        return None
     buffer_view_dicts = vrma_dict.get("bufferViews")
     if not isinstance(buffer_view_dicts, list):
-        return {"CANCELLED"}
+        return None
     buffer_dicts = vrma_dict.get("buffers")
     if not isinstance(buffer_dicts, list):
-        return {"CANCELLED"}
+        return None
 
-    humanoid_action = context.blend_data.actions.new(name="Humanoid")
+    humanoid_action = context.blend_data.actions.new(name=humanoid_action_name)
     if not armature.animation_data:
         armature.animation_data_create()
     armature_animation_data = armature.animation_data
@@ -199,7 +368,7 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
         raise ValueError(message)
     armature_animation_data.action = humanoid_action
 
-    expression_action = context.blend_data.actions.new(name="Expressions")
+    expression_action = context.blend_data.actions.new(name=expression_action_name)
     if not armature_data.animation_data:
         armature_data.animation_data_create()
     armature_data_animation_data = armature_data.animation_data
@@ -208,12 +377,8 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
         raise ValueError(message)
     armature_data_animation_data.action = expression_action
 
-    node_index_to_translation_keyframes: dict[
-        int, tuple[tuple[float, Vector], ...]
-    ] = {}
-    node_index_to_rotation_keyframes: dict[
-        int, tuple[tuple[float, Quaternion], ...]
-    ] = {}
+    node_index_to_translation_keyframes: dict[int, TranslationKeyframes] = {}
+    node_index_to_rotation_keyframes: dict[int, RotationKeyframes] = {}
 
     for animation_channel_dict in animation_channel_dicts:
         if not isinstance(animation_channel_dict, dict):
@@ -254,39 +419,51 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
         if not isinstance(output_accessor_dict, dict):
             continue
 
+        interpolation = animation_sampler_dict.get("interpolation")
+        if interpolation not in ["STEP", "CUBICSPLINE"]:
+            interpolation = "LINEAR"
+
         if animation_path == "translation":
-            translation_timestamps = read_accessor_as_animation_sampler_input(
+            translation_timestamps = accessor_cache.read_input(
                 input_accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
             )
             if translation_timestamps is None:
                 continue
-            translations = read_accessor_as_animation_sampler_translation_output(
+            translations = accessor_cache.read_translation_output(
                 output_accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
             )
             if translations is None:
                 continue
-            translation_keyframes = tuple(
-                sorted(zip(translation_timestamps, translations))
+            translation_keyframes = TranslationKeyframes.create(
+                translation_timestamps, translations, interpolation
             )
+            if translation_keyframes is None:
+                continue
             node_index_to_translation_keyframes[node_index] = translation_keyframes
         elif animation_path == "rotation":
-            rotation_timestamps = read_accessor_as_animation_sampler_input(
+            rotation_timestamps = accessor_cache.read_input(
                 input_accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
             )
             if rotation_timestamps is None:
                 continue
-            rotations = read_accessor_as_animation_sampler_rotation_output(
-                output_accessor_dict, buffer_view_dicts, buffer_dicts, buffer0_bytes
+            rotations = accessor_cache.read_rotation_output(
+                output_accessor_dict,
+                buffer_view_dicts,
+                buffer_dicts,
+                buffer0_bytes,
+                normalize=interpolation != "CUBICSPLINE",
             )
             if rotations is None:
                 continue
-            rotation_keyframes = tuple(sorted(zip(rotation_timestamps, rotations)))
+            rotation_keyframes = RotationKeyframes.create(
+                rotation_timestamps, rotations, interpolation
+            )
+            if rotation_keyframes is None:
+                continue
             node_index_to_rotation_keyframes[node_index] = rotation_keyframes
 
     expression_name_to_default_preview_value: dict[str, float] = {}
-    expression_name_to_translation_keyframes: dict[
-        str, tuple[tuple[float, Vector], ...]
-    ] = {}
+    expression_name_to_translation_keyframes: dict[str, TranslationKeyframes] = {}
     for expression_name, node_index in expression_name_to_node_index.items():
         if not (0 <= node_index < len(node_dicts)):
             continue
@@ -320,17 +497,17 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
             (
                 timestamp
                 for keyframes in node_index_to_translation_keyframes.values()
-                for (timestamp, _) in keyframes
+                for timestamp in keyframes.timestamps
             ),
             (
                 timestamp
                 for keyframes in node_index_to_rotation_keyframes.values()
-                for (timestamp, _) in keyframes
+                for timestamp in keyframes.timestamps
             ),
         )
     )
     if not timestamps:
-        return {"CANCELLED"}
+        return None
 
     first_timestamp = timestamps[0]
     last_timestamp = timestamps[-1]
@@ -382,107 +559,450 @@ def _import_vrm_animation(context: Context, path: Path, armature: Object) -> set
         )
     else:
         last_zero_origin_frame_count = first_zero_origin_frame_count
-    for zero_origin_frame_count in range(
+    zero_origin_frame_counts = range(
         first_zero_origin_frame_count, last_zero_origin_frame_count + 1
-    ):
-        timestamp = (
-            zero_origin_frame_count
-            * context.scene.render.fps_base
-            / context.scene.render.fps
+    )
+    frame_timestamps = [
+        zero_origin_frame_count
+        * context.scene.render.fps_base
+        / context.scene.render.fps
+        for zero_origin_frame_count in zero_origin_frame_counts
+    ]
+
+    # Resample all keyframes for all output frames at once
+    node_index_to_translations = {
+        node_index: translation_keyframes.sample(frame_timestamps)
+        for node_index, translation_keyframes in (
+            node_index_to_translation_keyframes.items()
         )
+    }
+    node_index_to_rotations = {
+        node_index: rotation_keyframes.sample(frame_timestamps)
+        for node_index, rotation_keyframes in node_index_to_rotation_keyframes.items()
+    }
+    node_index_to_pose_bone = _create_node_index_to_pose_bone(
+        humanoid_rest_pose, node_index_to_human_bone_name
+    )
+    expression_and_previews = _create_expression_and_previews(
+        armature_data,
+        expression_name_to_default_preview_value,
+        expression_name_to_translation_keyframes,
+        frame_timestamps,
+    )
+    look_at_translations = (
+        look_at_translation_keyframes.sample(frame_timestamps)
+        if look_at_translation_keyframes
+        else None
+    )
+
+    humanoid_keyframe_buffer = KeyframeBuffer()
+    expression_keyframe_buffer = KeyframeBuffer()
+    look_at_keyframe_buffer = KeyframeBuffer()
+    look_at_target_action = None
+    for frame_index, zero_origin_frame_count in enumerate(zero_origin_frame_counts):
         frame_count = zero_origin_frame_count + 1
 
         _assign_humanoid_keyframe(
-            armature,
             node_rest_pose_tree,
             node_index_to_human_bone_name,
-            node_index_to_translation_keyframes,
-            node_index_to_rotation_keyframes,
+            node_index_to_pose_bone,
+            node_index_to_translations,
+            node_index_to_rotations,
+            humanoid_keyframe_buffer,
+            frame_index,
             frame_count,
-            timestamp,
             humanoid_parent_rest_world_matrix=Matrix(),
             intermediate_rest_local_matrix=Matrix(),
             intermediate_pose_local_matrix=Matrix(),
             parent_node_rest_pose_world_matrix=Matrix(),
         )
         _assign_expression_keyframe(
-            armature_data,
-            expression_name_to_default_preview_value,
-            expression_name_to_translation_keyframes,
+            expression_and_previews,
+            expression_keyframe_buffer,
+            frame_index,
             frame_count,
-            timestamp,
         )
-        if look_at_target_object and look_at_translation_keyframes:
+        if look_at_target_object and look_at_translations:
             _assign_look_at_keyframe(
                 look_at_target_object,
-                look_at_translation_keyframes,
+                look_at_keyframe_buffer,
+                look_at_translations[frame_index],
                 frame_count,
-                timestamp,
             )
 
-    # This process should be done last because bone state changes occur.
-    # If translation is assigned to hips and hips is connected to parent
-    # with "use_connect", the movement animation will not be reflected, so
-    # we need to disconnect it
-    if node_index_to_translation_keyframes.get(hips_node_index):
-        with save_workspace(context, armature, mode="EDIT"):
-            armature_data = armature.data
-            if not isinstance(armature_data, Armature):
-                raise TypeError
-            hips_bone = armature_data.edit_bones.get(
-                humanoid.human_bones.hips.node.bone_name
+    humanoid_keyframe_buffer.write(context, humanoid_action)
+    expression_keyframe_buffer.write(context, expression_action)
+    if look_at_target_object and look_at_keyframe_buffer.data_path_to_keyframes:
+        look_at_target_object.animation_data_create()
+        look_at_target_animation_data = look_at_target_object.animation_data
+        if not look_at_target_animation_data:
+            message = "look_at_target_object.animation_data is None"
+            raise ValueError(message)
+        if look_at_action_name is None:
+            look_at_action_name = look_at_target_object.name + "Action"
+        look_at_target_action = context.blend_data.actions.new(name=look_at_action_name)
+        look_at_target_animation_data.action = look_at_target_action
+        look_at_keyframe_buffer.write(context, look_at_target_action)
+
+    return ImportedVrmAnimation(
+        humanoid_action=humanoid_action,
+        expression_action=expression_action,
+        look_at_target_object=look_at_target_object,
+        look_at_action=look_at_target_action,
+        hips_translation_imported=hips_node_index
+        in node_index_to_translation_keyframes,
+    )
+
+
+def _iter_keyframe_spans(
+    timestamps: Sequence[float],
+    frame_timestamps: Sequence[float],
+    *,
+    step: bool,
+) -> Iterator[tuple[int, int, float]]:
+    """Yield the bracketing keyframe indices and the factor for each frame.
+
+    The frame timestamps must be sorted in ascending order. The bracketing
+    keyframes are found by advancing a cursor, so sampling T frames from K
+    keyframes is O(T + K).
+    """
+    last_index = len(timestamps) - 1
+    end_index = 0
+    for frame_timestamp in frame_timestamps:
+        while end_index <= last_index and timestamps[end_index] < frame_timestamp:
+            end_index += 1
+        if end_index == 0:
+            yield 0, 0, 0.0
+            continue
+        if end_index > last_index:
+            yield last_index, last_index, 0.0
+            continue
+
+        begin_index = end_index - 1
+        begin_timestamp = timestamps[begin_index]
+        end_timestamp = timestamps[end_index]
+        if step:
+            if end_timestamp <= frame_timestamp:
+                yield end_index, end_index, 0.0
+            else:
+                yield begin_index, begin_index, 0.0
+            continue
+
+        timestamp_duration = end_timestamp - begin_timestamp
+        if timestamp_duration > 0:
+            yield (
+                begin_index,
+                end_index,
+                (frame_timestamp - begin_timestamp) / timestamp_duration,
             )
-            if hips_bone and hips_bone.use_connect:
-                hips_bone.use_connect = False
-    return {"FINISHED"}
+        else:
+            yield begin_index, begin_index, 0.0
+
+
+def _sort_keyframes(
+    timestamps: Sequence[float],
+    outputs: Sequence[KeyframeValue],
+    interpolation: str,
+) -> Optional[
+    tuple[
+        tuple[float, ...],
+        tuple[KeyframeValue, ...],
+        tuple[KeyframeValue, ...],
+        tuple[KeyframeValue, ...],
+    ]
+]:
+    """Split the sampler output into values and tangents, sorted by timestamp."""
+    if interpolation == "CUBICSPLINE":
+        if len(outputs) != len(timestamps) * 3:
+            return None
+        in_tangents = outputs[0::3]
+        values = outputs[1::3]
+        out_tangents = outputs[2::3]
+    else:
+        in_tangents = out_tangents = values = outputs
+
+    keyframe_len = min(len(timestamps), len(values))
+    if not keyframe_len:
+        return None
+    indices = sorted(range(keyframe_len), key=lambda index: timestamps[index])
+    if interpolation == "CUBICSPLINE":
+        sorted_in_tangents = tuple(in_tangents[index] for index in indices)
+        sorted_out_tangents = tuple(out_tangents[index] for index in indices)
+    else:
+        sorted_in_tangents = sorted_out_tangents = ()
+    return (
+        tuple(timestamps[index] for index in indices),
+        tuple(values[index] for index in indices),
+        sorted_in_tangents,
+        sorted_out_tangents,
+    )
 
 
-def _assign_look_at_keyframe(
-    look_at_target_object: Object,
-    translation_keyframes: tuple[tuple[float, Vector], ...],
-    frame_count: int,
-    timestamp: float,
-) -> None:
-    if not translation_keyframes:
-        return
+def _hermite_weights(factor: float) -> tuple[float, float, float, float]:
+    # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#interpolation-cubic
+    factor2 = factor * factor
+    factor3 = factor2 * factor
+    return (
+        2 * factor3 - 3 * factor2 + 1,
+        factor3 - 2 * factor2 + factor,
+        -2 * factor3 + 3 * factor2,
+        factor3 - factor2,
+    )
+
+
+@dataclass(frozen=True)
+class TranslationKeyframes:
+    timestamps: tuple[float, ...]
+    translations: tuple[Vector, ...]
+    interpolation: str
+    in_tangents: tuple[Vector, ...] = ()
+    out_tangents: tuple[Vector, ...] = ()
+
+    @staticmethod
+    def create(
+        timestamps: Sequence[float], outputs: Sequence[Vector], interpolation: str
+    ) -> Optional["TranslationKeyframes"]:
+        sorted_keyframes = _sort_keyframes(timestamps, outputs, interpolation)
+        if sorted_keyframes is None:
+            return None
+        (
+            sorted_timestamps,
+            translations,
+            in_tangents,
+            out_tangents,
+        ) = sorted_keyframes
+        return TranslationKeyframes(
+            timestamps=sorted_timestamps,
+            translations=translations,
+            interpolation=interpolation,
+            in_tangents=in_tangents,
+            out_tangents=out_tangents,
+        )
 
-    animation_translation = None
-    begin_timestamp, begin_translation = translation_keyframes[0]
-    for end_timestamp, end_translation in translation_keyframes:
-        if end_timestamp >= timestamp:
-            timestamp_duration = end_timestamp - begin_timestamp
-            if timestamp_duration > 0:
-                animation_translation = (
-                    begin_translation
-                    + (end_translation - begin_translation)
-                    * (timestamp - begin_timestamp)
-                    / timestamp_duration
+    def sample(self, frame_timestamps: Sequence[float]) -> list[Vector]:
+        translations = self.translations
+        if self.interpolation != "CUBICSPLINE":
+            return [
+                translations[begin_index].lerp(translations[end_index], factor)
+                if begin_index != end_index
+                else translations[begin_index]
+                for begin_index, end_index, factor in _iter_keyframe_spans(
+                    self.timestamps,
+                    frame_timestamps,
+                    step=self.interpolation == "STEP",
                 )
-            else:
-                animation_translation = begin_translation
-            break
-        begin_timestamp = end_timestamp
-        begin_translation = end_translation
-    if animation_translation is None:
-        animation_translation = begin_translation
+            ]
 
-    current_location = look_at_target_object.location.copy()
-    look_at_target_object.location = animation_translation
-    look_at_target_object.keyframe_insert(data_path="location", frame=frame_count)
-    look_at_target_object.location = current_location
+        result: list[Vector] = []
+        for begin_index, end_index, factor in _iter_keyframe_spans(
+            self.timestamps, frame_timestamps, step=False
+        ):
+            if begin_index == end_index:
+                result.append(translations[begin_index])
+                continue
+            timestamp_duration = (
+                self.timestamps[end_index] - self.timestamps[begin_index]
+            )
+            begin_weight, out_weight, end_weight, in_weight = _hermite_weights(factor)
+            result.append(
+                translations[begin_index] * begin_weight
+                + self.out_tangents[begin_index] * (out_weight * timestamp_duration)
+                + translations[end_index] * end_weight
+                + self.in_tangents[end_index] * (in_weight * timestamp_duration)
+            )
+        return result
 
 
-def _assign_expression_keyframe(
-    armature_data: Armature,
-    expression_name_to_default_preview_value: dict[str, float],
-    expression_name_to_translation_keyframes: dict[
-        str, tuple[tuple[float, Vector], ...]
-    ],
+@dataclass(frozen=True)
+class RotationKeyframes:
+    timestamps: tuple[float, ...]
+    rotations: tuple[Quaternion, ...]
+    interpolation: str
+    in_tangents: tuple[Quaternion, ...] = ()
+    out_tangents: tuple[Quaternion, ...] = ()
+
+    @staticmethod
+    def create(
+        timestamps: Sequence[float], outputs: Sequence[Quaternion], interpolation: str
+    ) -> Optional["RotationKeyframes"]:
+        sorted_keyframes = _sort_keyframes(timestamps, outputs, interpolation)
+        if sorted_keyframes is None:
+            return None
+        (
+            sorted_timestamps,
+            rotations,
+            in_tangents,
+            out_tangents,
+        ) = sorted_keyframes
+        if interpolation == "CUBICSPLINE":
+            rotations = tuple(rotation.normalized() for rotation in rotations)
+        return RotationKeyframes(
+            timestamps=sorted_timestamps,
+            rotations=rotations,
+            interpolation=interpolation,
+            in_tangents=in_tangents,
+            out_tangents=out_tangents,
+        )
+
+    def sample(self, frame_timestamps: Sequence[float]) -> list[Quaternion]:
+        rotations = self.rotations
+        if self.interpolation != "CUBICSPLINE":
+            return [
+                rotations[begin_index].slerp(rotations[end_index], factor)
+                if begin_index != end_index
+                else rotations[begin_index]
+                for begin_index, end_index, factor in _iter_keyframe_spans(
+                    self.timestamps,
+                    frame_timestamps,
+                    step=self.interpolation == "STEP",
+                )
+            ]
+
+        result: list[Quaternion] = []
+        for begin_index, end_index, factor in _iter_keyframe_spans(
+            self.timestamps, frame_timestamps, step=False
+        ):
+            if begin_index == end_index:
+                result.append(rotations[begin_index])
+                continue
+            timestamp_duration = (
+                self.timestamps[end_index] - self.timestamps[begin_index]
+            )
+            begin_weight, out_weight, end_weight, in_weight = _hermite_weights(factor)
+            result.append(
+                (
+                    rotations[begin_index] * begin_weight
+                    + self.out_tangents[begin_index] * (out_weight * timestamp_duration)
+                    + rotations[end_index] * end_weight
+                    + self.in_tangents[end_index] * (in_weight * timestamp_duration)
+                ).normalized()
+            )
+        return result
+
+
+@dataclass
+class KeyframeBuffer:
+    """Keyframes collected per F-curve and written to an action at once.
+
+    Inserting keyframes one by one with keyframe_insert() sorts the keyframes
+    and recalculates the handles on every call. Instead, the keyframes are
+    added to each F-curve with a single keyframe_points.add() call followed by
+    foreach_set(), and the handles are recalculated once by fcurve.update().
+    """
+
+    # data_path -> (color_mode, [[frame, value, frame, value, ...], ...])
+    data_path_to_keyframes: dict[str, tuple[str, list[list[float]]]] = field(
+        default_factory=dict[str, tuple[str, list[list[float]]]]
+    )
+
+    def insert(
+        self,
+        owner: Union[Object, PoseBone, Vrm1ExpressionPropertyGroup],
+        property_name: str,
+        values: Sequence[float],
+        frame: int,
+    ) -> None:
+        data_path = owner.path_from_id(property_name)
+        keyframes = self.data_path_to_keyframes.get(data_path)
+        if keyframes is None:
+            # https://projects.blender.org/blender/blender/src/tag/v4.2.0/source/blender/animrig/intern/action.cc#L1108-L1118
+            subtype = owner.bl_rna.properties[property_name].subtype
+            if subtype in {"TRANSLATION", "XYZ", "EULER", "COLOR", "COORDINATES"}:
+                color_mode = "AUTO_RGB"
+            elif subtype == "QUATERNION":
+                color_mode = "AUTO_YRGB"
+            else:
+                color_mode = "AUTO_RAINBOW"
+            index_to_frame_and_values: list[list[float]] = [[] for _ in values]
+            keyframes = (color_mode, index_to_frame_and_values)
+            self.data_path_to_keyframes[data_path] = keyframes
+        _, index_to_frame_and_values = keyframes
+        for frame_and_values, value in zip(index_to_frame_and_values, values):
+            frame_and_values.append(frame)
+            frame_and_values.append(value)
+
+    def write(self, context: Context, action: Action) -> None:
+        interpolation_property = Keyframe.bl_rna.properties["interpolation"]
+        if not isinstance(interpolation_property, EnumProperty):
+            message = f"{type(interpolation_property)} is not an EnumProperty"
+            raise TypeError(message)
+        handle_type_property = Keyframe.bl_rna.properties["handle_left_type"]
+        if not isinstance(handle_type_property, EnumProperty):
+            message = f"{type(handle_type_property)} is not an EnumProperty"
+            raise TypeError(message)
+        edit_preferences = context.preferences.edit
+        interpolation_value = interpolation_property.enum_items[
+            edit_preferences.keyframe_new_interpolation_type
+        ].value
+        handle_type_value = handle_type_property.enum_items[
+            edit_preferences.keyframe_new_handle_type
+        ].value
+        for data_path, (
+            color_mode,
+            index_to_frame_and_values,
+        ) in self.data_path_to_keyframes.items():
+            for index, frame_and_values in enumerate(index_to_frame_and_values):
+                keyframe_count = len(frame_and_values) // 2
+                if not keyframe_count:
+                    continue
+                fcurve = action.fcurves.find(data_path, index=index)
+                if fcurve is None:
+                    fcurve = action.fcurves.new(data_path, index=index)
+                    fcurve.color_mode = color_mode
+                keyframe_points = fcurve.keyframe_points
+                if keyframe_points:
+                    for frame, value in zip(
+                        frame_and_values[0::2], frame_and_values[1::2]
+                    ):
+                        keyframe_points.insert(frame, value, options={"FAST"})
+                    fcurve.update()
+                    continue
+                keyframe_points.add(keyframe_count)
+                keyframe_points.foreach_set("co", frame_and_values)
+                # Same initial handles as keyframe_insert(). Only the handles of
+                # a lone keyframe survive the recalculation in fcurve.update().
+                frame_and_values_with_offset = frame_and_values.copy()
+                frame_and_values_with_offset[0::2] = [
+                    frame - 1 for frame in frame_and_values[0::2]
+                ]
+                keyframe_points.foreach_set("handle_left", frame_and_values_with_offset)
+                frame_and_values_with_offset[0::2] = [
+                    frame + 1 for frame in frame_and_values[0::2]
+                ]
+                keyframe_points.foreach_set(
+                    "handle_right", frame_and_values_with_offset
+                )
+                keyframe_points.foreach_set(
+                    "interpolation", [interpolation_value] * keyframe_count
+                )
+                handle_types = [handle_type_value] * keyframe_count
+                keyframe_points.foreach_set("handle_left_type", handle_types)
+                keyframe_points.foreach_set("handle_right_type", handle_types)
+                fcurve.update()
+
+
+def _assign_look_at_keyframe(
+    look_at_target_object: Object,
+    keyframe_buffer: KeyframeBuffer,
+    animation_translation: Vector,
     frame_count: int,
-    timestamp: float,
 ) -> None:
+    keyframe_buffer.insert(
+        look_at_target_object, "location", animation_translation, frame_count
+    )
+
+
+def _create_expression_and_previews(
+    armature_data: Armature,
+    expression_name_to_default_preview_value: Mapping[str, float],
+    expression_name_to_translation_keyframes: Mapping[str, TranslationKeyframes],
+    frame_timestamps: Sequence[float],
+) -> list[tuple[Vrm1ExpressionPropertyGroup, Sequence[float]]]:
     expressions = get_armature_extension(armature_data).vrm1.expressions
     expression_name_to_expression = expressions.all_name_to_expression_dict()
+    expression_and_previews: list[
+        tuple[Vrm1ExpressionPropertyGroup, Sequence[float]]
+    ] = []
     for (
         expression_name,
         translation_keyframes,
@@ -498,35 +1018,98 @@ def _assign_expression_keyframe(
         if not expression:
             continue
 
-        if translation_keyframes:
-            preview = None
-            begin_timestamp, begin_translation = translation_keyframes[0]
-            for end_timestamp, end_translation in translation_keyframes:
-                if end_timestamp >= timestamp:
-                    timestamp_duration = end_timestamp - begin_timestamp
-                    if timestamp_duration > 0:
-                        preview = (
-                            begin_translation.x
-                            + (end_translation.x - begin_translation.x)
-                            * (timestamp - begin_timestamp)
-                            / timestamp_duration
-                        )
-                    else:
-                        preview = begin_translation.x
-                    break
-                begin_timestamp = end_timestamp
-                begin_translation = end_translation
-            if preview is None:
-                preview = begin_translation.x
+        if translation_keyframes.timestamps:
+            previews: Sequence[float] = [
+                translation.x
+                for translation in translation_keyframes.sample(frame_timestamps)
+            ]
         else:
-            preview = (
+            previews = [
                 expression_name_to_default_preview_value.get(expression_name) or 0.0
+            ] * len(frame_timestamps)
+        expression_and_previews.append((expression, previews))
+    return expression_and_previews
+
+
+def _assign_expression_keyframe(
+    expression_and_previews: Sequence[
+        tuple[Vrm1ExpressionPropertyGroup, Sequence[float]]
+    ],
+    keyframe_buffer: KeyframeBuffer,
+    frame_index: int,
+    frame_count: int,
+) -> None:
+    for expression, previews in expression_and_previews:
+        keyframe_buffer.insert(
+            expression, "preview", (previews[frame_index],), frame_count
+        )
+
+
+@dataclass(frozen=True)
+class HumanoidPoseBone:
+    """The state of a human bone in the pose that animations are imported onto."""
+
+    pose_bone: PoseBone
+    inverted_matrix_rotation: Quaternion
+    matrix_translation_z: float
+    rotation: Quaternion
+    rotation_data_path: Optional[str]
+
+    @staticmethod
+    def create(pose_bone: PoseBone) -> "HumanoidPoseBone":
+        return HumanoidPoseBone(
+            pose_bone=pose_bone,
+            inverted_matrix_rotation=pose_bone.matrix.to_quaternion().inverted(),
+            matrix_translation_z=pose_bone.matrix.to_translation().z,
+            rotation=get_rotation_as_quaternion(pose_bone),
+            rotation_data_path=get_rotation_data_path(pose_bone),
+        )
+
+
+@dataclass(frozen=True)
+class HumanoidRestPose:
+    """The human bones of an armature, read once and shared by imported files.
+
+    Importing keyframes does not change the pose, so the bone matrices and the
+    rotations are the same for every frame and for every file.
+    """
+
+    human_bone_name_to_pose_bone: Mapping[HumanBoneName, HumanoidPoseBone]
+
+    @staticmethod
+    def create(armature: Object) -> "HumanoidRestPose":
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            return HumanoidRestPose(human_bone_name_to_pose_bone={})
+        human_bone_name_to_human_bone = get_armature_extension(
+            armature_data
+        ).vrm1.humanoid.human_bones.human_bone_name_to_human_bone()
+        human_bone_name_to_pose_bone: dict[HumanBoneName, HumanoidPoseBone] = {}
+        for human_bone_name, human_bone in human_bone_name_to_human_bone.items():
+            if human_bone_name in {HumanBoneName.LEFT_EYE, HumanBoneName.RIGHT_EYE}:
+                continue
+            pose_bone = armature.pose.bones.get(human_bone.node.bone_name)
+            if not pose_bone:
+                continue
+            human_bone_name_to_pose_bone[human_bone_name] = HumanoidPoseBone.create(
+                pose_bone
             )
+        return HumanoidRestPose(
+            human_bone_name_to_pose_bone=human_bone_name_to_pose_bone
+        )
 
-        current_preview = expression.preview
-        expression.preview = preview
-        expression.keyframe_insert(data_path="preview", frame=frame_count)
-        expression.preview = current_preview
+
+def _create_node_index_to_pose_bone(
+    humanoid_rest_pose: HumanoidRestPose,
+    node_index_to_human_bone_name: Mapping[int, HumanBoneName],
+) -> dict[int, HumanoidPoseBone]:
+    node_index_to_pose_bone: dict[int, HumanoidPoseBone] = {}
+    for node_index, human_bone_name in node_index_to_human_bone_name.items():
+        pose_bone = humanoid_rest_pose.human_bone_name_to_pose_bone.get(human_bone_name)
+        if not pose_bone:
+            continue
+        node_index_to_pose_bone[node_index] = pose_bone
+    return node_index_to_pose_bone
 
 
 @dataclass(frozen=True)
@@ -596,67 +1179,28 @@ class NodeRestPoseTree:
 
 
 def _assign_humanoid_keyframe(
-    armature: Object,
     node_rest_pose_tree: NodeRestPoseTree,
-    node_index_to_human_bone_name: dict[int, HumanBoneName],
-    node_index_to_translation_keyframes: dict[int, tuple[tuple[float, Vector], ...]],
-    node_index_to_rotation_keyframes: dict[int, tuple[tuple[float, Quaternion], ...]],
+    node_index_to_human_bone_name: Mapping[int, HumanBoneName],
+    node_index_to_pose_bone: Mapping[int, HumanoidPoseBone],
+    node_index_to_translations: Mapping[int, Sequence[Vector]],
+    node_index_to_rotations: Mapping[int, Sequence[Quaternion]],
+    keyframe_buffer: KeyframeBuffer,
+    frame_index: int,
     frame_count: int,
-    timestamp: float,
     humanoid_parent_rest_world_matrix: Matrix,
     intermediate_rest_local_matrix: Matrix,
     intermediate_pose_local_matrix: Matrix,
     parent_node_rest_pose_world_matrix: Matrix,
 ) -> None:
-    armature_data = armature.data
-    if not isinstance(armature_data, Armature):
-        return
-
-    translation_keyframes = node_index_to_translation_keyframes.get(
-        node_rest_pose_tree.node_index
-    )
-
-    if translation_keyframes:
-        keyframe_translation = None
-        begin_timestamp, begin_translation = translation_keyframes[0]
-        for end_timestamp, end_translation in translation_keyframes:
-            if end_timestamp >= timestamp:
-                timestamp_duration = end_timestamp - begin_timestamp
-                if timestamp_duration > 0:
-                    keyframe_translation = begin_translation.lerp(
-                        end_translation,
-                        (timestamp - begin_timestamp) / timestamp_duration,
-                    )
-                else:
-                    keyframe_translation = begin_translation
-                break
-            begin_timestamp = end_timestamp
-            begin_translation = end_translation
-        if keyframe_translation is None:
-            keyframe_translation = begin_translation
+    translations = node_index_to_translations.get(node_rest_pose_tree.node_index)
+    if translations:
+        keyframe_translation = translations[frame_index]
     else:
         keyframe_translation = node_rest_pose_tree.local_matrix.to_translation()
 
-    rotation_keyframes = node_index_to_rotation_keyframes.get(
-        node_rest_pose_tree.node_index
-    )
-    if rotation_keyframes:
-        keyframe_rotation = None
-        begin_timestamp, begin_rotation = rotation_keyframes[0]
-        for end_timestamp, end_rotation in rotation_keyframes:
-            if end_timestamp >= timestamp:
-                timestamp_duration = end_timestamp - begin_timestamp
-                if timestamp_duration > 0:
-                    keyframe_rotation = begin_rotation.slerp(
-                        end_rotation, (timestamp - begin_timestamp) / timestamp_duration
-                    )
-                else:
-                    keyframe_rotation = begin_rotation
-                break
-            begin_timestamp = end_timestamp
-            begin_rotation = end_rotation
-        if keyframe_rotation is None:
-            keyframe_rotation = begin_rotation
+    rotations = node_index_to_rotations.get(node_rest_pose_tree.node_index)
+    if rotations:
+        keyframe_rotation = rotations[frame_index]
     else:
         keyframe_rotation = node_rest_pose_tree.local_matrix.to_quaternion()
 
@@ -672,17 +1216,8 @@ def _assign_humanoid_keyframe(
     )
 
     human_bone_name = node_index_to_human_bone_name.get(node_rest_pose_tree.node_index)
-    human_bones = get_armature_extension(armature_data).vrm1.humanoid.human_bones
-    if (
-        human_bone_name
-        and human_bone_name not in {HumanBoneName.LEFT_EYE, HumanBoneName.RIGHT_EYE}
-        and (
-            human_bone := human_bones.human_bone_name_to_human_bone().get(
-                human_bone_name
-            )
-        )
-        and (bone := armature.pose.bones.get(human_bone.node.bone_name))
-    ):
+    bone = node_index_to_pose_bone.get(node_rest_pose_tree.node_index)
+    if human_bone_name and bone:
         humanoid_rest_world_matrix = humanoid_parent_rest_world_matrix
         rest_world_matrix = humanoid_rest_world_matrix @ rest_local_matrix
         pose_world_matrix = humanoid_rest_world_matrix @ pose_local_matrix
@@ -694,13 +1229,13 @@ def _assign_humanoid_keyframe(
         rest_to_pose_world_rotation = Quaternion(axis, angle).copy()
 
         target_axis, target_angle = rest_to_pose_world_rotation.to_axis_angle()
-        target_axis.rotate(bone.matrix.to_quaternion().inverted())
+        target_axis.rotate(bone.inverted_matrix_rotation)
 
         rest_to_pose_target_local_rotation = Quaternion(
             target_axis, target_angle
         ).copy()
 
-        if rotation_keyframes:
+        if rotations:
             _logger.debug(
                 "================= %s =================", human_bone_name.value
             )
@@ -721,23 +1256,27 @@ def _assign_humanoid_keyframe(
                 dump(rest_to_pose_target_local_rotation),
             )
 
-            backup_rotation_quaternion = get_rotation_as_quaternion(bone)
+            backup_rotation_quaternion = bone.rotation
 
             # logger.debug("parent bone matrix  = %s", dump(parent_matrix))
-            _logger.debug("       bone matrix  = %s", dump(bone.matrix))
+            _logger.debug("       bone matrix  = %s", dump(bone.pose_bone.matrix))
             _logger.debug(
                 "current bone rotation = %s", dump(backup_rotation_quaternion)
             )
 
-            set_rotation_without_mode_change(
-                bone, backup_rotation_quaternion @ rest_to_pose_target_local_rotation
+            rotation_data_path = bone.rotation_data_path
+            rotation_values = convert_quaternion_to_rotation_values(
+                bone.pose_bone,
+                backup_rotation_quaternion @ rest_to_pose_target_local_rotation,
             )
-            insert_rotation_keyframe(bone, frame=frame_count)
-            set_rotation_without_mode_change(bone, backup_rotation_quaternion)
+            if rotation_data_path is not None and rotation_values is not None:
+                keyframe_buffer.insert(
+                    bone.pose_bone, rotation_data_path, rotation_values, frame_count
+                )
 
-        if human_bone_name == HumanBoneName.HIPS and translation_keyframes:
+        if human_bone_name == HumanBoneName.HIPS and translations:
             translation = (
-                bone.matrix.to_quaternion().inverted()
+                bone.inverted_matrix_rotation
                 @ humanoid_rest_world_matrix.to_quaternion()
                 @ (
                     pose_local_matrix.to_translation()
@@ -749,15 +1288,12 @@ def _assign_humanoid_keyframe(
             rest_world_translation_z = rest_world_matrix.to_translation().z
             if abs(rest_world_translation_z) > 0:
                 world_height_ratio = (
-                    bone.matrix.to_translation().z / rest_world_translation_z
+                    bone.matrix_translation_z / rest_world_translation_z
                 )
                 translation *= world_height_ratio
 
             # logger.debug(f"translation           = {dump(translation)}")
-            backup_translation = bone.location.copy()
-            bone.location = translation
-            bone.keyframe_insert(data_path="location", frame=frame_count)
-            bone.location = backup_translation
+            keyframe_buffer.insert(bone.pose_bone, "location", translation, frame_count)
 
         humanoid_rest_world_matrix = (
             humanoid_parent_rest_world_matrix @ rest_local_matrix
@@ -767,13 +1303,14 @@ def _assign_humanoid_keyframe(
 
     for child in node_rest_pose_tree.children:
         _assign_humanoid_keyframe(
-            armature,
             child,
             node_index_to_human_bone_name,
-            node_index_to_translation_keyframes,
-            node_index_to_rotation_keyframes,
+            node_index_to_pose_bone,
+            node_index_to_translations,
+            node_index_to_rotations,
+            keyframe_buffer,
+            frame_index,
             frame_count,
-            timestamp,
             humanoid_rest_world_matrix,
             rest_local_matrix,
             pose_local_matrix,
@@ -413,6 +413,14 @@ TRANSLATION_DICTIONARY: Final[Mapping[tuple[str, str], str]] = {
     ): "未割り当てのVRM必須ボーンが存在します。"
     + "全てのVRM必須ボーンを割り当ててください。",
     ("Operator", "Automatic Bone Assignment"): "ボーンの自動割り当て",
+    (
+        "Operator",
+        "Automatic Bone Assignment for Multiple Armatures",
+    ): "複数のアーマチュアのボーンの自動割り当て",
+    (
+        "*",
+        "Assign VRM 1.0 Humanoid Human Bones of the listed or selected armatures",
+    ): "一覧または選択中のアーマチュアのVRM 1.0ヒューマノイドのボーンを割り当てます",
     ("Operator", "Preview MToon 0.0"): "MToon 0.0のプレビュー",
     ("Operator", "VRM Humanoid"): "VRMヒューマノイド",
     ("Operator", "VRM License Confirmation"): "VRM利用条件の確認",
@@ -569,6 +577,37 @@ TRANSLATION_DICTIONARY: Final[Mapping[tuple[str, str], str]] = {
         "*",
         "VRM Animation import requires a VRM 1.0 armature",
     ): "VRM Animationのインポートには、VRM 1.0のアーマチュアが必要です",
+    ("*", "Keyframe Reduction"): "キーフレームの削減",
+    ("*", "Reduce the exported keyframes"): "エクスポートするキーフレームを削減します",
+    ("*", "Export every frame"): "全てのフレームをエクスポートします",
+    (
+        "*",
+        "Export only the frames needed to stay within the tolerances",
+    ): "許容誤差に収めるために必要なフレームのみをエクスポートします",
+    ("*", "Source Keyframes"): "元のキーフレーム",
+    (
+        "*",
+        "Export the frames of the source keyframes of each bone, expression"
+        + " and look at target. Frames are added where the tolerances are"
+        + " exceeded",
+    ): "ボーン、エクスプレッション、視線のターゲットごとに元のキーフレームの"
+    + "フレームをエクスポートします。"
+    + "許容誤差を超える箇所にはフレームを追加します",
+    ("*", "Rotation Tolerance"): "回転の許容誤差",
+    (
+        "*",
+        "Maximum rotation error of the humanoid bones",
+    ): "ヒューマノイドのボーンの回転の最大誤差",
+    ("*", "Translation Tolerance"): "移動の許容誤差",
+    (
+        "*",
+        "Maximum translation error of the hips and the look at target",
+    ): "腰と視線のターゲットの移動の最大誤差",
+    ("*", "Expression Tolerance"): "エクスプレッションの許容誤差",
+    (
+        "*",
+        "Maximum error of the expression preview values",
+    ): "エクスプレッションのプレビュー値の最大誤差",
     ("*", "Armature to be exported"): "エクスポート対象のアーマチュア",
     (
         "*",
@@ -320,6 +320,14 @@ TRANSLATION_DICTIONARY: Final[Mapping[tuple[str, str], str]] = {
         "There are unassigned Required VRM Human Bones. Please assign all.",
     ): "存在未分配的 VRM 必需骨骼。" + "分配所有 VRM 必需骨骼。",
     ("Operator", "Automatic Bone Assignment"): "自动骨骼分配",
+    (
+        "Operator",
+        "Automatic Bone Assignment for Multiple Armatures",
+    ): "多个骨架的自动骨骼分配",
+    (
+        "*",
+        "Assign VRM 1.0 Humanoid Human Bones of the listed or selected armatures",
+    ): "为列出或选中的骨架分配 VRM 1.0 人形骨骼",
     ("Operator", "Export VRM"): "导出 VRM",
     ("Operator", "Import VRM"): "导入 VRM",
     ("Operator", "Preview MToon 0.0"): "MToon 0.0预览",
@@ -478,6 +486,29 @@ TRANSLATION_DICTIONARY: Final[Mapping[tuple[str, str], str]] = {
         "*",
         "VRM Animation import requires a VRM 1.0 armature",
     ): "VRM 动画导入需要 VRM 1.0 骨架",
+    ("*", "Keyframe Reduction"): "关键帧精简",
+    ("*", "Reduce the exported keyframes"): "精简导出的关键帧",
+    ("*", "Export every frame"): "导出每一帧",
+    (
+        "*",
+        "Export only the frames needed to stay within the tolerances",
+    ): "仅导出保持在容差范围内所需的帧",
+    ("*", "Source Keyframes"): "源关键帧",
+    (
+        "*",
+        "Export the frames of the source keyframes of each bone, expression"
+        + " and look at target. Frames are added where the tolerances are"
+        + " exceeded",
+    ): "导出每个骨骼、表情和注视目标的源关键帧所在的帧。在超出容差的位置添加帧",
+    ("*", "Rotation Tolerance"): "旋转容差",
+    ("*", "Maximum rotation error of the humanoid bones"): "人形骨骼的最大旋转误差",
+    ("*", "Translation Tolerance"): "平移容差",
+    (
+        "*",
+        "Maximum translation error of the hips and the look at target",
+    ): "臀部和注视目标的最大平移误差",
+    ("*", "Expression Tolerance"): "表情容差",
+    ("*", "Maximum error of the expression preview values"): "表情预览值的最大误差",
     ("*", "Armature to be exported"): "要导出的骨架",
     (
         "*",
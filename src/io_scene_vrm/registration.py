@@ -36,6 +36,7 @@ from .common import (
     shader,
     writable_context,
 )
+from .common.human_bone_mapper import structure_based_mapping
 from .common.logger import get_logger
 from .common.version import trigger_clear_addon_version_cache
 from .editor import (
@@ -47,6 +48,7 @@ from .editor import (
     ops,
     panel,
     property_group,
+    search,
     subscription,
     validation,
 )
@@ -379,6 +381,7 @@ CLASSES: Final[
     vrm1_ops.VRM_OT_move_up_vrm1_first_person_mesh_annotation,
     vrm1_ops.VRM_OT_move_down_vrm1_first_person_mesh_annotation,
     vrm1_ops.VRM_OT_assign_vrm1_humanoid_human_bones_automatically,
+    vrm1_ops.VRM_OT_batch_assign_vrm1_humanoid_human_bones_automatically,
     vrm1_ops.VRM_OT_update_vrm1_expression_ui_list_elements,
     vrm1_ops.VRM_OT_refresh_vrm1_expression_texture_transform_bind_preview,
     vrm1_ops.VRM_OT_show_vrm1_bone_assignment_diagnostics,
@@ -442,6 +445,7 @@ CLASSES: Final[
     export_scene.EXPORT_SCENE_OT_vrm,
     export_scene.EXPORT_SCENE_OT_vrma,
     export_scene.VRM_PT_export_vrma_help,
+    export_scene.VRM_PT_export_vrma_keyframe_reduction,
     error_dialog.VrmErrorDialogMessageLine,
     error_dialog.VRM_UL_vrm_error_dialog_message,
     error_dialog.VRM_OT_save_error_dialog_message,
@@ -452,6 +456,7 @@ CLASSES: Final[
     import_scene.VRM_PT_import_file_browser_tool_props,
     import_scene.IMPORT_SCENE_OT_vrm,
     import_scene.IMPORT_SCENE_OT_vrma,
+    import_scene.IMPORT_SCENE_OT_vrma_batch,
     import_scene.VRM_PT_import_unsupported_blender_version_warning,
     import_scene.VRM_OT_import_vrm_via_file_handler,
     import_scene.VRM_OT_import_vrma_via_file_handler,
@@ -524,6 +529,9 @@ def register() -> None:
     bpy.app.handlers.depsgraph_update_post.append(vrm1_handler.depsgraph_update_post)
     bpy.app.handlers.depsgraph_update_post.append(mtoon1_handler.depsgraph_update_post)
     bpy.app.handlers.depsgraph_update_post.append(handler.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.append(validation.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.append(search.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.append(migration.depsgraph_update_post)
     bpy.app.handlers.save_pre.append(save_pre)
     bpy.app.handlers.save_pre.append(scene_watcher.save_pre)
     bpy.app.handlers.save_pre.append(vrm0_handler.save_pre)
@@ -579,6 +587,9 @@ def unregister() -> None:
     bpy.app.handlers.save_pre.remove(vrm0_handler.save_pre)
     bpy.app.handlers.save_pre.remove(scene_watcher.save_pre)
     bpy.app.handlers.save_pre.remove(save_pre)
+    bpy.app.handlers.depsgraph_update_post.remove(migration.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.remove(search.depsgraph_update_post)
+    bpy.app.handlers.depsgraph_update_post.remove(validation.depsgraph_update_post)
     bpy.app.handlers.depsgraph_update_post.remove(handler.depsgraph_update_post)
     bpy.app.handlers.depsgraph_update_post.remove(mtoon1_handler.depsgraph_update_post)
     bpy.app.handlers.depsgraph_update_post.remove(vrm1_handler.depsgraph_update_post)
@@ -638,7 +649,7 @@ def save_pre(_unused: object) -> None:
     writable_context.trigger_writable_context_becomes_available_once_handlers(
         context, load_post=False
     )
-    migration.migrate_all_objects(context, heavy_migration=False)
+    migration.migrate_all_objects(context, heavy_migration=False, changed_only=True)
     property_group.clear_expression_material_binds(context)
 
 
@@ -648,7 +659,7 @@ def setup_once_when_writable_context_becomes_available(
     """Execute setup process when a writable Context becomes available."""
     if preferences.get_preferences(context).add_mtoon_shader_node_group:
         shader.add_mtoon1_auto_setup_shader_node_group(context)
-    migration.migrate_all_objects(context, heavy_migration=False)
+    migration.migrate_all_objects(context, heavy_migration=False, show_progress=True)
     mtoon1_property_group.setup_drivers(context)
     subscription.setup_subscription(load_post=load_post)
     spring_bone1_handler.reset_state(context)
@@ -660,9 +671,12 @@ def clear_global_variables() -> None:
     This function is called from register() or load_pre().
     """
     animation.clear_global_variables()
+    structure_based_mapping.clear_global_variables()
     vrm0_property_group.clear_global_variables()
     vrm1_property_group.clear_global_variables()
     property_group.clear_global_variables()
     mtoon1_migration.clear_global_variables()
     migration.clear_global_variables()
     handler.clear_global_variables()
+    validation.clear_global_variables()
+    search.clear_global_variables()
@@ -1,9 +1,17 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 from unittest import TestCase
 
+import bpy
+from bpy.types import Armature
+
+from io_scene_vrm.common import ops
 from io_scene_vrm.common.human_bone_mapper.human_bone_mapper import (
     _canonicalize_bone_name,
+    create_human_bone_mapping,
+    create_human_bone_mapping_results,
 )
+from io_scene_vrm.editor.extension import get_armature_extension
+from tests.util import AddonTestCase
 
 
 class TestHumanBoneMapper(TestCase):
@@ -16,3 +24,54 @@ class TestHumanBoneMapper(TestCase):
             ),
             "upper.arm.left.012.mn.abc.de.f",
         )
+
+
+class TestBatchHumanBoneMapping(AddonTestCase):
+    def test_batch_assign_vrm1_humanoid_human_bones_automatically(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        ops.icyp.make_basic_armature()
+        armatures = [
+            obj for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        ]
+        self.assertEqual(len(armatures), 2)
+
+        results = create_human_bone_mapping_results(armatures)
+        self.assertEqual(
+            [result.armature_object_name for result in results],
+            [armature.name for armature in armatures],
+        )
+        for result in results:
+            self.assertEqual(result.confidence, 1.0)
+            self.assertEqual(result.mapping, create_human_bone_mapping(armatures[0]))
+
+        for armature in armatures:
+            armature_data = armature.data
+            if not isinstance(armature_data, Armature):
+                raise TypeError
+            ext = get_armature_extension(armature_data)
+            ext.spec_version = ext.SPEC_VERSION_VRM1
+            human_bones = ext.vrm1.humanoid.human_bones
+            for human_bone in human_bones.human_bone_name_to_human_bone().values():
+                human_bone.node.bone_name = ""
+            self.assertFalse(human_bones.bones_are_correctly_assigned())
+
+        self.assertEqual(
+            ops.vrm.batch_assign_vrm1_humanoid_human_bones_automatically(
+                armature_object_names=[
+                    {"name": armature.name, "value": armature.name}
+                    for armature in armatures
+                ]
+            ),
+            {"FINISHED"},
+        )
+
+        for armature in armatures:
+            armature_data = armature.data
+            if not isinstance(armature_data, Armature):
+                raise TypeError
+            human_bones = get_armature_extension(
+                armature_data
+            ).vrm1.humanoid.human_bones
+            self.assertTrue(human_bones.bones_are_correctly_assigned())
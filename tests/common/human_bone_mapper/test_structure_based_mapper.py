@@ -8,6 +8,7 @@ import bpy
 from bpy.types import Armature, Context, EditBone, Object
 from mathutils import Vector
 
+from io_scene_vrm.common.human_bone_mapper import structure_based_mapping
 from io_scene_vrm.common.human_bone_mapper.structure_based_mapping import (
     DEFAULT_MAX_SEARCH_COUNT,
     AssignedSearchBranch,
@@ -289,3 +290,123 @@ class TestStructureBasedMapper(AddonTestCase):
         }
 
         self.assert_tree(tree, "leg-branch", HumanBoneName.HIPS)
+
+    def test_renamed_rig(self) -> None:
+        def create_hand_tree(prefix: str, side: str, sign: int) -> Tree:
+            finger_names = ("Thumb", "Index", "Middle", "Ring", "Little")
+            finger_tree: dict[
+                tuple[
+                    Union[str, HumanBoneName, tuple[str, HumanBoneName]],
+                    tuple[float, float, float],
+                ],
+                Tree,
+            ] = {}
+            for finger_index, finger_name in enumerate(finger_names):
+                segment_names = (
+                    ("Metacarpal", "Proximal", "Distal")
+                    if finger_name == "Thumb"
+                    else ("Proximal", "Intermediate", "Distal")
+                )
+                segment_tree: Tree = {}
+                for segment_index, segment_name in reversed(
+                    list(enumerate(segment_names))
+                ):
+                    human_bone_name = HumanBoneName(side + finger_name + segment_name)
+                    segment_tree = {
+                        (
+                            (
+                                f"{prefix}{side}-{finger_index}-{segment_index}",
+                                human_bone_name,
+                            ),
+                            (
+                                sign * (3.2 + segment_index * 0.1),
+                                finger_index * 0.05 - 0.1,
+                                3,
+                            ),
+                        ): segment_tree
+                    }
+                finger_tree.update(segment_tree)
+            return finger_tree
+
+        def create_tree(prefix: str, *, fingers: bool) -> Tree:
+            return {
+                ((prefix + "hips", HumanBoneName.HIPS), (0, 0, 1)): {
+                    ((prefix + "spine", HumanBoneName.SPINE), (0, 0, 2)): {
+                        ((prefix + "head", HumanBoneName.HEAD), (0, 0, 4)): {},
+                        ((prefix + "l0", HumanBoneName.LEFT_UPPER_ARM), (1, 0, 3)): {
+                            (
+                                (prefix + "l1", HumanBoneName.LEFT_LOWER_ARM),
+                                (2, 0, 3),
+                            ): {
+                                (
+                                    (prefix + "l2", HumanBoneName.LEFT_HAND),
+                                    (3, 0, 3),
+                                ): create_hand_tree(prefix, "left", 1)
+                                if fingers
+                                else {}
+                            }
+                        },
+                        (
+                            (prefix + "r0", HumanBoneName.RIGHT_UPPER_ARM),
+                            (-1, 0, 3),
+                        ): {
+                            (
+                                (prefix + "r1", HumanBoneName.RIGHT_LOWER_ARM),
+                                (-2, 0, 3),
+                            ): {
+                                (
+                                    (prefix + "r2", HumanBoneName.RIGHT_HAND),
+                                    (-3, 0, 3),
+                                ): create_hand_tree(prefix, "right", -1)
+                                if fingers
+                                else {}
+                            }
+                        },
+                    },
+                    ((prefix + "ll0", HumanBoneName.LEFT_UPPER_LEG), (1, 0, 2)): {
+                        ((prefix + "ll1", HumanBoneName.LEFT_LOWER_LEG), (1, 0, 1)): {
+                            ((prefix + "ll2", HumanBoneName.LEFT_FOOT), (1, 0, 0)): {}
+                        }
+                    },
+                    ((prefix + "rl0", HumanBoneName.RIGHT_UPPER_LEG), (-1, 0, 2)): {
+                        (
+                            (prefix + "rl1", HumanBoneName.RIGHT_LOWER_LEG),
+                            (-1, 0, 1),
+                        ): {
+                            (
+                                (prefix + "rl2", HumanBoneName.RIGHT_FOOT),
+                                (-1, 0, 0),
+                            ): {}
+                        }
+                    },
+                }
+            }
+
+        self.assert_tree(create_tree("a-", fingers=False), "first", HumanBoneName.HIPS)
+        self.assert_tree(
+            create_tree("b-", fingers=False), "renamed", HumanBoneName.HIPS
+        )
+
+        # A rig of the same shape with different bone names reuses the cached
+        # results and must map the same as a search without the cache
+        context = bpy.context
+        human_bone_specification = HumanBoneSpecifications.get(HumanBoneName.HIPS)
+        first_armature, first_expected_mapping = _create_armature(
+            context, create_tree("c-", fingers=True)
+        )
+        self.assertEqual(
+            create_structure_based_mapping(first_armature, human_bone_specification),
+            first_expected_mapping,
+        )
+        renamed_armature, renamed_expected_mapping = _create_armature(
+            context, create_tree("d-", fingers=True)
+        )
+        self.assertEqual(
+            create_structure_based_mapping(renamed_armature, human_bone_specification),
+            renamed_expected_mapping,
+        )
+        structure_based_mapping.clear_global_variables()
+        self.assertEqual(
+            create_structure_based_mapping(renamed_armature, human_bone_specification),
+            renamed_expected_mapping,
+        )
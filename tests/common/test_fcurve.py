@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import itertools
+import math
+from unittest import TestCase
+
+import bpy
+from bpy.types import FCurve
+
+from io_scene_vrm.common.fcurve import evaluate_fcurve
+
+
+class TestEvaluateFcurve(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        bpy.ops.wm.read_homefile(use_empty=True)
+
+    def create_fcurve(
+        self,
+        keyframes: list[tuple[float, float, str]],
+        *,
+        extrapolation: str = "CONSTANT",
+        handle_type: str = "AUTO_CLAMPED",
+    ) -> FCurve:
+        action = bpy.data.actions.new("TestEvaluateFcurve")
+        fcurve = action.fcurves.new('["prop"]')
+        fcurve.keyframe_points.add(len(keyframes))
+        for keyframe_point, (x, y, interpolation) in zip(
+            fcurve.keyframe_points, keyframes
+        ):
+            keyframe_point.co = (x, y)
+            keyframe_point.interpolation = interpolation
+            keyframe_point.handle_left_type = handle_type
+            keyframe_point.handle_right_type = handle_type
+        fcurve.extrapolation = extrapolation
+        fcurve.update()
+        return fcurve
+
+    def assert_evaluate_fcurve(
+        self, fcurve: FCurve, frame_start: int, frame_end: int
+    ) -> None:
+        actual = evaluate_fcurve(fcurve, frame_start, frame_end)
+        expected = [fcurve.evaluate(f) for f in range(frame_start, frame_end + 1)]
+        self.assertEqual(len(actual), len(expected))
+        for frame, actual_value, expected_value in zip(
+            range(frame_start, frame_end + 1), actual, expected
+        ):
+            self.assertAlmostEqual(
+                actual_value, expected_value, places=5, msg=f"frame={frame}"
+            )
+
+    def test_no_keyframes(self) -> None:
+        self.assert_evaluate_fcurve(self.create_fcurve([]), 0, 3)
+
+    def test_constant_and_linear(self) -> None:
+        fcurve = self.create_fcurve(
+            [
+                (2, 1, "LINEAR"),
+                (5.5, -2, "CONSTANT"),
+                (8, 3, "LINEAR"),
+                (8, 4, "LINEAR"),
+                (12.25, 0.5, "LINEAR"),
+            ]
+        )
+        self.assert_evaluate_fcurve(fcurve, -3, 16)
+
+    def test_flat_bezier(self) -> None:
+        fcurve = self.create_fcurve([(0, 0.5, "BEZIER"), (10, 0.5, "BEZIER")])
+        self.assert_evaluate_fcurve(fcurve, 0, 10)
+
+    def test_linear_extrapolation(self) -> None:
+        for interpolation in ["CONSTANT", "LINEAR", "BEZIER"]:
+            with self.subTest(interpolation=interpolation):
+                fcurve = self.create_fcurve(
+                    [(3, 1, interpolation), (6, 2, interpolation)],
+                    extrapolation="LINEAR",
+                )
+                self.assert_evaluate_fcurve(fcurve, -2, 10)
+
+    def test_modifier(self) -> None:
+        fcurve = self.create_fcurve([(0, 0, "LINEAR"), (4, 1, "LINEAR")])
+        fcurve.modifiers.new("CYCLES")
+        self.assert_evaluate_fcurve(fcurve, -5, 20)
+
+    def test_combinations(self) -> None:
+        xs = [-4.5, -1, 0.25, 3, 3.5, 8, 15, 16.75, 40]
+        for interpolation, handle_type, extrapolation in itertools.product(
+            ["CONSTANT", "LINEAR", "BEZIER", "SINE", "BOUNCE"],
+            ["AUTO_CLAMPED", "AUTO", "VECTOR", "ALIGNED", "FREE"],
+            ["CONSTANT", "LINEAR"],
+        ):
+            fcurve = self.create_fcurve(
+                [
+                    (x, math.sin(index * 1.7), interpolation)
+                    for index, x in enumerate(xs)
+                ],
+                extrapolation=extrapolation,
+                handle_type=handle_type,
+            )
+            with self.subTest(
+                interpolation=interpolation,
+                handle_type=handle_type,
+                extrapolation=extrapolation,
+            ):
+                self.assert_evaluate_fcurve(fcurve, -10, 50)
@@ -6,6 +6,7 @@ from unittest import TestCase
 from io_scene_vrm.common.fs import (
     create_unique_indexed_directory_path,
     create_unique_indexed_file_path,
+    find_indexed_file_path_with_same_content,
 )
 
 
@@ -119,3 +120,30 @@ class TestFs(TestCase):
             self.assertEqual(exist_a_2, dir_path / "a.2.txt")
             self.assertEqual(exist_a_2.read_bytes(), b"a2")
             self.assertTrue(exist_a_2.is_file())
+
+    def test_find_indexed_file_path_with_same_content(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_str:
+            dir_path = Path(dir_str)
+
+            self.assertIsNone(
+                find_indexed_file_path_with_same_content(dir_path / "a.txt", b"a")
+            )
+
+            create_unique_indexed_file_path(dir_path / "a.txt", b"a")
+            create_unique_indexed_file_path(dir_path / "a.txt", b"a1")
+            create_unique_indexed_file_path(dir_path / "a.txt", b"a2")
+
+            self.assertEqual(
+                find_indexed_file_path_with_same_content(dir_path / "a.txt", b"a"),
+                dir_path / "a.txt",
+            )
+            self.assertEqual(
+                find_indexed_file_path_with_same_content(dir_path / "a.txt", b"a2"),
+                dir_path / "a.2.txt",
+            )
+            self.assertIsNone(
+                find_indexed_file_path_with_same_content(dir_path / "a.txt", b"a3")
+            )
+            self.assertIsNone(
+                find_indexed_file_path_with_same_content(dir_path / "b.txt", b"a")
+            )
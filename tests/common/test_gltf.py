@@ -1,6 +1,8 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 import base64
 import struct
+from array import array
+from io import BytesIO
 from unittest import TestCase
 
 from mathutils import Matrix, Quaternion
@@ -746,6 +748,127 @@ class TestGltf(TestCase):
         for actual, expected in zip(weights1, (1 / 9, 1 / 9, 1 / 9, 0.0)):
             self.assertAlmostEqual(actual, expected, places=6)
 
+    def test_buffer_builder_append_buffer_view(self) -> None:
+        buffer0 = bytearray(b"abc")
+        buffer_view_dicts: list[dict[str, Json]] = []
+        buffer_builder = gltf.BufferBuilder(buffer0, buffer_view_dicts, [])
+
+        self.assertEqual(buffer_builder.append_buffer_view(b"de"), 0)
+        self.assertEqual(buffer_builder.append_buffer_view(array("H", [1, 0x0203])), 1)
+
+        self.assertEqual(buffer0, b"abc\0de\0\0\x01\0\x03\x02")
+        self.assertEqual(
+            buffer_view_dicts,
+            [
+                {"buffer": 0, "byteOffset": 4, "byteLength": 2},
+                {"buffer": 0, "byteOffset": 8, "byteLength": 4},
+            ],
+        )
+
+    def test_buffer_builder_append_accessor(self) -> None:
+        buffer0 = bytearray()
+        buffer_view_dicts: list[dict[str, Json]] = []
+        accessor_dicts: list[dict[str, Json]] = []
+        buffer_builder = gltf.BufferBuilder(buffer0, buffer_view_dicts, accessor_dicts)
+
+        self.assertEqual(
+            buffer_builder.append_accessor(array("f", [1, 2, 3, 4]), "SCALAR"), 0
+        )
+        self.assertEqual(
+            buffer_builder.append_accessor(
+                array("f", [1, -2, 3, -4, 5, 6]), "VEC3", min_max=True
+            ),
+            1,
+        )
+
+        self.assertEqual(
+            struct.unpack("<10f", buffer0), (1, 2, 3, 4, 1, -2, 3, -4, 5, 6)
+        )
+        self.assertEqual(
+            accessor_dicts,
+            [
+                {
+                    "bufferView": 0,
+                    "componentType": gltf.GL_FLOAT,
+                    "count": 4,
+                    "type": "SCALAR",
+                },
+                {
+                    "bufferView": 1,
+                    "componentType": gltf.GL_FLOAT,
+                    "count": 2,
+                    "type": "VEC3",
+                    "min": [-4, -2, 3],
+                    "max": [1, 5, 6],
+                },
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            buffer_builder.append_accessor(array("f", [1, 2]), "VEC3")
+        with self.assertRaises(ValueError):
+            buffer_builder.append_accessor(array("f", [1, 2]), "MAT5")
+        with self.assertRaises(ValueError):
+            buffer_builder.append_accessor(array("d", [1, 2]), "SCALAR")
+
+    def test_write_glb_chunked_buffer(self) -> None:
+        json_dict: dict[str, Json] = {"asset": {"version": "2.0"}}
+        chunked_buffer = gltf.ChunkedBuffer()
+        buffer_builder = gltf.BufferBuilder(chunked_buffer, [], [])
+        buffer_builder.append_buffer_view(b"abc")
+        buffer_builder.append_buffer_view(array("H", [1, 2, 3]))
+        buffer_builder.append_buffer_view(b"")
+
+        self.assertEqual(len(chunked_buffer), 12)
+        self.assertEqual(b"".join(chunked_buffer.chunks), b"abc\0\1\0\2\0\3\0\0\0")
+
+        output = BytesIO()
+        gltf.write_glb(output, json_dict, chunked_buffer)
+        self.assertEqual(
+            output.getvalue(),
+            gltf.pack_glb(json_dict, b"".join(chunked_buffer.chunks)),
+        )
+        self.assertEqual(
+            gltf.parse_glb(output.getvalue()),
+            (json_dict, b"abc\0\1\0\2\0\3\0\0\0"),
+        )
+
+    def test_animation_sampler_accessor_cache(self) -> None:
+        buffer0 = bytearray()
+        buffer_view_dicts: list[dict[str, Json]] = []
+        accessor_dicts: list[dict[str, Json]] = []
+        buffer_builder = gltf.BufferBuilder(buffer0, buffer_view_dicts, accessor_dicts)
+        buffer_builder.append_accessor(array("f", [0, 1, 2]), "SCALAR")
+        buffer_builder.append_accessor(array("f", [0, 1, 2]), "SCALAR")
+        buffer_builder.append_accessor(array("f", [0, 1, 3]), "SCALAR")
+        buffer_builder.append_accessor(array("f", [0, 0, 0, 2]), "VEC4")
+        buffer_dicts: list[Json] = [{"byteLength": len(buffer0)}]
+        buffer0_bytes = bytes(buffer0)
+        accessor_cache = gltf.AnimationSamplerAccessorCache()
+
+        first, second, third = (
+            accessor_cache.read_input(
+                accessor_dict, list(buffer_view_dicts), buffer_dicts, buffer0_bytes
+            )
+            for accessor_dict in accessor_dicts[:3]
+        )
+        self.assertEqual(first, [0, 1, 2])
+        self.assertIs(first, second)
+        self.assertEqual(third, [0, 1, 3])
+
+        normalized = accessor_cache.read_rotation_output(
+            accessor_dicts[3], list(buffer_view_dicts), buffer_dicts, buffer0_bytes
+        )
+        not_normalized = accessor_cache.read_rotation_output(
+            accessor_dicts[3],
+            list(buffer_view_dicts),
+            buffer_dicts,
+            buffer0_bytes,
+            normalize=False,
+        )
+        self.assertEqual(normalized, [Quaternion((1, 0, 0, 0))])
+        self.assertEqual(not_normalized, [Quaternion((2, 0, 0, 0))])
+
     def test_parse_gltf_node_matrix(self) -> None:
         # Default empty dict
         self.assertEqual(gltf.parse_gltf_node_matrix({}), Matrix())
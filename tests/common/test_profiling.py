@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from io_scene_vrm.common import profiling
+from io_scene_vrm.common.profiling import span
+
+
+class TestSpan(TestCase):
+    def test_disabled(self) -> None:
+        with patch.dict(profiling.environ, clear=True):
+            first_span = span("first")
+            second_span = span("second")
+            self.assertIs(first_span, second_span)
+            with first_span:
+                pass
+
+    def test_enabled(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_path = Path(temp_dir, "trace.json")
+            with patch.dict(
+                profiling.environ, {"BLENDER_VRM_PROFILE_PATH": str(trace_path)}
+            ):
+                with span("outer"):
+                    with span("inner"):
+                        pass
+                    with span("inner"):
+                        pass
+                    # The trace is written when the outermost span ends
+                    self.assertFalse(trace_path.exists())
+                trace_dict = json.loads(trace_path.read_text(encoding="UTF-8"))
+
+        trace_event_dicts = trace_dict["traceEvents"]
+        self.assertEqual(
+            [trace_event_dict["name"] for trace_event_dict in trace_event_dicts],
+            ["inner", "inner", "outer"],
+        )
+        outer_trace_event_dict = trace_event_dicts[-1]
+        for inner_trace_event_dict in trace_event_dicts[:-1]:
+            self.assertEqual(inner_trace_event_dict["ph"], "X")
+            self.assertGreaterEqual(
+                inner_trace_event_dict["ts"], outer_trace_event_dict["ts"]
+            )
+            self.assertLessEqual(
+                inner_trace_event_dict["ts"] + inner_trace_event_dict["dur"],
+                outer_trace_event_dict["ts"] + outer_trace_event_dict["dur"],
+            )
+
+    def test_span_not_entered(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_path = Path(temp_dir, "trace.json")
+            with patch.dict(
+                profiling.environ, {"BLENDER_VRM_PROFILE_PATH": str(trace_path)}
+            ):
+                span("not_entered")
+            # A span that is never entered does not keep the tracing enabled
+            with patch.dict(profiling.environ, clear=True):
+                with span("disabled"):
+                    pass
+                self.assertFalse(trace_path.exists())
+
+            other_trace_path = Path(temp_dir, "other_trace.json")
+            with patch.dict(
+                profiling.environ, {"BLENDER_VRM_PROFILE_PATH": str(trace_path)}
+            ):
+                other_span = span("other")
+            with patch.dict(
+                profiling.environ, {"BLENDER_VRM_PROFILE_PATH": str(other_trace_path)}
+            ):
+                with other_span:
+                    pass
+                self.assertFalse(trace_path.exists())
+                trace_dict = json.loads(other_trace_path.read_text(encoding="UTF-8"))
+
+        self.assertEqual(
+            [
+                trace_event_dict["name"]
+                for trace_event_dict in trace_dict["traceEvents"]
+            ],
+            ["other"],
+        )
+
+
+if __name__ == "__main__":
+    main()
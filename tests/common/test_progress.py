@@ -1,8 +1,18 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import json
+import tempfile
+import threading
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from io_scene_vrm.common.progress import Progress, create_progress
+from io_scene_vrm.common.progress import (
+    CancellationToken,
+    Progress,
+    ProgressCancelledError,
+    cancel_active_progress,
+    create_progress,
+)
 
 
 class TestProgress(TestCase):
@@ -130,3 +140,93 @@ class TestProgress(TestCase):
                 # ratio = 0.2 + 0.5 * (0.6 - 0.2) = 0.2 + 0.5 * 0.4 = 0.2 + 0.2 = 0.4
                 # progress_value = math.floor(0.4 * 99) = 39
                 context.window_manager.progress_update.assert_called_once_with(39)
+
+    def test_phase(self) -> None:
+        context = MagicMock()
+        context.window_manager = MagicMock()
+
+        Progress.active_progress_uuid = None
+        Progress.active_report = None
+        with create_progress(context, show_progress=False) as progress:
+            with progress.phase("first", 0.5) as partial:
+                for index in range(3):
+                    partial.update_items(index + 1, 3)
+            self.assertAlmostEqual(progress.last_ratio, 0.5)
+            with progress.phase("second", 1):
+                pass
+            self.assertAlmostEqual(progress.last_ratio, 1)
+
+        self.assertEqual(
+            [
+                (phase_timing.name, phase_timing.processed_item_count)
+                for phase_timing in progress.report.phase_timings
+            ],
+            [("first", 3), ("second", 0)],
+        )
+        for phase_timing in progress.report.phase_timings:
+            self.assertGreaterEqual(phase_timing.elapsed_seconds, 0)
+
+    def test_nested_progress_shares_report(self) -> None:
+        context = MagicMock()
+        context.window_manager = MagicMock()
+
+        Progress.active_progress_uuid = None
+        Progress.active_report = None
+        with create_progress(context, show_progress=False) as progress1:
+            with create_progress(context, show_progress=False) as progress2:
+                self.assertIs(progress1.report, progress2.report)
+                with progress2.phase("nested", 1):
+                    pass
+            self.assertEqual(len(progress1.report.phase_timings), 1)
+        self.assertIsNone(Progress.active_report)
+
+    def test_report_path(self) -> None:
+        context = MagicMock()
+        context.window_manager = MagicMock()
+
+        Progress.active_progress_uuid = None
+        Progress.active_report = None
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = Path(temp_dir) / "report.json"
+            with (
+                patch.dict(
+                    "io_scene_vrm.common.progress.environ",
+                    {"BLENDER_VRM_PROGRESS_REPORT_PATH": str(report_path)},
+                ),
+                create_progress(context, show_progress=False) as progress,
+            ):
+                with progress.phase("phase", 1) as partial:
+                    partial.update_items(2, 2)
+                with create_progress(context, show_progress=False):
+                    pass
+                self.assertFalse(report_path.exists())
+
+            report = json.loads(report_path.read_text(encoding="UTF-8"))
+            self.assertFalse(report["cancelled"])
+            self.assertEqual(len(report["phases"]), 1)
+            self.assertEqual(report["phases"][0]["name"], "phase")
+            self.assertEqual(report["phases"][0]["processed_item_count"], 2)
+
+    def test_cancellation(self) -> None:
+        context = MagicMock()
+        context.window_manager = MagicMock()
+
+        Progress.active_progress_uuid = None
+        Progress.active_report = None
+        self.assertFalse(cancel_active_progress())
+
+        cancellation_token = CancellationToken()
+        with (
+            self.assertRaises(ProgressCancelledError),
+            create_progress(
+                context, show_progress=False, cancellation_token=cancellation_token
+            ) as progress,
+        ):
+            progress.update(0.1)
+            with create_progress(context, show_progress=False) as nested_progress:
+                thread = threading.Thread(target=cancel_active_progress)
+                thread.start()
+                thread.join()
+                self.assertTrue(cancellation_token.is_cancelled())
+                nested_progress.update(0.2)
+        self.assertIsNone(Progress.active_report)
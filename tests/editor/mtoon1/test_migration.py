@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+
+from unittest import main
+from unittest.mock import patch
+
+import bpy
+
+from io_scene_vrm.common.version import get_addon_version
+from io_scene_vrm.editor.extension_accessor import get_material_extension
+from io_scene_vrm.editor.mtoon1 import migration
+from tests.util import AddonTestCase
+
+
+class TestMigrate(AddonTestCase):
+    def test_migration_fingerprint(self) -> None:
+        context = bpy.context
+        addon_version = get_addon_version()
+
+        material = bpy.data.materials.new(name="MToonMaterial")
+        mtoon1 = get_material_extension(material).mtoon1
+        mtoon1.enabled = True
+        self.assertFalse(migration.is_migrated(context, material, addon_version))
+
+        migration.migrate(context)
+        self.assertTrue(migration.is_migrated(context, material, addon_version))
+        self.assertFalse(migration.is_migrated(context, material, (0, 0, 1)))
+
+        # Migrated materials are skipped without inspecting their node trees
+        with patch.object(migration, "_migrate_material") as migrate_material:
+            migration.migrate(context)
+        migrate_material.assert_not_called()
+
+        # A material saved by another version of the add-on needs migration
+        mtoon1.addon_version = (2, 20, 0)
+        self.assertFalse(migration.is_migrated(context, material, addon_version))
+        with patch.object(migration, "_migrate_material") as migrate_material:
+            migration.migrate(context)
+        migrate_material.assert_called_once()
+        self.assertEqual(migrate_material.call_args.args[1], material)
+
+        migration.migrate(context)
+        self.assertEqual(tuple(mtoon1.addon_version), addon_version)
+        self.assertTrue(migration.is_migrated(context, material, addon_version))
+
+    def test_node_tree_changed(self) -> None:
+        context = bpy.context
+        addon_version = get_addon_version()
+
+        material = bpy.data.materials.new(name="MToonMaterial")
+        get_material_extension(material).mtoon1.enabled = True
+        migration.migrate(context)
+
+        node_tree = material.node_tree
+        if node_tree is None:
+            raise AssertionError
+        node_tree.nodes.new("NodeFrame")
+        self.assertFalse(migration.is_migrated(context, material, addon_version))
+
+    def test_non_mtoon_material(self) -> None:
+        context = bpy.context
+        material = bpy.data.materials.new(name="Material")
+        material.use_nodes = True
+        migration.migrate(context)
+        self.assertFalse(migration.is_migrated(context, material, get_addon_version()))
+
+
+if __name__ == "__main__":
+    main()
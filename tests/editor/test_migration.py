@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from unittest import main
+
+import bpy
+from bpy.types import Armature, Object
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.common.version import get_addon_version
+from io_scene_vrm.editor import migration
+from io_scene_vrm.editor.extension import get_armature_extension
+from tests.util import AddonTestCase
+
+
+class TestMigrateAllObjects(AddonTestCase):
+    def create_armature(self) -> Object:
+        context = bpy.context
+        self.assertEqual(ops.icyp.make_basic_armature(), {"FINISHED"})
+        armature = context.view_layer.objects.active
+        self.assertIsNotNone(armature)
+        if armature is None:
+            raise AssertionError
+        return armature
+
+    def get_addon_version(self, armature: Object) -> tuple[int, ...]:
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+        return tuple(get_armature_extension(armature_data).addon_version)
+
+    def set_old_addon_version(self, armature: Object) -> None:
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+        get_armature_extension(armature_data).addon_version = (2, 0, 0)
+
+    def test_changed_only(self) -> None:
+        context = bpy.context
+        armature1 = self.create_armature()
+        armature2 = self.create_armature()
+        context.view_layer.update()
+        migration.migrate_all_objects(context, heavy_migration=False)
+
+        # Changes to add-on properties are not tracked
+        self.set_old_addon_version(armature1)
+        self.set_old_addon_version(armature2)
+        context.view_layer.update()
+        migration.migrate_all_objects(context, heavy_migration=False, changed_only=True)
+        self.assertEqual(self.get_addon_version(armature1), (2, 0, 0))
+        self.assertEqual(self.get_addon_version(armature2), (2, 0, 0))
+
+        # Renaming the armature data is tracked by the depsgraph
+        armature1_data = armature1.data
+        if not isinstance(armature1_data, Armature):
+            raise TypeError
+        armature1_data.name = "Renamed"
+        context.view_layer.update()
+        migration.migrate_all_objects(context, heavy_migration=False, changed_only=True)
+        self.assertEqual(self.get_addon_version(armature1), get_addon_version())
+        self.assertEqual(self.get_addon_version(armature2), (2, 0, 0))
+
+        # Adding an object requires a full migration
+        self.set_old_addon_version(armature1)
+        armature3 = self.create_armature()
+        self.set_old_addon_version(armature3)
+        migration.migrate_all_objects(context, heavy_migration=False, changed_only=True)
+        self.assertEqual(self.get_addon_version(armature1), get_addon_version())
+        self.assertEqual(self.get_addon_version(armature2), get_addon_version())
+        self.assertEqual(self.get_addon_version(armature3), get_addon_version())
+
+    def test_full_migration(self) -> None:
+        context = bpy.context
+        armature = self.create_armature()
+        context.view_layer.update()
+        migration.migrate_all_objects(context, heavy_migration=False)
+
+        self.set_old_addon_version(armature)
+        migration.migrate_all_objects(context, heavy_migration=False)
+        self.assertEqual(self.get_addon_version(armature), get_addon_version())
+
+
+if __name__ == "__main__":
+    main()
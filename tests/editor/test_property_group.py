@@ -2,7 +2,7 @@
 import re
 from collections.abc import Mapping
 from typing import Optional
-from unittest import main
+from unittest import TestCase, main
 
 import bpy
 from bpy.types import Armature, EditBone, Object
@@ -19,6 +19,7 @@ from io_scene_vrm.common.vrm0.human_bone import (
 from io_scene_vrm.editor.extension import get_armature_extension
 from io_scene_vrm.editor.property_group import (
     BonePropertyGroup,
+    BoneTreeIndex,
     HumanoidStructureBonePropertyGroup,
 )
 from io_scene_vrm.editor.vrm0.property_group import Vrm0HumanoidPropertyGroup
@@ -233,5 +234,55 @@ class TestBonePropertyGroup(AddonTestCase):
         )
 
 
+class TestBoneTreeIndex(TestCase):
+    def test_create(self) -> None:
+        bone_tree_index = BoneTreeIndex.create(
+            (
+                ("hips", "root"),
+                ("root", ""),
+                ("spine", "hips"),
+                ("leg", "hips"),
+                ("head", "spine"),
+                ("prop", ""),
+            )
+        )
+
+        self.assertEqual(
+            ("root", "hips", "spine", "head", "leg", "prop"),
+            bone_tree_index.bone_names,
+        )
+        self.assertEqual((-1, 0, 1, 2, 1, -1), bone_tree_index.parent_indices)
+        self.assertEqual((0, 1, 2, 3, 2, 0), bone_tree_index.depths)
+        self.assertEqual((4, 4, 3, 3, 4, 5), bone_tree_index.exit_indices)
+        self.assertEqual((0, 5), bone_tree_index.root_indices)
+        self.assertEqual((2, 4), bone_tree_index.children_indices[1])
+
+        hips = bone_tree_index.bone_name_to_index["hips"]
+        head = bone_tree_index.bone_name_to_index["head"]
+        leg = bone_tree_index.bone_name_to_index["leg"]
+        prop = bone_tree_index.bone_name_to_index["prop"]
+        self.assertTrue(bone_tree_index.is_ancestor_of(hips, head))
+        self.assertFalse(bone_tree_index.is_ancestor_of(head, hips))
+        self.assertFalse(bone_tree_index.is_ancestor_of(hips, hips))
+        self.assertFalse(bone_tree_index.is_ancestor_of(leg, head))
+        self.assertFalse(bone_tree_index.is_ancestor_of(hips, prop))
+        self.assertEqual(
+            ["hips", "spine", "head", "leg"],
+            [
+                bone_tree_index.bone_names[index]
+                for index in bone_tree_index.subtree_indices(hips)
+            ],
+        )
+        self.assertEqual(
+            ["spine", "hips", "root"],
+            [
+                bone_tree_index.bone_names[index]
+                for index in bone_tree_index.ancestor_indices(head)
+            ],
+        )
+        self.assertEqual(0, bone_tree_index.find_root_index(head))
+        self.assertEqual(prop, bone_tree_index.find_root_index(prop))
+
+
 if __name__ == "__main__":
     main()
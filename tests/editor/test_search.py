@@ -3,11 +3,17 @@ from typing import Optional
 from unittest import main
 
 import bpy
+from bpy.types import Armature
 
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor.extension import get_armature_extension
 from io_scene_vrm.editor.search import (
     active_object_is_vrm0_armature,
     active_object_is_vrm1_armature,
+    armature_exists,
     current_armature,
+    export_objects,
+    multiple_armatures_exist,
     object_distance,
 )
 from tests.util import AddonTestCase
@@ -122,13 +128,13 @@ class TestSearch(AddonTestCase):
 
         # 1. Same object
         self.assertEqual(
-            object_distance(obj1, obj1, collection_child_to_parent),
+            object_distance(context, obj1, obj1, collection_child_to_parent),
             (0, 0, 0, 0, 0, 0, 0),
         )
 
         # 2. Parent-child
         self.assertEqual(
-            object_distance(obj1, obj2, collection_child_to_parent),
+            object_distance(context, obj1, obj2, collection_child_to_parent),
             # left_parent_path: obj1, right_parent_path:
             # obj2->obj1 (pop obj1 -> obj2) => (0, 1)
             (1, 0, 0, 1, 0, 1, 0),
@@ -136,13 +142,13 @@ class TestSearch(AddonTestCase):
 
         # 3. Grandparent-child
         self.assertEqual(
-            object_distance(obj1, obj3, collection_child_to_parent),
+            object_distance(context, obj1, obj3, collection_child_to_parent),
             (1, 0, 0, 2, 0, 1, 0),
         )
 
         # 4. Siblings in same collection
         self.assertEqual(
-            object_distance(obj2, obj3, collection_child_to_parent),
+            object_distance(context, obj2, obj3, collection_child_to_parent),
             (1, 0, 0, 1, 0, 0, 0),
         )
 
@@ -153,14 +159,14 @@ class TestSearch(AddonTestCase):
         # left_collection: root->a->b, right:
         # root->c. pop root -> [a,b], [c] -> len 2, 1
         self.assertEqual(
-            object_distance(obj2, obj4, collection_child_to_parent),
+            object_distance(context, obj2, obj4, collection_child_to_parent),
             (1, 0, 2, 1, 2, 1, 0),
         )
 
         # 6. Object not in collection mapping
         obj5 = bpy.data.objects.new("Obj5", None)
         self.assertEqual(
-            object_distance(obj1, obj5, collection_child_to_parent),
+            object_distance(context, obj1, obj5, collection_child_to_parent),
             (1, 0, 1, 1, 2, 0, 0),
         )
 
@@ -187,11 +193,15 @@ class TestSearch(AddonTestCase):
         unselected_target.select_set(False)
 
         self.assertEqual(
-            object_distance(source, selected_target, collection_child_to_parent),
+            object_distance(
+                context, source, selected_target, collection_child_to_parent
+            ),
             (0, 0, 1, 1, 0, 0, 0),
         )
         self.assertEqual(
-            object_distance(source, unselected_target, collection_child_to_parent),
+            object_distance(
+                context, source, unselected_target, collection_child_to_parent
+            ),
             (1, 0, 1, 1, 0, 0, 0),
         )
 
@@ -201,7 +211,7 @@ class TestSearch(AddonTestCase):
         hidden_target.hide_render = True
 
         self.assertEqual(
-            object_distance(source, hidden_target, collection_child_to_parent),
+            object_distance(context, source, hidden_target, collection_child_to_parent),
             (1, 1, 1, 1, 0, 0, 1),
         )
 
@@ -237,6 +247,109 @@ class TestSearch(AddonTestCase):
 
         self.assertEqual(current_armature(context), armature_object_1)
 
+    def test_current_armature_without_depsgraph_update(self) -> None:
+        context = bpy.context
+
+        self.assertFalse(armature_exists(context))
+        self.assertIsNone(current_armature(context))
+
+        armature_data = bpy.data.armatures.new("ArmatureData")
+        armature_object_1 = bpy.data.objects.new("ArmatureObject1", armature_data)
+        context.scene.collection.objects.link(armature_object_1)
+        self.assertTrue(armature_exists(context))
+        self.assertFalse(multiple_armatures_exist(context))
+        self.assertEqual(current_armature(context), armature_object_1)
+
+        # Shares the armature data
+        armature_object_2 = bpy.data.objects.new("ArmatureObject2", armature_data)
+        context.scene.collection.objects.link(armature_object_2)
+        armature_object_2.select_set(True)
+        context.view_layer.objects.active = armature_object_2
+        self.assertEqual(current_armature(context), armature_object_2)
+
+        bpy.data.objects.remove(armature_object_2)
+        self.assertEqual(current_armature(context), armature_object_1)
+
+        bpy.data.objects.remove(armature_object_1)
+        self.assertFalse(armature_exists(context))
+        self.assertIsNone(current_armature(context))
+
+    def test_current_armature_after_rename(self) -> None:
+        context = bpy.context
+
+        armature_objects = [
+            bpy.data.objects.new(name, bpy.data.armatures.new(name))
+            for name in ("C", "D")
+        ]
+        for armature_object in armature_objects:
+            context.scene.collection.objects.link(armature_object)
+        context.view_layer.objects.active = None
+        self.assertEqual(current_armature(context), armature_objects[0])
+
+        # Renaming doesn't change the users of the armatures
+        armature_objects[0].name = "Z"
+        self.assertEqual(current_armature(context), armature_objects[1])
+
+    def test_export_objects(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = next(
+            obj for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        )
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+        mesh = context.blend_data.meshes.new("Mesh")
+        objects = [context.blend_data.objects.new(f"Mesh{i}", mesh) for i in range(4)]
+        for obj in objects:
+            context.scene.collection.objects.link(obj)
+        camera = context.blend_data.objects.new(
+            "Camera", context.blend_data.cameras.new("Camera")
+        )
+        context.scene.collection.objects.link(camera)
+
+        def search_export_objects(*, export_invisibles: bool) -> list[str]:
+            return [
+                obj.name
+                for obj in export_objects(
+                    context,
+                    armature.name,
+                    export_invisibles=export_invisibles,
+                    export_only_selections=False,
+                    export_lights=False,
+                )
+            ]
+
+        all_names = [armature.name, *(obj.name for obj in objects)]
+        self.assertEqual(search_export_objects(export_invisibles=False), all_names)
+
+        # Hiding or removing objects discards the cached candidates
+        objects[1].hide_set(True)
+        self.assertEqual(
+            search_export_objects(export_invisibles=False),
+            [armature.name, "Mesh0", "Mesh2", "Mesh3"],
+        )
+        self.assertEqual(search_export_objects(export_invisibles=True), all_names)
+        context.blend_data.objects.remove(objects.pop())
+        self.assertEqual(
+            search_export_objects(export_invisibles=True),
+            [armature.name, "Mesh0", "Mesh1", "Mesh2"],
+        )
+
+        # Colliders are excluded even if the depsgraph is not updated
+        ext = get_armature_extension(armature_data)
+        spring_bone1_collider = ext.spring_bone1.colliders.add()
+        spring_bone1_collider.bpy_object = objects[0]
+        objects[2].parent = objects[0]
+        self.assertEqual(
+            search_export_objects(export_invisibles=True),
+            [armature.name, "Mesh1"],
+        )
+        collider_group = ext.vrm0.secondary_animation.collider_groups.add()
+        collider_group.colliders.add().bpy_object = objects[1]
+        self.assertEqual(search_export_objects(export_invisibles=True), [armature.name])
+
 
 if __name__ == "__main__":
     main()
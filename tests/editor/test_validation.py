@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from typing import Optional
 from unittest import main
 
 import bpy
@@ -6,9 +7,10 @@ from bpy.types import Armature, Mesh
 from mathutils import Vector
 
 from io_scene_vrm.common import ops
-from io_scene_vrm.editor import search
+from io_scene_vrm.editor import search, validation
 from io_scene_vrm.editor.extension import get_armature_extension
 from io_scene_vrm.editor.validation import (
+    ValidationCache,
     ValidationState,
     WM_OT_vrm_validator,
     is_valid_url,
@@ -184,6 +186,118 @@ class TestValidation(AddonTestCase):
         self.assertIn("have common bone", state.skippable_warning_messages[0])
         self.assertIn('"spine"', state.skippable_warning_messages[0])
 
+    def test_validate_vertex_weights(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = next(
+            obj for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        )
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+
+        mesh = context.blend_data.meshes.new("Mesh")
+        mesh.vertices.add(10)
+        mesh_object = context.blend_data.objects.new("Mesh", mesh)
+        context.scene.collection.objects.link(mesh_object)
+        for bone_name in ["hips", "spine", "chest", "neck", "head"]:
+            mesh_object.vertex_groups.new(name=bone_name).add([2], 0.0, "REPLACE")
+        mesh_object.vertex_groups["hips"].add([0], 1.0, "REPLACE")
+
+        state = ValidationState()
+        WM_OT_vrm_validator.validate_vertex_weights(
+            [mesh_object], armature, armature_data, is_vrm1=False, state=state
+        )
+        self.assertEqual(len(state.info_messages), 6)
+        self.assertIn('has too many (over 4) weight in "Mesh"', state.info_messages[1])
+        for message, vertex_index in zip(state.info_messages, [1, 2, 3, 4, 5, 6]):
+            self.assertIn(f'vertex index "{vertex_index}"', message)
+
+        state = ValidationState()
+        WM_OT_vrm_validator.validate_vertex_weights(
+            [mesh_object], armature, armature_data, is_vrm1=True, state=state
+        )
+        self.assertEqual(len(state.info_messages), 1)
+        self.assertIn('vertex index "2" has too many', state.info_messages[0])
+
+        mesh_object.parent = armature
+        mesh_object.parent_type = "BONE"
+        mesh_object.parent_bone = "hips"
+        state = ValidationState()
+        WM_OT_vrm_validator.validate_vertex_weights(
+            [mesh_object], None, None, is_vrm1=False, state=state
+        )
+        self.assertEqual(state.info_messages, [])
+
+    def test_validation_cache(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = next(
+            obj for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        )
+        armature_data = armature.data
+        if not isinstance(armature_data, Armature):
+            raise TypeError
+
+        mesh = context.blend_data.meshes.new("Mesh")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)], [], [])
+        mesh_object = context.blend_data.objects.new("Mesh", mesh)
+        context.scene.collection.objects.link(mesh_object)
+        material = context.blend_data.materials.new("Material")
+        material.use_nodes = True
+        mesh.materials.append(material)
+        cache = validation._cache
+
+        WM_OT_vrm_validator.detect_errors(context, None, armature.name)
+        self.assertTrue(cache.vertex_weight_info_messages)
+        self.assertTrue(cache.material_results)
+
+        def validate_vertex_weights(
+            cache: Optional[ValidationCache],
+        ) -> list[str]:
+            state = ValidationState()
+            WM_OT_vrm_validator.validate_vertex_weights(
+                [mesh_object],
+                armature,
+                armature_data,
+                is_vrm1=False,
+                state=state,
+                cache=cache,
+            )
+            return state.info_messages
+
+        def validate_materials(cache: Optional[ValidationCache]) -> list[str]:
+            state = ValidationState()
+            state.used_materials.append(material)
+            WM_OT_vrm_validator.validate_materials(
+                context, [mesh_object], is_vrm0=False, state=state, cache=cache
+            )
+            return state.skippable_warning_messages
+
+        self.assertEqual(len(validate_vertex_weights(cache)), 4)
+        self.assertEqual(validate_materials(cache), [])
+
+        # Node changes discard only the material results
+        node_tree = material.node_tree
+        if not node_tree:
+            raise AssertionError
+        node_tree.links.clear()
+        context.view_layer.update()
+        self.assertFalse(cache.material_results)
+        self.assertTrue(cache.vertex_weight_info_messages)
+        self.assertEqual(validate_materials(cache), validate_materials(None))
+        self.assertEqual(len(validate_materials(cache)), 1)
+
+        # Weight changes discard only the mesh results
+        mesh_object.vertex_groups.new(name="hips").add([0, 1], 1.0, "REPLACE")
+        context.view_layer.update()
+        self.assertFalse(cache.vertex_weight_info_messages)
+        self.assertTrue(cache.material_results)
+        self.assertEqual(validate_vertex_weights(cache), validate_vertex_weights(None))
+        self.assertEqual(len(validate_vertex_weights(cache)), 2)
+
     def test_validate_vrm0_blend_shape_material_validation(self) -> None:
         context = bpy.context
 
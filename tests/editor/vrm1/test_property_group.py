@@ -8,6 +8,7 @@ from io_scene_vrm.common import ops
 from io_scene_vrm.common.vrm1.human_bone import HumanBoneSpecifications
 from io_scene_vrm.editor.extension import get_armature_extension
 from io_scene_vrm.editor.vrm1 import ops as vrm1_ops
+from io_scene_vrm.editor.vrm1.property_group import Vrm1LookAtPropertyGroup
 from tests.util import AddonTestCase
 
 
@@ -245,5 +246,47 @@ class TestVrm1HumanBonesPropertyGroup(AddonTestCase):
         self.assertTrue(human_bones.human_bone_duplication_error_messages())
 
 
+class TestVrm1LookAtPropertyGroup(AddonTestCase):
+    def test_update_previews_affected_by_moved_objects(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = next(
+            obj for obj in context.blend_data.objects if obj.type == "ARMATURE"
+        )
+        if not isinstance(armature.data, Armature):
+            raise TypeError
+
+        target_parent = bpy.data.objects.new("TargetParent", None)
+        context.scene.collection.objects.link(target_parent)
+        target = bpy.data.objects.new("Target", None)
+        context.scene.collection.objects.link(target)
+        target.parent = target_parent
+        unrelated = bpy.data.objects.new("Unrelated", None)
+        context.scene.collection.objects.link(unrelated)
+
+        ext = get_armature_extension(armature.data)
+        ext.spec_version = ext.SPEC_VERSION_VRM1
+        look_at = ext.vrm1.look_at
+        look_at.type = look_at.TYPE_BONE.identifier
+        look_at.preview_target_bpy_object = target
+        look_at.enable_preview = True
+        target_parent.location = (1, -5, 1)
+        context.view_layer.update()
+        previous_preview_matrix = list(look_at.previous_preview_matrix)
+
+        Vrm1LookAtPropertyGroup.update_previews_affected_by_moved_objects(
+            context, {unrelated.name}
+        )
+        self.assertEqual(previous_preview_matrix, list(look_at.previous_preview_matrix))
+
+        Vrm1LookAtPropertyGroup.update_previews_affected_by_moved_objects(
+            context, {target_parent.name}
+        )
+        self.assertNotEqual(
+            previous_preview_matrix, list(look_at.previous_preview_matrix)
+        )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import bpy
+from bpy.types import Armature, Mesh, Object
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.editor.extension import get_armature_extension
+from io_scene_vrm.editor.vrm1.property_group import Vrm1ExpressionPropertyGroup
+from io_scene_vrm.exporter.abstract_base_vrm_exporter import (
+    AbstractBaseVrmExporter,
+    force_apply_modifiers,
+    shape_keys_require_evaluation,
+)
+from tests.util import AddonTestCase
+
+
+class TestClearBlendShapeProxyPreviews(AddonTestCase):
+    def create_mesh_object(self, name: str) -> Object:
+        context = bpy.context
+        mesh = context.blend_data.meshes.new(name)
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+        obj = context.blend_data.objects.new(name, mesh)
+        context.scene.collection.objects.link(obj)
+        obj.shape_key_add(name="Basis")
+        obj.shape_key_add(name="Smile")
+        return obj
+
+    @staticmethod
+    def get_key_block_value(obj: Object, key_block_name: str) -> float:
+        mesh = obj.data
+        if not isinstance(mesh, Mesh) or not mesh.shape_keys:
+            raise AssertionError
+        return mesh.shape_keys.key_blocks[key_block_name].value
+
+    def test_clear_blend_shape_proxy_previews(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = context.view_layer.objects.active
+        if not armature or not isinstance(armature_data := armature.data, Armature):
+            raise AssertionError
+        ext = get_armature_extension(armature_data)
+        ext.spec_version = ext.SPEC_VERSION_VRM1
+
+        face = self.create_mesh_object("Face")
+        body = self.create_mesh_object("Body")
+        unrelated = self.create_mesh_object("Unrelated")
+
+        happy = ext.vrm1.expressions.preset.happy
+        morph_target_bind = happy.morph_target_binds.add()
+        morph_target_bind.node.mesh_object_name = face.name
+        morph_target_bind.index = "Smile"
+        happy.preview = 0.75
+        self.assertAlmostEqual(self.get_key_block_value(face, "Smile"), 0.75)
+
+        body_data = body.data
+        if not isinstance(body_data, Mesh) or not body_data.shape_keys:
+            raise AssertionError
+        body_data.shape_keys.key_blocks["Smile"].value = 0.5
+
+        saved_vrm0_previews, saved_vrm1_previews, saved_key_block_values = (
+            AbstractBaseVrmExporter.enter_clear_blend_shape_proxy_previews(
+                context, armature_data, [armature, body]
+            )
+        )
+
+        self.assertEqual(happy.preview, 0)
+        self.assertEqual(self.get_key_block_value(face, "Smile"), 0)
+        face_data = face.data
+        if face_data is None:
+            raise AssertionError
+        self.assertEqual(
+            set(saved_key_block_values.keys()), {face_data.name, body_data.name}
+        )
+        self.assertFalse(
+            Vrm1ExpressionPropertyGroup.pending_preview_update_armature_data_names
+        )
+
+        body_data.shape_keys.key_blocks["Smile"].value = 0.25
+
+        AbstractBaseVrmExporter.leave_clear_blend_shape_proxy_previews(
+            context,
+            armature_data,
+            saved_vrm0_previews,
+            saved_vrm1_previews,
+            saved_key_block_values,
+        )
+
+        self.assertAlmostEqual(happy.preview, 0.75)
+        self.assertAlmostEqual(self.get_key_block_value(face, "Smile"), 0.75)
+        self.assertAlmostEqual(self.get_key_block_value(body, "Smile"), 0.5)
+        self.assertEqual(self.get_key_block_value(unrelated, "Smile"), 0)
+        self.assertFalse(
+            Vrm1ExpressionPropertyGroup.pending_preview_update_armature_data_names
+        )
+
+
+class TestForceApplyModifiers(AddonTestCase):
+    def test_shape_keys_without_deforming_modifiers(self) -> None:
+        context = bpy.context
+        mesh = context.blend_data.meshes.new("Mesh")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+        obj = context.blend_data.objects.new("Mesh", mesh)
+        context.scene.collection.objects.link(obj)
+        obj.shape_key_add(name="Basis")
+        up = obj.shape_key_add(name="Up")
+        up.data[0].co = (0, 0, 1)
+        up.value = 0.5
+        up_more = obj.shape_key_add(name="UpMore")
+        up_more.data[0].co = (0, 0, 3)
+        up_more.relative_key = up
+        muted = obj.shape_key_add(name="Muted")
+        muted.data[1].co = (2, 0, 0)
+        muted.mute = True
+        obj.modifiers.new("WeightedNormal", "WEIGHTED_NORMAL")
+        context.view_layer.update()
+
+        shape_keys = mesh.shape_keys
+        if not shape_keys:
+            raise AssertionError
+        self.assertFalse(shape_keys_require_evaluation(obj, shape_keys))
+
+        evaluated_mesh = force_apply_modifiers(context, obj)
+        if not evaluated_mesh or not evaluated_mesh.shape_keys:
+            raise AssertionError
+        key_blocks = evaluated_mesh.shape_keys.key_blocks
+        self.assertEqual(tuple(key_blocks["Up"].data[0].co), (0, 0, 1))
+        self.assertEqual(tuple(key_blocks["UpMore"].data[0].co), (0, 0, 2))
+        self.assertEqual(tuple(key_blocks["Muted"].data[1].co), (1, 0, 0))
+        self.assertEqual(up.value, 0.5)
+
+        obj.modifiers.new("Displace", "DISPLACE")
+        self.assertTrue(shape_keys_require_evaluation(obj, shape_keys))
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import tempfile
+from pathlib import Path
+
+import bpy
+from bpy.types import Armature
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.common.gltf import parse_glb
+from io_scene_vrm.editor.extension import get_armature_extension
+from tests.util import AddonTestCase
+
+
+class TestVrm0Exporter(AddonTestCase):
+    def test_buffer_view_alignment(self) -> None:
+        context = bpy.context
+
+        self.assertEqual(ops.icyp.make_basic_armature(), {"FINISHED"})
+        armature = context.view_layer.objects.active
+        if armature is None or not isinstance(armature.data, Armature):
+            raise AssertionError
+        ext = get_armature_extension(armature.data)
+        ext.spec_version = ext.SPEC_VERSION_VRM0
+
+        # A single triangle has an odd number of indices
+        mesh = context.blend_data.meshes.new("Triangle")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 0, 1)], [], [(0, 1, 2)])
+        mesh.uv_layers.new()
+        mesh_object = context.blend_data.objects.new("Triangle", mesh)
+        context.scene.collection.objects.link(mesh_object)
+        mesh_object.parent = armature
+        mesh_object.shape_key_add(name="Basis")
+        mesh_object.shape_key_add(name="Key")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "out.vrm")
+            self.assertEqual(
+                ops.export_scene.vrm(
+                    filepath=str(path), armature_object_name=armature.name
+                ),
+                {"FINISHED"},
+            )
+            json_dict, _ = parse_glb(path.read_bytes())
+
+        mesh_dicts = json_dict.get("meshes")
+        accessor_dicts = json_dict.get("accessors")
+        buffer_view_dicts = json_dict.get("bufferViews")
+        if not (
+            isinstance(mesh_dicts, list)
+            and isinstance(mesh_dict := mesh_dicts[0], dict)
+            and isinstance(primitive_dicts := mesh_dict.get("primitives"), list)
+            and isinstance(primitive_dict := primitive_dicts[0], dict)
+            and isinstance(indices_accessor_index := primitive_dict.get("indices"), int)
+            and isinstance(accessor_dicts, list)
+            and isinstance(
+                indices_accessor_dict := accessor_dicts[indices_accessor_index], dict
+            )
+            and isinstance(buffer_view_dicts, list)
+        ):
+            raise TypeError
+        self.assertEqual(indices_accessor_dict.get("count"), 3)
+
+        for buffer_view_dict in buffer_view_dicts:
+            if not isinstance(buffer_view_dict, dict):
+                raise TypeError
+            byte_offset = buffer_view_dict.get("byteOffset", 0)
+            if not isinstance(byte_offset, int):
+                raise TypeError
+            self.assertEqual(byte_offset % 4, 0, buffer_view_dict)
@@ -1,11 +1,18 @@
 # SPDX-License-Identifier: MIT OR GPL-3.0-or-later
 
+import json
 import sys
+import tempfile
 import unittest
+from pathlib import Path
+from unittest.mock import patch
 
+import bpy
 from mathutils import Matrix
 
+from io_scene_vrm.common import ops
 from io_scene_vrm.exporter.vrm1_exporter import is_identity_matrix
+from tests.util import AddonTestCase
 
 
 class TestVrm1Exporter(unittest.TestCase):
@@ -48,3 +55,48 @@ class TestVrm1Exporter(unittest.TestCase):
         not_identity_off_diagonal = Matrix()
         not_identity_off_diagonal[1][2] = 1e-6
         self.assertFalse(is_identity_matrix(not_identity_off_diagonal))
+
+
+class TestVrm1ExporterProgress(AddonTestCase):
+    def test_phases(self) -> None:
+        context = bpy.context
+
+        self.assertEqual(ops.icyp.make_basic_armature(), {"FINISHED"})
+        armature = context.view_layer.objects.active
+        if armature is None:
+            raise AssertionError
+
+        for index in range(2):
+            mesh = context.blend_data.meshes.new(f"Triangle{index}")
+            mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 0, 1)], [], [(0, 1, 2)])
+            mesh.materials.append(context.blend_data.materials.new(f"Material{index}"))
+            mesh_object = context.blend_data.objects.new(f"Triangle{index}", mesh)
+            context.scene.collection.objects.link(mesh_object)
+            mesh_object.parent = armature
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = Path(temp_dir, "report.json")
+            with patch.dict(
+                "io_scene_vrm.common.progress.environ",
+                {"BLENDER_VRM_PROGRESS_REPORT_PATH": str(report_path)},
+            ):
+                self.assertEqual(
+                    ops.export_scene.vrm(
+                        filepath=str(Path(temp_dir, "out.vrm")),
+                        armature_object_name=armature.name,
+                    ),
+                    {"FINISHED"},
+                )
+            report = json.loads(report_path.read_text(encoding="UTF-8"))
+
+        self.assertEqual(
+            [
+                (phase["name"], phase["processed_item_count"])
+                for phase in report["phases"]
+            ],
+            [
+                ("apply_modifiers", 2),
+                ("export_scene_gltf", 0),
+                ("save_vrm_materials", 2),
+            ],
+        )
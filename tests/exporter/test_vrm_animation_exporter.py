@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+from collections.abc import Sequence
+from typing import Optional
+from unittest import TestCase
+
+import bpy
+from bpy.types import Armature
+from mathutils import Quaternion, Vector
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.exporter.vrm_animation_exporter import (
+    KeyframeReduction,
+    _calculate_expression_error,
+    _calculate_pose_bone_matrices,
+    _create_bone_name_to_fcurves,
+    _get_action_fcurves,
+    _get_bone_source_frame_offsets,
+    _pose_bone_matrices_require_depsgraph,
+)
+from tests.util import AddonTestCase
+
+
+class TestKeyframeReduction(TestCase):
+    def reduce(
+        self,
+        keyframe_reduction: KeyframeReduction,
+        weights: list[float],
+        source_frame_offsets: Sequence[int] = (),
+    ) -> list[int]:
+        return list(
+            keyframe_reduction.reduce(
+                len(weights),
+                source_frame_offsets,
+                lambda begin, end, index: _calculate_expression_error(
+                    weights, begin, end, index
+                ),
+                keyframe_reduction.expression_tolerance,
+            )
+        )
+
+    def test_none(self) -> None:
+        self.assertEqual(
+            [0, 1, 2, 3], self.reduce(KeyframeReduction(), [0.0, 0.0, 0.0, 0.0])
+        )
+
+    def test_simplify(self) -> None:
+        keyframe_reduction = KeyframeReduction(mode="SIMPLIFY")
+        self.assertEqual([0, 4], self.reduce(keyframe_reduction, [0.0] * 5))
+        self.assertEqual(
+            [0, 4], self.reduce(keyframe_reduction, [0.0, 0.25, 0.5, 0.75, 1.0])
+        )
+        self.assertEqual(
+            [0, 2, 3, 5],
+            self.reduce(keyframe_reduction, [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]),
+        )
+
+    def test_source_keyframes(self) -> None:
+        self.assertEqual(
+            [0, 2, 4],
+            self.reduce(
+                KeyframeReduction(mode="SOURCE_KEYFRAMES"),
+                [0.0, 0.25, 0.5, 0.75, 1.0],
+                [2, 9],
+            ),
+        )
+        self.assertEqual(
+            [0, 1, 3, 4, 5],
+            self.reduce(
+                KeyframeReduction(mode="SOURCE_KEYFRAMES"),
+                [0.0, 0.0, 0.0, 0.0, 1.0, 1.0],
+                [1],
+            ),
+        )
+
+
+class TestVrmAnimationExporter(AddonTestCase):
+    def test_calculate_pose_bone_matrices(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = context.view_layer.objects.active
+        if not armature or not isinstance(armature.data, Armature):
+            message = "No armature"
+            raise AssertionError(message)
+
+        armature.data.bones["spine"].use_inherit_rotation = False
+        armature.data.bones["chest"].inherit_scale = "ALIGNED"
+        armature.data.bones["neck"].use_local_location = False
+        for index, pose_bone in enumerate(armature.pose.bones):
+            pose_bone.location = Vector((0.01 * index, -0.02, 0.03))
+            pose_bone.rotation_quaternion = Quaternion((1, 0.1, 0.02 * index, 0.3))
+            pose_bone.scale = Vector((1.1, 0.9, 1.0 + 0.01 * index))
+
+        self.assertFalse(_pose_bone_matrices_require_depsgraph(armature))
+        bone_name_to_matrix = _calculate_pose_bone_matrices(
+            armature, [pose_bone.name for pose_bone in armature.pose.bones]
+        )
+
+        context.view_layer.update()
+        self.assertEqual(len(armature.pose.bones), len(bone_name_to_matrix))
+        for pose_bone in armature.pose.bones:
+            matrix = bone_name_to_matrix[pose_bone.name]
+            for row, expected_row in zip(matrix, pose_bone.matrix):
+                for value, expected_value in zip(row, expected_row):
+                    self.assertAlmostEqual(
+                        expected_value, value, places=5, msg=pose_bone.name
+                    )
+
+    def test_pose_bone_matrices_require_depsgraph(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = context.view_layer.objects.active
+        if not armature or not isinstance(armature.data, Armature):
+            message = "No armature"
+            raise AssertionError(message)
+
+        constraint = armature.pose.bones["head"].constraints.new("COPY_ROTATION")
+        self.assertTrue(_pose_bone_matrices_require_depsgraph(armature))
+        constraint.enabled = False
+        self.assertFalse(_pose_bone_matrices_require_depsgraph(armature))
+
+    def test_get_bone_source_frame_offsets(self) -> None:
+        context = bpy.context
+
+        ops.icyp.make_basic_armature()
+        armature = context.view_layer.objects.active
+        if not armature or not isinstance(armature.data, Armature):
+            message = "No armature"
+            raise AssertionError(message)
+
+        armature.data.bones["spine"].name = 'sp"]ine'
+        armature.pose.bones["hips"].keyframe_insert("location", frame=1)
+        armature.pose.bones["hips"].keyframe_insert("location", frame=9)
+        armature.pose.bones['sp"]ine'].keyframe_insert("rotation_quaternion", frame=3)
+        armature.pose.bones["chest"].keyframe_insert("rotation_quaternion", frame=5)
+        armature.pose.bones["head"].keyframe_insert("rotation_quaternion", frame=7)
+        animation_data = armature.animation_data
+        if not animation_data or not (action := animation_data.action):
+            message = "No action"
+            raise AssertionError(message)
+
+        bone_name_to_fcurves = _create_bone_name_to_fcurves(
+            armature, _get_action_fcurves(action)
+        )
+        self.assertEqual(
+            {"hips": 3, 'sp"]ine': 4, "chest": 4, "head": 4},
+            {
+                bone_name: len(fcurves)
+                for bone_name, fcurves in bone_name_to_fcurves.items()
+            },
+        )
+
+        def get_offsets(bone_name: str, parent_bone_name: Optional[str]) -> set[int]:
+            return _get_bone_source_frame_offsets(
+                armature, bone_name_to_fcurves, bone_name, parent_bone_name, 1, 9
+            )
+
+        self.assertEqual({0, 8}, get_offsets("hips", None))
+        self.assertEqual({2}, get_offsets('sp"]ine', "hips"))
+        self.assertEqual({2, 4}, get_offsets("chest", "hips"))
+        self.assertEqual({4}, get_offsets("chest", 'sp"]ine'))
+        self.assertEqual({0, 2, 4, 6, 8}, get_offsets("head", None))
+        self.assertEqual({6}, get_offsets("head", "neck"))
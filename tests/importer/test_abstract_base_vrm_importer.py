@@ -0,0 +1,247 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import functools
+import random
+from collections.abc import Mapping
+from typing import Optional
+from unittest import TestCase
+
+from io_scene_vrm.common.convert import Json
+from io_scene_vrm.importer.abstract_base_vrm_importer import find_retain_node_indices
+
+
+def find_middle_bone_indices_reference(
+    node_dicts: list[dict[str, Json]],
+    bone_node_indices: list[int],
+    bone_node_index: int,
+    middle_bone_node_indices: list[int],
+) -> list[int]:
+    if not (0 <= bone_node_index < len(node_dicts)):
+        return []
+    node_dict = node_dicts[bone_node_index]
+    child_indices = node_dict.get("children")
+    if not isinstance(child_indices, list):
+        return []
+
+    result: list[int] = []
+    for child_index in child_indices:
+        if not isinstance(child_index, int):
+            continue
+        if not (0 <= child_index < len(node_dicts)):
+            continue
+        if child_index in bone_node_indices:
+            result.extend(middle_bone_node_indices)
+            continue
+        result.extend(
+            find_middle_bone_indices_reference(
+                node_dicts,
+                bone_node_indices,
+                child_index,
+                [*middle_bone_node_indices, bone_node_index],
+            )
+        )
+    return result
+
+
+def find_retain_node_indices_reference(
+    json_dict: Mapping[str, Json],
+    scene_dict: dict[str, Json],
+    bone_node_indices: list[int],
+    hips_node_index: Optional[int],
+) -> list[int]:
+    """Return the result of the previous list-based implementation."""
+    scene_node_index_jsons = scene_dict.get("nodes")
+    if not isinstance(scene_node_index_jsons, list):
+        return []
+    scene_node_indices = [
+        index for index in scene_node_index_jsons if isinstance(index, int)
+    ]
+    node_dict_jsons = json_dict.get("nodes")
+    if not isinstance(node_dict_jsons, list):
+        return []
+    node_dicts = [
+        node_dict for node_dict in node_dict_jsons if isinstance(node_dict, dict)
+    ]
+    skin_dict_jsons = json_dict.get("skins")
+    if not isinstance(skin_dict_jsons, list):
+        skin_dict_jsons = []
+    skin_dicts = [
+        skin_dict for skin_dict in skin_dict_jsons if isinstance(skin_dict, dict)
+    ]
+
+    bone_node_indices = list(bone_node_indices)
+
+    all_scene_node_indices: list[int] = []
+    hips_found = False
+    for scene_node_index in scene_node_indices:
+        all_scene_node_indices.clear()
+
+        search_scene_node_indices = [scene_node_index]
+        while search_scene_node_indices:
+            search_scene_node_index = search_scene_node_indices.pop()
+            if search_scene_node_index == hips_node_index:
+                bone_node_indices.append(scene_node_index)
+                hips_found = True
+            if not (0 <= search_scene_node_index < len(node_dicts)):
+                continue
+            node_dict = node_dicts[search_scene_node_index]
+            all_scene_node_indices.append(search_scene_node_index)
+            child_indices = node_dict.get("children")
+            if not isinstance(child_indices, list):
+                continue
+            for child_index in child_indices:
+                if not isinstance(child_index, int):
+                    continue
+                if child_index in all_scene_node_indices:
+                    continue
+                search_scene_node_indices.append(child_index)
+        if hips_found:
+            break
+    if not hips_found:
+        return []
+
+    all_scene_node_indices = list(dict.fromkeys(all_scene_node_indices))
+
+    for node_index in all_scene_node_indices:
+        if not (0 <= node_index < len(node_dicts)):
+            continue
+        node_dict = node_dicts[node_index]
+        skin_index = node_dict.get("skin")
+        if not isinstance(skin_index, int) or not (0 <= skin_index < len(skin_dicts)):
+            continue
+        skin_dict = skin_dicts[skin_index]
+        skeleton_index = skin_dict.get("skeleton")
+        if isinstance(skeleton_index, int):
+            bone_node_indices.append(skeleton_index)
+        joint_indices = skin_dict.get("joints")
+        if isinstance(joint_indices, list):
+            for joint_index in joint_indices:
+                if isinstance(joint_index, int):
+                    bone_node_indices.append(joint_index)
+
+    for bone_node_index in list(bone_node_indices):
+        if bone_node_index not in all_scene_node_indices:
+            bone_node_indices.remove(bone_node_index)
+
+    search_bone_node_indices = list(bone_node_indices)
+    while search_bone_node_indices:
+        search_bone_node_index = search_bone_node_indices.pop()
+        if not (0 <= search_bone_node_index < len(node_dicts)):
+            continue
+        node_dict = node_dicts[search_bone_node_index]
+        if isinstance(node_dict.get("mesh"), int):
+            continue
+
+        bone_node_indices.append(search_bone_node_index)
+
+        child_indices = node_dict.get("children")
+        if not isinstance(child_indices, list):
+            continue
+        for child_index in child_indices:
+            if not isinstance(child_index, int):
+                continue
+            if child_index in bone_node_indices:
+                continue
+            search_bone_node_indices.append(child_index)
+
+    bone_node_indices.extend(
+        functools.reduce(
+            lambda left, right: left + right,
+            [
+                find_middle_bone_indices_reference(
+                    node_dicts, bone_node_indices, bone_node_index, []
+                )
+                for bone_node_index in bone_node_indices
+            ],
+            list[int](),
+        )
+    )
+
+    return list(dict.fromkeys(bone_node_indices))
+
+
+def create_random_gltf(
+    rng: random.Random,
+) -> tuple[dict[str, Json], dict[str, Json], list[int], Optional[int]]:
+    node_count = rng.randint(1, 60)
+    node_dicts: list[dict[str, Json]] = [{} for _ in range(node_count)]
+    root_node_indices: list[Json] = []
+    for node_index in range(node_count):
+        # Parents always have smaller indices, so the graph never has cycles
+        if node_index == 0 or rng.random() < 0.1:
+            root_node_indices.append(node_index)
+        else:
+            parent_node_dict = node_dicts[rng.randrange(node_index)]
+            children = parent_node_dict.setdefault("children", [])
+            if isinstance(children, list):
+                children.append(node_index)
+        # Rarely share a node between two parents
+        if node_index > 1 and rng.random() < 0.03:
+            other_parent_node_dict = node_dicts[rng.randrange(node_index)]
+            children = other_parent_node_dict.setdefault("children", [])
+            if isinstance(children, list):
+                children.append(node_index)
+        if rng.random() < 0.3:
+            node_dicts[node_index]["mesh"] = 0
+    for node_dict in node_dicts:
+        children = node_dict.get("children")
+        if isinstance(children, list):
+            rng.shuffle(children)
+            if rng.random() < 0.05:
+                children.append(node_count + rng.randrange(3))
+            if rng.random() < 0.05:
+                children.append("invalid")
+
+    skin_dicts: list[Json] = []
+    for _ in range(rng.randrange(3)):
+        skin_dict: dict[str, Json] = {
+            "joints": rng.sample(range(node_count + 2), rng.randrange(node_count))
+        }
+        if rng.random() < 0.5:
+            skin_dict["skeleton"] = rng.randrange(node_count + 2)
+        skin_dicts.append(skin_dict)
+    for node_dict in node_dicts:
+        if skin_dicts and rng.random() < 0.1:
+            node_dict["skin"] = rng.randrange(len(skin_dicts) + 1)
+
+    json_dict: dict[str, Json] = {"nodes": list(node_dicts), "skins": skin_dicts}
+    rng.shuffle(root_node_indices)
+    scene_dict: dict[str, Json] = {"nodes": root_node_indices}
+    bone_node_indices = [
+        rng.randrange(node_count + 2) for _ in range(rng.randrange(node_count))
+    ]
+    hips_node_index = rng.randrange(node_count + 1) if rng.random() < 0.95 else None
+    return json_dict, scene_dict, bone_node_indices, hips_node_index
+
+
+class TestFindRetainNodeIndices(TestCase):
+    def test_matches_reference(self) -> None:
+        rng = random.Random(1234)  # noqa: S311
+        for iteration in range(3000):
+            json_dict, scene_dict, bone_node_indices, hips_node_index = (
+                create_random_gltf(rng)
+            )
+            with self.subTest(iteration=iteration):
+                self.assertEqual(
+                    find_retain_node_indices(
+                        json_dict, scene_dict, bone_node_indices, hips_node_index
+                    ),
+                    find_retain_node_indices_reference(
+                        json_dict, scene_dict, bone_node_indices, hips_node_index
+                    ),
+                )
+
+    def test_mesh_node_between_bones(self) -> None:
+        json_dict: dict[str, Json] = {
+            "nodes": [
+                {"children": [1]},
+                {"children": [2]},
+                {"mesh": 0, "children": [3]},
+                {"mesh": 0, "children": [4]},
+                {},
+            ],
+            "skins": [],
+        }
+        self.assertEqual(
+            find_retain_node_indices(json_dict, {"nodes": [0]}, [1, 4], 1),
+            [1, 4, 0, 2],
+        )
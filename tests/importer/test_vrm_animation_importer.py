@@ -0,0 +1,269 @@
+# SPDX-License-Identifier: MIT OR GPL-3.0-or-later
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import bpy
+from bpy.types import Armature
+from mathutils import Quaternion, Vector
+
+from io_scene_vrm.common import ops
+from io_scene_vrm.common.convert import Json
+from io_scene_vrm.common.gltf import pack_glb, parse_glb
+from io_scene_vrm.editor.extension import get_armature_extension
+from io_scene_vrm.importer.vrm_animation_importer import (
+    KeyframeBuffer,
+    RotationKeyframes,
+    TranslationKeyframes,
+)
+from tests.util import AddonTestCase
+
+
+class TestVrmAnimationKeyframes(TestCase):
+    def test_translation_linear(self) -> None:
+        keyframes = TranslationKeyframes.create(
+            [1.0, 0.0],
+            [Vector((2, 0, 0)), Vector((0, 0, 0))],
+            "LINEAR",
+        )
+        if keyframes is None:
+            raise AssertionError
+        self.assertEqual(
+            [Vector((0, 0, 0)), Vector((0.5, 0, 0)), Vector((2, 0, 0))],
+            keyframes.sample([-1.0, 0.25, 2.0]),
+        )
+
+    def test_translation_step(self) -> None:
+        keyframes = TranslationKeyframes.create(
+            [0.0, 1.0],
+            [Vector((0, 0, 0)), Vector((2, 0, 0))],
+            "STEP",
+        )
+        if keyframes is None:
+            raise AssertionError
+        self.assertEqual(
+            [Vector((0, 0, 0)), Vector((0, 0, 0)), Vector((2, 0, 0))],
+            keyframes.sample([0.0, 0.99, 1.0]),
+        )
+
+    def test_translation_cubic_spline(self) -> None:
+        zero = Vector((0, 0, 0))
+        keyframes = TranslationKeyframes.create(
+            [0.0, 2.0],
+            [zero, zero, Vector((1, 0, 0)), Vector((1, 0, 0)), Vector((2, 0, 0)), zero],
+            "CUBICSPLINE",
+        )
+        if keyframes is None:
+            raise AssertionError
+        for actual, expected in zip(
+            keyframes.sample([0.0, 1.0, 2.0]),
+            [zero, Vector((1, 0, 0)), Vector((2, 0, 0))],
+        ):
+            self.assertAlmostEqual((actual - expected).length, 0, places=6)
+
+    def test_translation_mismatched_cubic_spline(self) -> None:
+        self.assertIsNone(
+            TranslationKeyframes.create([0.0], [Vector((0, 0, 0))], "CUBICSPLINE")
+        )
+
+    def test_rotation_linear(self) -> None:
+        begin = Quaternion()
+        end = Quaternion((0, 0, 1), 1.0)
+        keyframes = RotationKeyframes.create([0.0, 1.0], [begin, end], "LINEAR")
+        if keyframes is None:
+            raise AssertionError
+        (actual,) = keyframes.sample([0.5])
+        self.assertAlmostEqual(
+            actual.rotation_difference(Quaternion((0, 0, 1), 0.5)).angle, 0, places=5
+        )
+
+
+class TestKeyframeBuffer(AddonTestCase):
+    def test_write(self) -> None:
+        context = bpy.context
+        obj = context.blend_data.objects.new("Target", None)
+        action = context.blend_data.actions.new("TargetAction")
+
+        keyframe_buffer = KeyframeBuffer()
+        keyframe_buffer.insert(obj, "location", (1, 2, 3), 1)
+        keyframe_buffer.insert(obj, "location", (4, 5, 6), 2)
+        keyframe_buffer.insert(obj, "rotation_quaternion", (1, 0, 0, 0), 1)
+        keyframe_buffer.write(context, action)
+
+        self.assertEqual(7, len(action.fcurves))
+        location_z = action.fcurves.find("location", index=2)
+        if location_z is None:
+            raise AssertionError
+        self.assertEqual("AUTO_RGB", location_z.color_mode)
+        self.assertEqual(
+            [(1, 3), (2, 6)],
+            [tuple(keyframe.co) for keyframe in location_z.keyframe_points],
+        )
+        rotation_w = action.fcurves.find("rotation_quaternion", index=0)
+        if rotation_w is None:
+            raise AssertionError
+        self.assertEqual("AUTO_YRGB", rotation_w.color_mode)
+        (keyframe,) = rotation_w.keyframe_points
+        self.assertEqual((0, 1), tuple(keyframe.handle_left))
+        self.assertEqual((2, 1), tuple(keyframe.handle_right))
+
+
+def write_look_at_vrma(source_path: Path, path: Path) -> None:
+    """Write source_path with a look at target node animated by translation."""
+    vrma_dict, buffer0_bytes = parse_glb(source_path.read_bytes())
+    buffer0 = bytearray(buffer0_bytes)
+
+    node_dicts = vrma_dict.get("nodes")
+    scene_dicts = vrma_dict.get("scenes")
+    buffer_view_dicts = vrma_dict.get("bufferViews")
+    accessor_dicts = vrma_dict.get("accessors")
+    buffer_dicts = vrma_dict.get("buffers")
+    animation_dicts = vrma_dict.get("animations")
+    extensions_dict = vrma_dict.get("extensions")
+    if not (
+        isinstance(node_dicts, list)
+        and isinstance(scene_dicts, list)
+        and isinstance(scene_dict := scene_dicts[0], dict)
+        and isinstance(scene_node_indices := scene_dict.get("nodes"), list)
+        and isinstance(buffer_view_dicts, list)
+        and isinstance(accessor_dicts, list)
+        and isinstance(buffer_dicts, list)
+        and isinstance(buffer_dict := buffer_dicts[0], dict)
+        and isinstance(animation_dicts, list)
+        and isinstance(animation_dict := animation_dicts[0], dict)
+        and isinstance(channel_dicts := animation_dict.get("channels"), list)
+        and isinstance(sampler_dicts := animation_dict.get("samplers"), list)
+        and isinstance(sampler_dict := sampler_dicts[0], dict)
+        and isinstance(extensions_dict, dict)
+        and isinstance(
+            vrmc_vrm_animation_dict := extensions_dict.get("VRMC_vrm_animation"),
+            dict,
+        )
+    ):
+        raise TypeError
+
+    look_at_target_node_index = len(node_dicts)
+    node_dicts.append({"name": "LookAtTarget", "translation": [0.0, 1.0, 1.0]})
+    scene_node_indices.append(look_at_target_node_index)
+
+    buffer_view_dicts.append(
+        {"buffer": 0, "byteOffset": len(buffer0), "byteLength": 12}
+    )
+    buffer0.extend(struct.pack("<3f", 0.0, 1.0, 1.0))
+    buffer_dict["byteLength"] = len(buffer0)
+    accessor_dicts.append(
+        {
+            "bufferView": len(buffer_view_dicts) - 1,
+            "componentType": 5126,
+            "count": 1,
+            "type": "VEC3",
+        }
+    )
+
+    sampler_dicts.append(
+        {"input": sampler_dict.get("input"), "output": len(accessor_dicts) - 1}
+    )
+    channel_dict: dict[str, Json] = {
+        "sampler": len(sampler_dicts) - 1,
+        "target": {"node": look_at_target_node_index, "path": "translation"},
+    }
+    channel_dicts.append(channel_dict)
+    vrmc_vrm_animation_dict["lookAt"] = {"node": look_at_target_node_index}
+
+    path.write_bytes(pack_glb(vrma_dict, buffer0))
+
+
+class TestImportVrmaBatch(AddonTestCase):
+    def import_vrma_batch(
+        self,
+        names: list[str],
+        *,
+        push_to_nla: bool,
+        look_at_names: tuple[str, ...] = (),
+    ) -> None:
+        context = bpy.context
+        ops.icyp.make_basic_armature()
+        armature = context.view_layer.objects.active
+        if not armature or not isinstance(armature_data := armature.data, Armature):
+            raise AssertionError
+        ext = get_armature_extension(armature_data)
+        ext.spec_version = ext.SPEC_VERSION_VRM1
+
+        source_path = Path(__file__).parent.parent / "resources" / "vrma" / "nop.vrma"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in names:
+                if name in look_at_names:
+                    write_look_at_vrma(source_path, Path(temp_dir) / name)
+                else:
+                    shutil.copy(source_path, Path(temp_dir) / name)
+            self.assertEqual(
+                ops.import_scene.vrma_batch(
+                    armature_object_name=armature.name,
+                    push_to_nla=push_to_nla,
+                    files=[{"name": name} for name in names],
+                    directory=temp_dir,
+                ),
+                {"FINISHED"},
+            )
+
+    def test_import_actions(self) -> None:
+        self.import_vrma_batch(["Walk.vrma", "Run.vrma"], push_to_nla=False)
+
+        armature = bpy.context.view_layer.objects.active
+        if not armature or not armature.animation_data:
+            raise AssertionError
+        walk = bpy.context.blend_data.actions["Walk"]
+        run = bpy.context.blend_data.actions["Run"]
+        self.assertTrue(walk.use_fake_user)
+        self.assertTrue(run.use_fake_user)
+        self.assertEqual(armature.animation_data.action, run)
+        self.assertEqual(
+            [(fcurve.data_path, fcurve.array_index) for fcurve in walk.fcurves],
+            [(fcurve.data_path, fcurve.array_index) for fcurve in run.fcurves],
+        )
+
+    def test_push_to_nla(self) -> None:
+        self.import_vrma_batch(["Walk.vrma", "Run.vrma"], push_to_nla=True)
+
+        armature = bpy.context.view_layer.objects.active
+        if not armature or not armature.animation_data:
+            raise AssertionError
+        animation_data = armature.animation_data
+        self.assertIsNone(animation_data.action)
+        actions = bpy.context.blend_data.actions
+        self.assertEqual(
+            [
+                (nla_track.name, [strip.action for strip in nla_track.strips])
+                for nla_track in animation_data.nla_tracks
+            ],
+            [("Walk", [actions["Walk"]]), ("Run", [actions["Run"]])],
+        )
+
+    def assert_look_at_actions(self, *, push_to_nla: bool) -> None:
+        names = ["Walk.vrma", "Run.vrma"]
+        self.import_vrma_batch(
+            names, push_to_nla=push_to_nla, look_at_names=tuple(names)
+        )
+
+        actions = bpy.context.blend_data.actions
+        nla_strip_actions = {
+            strip.action
+            for obj in bpy.context.blend_data.objects
+            if obj.animation_data
+            for nla_track in obj.animation_data.nla_tracks
+            for strip in nla_track.strips
+        }
+        for name in ("Walk", "Run"):
+            # Every look at action must have a user so that it is saved
+            look_at_action = actions[name + " LookAt"]
+            self.assertTrue(look_at_action.fcurves)
+            self.assertEqual(look_at_action.use_fake_user, not push_to_nla)
+            self.assertEqual(look_at_action in nla_strip_actions, push_to_nla)
+
+    def test_import_look_at_actions(self) -> None:
+        self.assert_look_at_actions(push_to_nla=False)
+
+    def test_push_look_at_actions_to_nla(self) -> None:
+        self.assert_look_at_actions(push_to_nla=True)
@@ -35,6 +35,10 @@ class bpy_struct:
 __BpyPropCollectionElement = TypeVar("__BpyPropCollectionElement")
 
 class bpy_prop_collection(Generic[__BpyPropCollectionElement]):
+    def foreach_get(
+        self, attr: str, seq: MutableSequence[float] | MutableSequence[int]
+    ) -> None: ...
+    def foreach_set(self, attr: str, seq: Sequence[float]) -> None: ...
     def get(
         self,
         key: str,
@@ -90,6 +94,8 @@ class ID(bpy_struct, __CustomProperty):
     def user_remap(self, new_id: ID) -> None: ...
     def update_tag(self, refresh: set[str] = ...) -> None: ...
     @property
+    def original(self) -> ID: ...
+    @property
     def preview(self) -> ImagePreview | None: ...
     def copy(self) -> ID: ...
 
@@ -98,6 +104,8 @@ class Property(bpy_struct):
     def name(self) -> str: ...
     @property
     def identifier(self) -> str: ...
+    @property
+    def subtype(self) -> str: ...
 
 class PointerProperty(Property):
     @property
@@ -258,9 +266,36 @@ class TimelineMarker(bpy_struct):
 class ActionPoseMarkers(bpy_prop_collection[TimelineMarker]): ...
 
 class Keyframe(bpy_struct):
-    co: Vector
+    @property
+    def co(self) -> Vector: ...
+    @co.setter
+    def co(self, value: Sequence[float]) -> None: ...
+    handle_left: Vector
+    handle_left_type: str
+    handle_right: Vector
+    handle_right_type: str
+    interpolation: str
+
+class FCurveKeyframePoints(bpy_prop_collection[Keyframe]):
+    def insert(
+        self,
+        frame: float,
+        value: float,
+        *,
+        options: set[str] = ...,
+        keyframe_type: str = "KEYFRAME",
+    ) -> Keyframe: ...
+    def add(self, count: int) -> None: ...
+
+class FModifier(bpy_struct):
+    active: bool
+    mute: bool
+    @property
+    def type(self) -> str: ...
 
-class FCurveKeyframePoints(bpy_prop_collection[Keyframe]): ...
+class FCurveModifiers(bpy_prop_collection[FModifier]):
+    def new(self, type: str) -> FModifier: ...
+    def remove(self, modifier: FModifier) -> None: ...
 
 class FCurve(bpy_struct):
     array_index: int
@@ -274,11 +309,18 @@ class FCurve(bpy_struct):
     is_valid: bool
     @property
     def keyframe_points(self) -> FCurveKeyframePoints: ...
+    @property
+    def modifiers(self) -> FCurveModifiers: ...
     mute: bool
 
     def evaluate(self, frame: int) -> float: ...
+    def update(self) -> None: ...
 
-class ActionFCurves(bpy_prop_collection[FCurve]): ...
+class ActionFCurves(bpy_prop_collection[FCurve]):
+    def new(
+        self, data_path: str, *, index: int = 0, action_group: str = ""
+    ) -> FCurve: ...
+    def find(self, data_path: str, *, index: int = 0) -> FCurve | None: ...
 
 class ActionChannelbagFCurves(bpy_prop_collection[FCurve]):
     def new(self, data_path: str, *, index: int = 0) -> FCurve: ...
@@ -383,9 +425,13 @@ class DepsgraphObjectInstance(bpy_struct):
     def uv(self) -> Sequence[float]: ...
 
 class DepsgraphUpdate(bpy_struct):
+    @property
     def id(self) -> ID: ...
+    @property
     def is_updated_geometry(self) -> bool: ...
+    @property
     def is_updated_shading(self) -> bool: ...
+    @property
     def is_updated_transform(self) -> bool: ...
 
 class Depsgraph(bpy_struct):
@@ -466,7 +512,9 @@ class ViewLayer(bpy_struct):
 class Bone(bpy_struct, __CustomProperty):
     name: str
     parent: Bone | None
+    inherit_scale: str
     use_inherit_rotation: bool
+    use_local_location: bool
     select: bool
     tail_radius: float
 
@@ -808,22 +856,35 @@ class MeshVertex(bpy_struct):
     @property
     def index(self) -> int: ...
 
-class MeshVertices(bpy_prop_collection[MeshVertex]): ...
+class MeshVertices(bpy_prop_collection[MeshVertex]):
+    def add(self, count: int) -> None: ...
+
 class UnknownType(bpy_struct): ...
 
 class ShapeKeyPoint(bpy_struct):
-    co: Vector
+    @property
+    def co(self) -> Vector: ...
+    @co.setter
+    def co(self, value: Sequence[float]) -> None: ...
 
 class ShapeKey(bpy_struct):
     name: str
     value: float
+    mute: bool
+    relative_key: ShapeKey
+    slider_max: float
+    slider_min: float
+    vertex_group: str
     @property  # TODO: It's becoming UnknownType
     def data(self) -> bpy_prop_collection[ShapeKeyPoint]: ...
     def normals_split_get(self) -> Sequence[float]: ...  # TODO: Correct type
 
 class Key(ID):
+    @property
+    def animation_data(self) -> AnimData | None: ...
     @property
     def key_blocks(self) -> bpy_prop_collection[ShapeKey]: ...
+    use_relative: bool
     @property
     def reference_key(self) -> ShapeKey: ...
 
@@ -897,9 +958,23 @@ class Mesh(ID):
 
 class AnimDataDrivers(bpy_prop_collection[FCurve]):  # TODO: Type is unclear
     ...
-class NlaTrack(bpy_struct): ...
-class NlaTracks(bpy_prop_collection[NlaTrack]):  # TODO: Type is unclear
-    ...
+
+class NlaStrip(bpy_struct):
+    action: Action | None
+    name: str
+
+class NlaStrips(bpy_prop_collection[NlaStrip]):
+    def new(self, name: str, start: int, action: Action) -> NlaStrip: ...
+    def remove(self, strip: NlaStrip) -> None: ...
+
+class NlaTrack(bpy_struct):
+    name: str
+    @property
+    def strips(self) -> NlaStrips: ...
+
+class NlaTracks(bpy_prop_collection[NlaTrack]):
+    def new(self, prev: NlaTrack | None = None) -> NlaTrack: ...
+    def remove(self, track: NlaTrack) -> None: ...
 
 class AnimData(bpy_struct):
     action: Action | None
@@ -1627,7 +1702,12 @@ class Object(ID):
 class PreferencesView:
     use_translate_interface: bool
 
+class PreferencesEdit:
+    keyframe_new_handle_type: str
+    keyframe_new_interpolation_type: str
+
 class Preferences(bpy_struct):
+    edit: PreferencesEdit
     view: PreferencesView
     addons: Addons
 
@@ -1661,6 +1741,7 @@ class NodeLinks(bpy_prop_collection[NodeLink]):
         verify_limits: bool = True,
     ) -> NodeLink: ...
     def remove(self, link: NodeLink) -> None: ...
+    def clear(self) -> None: ...
 
 class Nodes(bpy_prop_collection[Node]):
     def new(self, type: str) -> Node: ...
@@ -1895,6 +1976,7 @@ class NodesModifier(Modifier):
 class OperatorFileListElement(PropertyGroup): ...
 
 class Constraint(bpy_struct):
+    enabled: bool
     influence: float
     @property
     def is_valid(self) -> bool: ...
@@ -2259,6 +2341,13 @@ class BlendDataNodeTrees(bpy_prop_collection[NodeTree]):
 
 class BlendDataActions(bpy_prop_collection[Action]):
     def new(self, name: str) -> Action: ...
+    def remove(
+        self,
+        action: Action,
+        do_unlink: bool = True,
+        do_id_user: bool = True,
+        do_ui_user: bool = True,
+    ) -> None: ...
 
 class BlendDataScenes(bpy_prop_collection[Scene]):
     def new(self, name: str) -> Scene: ...
@@ -2345,6 +2434,7 @@ class BlendDataWorlds:
     def new(self, name: str) -> World: ...
 
 class BlendData:
+    def as_pointer(self) -> int: ...
     @property
     def actions(self) -> BlendDataActions: ...
     @property
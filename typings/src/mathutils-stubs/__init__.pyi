@@ -116,6 +116,9 @@ class Quaternion:
     def to_matrix(self) -> Matrix: ...
     def normalize(self) -> None: ...
     def normalized(self) -> Quaternion: ...
+    def dot(self, other: Quaternion) -> float: ...
+    def __add__(self, other: Quaternion) -> Quaternion: ...
+    def __mul__(self, other: float) -> Quaternion: ...
     @overload
     def __matmul__(self, other: Quaternion) -> Quaternion: ...
     @overload